@@ -0,0 +1,175 @@
+"""Store spectrum curves as packed float32 values with content-hashed wavelength axes"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import math
+
+import numpy as np
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "3f7a2c9e1d48"
+down_revision = "9d3c6a1f8e57"
+branch_labels: tuple[str, ...] | None = None
+depends_on: tuple[str, ...] | None = None
+
+BATCH = 1000
+VALUE_DTYPE = np.dtype("<f4")
+AXIS_DTYPE = np.dtype("<f8")
+
+spectra = sa.table(
+    "annotation_spectra",
+    sa.column("id", sa.Integer),
+    sa.column("detail_id", sa.Integer),
+    sa.column("points", sa.JSON),
+    sa.column("values", sa.LargeBinary),
+    sa.column("axis_id", sa.Integer),
+)
+axes = sa.table(
+    "spectrum_axes",
+    sa.column("id", sa.Integer),
+    sa.column("content_hash", sa.String),
+    sa.column("wavelengths", sa.LargeBinary),
+)
+details = sa.table("annotation_details", sa.column("id", sa.Integer), sa.column("sample_id", sa.Integer))
+samples = sa.table("annotation_samples", sa.column("id", sa.Integer), sa.column("wavelengths", sa.JSON))
+
+
+def _load(value: object) -> object:
+    return json.loads(value) if isinstance(value, str) else value
+
+
+def _pack(points: list[dict], sample_axis: list[float] | None) -> tuple[bytes, bytes]:
+    """旧的 JSON 点列 -> (强度字节, 波长轴字节)；缺少波长时取样本波长轴，再退化为波段号."""
+    fallback = sample_axis if sample_axis is not None and len(sample_axis) == len(points) else None
+    wavelengths = np.asarray(
+        [
+            float(point["wavelength"]) if point.get("wavelength") is not None
+            else float(fallback[index]) if fallback is not None
+            else float(index)
+            for index, point in enumerate(points)
+        ],
+        dtype=AXIS_DTYPE,
+    )
+    values = np.asarray(
+        [np.nan if point.get("intensity") is None else float(point["intensity"]) for point in points],
+        dtype=VALUE_DTYPE,
+    )
+    return values.tobytes(), wavelengths.tobytes()
+
+
+def _unpack(values: bytes, wavelengths: bytes) -> list[dict]:
+    intensities = np.frombuffer(values, dtype=VALUE_DTYPE).astype(np.float64).tolist()
+    axis = np.frombuffer(wavelengths, dtype=AXIS_DTYPE).tolist()
+    return [
+        {"wavelength": wavelength, "intensity": None if math.isnan(value) else value}
+        for wavelength, value in zip(axis, intensities)
+    ]
+
+
+def _intern_axes(bind: sa.Connection, wavelengths: dict[str, bytes], known: dict[str, int]) -> None:
+    """把本批新出现的波长轴写入 spectrum_axes，并补全 known 中的 {哈希: id}."""
+    pending = [digest for digest in wavelengths if digest not in known]
+    if not pending:
+        return
+    known.update(bind.execute(sa.select(axes.c.content_hash, axes.c.id).where(axes.c.content_hash.in_(pending))).all())
+    missing = [digest for digest in pending if digest not in known]
+    if missing:
+        bind.execute(
+            axes.insert(),
+            [{"content_hash": digest, "wavelengths": wavelengths[digest]} for digest in missing],
+        )
+        known.update(
+            bind.execute(sa.select(axes.c.content_hash, axes.c.id).where(axes.c.content_hash.in_(missing))).all()
+        )
+
+
+def upgrade() -> None:
+    op.create_table(
+        "spectrum_axes",
+        sa.Column("id", sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column("content_hash", sa.String(length=64), nullable=False),
+        sa.Column("wavelengths", sa.LargeBinary(), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_spectrum_axes_content_hash", "spectrum_axes", ["content_hash"], unique=True)
+    op.add_column("annotation_spectra", sa.Column("values", sa.LargeBinary(), nullable=True))
+    op.add_column("annotation_spectra", sa.Column("axis_id", sa.Integer(), nullable=True))
+
+    bind = op.get_bind()
+    known: dict[str, int] = {}
+    last_id = 0
+    while True:
+        rows = bind.execute(
+            sa.select(spectra.c.id, spectra.c.points, samples.c.wavelengths)
+            .select_from(
+                spectra.join(details, details.c.id == spectra.c.detail_id).join(
+                    samples, samples.c.id == details.c.sample_id
+                )
+            )
+            .where(spectra.c.id > last_id)
+            .order_by(spectra.c.id)
+            .limit(BATCH)
+        ).all()
+        if not rows:
+            break
+        packed = []
+        batch_axes: dict[str, bytes] = {}
+        for spectrum_id, points, sample_axis in rows:
+            values, wavelengths = _pack(_load(points) or [], _load(sample_axis))
+            digest = hashlib.sha256(wavelengths).hexdigest()
+            batch_axes.setdefault(digest, wavelengths)
+            packed.append((spectrum_id, values, digest))
+        _intern_axes(bind, batch_axes, known)
+        bind.execute(
+            spectra.update().where(spectra.c.id == sa.bindparam("_id")),
+            [{"_id": spectrum_id, "values": values, "axis_id": known[digest]} for spectrum_id, values, digest in packed],
+        )
+        last_id = rows[-1][0]
+
+    with op.batch_alter_table("annotation_spectra") as batch:
+        batch.alter_column("values", existing_type=sa.LargeBinary(), nullable=False)
+        batch.alter_column("axis_id", existing_type=sa.Integer(), nullable=False)
+        batch.create_foreign_key(
+            "fk_annotation_spectra_axis_id",
+            "spectrum_axes",
+            ["axis_id"],
+            ["id"],
+            ondelete="RESTRICT",
+        )
+        batch.drop_column("points")
+
+
+def downgrade() -> None:
+    op.add_column("annotation_spectra", sa.Column("points", sa.JSON(), nullable=True))
+    bind = op.get_bind()
+    last_id = 0
+    while True:
+        rows = bind.execute(
+            sa.select(spectra.c.id, spectra.c["values"], axes.c.wavelengths)
+            .select_from(spectra.join(axes, axes.c.id == spectra.c.axis_id))
+            .where(spectra.c.id > last_id)
+            .order_by(spectra.c.id)
+            .limit(BATCH)
+        ).all()
+        if not rows:
+            break
+        bind.execute(
+            spectra.update().where(spectra.c.id == sa.bindparam("_id")),
+            [{"_id": row[0], "points": _unpack(row[1], row[2])} for row in rows],
+        )
+        last_id = rows[-1][0]
+
+    with op.batch_alter_table("annotation_spectra") as batch:
+        batch.alter_column("points", existing_type=sa.JSON(), nullable=False)
+        batch.drop_constraint("fk_annotation_spectra_axis_id", type_="foreignkey")
+        batch.drop_column("axis_id")
+        batch.drop_column("values")
+    op.drop_index("ix_spectrum_axes_content_hash", table_name="spectrum_axes")
+    op.drop_table("spectrum_axes")
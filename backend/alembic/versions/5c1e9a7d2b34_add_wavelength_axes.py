@@ -0,0 +1,29 @@
+"""Store per-sample wavelength axes and wavelength-keyed display modes"""
+
+from __future__ import annotations
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "5c1e9a7d2b34"
+down_revision = "82b27cfa3fe7"
+branch_labels: tuple[str, ...] | None = None
+depends_on: tuple[str, ...] | None = None
+
+
+def upgrade() -> None:
+    op.add_column("annotation_samples", sa.Column("wavelengths", sa.JSON(), nullable=True))
+    op.add_column("annotation_samples", sa.Column("fwhm", sa.JSON(), nullable=True))
+    op.add_column("spectral_display_modes", sa.Column("r_wavelength", sa.Float(), nullable=True))
+    op.add_column("spectral_display_modes", sa.Column("g_wavelength", sa.Float(), nullable=True))
+    op.add_column("spectral_display_modes", sa.Column("b_wavelength", sa.Float(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column("spectral_display_modes", "b_wavelength")
+    op.drop_column("spectral_display_modes", "g_wavelength")
+    op.drop_column("spectral_display_modes", "r_wavelength")
+    op.drop_column("annotation_samples", "fwhm")
+    op.drop_column("annotation_samples", "wavelengths")
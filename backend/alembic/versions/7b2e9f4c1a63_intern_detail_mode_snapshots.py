@@ -0,0 +1,130 @@
+"""Deduplicate display-mode snapshots into a content-hashed table"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "7b2e9f4c1a63"
+down_revision = "3f7a2c9e1d48"
+branch_labels: tuple[str, ...] | None = None
+depends_on: tuple[str, ...] | None = None
+
+BATCH = 1000
+MODE_FIELDS = (
+    ("r_channel", int),
+    ("g_channel", int),
+    ("b_channel", int),
+    ("r_gain", float),
+    ("g_gain", float),
+    ("b_gain", float),
+    ("gain_algorithm_id", int),
+    ("dark_calibration", bool),
+    ("white_calibration", bool),
+)
+
+modes = sa.table(
+    "annotation_detail_modes",
+    sa.column("id", sa.Integer),
+    sa.column("detail_id", sa.Integer),
+    sa.column("content_hash", sa.String),
+    sa.column("created_at", sa.DateTime),
+    sa.column("updated_at", sa.DateTime),
+    *(sa.column(name) for name, _cast in MODE_FIELDS),
+)
+details = sa.table("annotation_details", sa.column("id", sa.Integer), sa.column("mode_id", sa.Integer))
+
+
+def _content_hash(row: sa.Row) -> str:
+    content = [cast(getattr(row, name)) for name, cast in MODE_FIELDS]
+    return hashlib.sha256(json.dumps(content).encode("utf-8")).hexdigest()
+
+
+def upgrade() -> None:
+    op.add_column("annotation_details", sa.Column("mode_id", sa.Integer(), nullable=True))
+    op.add_column("annotation_detail_modes", sa.Column("content_hash", sa.String(length=64), nullable=True))
+
+    # 每种内容保留 id 最小的一行，其余标注改指向它后删除
+    bind = op.get_bind()
+    canonical: dict[str, int] = {}
+    last_id = 0
+    while True:
+        rows = bind.execute(
+            sa.select(modes).where(modes.c.id > last_id).order_by(modes.c.id).limit(BATCH)
+        ).all()
+        if not rows:
+            break
+        links, hashes, duplicates = [], [], []
+        for row in rows:
+            digest = _content_hash(row)
+            target = canonical.setdefault(digest, row.id)
+            links.append({"_id": row.detail_id, "mode_id": target})
+            if target == row.id:
+                hashes.append({"_id": row.id, "content_hash": digest})
+            else:
+                duplicates.append(row.id)
+        bind.execute(details.update().where(details.c.id == sa.bindparam("_id")), links)
+        if hashes:
+            bind.execute(modes.update().where(modes.c.id == sa.bindparam("_id")), hashes)
+        if duplicates:
+            bind.execute(modes.delete().where(modes.c.id.in_(duplicates)))
+        last_id = rows[-1].id
+
+    op.drop_index("ix_annotation_detail_modes_detail_id", table_name="annotation_detail_modes")
+    with op.batch_alter_table("annotation_detail_modes") as batch:
+        batch.alter_column("content_hash", existing_type=sa.String(length=64), nullable=False)
+        batch.drop_column("detail_id")
+    op.create_index(
+        "ix_annotation_detail_modes_content_hash",
+        "annotation_detail_modes",
+        ["content_hash"],
+        unique=True,
+    )
+    with op.batch_alter_table("annotation_details") as batch:
+        batch.create_foreign_key(
+            "fk_annotation_details_mode_id",
+            "annotation_detail_modes",
+            ["mode_id"],
+            ["id"],
+            ondelete="RESTRICT",
+        )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_annotation_detail_modes_content_hash", table_name="annotation_detail_modes")
+    op.add_column("annotation_detail_modes", sa.Column("detail_id", sa.Integer(), nullable=True))
+    with op.batch_alter_table("annotation_detail_modes") as batch:
+        batch.alter_column("content_hash", existing_type=sa.String(length=64), nullable=True)
+
+    # 为每条引用快照的标注复制一行私有快照，再删除共享行
+    fields = [name for name, _cast in MODE_FIELDS]
+    bind = op.get_bind()
+    bind.execute(
+        modes.insert().from_select(
+            ["detail_id", *fields, "created_at", "updated_at"],
+            sa.select(details.c.id, *(modes.c[name] for name in fields), modes.c.created_at, modes.c.updated_at)
+            .select_from(details.join(modes, modes.c.id == details.c.mode_id)),
+        )
+    )
+    bind.execute(details.update().values(mode_id=None))
+    bind.execute(modes.delete().where(modes.c.detail_id.is_(None)))
+
+    with op.batch_alter_table("annotation_details") as batch:
+        batch.drop_constraint("fk_annotation_details_mode_id", type_="foreignkey")
+        batch.drop_column("mode_id")
+    with op.batch_alter_table("annotation_detail_modes") as batch:
+        batch.drop_column("content_hash")
+        batch.alter_column("detail_id", existing_type=sa.Integer(), nullable=False)
+        batch.create_foreign_key(
+            "annotation_detail_modes_detail_id_fkey",
+            "annotation_details",
+            ["detail_id"],
+            ["id"],
+            ondelete="CASCADE",
+        )
+    op.create_index("ix_annotation_detail_modes_detail_id", "annotation_detail_modes", ["detail_id"])
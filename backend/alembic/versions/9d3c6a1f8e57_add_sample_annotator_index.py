@@ -0,0 +1,23 @@
+"""Index samples by annotator for filtered keyset pagination"""
+
+from __future__ import annotations
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "9d3c6a1f8e57"
+down_revision = "f2b8d5e1c904"
+branch_labels: tuple[str, ...] | None = None
+depends_on: tuple[str, ...] | None = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "ix_annotation_samples_project_annotator",
+        "annotation_samples",
+        ["project_id", "last_annotated_by", "id"],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_annotation_samples_project_annotator", table_name="annotation_samples")
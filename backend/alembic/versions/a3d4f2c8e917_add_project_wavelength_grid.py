@@ -0,0 +1,21 @@
+"""Add project-wide wavelength grid"""
+
+from __future__ import annotations
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "a3d4f2c8e917"
+down_revision = "5c1e9a7d2b34"
+branch_labels: tuple[str, ...] | None = None
+depends_on: tuple[str, ...] | None = None
+
+
+def upgrade() -> None:
+    op.add_column("annotation_projects", sa.Column("wavelength_grid", sa.JSON(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column("annotation_projects", "wavelength_grid")
@@ -0,0 +1,69 @@
+"""Add change versions and annotation tombstones for delta exports"""
+
+from __future__ import annotations
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "a8d4c2e6f190"
+down_revision = "7b2e9f4c1a63"
+branch_labels: tuple[str, ...] | None = None
+depends_on: tuple[str, ...] | None = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "annotation_projects",
+        sa.Column("change_version", sa.BigInteger(), server_default="0", nullable=False),
+    )
+    op.add_column(
+        "annotation_projects",
+        sa.Column("tombstone_floor", sa.BigInteger(), server_default="0", nullable=False),
+    )
+    op.add_column(
+        "annotation_samples",
+        sa.Column("change_version", sa.BigInteger(), server_default="0", nullable=False),
+    )
+    op.add_column(
+        "annotation_details",
+        sa.Column("change_version", sa.BigInteger(), server_default="0", nullable=False),
+    )
+    op.create_table(
+        "annotation_tombstones",
+        sa.Column("id", sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column("project_id", sa.Integer(), nullable=False),
+        sa.Column("sample_id", sa.String(length=64), nullable=False),
+        sa.Column("detail_id", sa.String(length=64), nullable=False),
+        sa.Column("change_version", sa.BigInteger(), nullable=False),
+        sa.Column("deleted_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=False),
+        sa.ForeignKeyConstraint(["project_id"], ["annotation_projects.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(
+        "ix_annotation_tombstones_project_version",
+        "annotation_tombstones",
+        ["project_id", "change_version"],
+    )
+    op.create_index(
+        "ix_annotation_tombstones_project_deleted_at",
+        "annotation_tombstones",
+        ["project_id", "deleted_at"],
+    )
+    op.create_index(
+        "ix_annotation_samples_project_version",
+        "annotation_samples",
+        ["project_id", "change_version"],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_annotation_samples_project_version", table_name="annotation_samples")
+    op.drop_index("ix_annotation_tombstones_project_deleted_at", table_name="annotation_tombstones")
+    op.drop_index("ix_annotation_tombstones_project_version", table_name="annotation_tombstones")
+    op.drop_table("annotation_tombstones")
+    op.drop_column("annotation_details", "change_version")
+    op.drop_column("annotation_samples", "change_version")
+    op.drop_column("annotation_projects", "tombstone_floor")
+    op.drop_column("annotation_projects", "change_version")
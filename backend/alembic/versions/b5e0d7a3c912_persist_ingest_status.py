@@ -0,0 +1,40 @@
+"""Persist per-sample ingest pipeline status"""
+
+from __future__ import annotations
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "b5e0d7a3c912"
+down_revision = "a8d4c2e6f190"
+branch_labels: tuple[str, ...] | None = None
+depends_on: tuple[str, ...] | None = None
+
+
+def upgrade() -> None:
+    op.add_column("annotation_samples", sa.Column("ingest_status", sa.String(length=20), nullable=True))
+    op.add_column(
+        "annotation_samples",
+        sa.Column("ingest_progress", sa.Float(), server_default="0", nullable=False),
+    )
+    op.add_column("annotation_samples", sa.Column("ingest_stage", sa.String(length=32), nullable=True))
+    op.add_column("annotation_samples", sa.Column("ingest_error", sa.Text(), nullable=True))
+    op.add_column("annotation_samples", sa.Column("ingest_stages", sa.JSON(), nullable=True))
+    # 已有的高光谱样本先记为 pending，首次轮询时从 pipeline.json 回写
+    op.execute("UPDATE annotation_samples SET ingest_status = 'pending' WHERE sample_type = 'hyperspectral'")
+    op.create_index(
+        "ix_annotation_samples_project_ingest",
+        "annotation_samples",
+        ["project_id", "ingest_status", "id"],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_annotation_samples_project_ingest", table_name="annotation_samples")
+    op.drop_column("annotation_samples", "ingest_stages")
+    op.drop_column("annotation_samples", "ingest_error")
+    op.drop_column("annotation_samples", "ingest_stage")
+    op.drop_column("annotation_samples", "ingest_progress")
+    op.drop_column("annotation_samples", "ingest_status")
@@ -0,0 +1,67 @@
+"""Track project data source folder and per-file fingerprints"""
+
+from __future__ import annotations
+
+import json
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "c7b1e4f09a52"
+down_revision = "a3d4f2c8e917"
+branch_labels: tuple[str, ...] | None = None
+depends_on: tuple[str, ...] | None = None
+
+projects = sa.table(
+    "annotation_projects",
+    sa.column("id", sa.Integer),
+    sa.column("data_source_folder", sa.String),
+)
+samples = sa.table(
+    "annotation_samples",
+    sa.column("id", sa.Integer),
+    sa.column("project_id", sa.Integer),
+    sa.column("source_files", sa.JSON),
+)
+
+
+def _folder_of(source_files: object) -> str | None:
+    """样本路径形如 "<数据源文件夹>/..."，取第一级目录."""
+    if isinstance(source_files, str):
+        source_files = json.loads(source_files)
+    if not source_files:
+        return None
+    parts = str(source_files[0]).replace("\\", "/").strip("/").split("/")
+    return parts[0] if len(parts) > 1 else None
+
+
+def upgrade() -> None:
+    op.add_column("annotation_projects", sa.Column("data_source_folder", sa.String(length=255), nullable=True))
+    op.add_column("annotation_samples", sa.Column("file_fingerprints", sa.JSON(), nullable=True))
+    op.add_column("annotation_samples", sa.Column("status_before_missing", sa.String(length=20), nullable=True))
+
+    # 已有项目从任一样本的路径回填数据源文件夹，否则无法同步
+    bind = op.get_bind()
+    project_ids = bind.execute(
+        sa.select(projects.c.id).where(projects.c.data_source_folder.is_(None))
+    ).scalars().all()
+    for project_id in project_ids:
+        source_files = bind.execute(
+            sa.select(samples.c.source_files)
+            .where(samples.c.project_id == project_id)
+            .order_by(samples.c.id)
+            .limit(1)
+        ).scalar()
+        folder = _folder_of(source_files)
+        if folder is not None:
+            bind.execute(
+                projects.update().where(projects.c.id == project_id).values(data_source_folder=folder)
+            )
+
+
+def downgrade() -> None:
+    op.drop_column("annotation_samples", "status_before_missing")
+    op.drop_column("annotation_samples", "file_fingerprints")
+    op.drop_column("annotation_projects", "data_source_folder")
@@ -0,0 +1,66 @@
+"""Denormalize cube metadata onto annotation samples"""
+
+from __future__ import annotations
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "e4a91c3d7b26"
+down_revision = "c7b1e4f09a52"
+branch_labels: tuple[str, ...] | None = None
+depends_on: tuple[str, ...] | None = None
+
+
+def upgrade() -> None:
+    op.add_column("annotation_samples", sa.Column("cube_samples", sa.Integer(), nullable=True))
+    op.add_column("annotation_samples", sa.Column("cube_lines", sa.Integer(), nullable=True))
+    op.add_column("annotation_samples", sa.Column("cube_bands", sa.Integer(), nullable=True))
+    op.add_column("annotation_samples", sa.Column("data_type", sa.Integer(), nullable=True))
+    op.add_column("annotation_samples", sa.Column("interleave", sa.String(length=8), nullable=True))
+    op.add_column("annotation_samples", sa.Column("wavelength_min", sa.Float(), nullable=True))
+    op.add_column("annotation_samples", sa.Column("wavelength_max", sa.Float(), nullable=True))
+    op.add_column("annotation_samples", sa.Column("file_size", sa.BigInteger(), nullable=True))
+    op.add_column(
+        "annotation_samples",
+        sa.Column("has_dark", sa.Boolean(), nullable=False, server_default=sa.false()),
+    )
+    op.add_column(
+        "annotation_samples",
+        sa.Column("has_white", sa.Boolean(), nullable=False, server_default=sa.false()),
+    )
+    op.create_index(
+        "ix_annotation_samples_project_bands",
+        "annotation_samples",
+        ["project_id", "cube_bands"],
+    )
+    op.create_index(
+        "ix_annotation_samples_project_size",
+        "annotation_samples",
+        ["project_id", "cube_lines", "cube_samples"],
+    )
+    op.create_index(
+        "ix_annotation_samples_project_file_size",
+        "annotation_samples",
+        ["project_id", "file_size"],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_annotation_samples_project_file_size", table_name="annotation_samples")
+    op.drop_index("ix_annotation_samples_project_size", table_name="annotation_samples")
+    op.drop_index("ix_annotation_samples_project_bands", table_name="annotation_samples")
+    for column in (
+        "has_white",
+        "has_dark",
+        "file_size",
+        "wavelength_max",
+        "wavelength_min",
+        "interleave",
+        "data_type",
+        "cube_bands",
+        "cube_lines",
+        "cube_samples",
+    ):
+        op.drop_column("annotation_samples", column)
@@ -0,0 +1,44 @@
+"""Add composite indexes for sample, detail and spectrum hot paths"""
+
+from __future__ import annotations
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "f2b8d5e1c904"
+down_revision = "e4a91c3d7b26"
+branch_labels: tuple[str, ...] | None = None
+depends_on: tuple[str, ...] | None = None
+
+# (索引名, 表名, 列) —— 与实际查询形状对应
+INDEXES: tuple[tuple[str, str, list[str]], ...] = (
+    # 项目样本列表 / 导出：WHERE project_id = ? ORDER BY id
+    ("ix_annotation_samples_project_id_id", "annotation_samples", ["project_id", "id"]),
+    # 项目统计：按 project_id 的 status / is_annotated 条件计数（仅索引扫描）
+    (
+        "ix_annotation_samples_project_status_annotated",
+        "annotation_samples",
+        ["project_id", "status", "is_annotated"],
+    ),
+    # 样本详情与删除：WHERE sample_id = ? ORDER BY id
+    ("ix_annotation_details_sample_id_id", "annotation_details", ["sample_id", "id"]),
+    ("ix_annotation_spectra_detail_id", "annotation_spectra", ["detail_id"]),
+    ("ix_annotation_detail_modes_detail_id", "annotation_detail_modes", ["detail_id"]),
+    # 项目列表：ORDER BY created_at DESC，可选 is_archived 过滤
+    ("ix_annotation_projects_created_at", "annotation_projects", ["created_at"]),
+    (
+        "ix_annotation_projects_archived_created_at",
+        "annotation_projects",
+        ["is_archived", "created_at"],
+    ),
+)
+
+
+def upgrade() -> None:
+    for name, table, columns in INDEXES:
+        op.create_index(name, table, columns)
+
+
+def downgrade() -> None:
+    for name, table, _columns in reversed(INDEXES):
+        op.drop_index(name, table_name=table)
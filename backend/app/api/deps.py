@@ -1,4 +1,5 @@
-from collections.abc import AsyncGenerator
+from collections.abc import AsyncGenerator, Callable
+from contextlib import AbstractAsyncContextManager
 from typing import Annotated
 
 from fastapi import Depends, HTTPException, status
@@ -24,6 +25,11 @@ async def get_db() -> AsyncGenerator[AsyncSession, None]:
             raise
 
 
+def get_session_factory() -> Callable[[], AbstractAsyncContextManager[AsyncSession]]:
+    """Dependency that provides a session factory for work outliving the request (e.g. streaming bodies)."""
+    return AsyncSessionLocal
+
+
 async def get_current_user(
     db: Annotated[AsyncSession, Depends(get_db)],
     token: Annotated[str, Depends(oauth2_scheme)],
@@ -1,9 +1,9 @@
 from __future__ import annotations
 
 import shutil
-from pathlib import Path
+from collections.abc import AsyncIterator, Callable
+from contextlib import AbstractAsyncContextManager, AsyncExitStack
 from typing import Annotated
-from uuid import uuid4
 
 from fastapi import (
     APIRouter,
@@ -11,14 +11,19 @@ from fastapi import (
     Depends,
     File,
     Form,
+    Header,
     HTTPException,
     Query,
+    Request,
     UploadFile,
     status,
 )
+from fastapi.responses import FileResponse, StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.background import BackgroundTask
+from starlette.concurrency import run_in_threadpool
 
-from app.api.deps import get_current_active_user, get_db
+from app.api.deps import get_current_active_user, get_db, get_session_factory
 from app.models.user import User
 from app.schemas.project import (
     DataSourceInfo,
@@ -26,10 +31,23 @@ from app.schemas.project import (
     ProjectCreate,
     ProjectExportOptions,
     ProjectExportResponse,
+    ProjectIngestStatus,
     ProjectListResponse,
     ProjectResponse,
+    ProjectSyncResponse,
     ProjectUpdate,
+    UploadSessionCreate,
+    UploadSessionFileStatus,
+    UploadSessionResponse,
 )
+from app.services.blob_store import schedule_orphan_collection
+from app.services.columnar_export import build_columnar_export_archive
+from app.services.data_source_index import (
+    data_source_index,
+    refresh_tree,
+    summarize_tree,
+)
+from app.services.ingest_pipeline import get_project_ingest_status
 from app.services.project import (
     DATA_SOURCE_ROOT,
     archive_project,
@@ -40,12 +58,25 @@ from app.services.project import (
     list_data_sources,
     list_projects,
     restore_project,
+    stream_project_export,
+    sync_project_samples,
     update_project,
 )
+from app.services.resumable_upload import (
+    abort_upload_session,
+    create_upload_session,
+    finalize_upload_session,
+    get_upload_session,
+    write_upload_range,
+)
+from app.services.upload import (
+    extract_archive,
+    validate_folder_name,
+    write_upload_files,
+)
 
 router = APIRouter()
 MAX_UPLOAD_FILES = 5000
-MAX_NESTED_DIRS = 3
 
 
 @router.get("", response_model=ProjectListResponse)
@@ -91,7 +122,7 @@ async def list_data_sources_endpoint(
     _current_user: Annotated[User, Depends(get_current_active_user)],
 ) -> list[DataSourceInfo]:
     """列出可选数据源."""
-    return list_data_sources()
+    return await run_in_threadpool(list_data_sources)
 
 
 @router.post("/data-sources/upload-folder", response_model=DataSourceUploadResponse)
@@ -101,9 +132,8 @@ async def upload_data_source_folder_endpoint(
     relative_paths: Annotated[list[str], Form(...)],
     _current_user: Annotated[User, Depends(get_current_active_user)],
 ) -> DataSourceUploadResponse:
-    """上传整個文件夹（逐文件）."""
-    if not folder_name.strip():
-        raise HTTPException(status_code=400, detail="文件夹名称不能为空")
+    """上传整個文件夹（逐文件分块流式写入）."""
+    safe_folder = validate_folder_name(folder_name)
     if not files or not relative_paths:
         raise HTTPException(status_code=400, detail="未提供文件")
     if len(files) != len(relative_paths):
@@ -111,43 +141,108 @@ async def upload_data_source_folder_endpoint(
     if len(files) > MAX_UPLOAD_FILES:
         raise HTTPException(status_code=400, detail="单次上传文件过多")
 
-    safe_folder = folder_name.strip().strip("/").strip()
-    safe_folder = safe_folder or f"dataset_{uuid4().hex[:8]}"
-    if ".." in safe_folder or "/" in safe_folder or "\\" in safe_folder:
-        raise HTTPException(status_code=400, detail="非法文件夹名称")
-
     target_dir = DATA_SOURCE_ROOT / safe_folder
     if target_dir.exists():
         raise HTTPException(status_code=400, detail="目标文件夹已存在")
     target_dir.mkdir(parents=True, exist_ok=True)
 
     try:
-        for upload_file, rel in zip(files, relative_paths):
-            rel_path = Path(rel.strip().strip("/"))
-            if rel_path.is_absolute() or ".." in rel_path.parts:
-                raise HTTPException(status_code=400, detail="包含非法路径")
-            cleaned_parts = [part for part in rel_path.parts if part and part not in {".", ""}]
-            if cleaned_parts and cleaned_parts[0].casefold() == safe_folder.casefold():
-                cleaned_parts = cleaned_parts[1:]
-            dir_depth = max(len(cleaned_parts) - 1, 0)
-            if dir_depth > MAX_NESTED_DIRS:
-                raise HTTPException(status_code=400, detail=f"目录嵌套不能超过 {MAX_NESTED_DIRS} 层")
-            normalized_rel = Path(*cleaned_parts) if cleaned_parts else Path(upload_file.filename or uuid4().hex)
-            destination = target_dir / normalized_rel
-            destination.parent.mkdir(parents=True, exist_ok=True)
-            content = await upload_file.read()
-            with destination.open("wb") as f:
-                f.write(content)
+        stored = await write_upload_files(target_dir, safe_folder, files, relative_paths)
+    except HTTPException:
+        shutil.rmtree(target_dir, ignore_errors=True)
+        schedule_orphan_collection()
+        raise
     except Exception as exc:  # pragma: no cover - cleanup on failure
         shutil.rmtree(target_dir, ignore_errors=True)
+        schedule_orphan_collection()
         raise HTTPException(status_code=400, detail=str(exc)) from exc
 
-    total_files = sum(1 for _ in target_dir.rglob("*") if _.is_file())
+    total_files, _total_samples = summarize_tree(refresh_tree(target_dir, {}))
+    data_source_index.invalidate()
     if total_files == 0:
         shutil.rmtree(target_dir, ignore_errors=True)
+        schedule_orphan_collection()
         raise HTTPException(status_code=400, detail="上传内容为空")
 
-    return DataSourceUploadResponse(name=safe_folder, total_files=total_files)
+    duplicates = [item for item in stored if item.deduplicated]
+    return DataSourceUploadResponse(
+        name=safe_folder,
+        total_files=total_files,
+        deduplicated_files=len(duplicates),
+        deduplicated_bytes=sum(item.size for item in duplicates),
+    )
+
+
+@router.post("/data-sources/upload-archive", response_model=DataSourceUploadResponse)
+async def upload_data_source_archive_endpoint(
+    folder_name: Annotated[str, Form(...)],
+    file: Annotated[UploadFile, File(...)],
+    _current_user: Annotated[User, Depends(get_current_active_user)],
+) -> DataSourceUploadResponse:
+    """上传单个 zip/tar 压缩包并流式解压为数据源."""
+    safe_folder = validate_folder_name(folder_name)
+    if (DATA_SOURCE_ROOT / safe_folder).exists():
+        raise HTTPException(status_code=400, detail="目标文件夹已存在")
+
+    stored = await run_in_threadpool(extract_archive, file.file, safe_folder)
+    data_source_index.invalidate()
+    duplicates = [item for item in stored if item.deduplicated]
+    return DataSourceUploadResponse(
+        name=safe_folder,
+        total_files=len(stored),
+        deduplicated_files=len(duplicates),
+        deduplicated_bytes=sum(item.size for item in duplicates),
+    )
+
+
+@router.post("/data-sources/uploads", response_model=UploadSessionResponse, status_code=status.HTTP_201_CREATED)
+async def create_upload_session_endpoint(
+    payload: UploadSessionCreate,
+    current_user: Annotated[User, Depends(get_current_active_user)],
+) -> UploadSessionResponse:
+    """创建断点续传会话."""
+    return await run_in_threadpool(create_upload_session, payload, user_id=current_user.id)
+
+
+@router.get("/data-sources/uploads/{session_id}", response_model=UploadSessionResponse)
+async def get_upload_session_endpoint(
+    session_id: str,
+    current_user: Annotated[User, Depends(get_current_active_user)],
+) -> UploadSessionResponse:
+    """查询会话进度（断线后据此续传缺失区间）."""
+    return await run_in_threadpool(get_upload_session, session_id, user_id=current_user.id)
+
+
+@router.put("/data-sources/uploads/{session_id}/files/{index}", response_model=UploadSessionFileStatus)
+async def upload_session_range_endpoint(
+    session_id: str,
+    index: int,
+    request: Request,
+    current_user: Annotated[User, Depends(get_current_active_user)],
+    content_range: Annotated[str | None, Header()] = None,
+) -> UploadSessionFileStatus:
+    """上传文件的一个字节区间（请求体为原始字节，需携带 Content-Range）."""
+    return await write_upload_range(
+        session_id, index, content_range, request.stream(), user_id=current_user.id
+    )
+
+
+@router.post("/data-sources/uploads/{session_id}/finalize", response_model=DataSourceUploadResponse)
+async def finalize_upload_session_endpoint(
+    session_id: str,
+    current_user: Annotated[User, Depends(get_current_active_user)],
+) -> DataSourceUploadResponse:
+    """完成上传：校验后使数据源可见."""
+    return await run_in_threadpool(finalize_upload_session, session_id, user_id=current_user.id)
+
+
+@router.delete("/data-sources/uploads/{session_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def abort_upload_session_endpoint(
+    session_id: str,
+    current_user: Annotated[User, Depends(get_current_active_user)],
+) -> None:
+    """放弃上传会话."""
+    await run_in_threadpool(abort_upload_session, session_id, user_id=current_user.id)
 
 
 @router.get("/{project_id}", response_model=ProjectResponse)
@@ -189,6 +284,7 @@ async def delete_project_endpoint(
     if not project:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="项目不存在")
     await delete_project(db, project)
+    schedule_orphan_collection()
 
 
 @router.post("/{project_id}/archive", response_model=ProjectResponse)
@@ -219,6 +315,34 @@ async def restore_project_endpoint(
     return ProjectResponse.model_validate(restored)
 
 
+@router.post("/{project_id}/sync", response_model=ProjectSyncResponse)
+async def sync_project_endpoint(
+    project_id: int,
+    db: Annotated[AsyncSession, Depends(get_db)],
+    _current_user: Annotated[User, Depends(get_current_active_user)],
+) -> ProjectSyncResponse:
+    """与数据源目录增量同步样本."""
+    project = await get_project_by_id(db, project_id)
+    if not project:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="项目不存在")
+    return await sync_project_samples(db, project)
+
+
+@router.get("/{project_id}/ingest", response_model=ProjectIngestStatus)
+async def get_project_ingest_status_endpoint(
+    project_id: int,
+    db: Annotated[AsyncSession, Depends(get_db)],
+    _current_user: Annotated[User, Depends(get_current_active_user)],
+    skip: int = Query(0, ge=0),
+    limit: int = Query(50, ge=1, le=500),
+) -> ProjectIngestStatus:
+    """导入后处理（头文件校验、波段统计、缩略图、概览金字塔）进度."""
+    project = await get_project_by_id(db, project_id)
+    if not project:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="项目不存在")
+    return await get_project_ingest_status(db, project_id, skip=skip, limit=limit)
+
+
 @router.post(
     "/{project_id}/export",
     response_model=ProjectExportResponse,
@@ -236,3 +360,60 @@ async def export_project_annotations_endpoint(
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="项目不存在")
     payload = await export_project_annotations(db, project, options)
     return payload
+
+
+@router.post("/{project_id}/export/columnar")
+async def export_project_columnar_endpoint(
+    project_id: int,
+    db: Annotated[AsyncSession, Depends(get_db)],
+    _current_user: Annotated[User, Depends(get_current_active_user)],
+) -> FileResponse:
+    """列式导出（.npy 列 + manifest.json 的 tar 包，解包后可内存映射读取）."""
+    project = await get_project_by_id(db, project_id)
+    if not project:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="项目不存在")
+    archive = await build_columnar_export_archive(db, project)
+    return FileResponse(
+        archive,
+        media_type="application/x-tar",
+        filename=f"project_{project.project_id}_columnar.tar",
+        background=BackgroundTask(archive.unlink, missing_ok=True),
+    )
+
+
+@router.post("/{project_id}/export/stream")
+async def stream_project_export_endpoint(
+    project_id: int,
+    options: Annotated[ProjectExportOptions, Body(default_factory=ProjectExportOptions)],
+    session_factory: Annotated[
+        Callable[[], AbstractAsyncContextManager[AsyncSession]], Depends(get_session_factory)
+    ],
+    _current_user: Annotated[User, Depends(get_current_active_user)],
+) -> StreamingResponse:
+    """流式导出项目标注（NDJSON，每行一个样本）."""
+    # 响应体在端点返回后才被迭代，使用独立会话并在流结束时关闭，不依赖请求级会话的生命周期
+    stack = AsyncExitStack()
+    try:
+        db = await stack.enter_async_context(session_factory())
+        project = await get_project_by_id(db, project_id)
+        if not project:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="项目不存在")
+        lines = stream_project_export(db, project, options)
+        stack.push_async_callback(lines.aclose)
+        # 先取首行，使参数错误仍以正常的 HTTP 错误返回
+        header = await anext(lines)
+    except BaseException:
+        await stack.aclose()
+        raise
+
+    async def _body() -> AsyncIterator[bytes]:
+        async with stack:
+            yield header
+            async for chunk in lines:
+                yield chunk
+
+    return StreamingResponse(
+        _body(),
+        media_type="application/x-ndjson",
+        headers={"Content-Disposition": f'attachment; filename="project_{project.project_id}.ndjson"'},
+    )
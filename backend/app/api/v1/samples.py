@@ -3,7 +3,7 @@ from __future__ import annotations
 from pathlib import Path
 from typing import Annotated
 
-from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
 from fastapi.responses import FileResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
@@ -11,17 +11,39 @@ from app.api.deps import get_current_active_user, get_db
 from app.models.user import User
 from app.schemas.sample import (
     AnnotationSampleDetail,
+    BandLookupResponse,
+    BandRangeResponse,
+    EndmemberExtractionRequest,
+    EndmemberResult,
+    ResolvedModeChannels,
+    SampleAnnotationsPatch,
     SampleAnnotationsPayload,
+    SampleListQuery,
     SampleListResponse,
+    SampleQualityReport,
     SampleStatusUpdate,
+    SpectrumExtractionRequest,
+    SpectrumExtractionResponse,
 )
+from app.services.band_quality import get_quality_report
+from app.services.ingest_pipeline import get_thumbnail_png, render_overview_png
 from app.services.sample import (
     build_sample_asset_path,
     get_sample_detail,
+    get_sample_or_404,
     list_samples_for_project,
+    patch_annotations,
     replace_annotations,
     update_sample_status,
 )
+from app.services.spectral_mode import get_spectral_mode_by_id
+from app.services.spectrum import extract_sample_spectra
+from app.services.unmixing import extract_endmembers, render_abundance_png
+from app.services.wavelength import (
+    lookup_bands,
+    resolve_mode_channels,
+    select_band_range,
+)
 
 router = APIRouter()
 
@@ -34,9 +56,17 @@ async def list_project_samples_endpoint(
     project_id: int,
     db: Annotated[AsyncSession, Depends(get_db)],
     _current_user: Annotated[User, Depends(get_current_active_user)],
+    query: Annotated[SampleListQuery, Query()],
 ) -> SampleListResponse:
-    """项目下样本列表."""
-    return await list_samples_for_project(db, project_id)
+    """项目下样本列表（游标分页，可按状态、标注人及立方体元数据筛选）."""
+    return await list_samples_for_project(
+        db,
+        project_id,
+        query.filters(),
+        cursor=query.cursor,
+        limit=query.limit,
+        with_total=query.with_total,
+    )
 
 
 @router.get("/samples/{sample_id}", response_model=AnnotationSampleDetail)
@@ -71,6 +101,17 @@ async def replace_sample_annotations_endpoint(
     return await replace_annotations(db, sample_id, payload, user_id=current_user.id)
 
 
+@router.patch("/samples/{sample_id}/annotations", response_model=AnnotationSampleDetail)
+async def patch_sample_annotations_endpoint(
+    sample_id: int,
+    payload: SampleAnnotationsPatch,
+    db: Annotated[AsyncSession, Depends(get_db)],
+    current_user: Annotated[User, Depends(get_current_active_user)],
+) -> AnnotationSampleDetail:
+    """增量保存标注（按 detail_id 新增、更新、删除）."""
+    return await patch_annotations(db, sample_id, payload, user_id=current_user.id)
+
+
 @router.get("/samples/{sample_id}/assets")
 async def get_sample_asset_endpoint(
     sample_id: int,
@@ -86,3 +127,144 @@ async def get_sample_asset_endpoint(
         media_type="application/octet-stream",
         filename=Path(path).name,
     )
+
+
+@router.post("/samples/{sample_id}/endmembers", response_model=EndmemberResult)
+async def extract_sample_endmembers_endpoint(
+    sample_id: int,
+    params: EndmemberExtractionRequest,
+    db: Annotated[AsyncSession, Depends(get_db)],
+    _current_user: Annotated[User, Depends(get_current_active_user)],
+) -> EndmemberResult:
+    """提取端元并缓存丰度图."""
+    sample = await get_sample_or_404(db, sample_id)
+    return await extract_endmembers(sample.sample_id, sample.source_files, params)
+
+
+@router.get("/samples/{sample_id}/endmembers/{index}/abundance")
+async def render_sample_abundance_endpoint(
+    sample_id: int,
+    index: int,
+    db: Annotated[AsyncSession, Depends(get_db)],
+    _current_user: Annotated[User, Depends(get_current_active_user)],
+    n_endmembers: int = Query(5, ge=2, le=32),
+    subsample: int = Query(20000, ge=100, le=1_000_000),
+    seed: int = Query(0, ge=0),
+    wavelength_min: float | None = Query(default=None, ge=0),
+    wavelength_max: float | None = Query(default=None, ge=0),
+) -> Response:
+    """渲染端元丰度图 (PNG)."""
+    sample = await get_sample_or_404(db, sample_id)
+    params = EndmemberExtractionRequest(
+        n_endmembers=n_endmembers,
+        subsample=subsample,
+        seed=seed,
+        wavelength_min=wavelength_min,
+        wavelength_max=wavelength_max,
+    )
+    content = await render_abundance_png(sample.sample_id, sample.source_files, params, index)
+    return Response(content=content, media_type="image/png")
+
+
+@router.get("/samples/{sample_id}/quality", response_model=SampleQualityReport)
+async def get_sample_quality_endpoint(
+    sample_id: int,
+    db: Annotated[AsyncSession, Depends(get_db)],
+    _current_user: Annotated[User, Depends(get_current_active_user)],
+) -> SampleQualityReport:
+    """坏波段与坏像元列扫描结果."""
+    sample = await get_sample_or_404(db, sample_id)
+    return get_quality_report(sample.sample_id, sample.sample_type)
+
+
+@router.get("/samples/{sample_id}/thumbnail")
+async def get_sample_thumbnail_endpoint(
+    sample_id: int,
+    db: Annotated[AsyncSession, Depends(get_db)],
+    _current_user: Annotated[User, Depends(get_current_active_user)],
+) -> Response:
+    """样本缩略图；后处理未完成时即时渲染（X-Derivative: live）."""
+    sample = await get_sample_or_404(db, sample_id)
+    if sample.sample_type != "hyperspectral":
+        return FileResponse(build_sample_asset_path(sample, sample.source_files[0]))
+    content, cached = await get_thumbnail_png(sample.sample_id, sample.source_files)
+    return Response(
+        content=content,
+        media_type="image/png",
+        headers={"X-Derivative": "cached" if cached else "live"},
+    )
+
+
+@router.get("/samples/{sample_id}/overview")
+async def render_sample_overview_endpoint(
+    sample_id: int,
+    db: Annotated[AsyncSession, Depends(get_db)],
+    _current_user: Annotated[User, Depends(get_current_active_user)],
+    band: int = Query(0, ge=0),
+    level: int = Query(1, ge=1, le=16),
+) -> Response:
+    """概览金字塔单波段图 (PNG)；金字塔未就绪时按步长从原立方体抽取."""
+    sample = await get_sample_or_404(db, sample_id)
+    if sample.sample_type != "hyperspectral":
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="样本不是高光谱数据")
+    content, cached = await render_overview_png(sample.sample_id, sample.source_files, level, band)
+    return Response(
+        content=content,
+        media_type="image/png",
+        headers={"X-Derivative": "cached" if cached else "live"},
+    )
+
+
+@router.get("/samples/{sample_id}/bands/lookup", response_model=BandLookupResponse)
+async def lookup_sample_bands_endpoint(
+    sample_id: int,
+    db: Annotated[AsyncSession, Depends(get_db)],
+    _current_user: Annotated[User, Depends(get_current_active_user)],
+    wavelength: Annotated[list[float], Query(description="目标波长 (nm)")],
+) -> BandLookupResponse:
+    """按波长查找最近波段."""
+    sample = await get_sample_or_404(db, sample_id)
+    return lookup_bands(sample, wavelength)
+
+
+@router.get("/samples/{sample_id}/bands/range", response_model=BandRangeResponse)
+async def select_sample_band_range_endpoint(
+    sample_id: int,
+    db: Annotated[AsyncSession, Depends(get_db)],
+    _current_user: Annotated[User, Depends(get_current_active_user)],
+    wavelength_min: float | None = Query(default=None, ge=0),
+    wavelength_max: float | None = Query(default=None, ge=0),
+) -> BandRangeResponse:
+    """截取波长范围内的波段."""
+    sample = await get_sample_or_404(db, sample_id)
+    return select_band_range(sample, wavelength_min, wavelength_max)
+
+
+@router.get(
+    "/samples/{sample_id}/spectral-modes/{mode_id}/channels",
+    response_model=ResolvedModeChannels,
+)
+async def resolve_sample_mode_channels_endpoint(
+    sample_id: int,
+    mode_id: int,
+    db: Annotated[AsyncSession, Depends(get_db)],
+    _current_user: Annotated[User, Depends(get_current_active_user)],
+) -> ResolvedModeChannels:
+    """把显示模式解析为该样本的波段号."""
+    sample = await get_sample_or_404(db, sample_id)
+    mode = await get_spectral_mode_by_id(db, mode_id)
+    if not mode:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="模式不存在")
+    return resolve_mode_channels(sample, mode)
+
+
+@router.post("/samples/{sample_id}/spectra/extract", response_model=SpectrumExtractionResponse)
+async def extract_sample_spectra_endpoint(
+    sample_id: int,
+    payload: SpectrumExtractionRequest,
+    db: Annotated[AsyncSession, Depends(get_db)],
+    _current_user: Annotated[User, Depends(get_current_active_user)],
+) -> SpectrumExtractionResponse:
+    """提取像元光谱."""
+    sample = await get_sample_or_404(db, sample_id)
+    return await extract_sample_spectra(db, sample, payload)
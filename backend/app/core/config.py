@@ -21,6 +21,29 @@ class Settings(BaseSettings):
     jwt_algorithm: str = "HS256"
     jwt_access_token_expire_minutes: int = 30
 
+    # Background processing
+    background_workers: int = 2
+    # 导入后处理阶段（按顺序执行）
+    ingest_stages: list[str] = ["header", "band_stats", "thumbnail", "overview"]
+
+    # Data source index
+    data_source_index_ttl: float = 5.0
+    scan_workers: int = 8
+
+    # Export
+    # 流式导出每批加载的样本数（决定导出时的内存上限）
+    export_batch_size: int = 200
+    # 删除墓碑保留天数；早于保留期的 since 需要全量导出
+    tombstone_retention_days: int = 90
+
+    # Uploads
+    upload_concurrency: int = 4
+    # 断点续传会话超过该时长无写入即视为放弃，暂存文件被清理
+    upload_session_ttl_hours: float = 24.0
+    # 压缩包解压上限（成员数与解压后总字节数），防止压缩炸弹写满磁盘
+    archive_max_members: int = 200_000
+    archive_max_bytes: int = 64 * 1024**3
+
     # Sentry
     sentry_dsn: str | None = None
 
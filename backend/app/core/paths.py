@@ -0,0 +1,11 @@
+"""Filesystem locations for uploaded and derived data."""
+
+from pathlib import Path
+
+UPLOAD_ROOT = Path(__file__).parent.parent.parent / "uploads"
+DATA_SOURCE_ROOT = UPLOAD_ROOT / "datasource"
+DERIVED_ROOT = UPLOAD_ROOT / "derived"
+STAGING_ROOT = UPLOAD_ROOT / ".staging"
+BLOB_ROOT = UPLOAD_ROOT / "blobs"
+INGEST_QUEUE_ROOT = UPLOAD_ROOT / ".cache" / "ingest_queue"
+EXPORT_ROOT = UPLOAD_ROOT / ".cache" / "exports"
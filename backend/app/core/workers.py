@@ -0,0 +1,33 @@
+"""Thread pool for CPU/IO heavy background work (cube scans, derivatives)."""
+
+from collections.abc import Callable
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any
+
+from app.core.config import settings
+from app.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+background_executor = ThreadPoolExecutor(
+    max_workers=max(1, settings.background_workers),
+    thread_name_prefix="background",
+)
+
+
+def _log_failure(future: Future) -> None:
+    exc = future.exception()
+    if exc is not None:
+        logger.error("background task failed", error=repr(exc))
+
+
+def submit_background(fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Future:
+    """Submit a job to the background pool; failures are logged, never raised."""
+    future = background_executor.submit(fn, *args, **kwargs)
+    future.add_done_callback(_log_failure)
+    return future
+
+
+def shutdown_background() -> None:
+    """Stop accepting work and drop queued jobs (used on application shutdown)."""
+    background_executor.shutdown(wait=False, cancel_futures=True)
@@ -8,6 +8,10 @@ from fastapi.middleware.cors import CORSMiddleware
 from app.api.v1.router import api_router
 from app.core.config import settings
 from app.core.logging import setup_logging
+from app.core.workers import shutdown_background
+from app.services.blob_store import schedule_orphan_collection
+from app.services.ingest_pipeline import resume_ingest_queue
+from app.services.resumable_upload import schedule_session_cleanup
 
 
 @asynccontextmanager
@@ -22,10 +26,17 @@ async def lifespan(app: FastAPI) -> AsyncIterator[None]:
             traces_sample_rate=1.0 if settings.debug else 0.1,
         )
 
+    # Resume post-ingest pipelines interrupted by the last shutdown
+    resume_ingest_queue()
+    # Drop resumable upload sessions abandoned past their TTL
+    schedule_session_cleanup()
+    # Reclaim blobs no longer linked from any data source
+    schedule_orphan_collection()
+
     yield
 
     # Shutdown
-    pass
+    shutdown_background()
 
 
 app = FastAPI(
@@ -2,11 +2,13 @@ from app.models.annotation_detail import AnnotationDetail
 from app.models.annotation_detail_mode import AnnotationDetailMode
 from app.models.annotation_sample import AnnotationSample
 from app.models.annotation_spectrum import AnnotationSpectrum
+from app.models.annotation_tombstone import AnnotationTombstone
 from app.models.base import Base
 from app.models.display_algorithm import DisplayAlgorithm
 from app.models.label_group import LabelCategory, LabelGroup
 from app.models.project import AnnotationProject
 from app.models.spectral_mode import SpectralDisplayMode
+from app.models.spectrum_axis import SpectrumAxis
 from app.models.todo import Todo
 from app.models.user import User
 
@@ -16,11 +18,13 @@ __all__ = [
     "AnnotationProject",
     "AnnotationSample",
     "AnnotationSpectrum",
+    "AnnotationTombstone",
     "Base",
     "DisplayAlgorithm",
     "LabelCategory",
     "LabelGroup",
     "SpectralDisplayMode",
+    "SpectrumAxis",
     "Todo",
     "User",
 ]
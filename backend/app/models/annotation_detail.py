@@ -3,7 +3,7 @@ from __future__ import annotations
 from typing import TYPE_CHECKING
 from uuid import uuid4
 
-from sqlalchemy import Float, ForeignKey, String, Text, JSON
+from sqlalchemy import JSON, BigInteger, Float, ForeignKey, Index, String, Text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.models.base import Base, TimestampMixin
@@ -18,6 +18,7 @@ class AnnotationDetail(Base, TimestampMixin):
     """单条标注细节."""
 
     __tablename__ = "annotation_details"
+    __table_args__ = (Index("ix_annotation_details_sample_id_id", "sample_id", "id"),)
 
     id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
     detail_id: Mapped[str] = mapped_column(
@@ -37,18 +38,18 @@ class AnnotationDetail(Base, TimestampMixin):
     area: Mapped[float | None] = mapped_column(Float, nullable=True)
     confidence: Mapped[float | None] = mapped_column(Float, nullable=True)
     remark: Mapped[str | None] = mapped_column(Text, nullable=True)
+    mode_id: Mapped[int | None] = mapped_column(
+        ForeignKey("annotation_detail_modes.id", ondelete="RESTRICT"),
+        nullable=True,
+    )
+    # 最近一次写入所分配的项目变更版本
+    change_version: Mapped[int] = mapped_column(BigInteger, default=0, server_default="0")
 
     sample: Mapped["AnnotationSample"] = relationship(
         "AnnotationSample",
         back_populates="details",
     )
-    mode_snapshot: Mapped["AnnotationDetailMode | None"] = relationship(
-        "AnnotationDetailMode",
-        back_populates="detail",
-        cascade="all, delete-orphan",
-        passive_deletes=True,
-        uselist=False,
-    )
+    mode_snapshot: Mapped["AnnotationDetailMode | None"] = relationship("AnnotationDetailMode")
     spectra: Mapped[list["AnnotationSpectrum"]] = relationship(
         "AnnotationSpectrum",
         back_populates="detail",
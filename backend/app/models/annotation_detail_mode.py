@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from sqlalchemy import Boolean, Float, ForeignKey, Integer
+from sqlalchemy import Boolean, Float, ForeignKey, Index, Integer, String
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.models.base import Base, TimestampMixin
@@ -8,15 +8,13 @@ from app.models.display_algorithm import DisplayAlgorithm
 
 
 class AnnotationDetailMode(Base, TimestampMixin):
-    """标注时的显示模式快照."""
+    """标注时的显示模式快照（按内容哈希去重，多条标注共享）."""
 
     __tablename__ = "annotation_detail_modes"
+    __table_args__ = (Index("ix_annotation_detail_modes_content_hash", "content_hash", unique=True),)
 
     id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
-    detail_id: Mapped[int] = mapped_column(
-        ForeignKey("annotation_details.id", ondelete="CASCADE"),
-        nullable=False,
-    )
+    content_hash: Mapped[str] = mapped_column(String(64), nullable=False)
     r_channel: Mapped[int] = mapped_column(Integer)
     g_channel: Mapped[int] = mapped_column(Integer)
     b_channel: Mapped[int] = mapped_column(Integer)
@@ -30,10 +28,6 @@ class AnnotationDetailMode(Base, TimestampMixin):
     dark_calibration: Mapped[bool] = mapped_column(Boolean, default=False)
     white_calibration: Mapped[bool] = mapped_column(Boolean, default=False)
 
-    detail = relationship(
-        "AnnotationDetail",
-        back_populates="mode_snapshot",
-    )
     algorithm = relationship("DisplayAlgorithm", lazy="joined")
 
     @property
@@ -3,7 +3,17 @@ from __future__ import annotations
 from typing import TYPE_CHECKING
 from uuid import uuid4
 
-from sqlalchemy import JSON, Boolean, ForeignKey, Integer, String
+from sqlalchemy import (
+    JSON,
+    BigInteger,
+    Boolean,
+    Float,
+    ForeignKey,
+    Index,
+    Integer,
+    String,
+    Text,
+)
 from sqlalchemy.orm import Mapped, backref, mapped_column, relationship
 
 from app.models.base import Base, TimestampMixin
@@ -12,10 +22,36 @@ if TYPE_CHECKING:
     from app.models.annotation_detail import AnnotationDetail
 
 
+CUBE_METADATA_COLUMNS = (
+    "cube_samples",
+    "cube_lines",
+    "cube_bands",
+    "data_type",
+    "interleave",
+    "wavelength_min",
+    "wavelength_max",
+    "file_size",
+    "has_dark",
+    "has_white",
+)
+
+
 class AnnotationSample(Base, TimestampMixin):
     """标注样本（标注模型）."""
 
     __tablename__ = "annotation_samples"
+    __table_args__ = (
+        Index("ix_annotation_samples_project_id_id", "project_id", "id"),
+        Index("ix_annotation_samples_project_status_annotated", "project_id", "status", "is_annotated"),
+        Index("ix_annotation_samples_project_annotator", "project_id", "last_annotated_by", "id"),
+        Index("ix_annotation_samples_project_bands", "project_id", "cube_bands"),
+        Index("ix_annotation_samples_project_size", "project_id", "cube_lines", "cube_samples"),
+        Index("ix_annotation_samples_project_file_size", "project_id", "file_size"),
+        # 增量导出：WHERE project_id = ? AND change_version > ?
+        Index("ix_annotation_samples_project_version", "project_id", "change_version"),
+        # 导入进度：按状态聚合，并只回写未完成的样本
+        Index("ix_annotation_samples_project_ingest", "project_id", "ingest_status", "id"),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
     project_id: Mapped[int] = mapped_column(
@@ -29,12 +65,38 @@ class AnnotationSample(Base, TimestampMixin):
     )
     sample_type: Mapped[str] = mapped_column(String(32))  # image / hyperspectral
     source_files: Mapped[list[str]] = mapped_column(JSON, default=list)
-    status: Mapped[str] = mapped_column(String(20), default="valid")
+    status: Mapped[str] = mapped_column(String(20), default="valid")  # valid / ignored / missing
+    # 同步标记为 missing 前的状态，文件恢复时还原
+    status_before_missing: Mapped[str | None] = mapped_column(String(20), nullable=True)
     is_annotated: Mapped[bool] = mapped_column(Boolean, default=False)
     last_annotated_by: Mapped[int | None] = mapped_column(
         ForeignKey("users.id", ondelete="SET NULL"),
         nullable=True,
     )
+    wavelengths: Mapped[list[float] | None] = mapped_column(JSON, nullable=True)
+    fwhm: Mapped[list[float] | None] = mapped_column(JSON, nullable=True)
+    # {相对路径: [size, mtime_ns]}
+    file_fingerprints: Mapped[dict[str, list[int]] | None] = mapped_column(JSON, nullable=True)
+    # 导入时解析的立方体元数据（图像样本只有 file_size）
+    cube_samples: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    cube_lines: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    cube_bands: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    data_type: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    interleave: Mapped[str | None] = mapped_column(String(8), nullable=True)
+    wavelength_min: Mapped[float | None] = mapped_column(Float, nullable=True)
+    wavelength_max: Mapped[float | None] = mapped_column(Float, nullable=True)
+    file_size: Mapped[int | None] = mapped_column(BigInteger, nullable=True)
+    has_dark: Mapped[bool] = mapped_column(Boolean, default=False)
+    has_white: Mapped[bool] = mapped_column(Boolean, default=False)
+    # 导入后处理状态（仅高光谱样本）：pending / running / completed / failed，
+    # 轮询 /ingest 时从 pipeline.json 回写，其余字段为对应的摘要
+    ingest_status: Mapped[str | None] = mapped_column(String(20), nullable=True)
+    ingest_progress: Mapped[float] = mapped_column(Float, default=0.0)
+    ingest_stage: Mapped[str | None] = mapped_column(String(32), nullable=True)
+    ingest_error: Mapped[str | None] = mapped_column(Text, nullable=True)
+    ingest_stages: Mapped[list[dict] | None] = mapped_column(JSON, nullable=True)
+    # 最近一次影响导出内容的写入所分配的项目变更版本
+    change_version: Mapped[int] = mapped_column(BigInteger, default=0, server_default="0")
 
     project = relationship(
         "AnnotationProject",
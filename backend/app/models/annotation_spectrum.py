@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from sqlalchemy import Float, ForeignKey, JSON
+from sqlalchemy import ForeignKey, Index, JSON, LargeBinary
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.models.base import Base, TimestampMixin
@@ -10,6 +10,7 @@ class AnnotationSpectrum(Base, TimestampMixin):
     """光谱曲线数据."""
 
     __tablename__ = "annotation_spectra"
+    __table_args__ = (Index("ix_annotation_spectra_detail_id", "detail_id"),)
 
     id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
     detail_id: Mapped[int] = mapped_column(
@@ -17,9 +18,15 @@ class AnnotationSpectrum(Base, TimestampMixin):
         nullable=False,
     )
     position: Mapped[dict | None] = mapped_column(JSON, nullable=True)
-    points: Mapped[list[dict]] = mapped_column(JSON)
+    # float32 强度数组；波长轴按内容去重存放在 spectrum_axes（不随样本重新扫描变化）
+    values: Mapped[bytes] = mapped_column(LargeBinary)
+    axis_id: Mapped[int] = mapped_column(
+        ForeignKey("spectrum_axes.id", ondelete="RESTRICT"),
+        nullable=False,
+    )
 
     detail = relationship(
         "AnnotationDetail",
         back_populates="spectra",
     )
+    axis = relationship("SpectrumAxis")
@@ -0,0 +1,35 @@
+from __future__ import annotations
+
+from datetime import datetime
+
+from sqlalchemy import BigInteger, DateTime, ForeignKey, Index, String, func
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.models.base import Base
+
+
+class AnnotationTombstone(Base):
+    """已删除标注的记录，供增量导出下发删除."""
+
+    __tablename__ = "annotation_tombstones"
+    __table_args__ = (
+        # 增量导出：WHERE project_id = ? AND change_version > ?
+        Index("ix_annotation_tombstones_project_version", "project_id", "change_version"),
+        # 过期清理：WHERE project_id = ? AND deleted_at < ?
+        Index("ix_annotation_tombstones_project_deleted_at", "project_id", "deleted_at"),
+    )
+
+    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
+    project_id: Mapped[int] = mapped_column(
+        ForeignKey("annotation_projects.id", ondelete="CASCADE"),
+        nullable=False,
+    )
+    sample_id: Mapped[str] = mapped_column(String(64), nullable=False)
+    detail_id: Mapped[str] = mapped_column(String(64), nullable=False)
+    # 删除时分配的项目变更版本
+    change_version: Mapped[int] = mapped_column(BigInteger, nullable=False)
+    deleted_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        nullable=False,
+    )
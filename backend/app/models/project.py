@@ -3,7 +3,16 @@ from __future__ import annotations
 from typing import TYPE_CHECKING
 from uuid import uuid4
 
-from sqlalchemy import Boolean, Float, ForeignKey, Integer, String
+from sqlalchemy import (
+    JSON,
+    BigInteger,
+    Boolean,
+    Float,
+    ForeignKey,
+    Index,
+    Integer,
+    String,
+)
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.models.base import Base, TimestampMixin
@@ -16,6 +25,10 @@ class AnnotationProject(Base, TimestampMixin):
     """标注项目模型."""
 
     __tablename__ = "annotation_projects"
+    __table_args__ = (
+        Index("ix_annotation_projects_created_at", "created_at"),
+        Index("ix_annotation_projects_archived_created_at", "is_archived", "created_at"),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
     project_id: Mapped[str] = mapped_column(
@@ -29,6 +42,14 @@ class AnnotationProject(Base, TimestampMixin):
     available_samples: Mapped[int] = mapped_column(Integer, default=0)
     total_samples: Mapped[int] = mapped_column(Integer, default=0)
     is_archived: Mapped[bool] = mapped_column(Boolean, default=False)
+    # 项目统一的波长网格（用于跨传感器比较光谱）
+    wavelength_grid: Mapped[list[float] | None] = mapped_column(JSON, nullable=True)
+    # 创建项目时使用的数据源目录（同步时重新扫描）
+    data_source_folder: Mapped[str | None] = mapped_column(String(255), nullable=True)
+    # 增量导出的变更版本：每次写入在项目行锁内加一，版本顺序即提交顺序
+    change_version: Mapped[int] = mapped_column(BigInteger, default=0, server_default="0")
+    # 已清理墓碑的最大版本；更早的 since 无法得到完整的删除记录
+    tombstone_floor: Mapped[int] = mapped_column(BigInteger, default=0, server_default="0")
     created_by: Mapped[int] = mapped_column(
         ForeignKey("users.id", ondelete="SET NULL"),
         nullable=True,
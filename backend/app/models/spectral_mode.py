@@ -25,6 +25,10 @@ class SpectralDisplayMode(Base, TimestampMixin):
     r_channel: Mapped[int] = mapped_column(Integer)
     g_channel: Mapped[int] = mapped_column(Integer)
     b_channel: Mapped[int] = mapped_column(Integer)
+    # 按波长定义的通道（跨传感器时优先使用）
+    r_wavelength: Mapped[float | None] = mapped_column(Float, nullable=True)
+    g_wavelength: Mapped[float | None] = mapped_column(Float, nullable=True)
+    b_wavelength: Mapped[float | None] = mapped_column(Float, nullable=True)
     r_gain: Mapped[float] = mapped_column(Float, default=1.0)
     g_gain: Mapped[float] = mapped_column(Float, default=1.0)
     b_gain: Mapped[float] = mapped_column(Float, default=1.0)
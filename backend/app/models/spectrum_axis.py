@@ -0,0 +1,17 @@
+from __future__ import annotations
+
+from sqlalchemy import Index, LargeBinary, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.models.base import Base, TimestampMixin
+
+
+class SpectrumAxis(Base, TimestampMixin):
+    """光谱波长轴（float64 数组，按内容哈希去重，写入后不再修改）."""
+
+    __tablename__ = "spectrum_axes"
+    __table_args__ = (Index("ix_spectrum_axes_content_hash", "content_hash", unique=True),)
+
+    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
+    content_hash: Mapped[str] = mapped_column(String(64), nullable=False)
+    wavelengths: Mapped[bytes] = mapped_column(LargeBinary, nullable=False)
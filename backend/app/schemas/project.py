@@ -1,7 +1,27 @@
 from datetime import datetime
+from itertools import pairwise
 from typing import Literal
 
-from pydantic import BaseModel, ConfigDict, Field
+from pydantic import BaseModel, ConfigDict, Field, field_validator
+
+from app.schemas.sample import SpectralTransform
+
+MAX_GRID_SIZE = 10000
+
+
+def validate_wavelength_grid(grid: list[float] | None) -> list[float] | None:
+    """验证项目波长网格"""
+    if grid is None:
+        return grid
+    if not grid:
+        raise ValueError("波长网格不能为空")
+    if len(grid) > MAX_GRID_SIZE:
+        raise ValueError(f"波长网格不能超过 {MAX_GRID_SIZE} 个波段")
+    if any(value <= 0 for value in grid):
+        raise ValueError("波长必须为正数")
+    if any(later <= earlier for earlier, later in pairwise(grid)):
+        raise ValueError("波长网格必须严格递增")
+    return grid
 
 
 class ProjectBase(BaseModel):
@@ -12,6 +32,12 @@ class ProjectBase(BaseModel):
     completion_rate: float = Field(ge=0, le=100, default=0)
     available_samples: int = Field(ge=0, default=0)
     total_samples: int = Field(ge=0, default=0)
+    wavelength_grid: list[float] | None = None
+
+    @field_validator("wavelength_grid")
+    @classmethod
+    def grid_is_increasing(cls, v: list[float] | None) -> list[float] | None:
+        return validate_wavelength_grid(v)
 
 
 class ProjectCreate(ProjectBase):
@@ -28,6 +54,12 @@ class ProjectUpdate(BaseModel):
     completion_rate: float | None = Field(default=None, ge=0, le=100)
     available_samples: int | None = Field(default=None, ge=0)
     total_samples: int | None = Field(default=None, ge=0)
+    wavelength_grid: list[float] | None = None
+
+    @field_validator("wavelength_grid")
+    @classmethod
+    def grid_is_increasing(cls, v: list[float] | None) -> list[float] | None:
+        return validate_wavelength_grid(v)
 
 
 class ProjectResponse(ProjectBase):
@@ -42,6 +74,7 @@ class ProjectResponse(ProjectBase):
     created_by: int | None
     updated_by: int | None
     is_archived: bool
+    data_source_folder: str | None = None
 
 
 class ProjectListResponse(BaseModel):
@@ -54,6 +87,51 @@ class ProjectListResponse(BaseModel):
     total_pages: int
 
 
+class ProjectSyncResponse(BaseModel):
+    """数据源同步结果."""
+
+    added: int
+    missing: int
+    restored: int
+    changed: int
+    unchanged: int
+    total_samples: int
+
+
+class IngestStageStatus(BaseModel):
+    """单个后处理阶段的状态."""
+
+    name: str
+    status: Literal["pending", "completed", "failed"]
+    error: str | None = None
+
+
+class SampleIngestStatus(BaseModel):
+    """样本的导入后处理进度."""
+
+    id: int
+    sample_id: str
+    status: Literal["pending", "running", "completed", "failed"]
+    progress: float
+    current_stage: str | None = None
+    error: str | None = None
+    stages: list[IngestStageStatus] = Field(default_factory=list)
+
+
+class ProjectIngestStatus(BaseModel):
+    """项目内高光谱样本的后处理汇总."""
+
+    project_id: int
+    stages: list[str]
+    total: int
+    pending: int
+    running: int
+    completed: int
+    failed: int
+    progress: float
+    items: list[SampleIngestStatus] = Field(default_factory=list)
+
+
 class DataSourceInfo(BaseModel):
     """数据源目录."""
 
@@ -67,6 +145,41 @@ class DataSourceUploadResponse(BaseModel):
 
     name: str
     total_files: int
+    deduplicated_files: int = 0
+    deduplicated_bytes: int = 0
+
+
+class UploadSessionFile(BaseModel):
+    """断点续传会话中的单个文件."""
+
+    path: str = Field(..., min_length=1, max_length=1024)
+    size: int = Field(..., ge=0)
+
+
+class UploadSessionCreate(BaseModel):
+    """创建断点续传会话."""
+
+    folder_name: str = Field(..., min_length=1, max_length=255)
+    files: list[UploadSessionFile] = Field(..., min_length=1)
+
+
+class UploadSessionFileStatus(BaseModel):
+    """文件接收进度（received 为已接收的 [start, end) 区间）."""
+
+    index: int
+    path: str
+    size: int
+    received: list[list[int]] = Field(default_factory=list)
+    complete: bool
+
+
+class UploadSessionResponse(BaseModel):
+    """断点续传会话状态."""
+
+    session_id: str
+    folder_name: str
+    files: list[UploadSessionFileStatus]
+    complete: bool
 
 
 class ProjectExportOptions(BaseModel):
@@ -75,6 +188,11 @@ class ProjectExportOptions(BaseModel):
     include_project_meta: bool = True
     include_sample_meta: bool = True
     include_annotation_bundle: bool = True
+    resample_to_project_grid: bool = False
+    resample_method: Literal["linear", "gaussian"] = "linear"
+    spectral_transforms: list[SpectralTransform] = Field(default_factory=list, max_length=8)
+    # 增量导出：只含该变更版本之后变化的样本与标注，并附带删除墓碑（传上次导出返回的 version）
+    since: int | None = Field(default=None, ge=0)
 
 
 class ProjectExportIncludedSections(BaseModel):
@@ -174,10 +292,23 @@ class ProjectExportSampleBlock(BaseModel):
     annotations: list[ProjectExportAnnotationRecord] | None = None
 
 
+class ProjectExportTombstone(BaseModel):
+    """增量导出中的已删除标注."""
+
+    sample_id: str
+    detail_id: str
+    change_version: int
+    deleted_at: datetime
+
+
 class ProjectExportResponse(BaseModel):
     """导出返回."""
 
     project: ProjectExportProjectMeta
     included_sections: ProjectExportIncludedSections
     generated_at: datetime
+    # 导出时的项目变更版本，作为下一次增量导出的 since
+    version: int
+    since: int | None = None
     samples: list[ProjectExportSampleBlock] = Field(default_factory=list)
+    tombstones: list[ProjectExportTombstone] = Field(default_factory=list)
@@ -3,7 +3,16 @@ from __future__ import annotations
 from datetime import datetime
 from typing import Literal
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field, model_validator
+
+
+class SpectrumPoint(BaseModel):
+    """光谱曲线上的一个点（intensity 为 null 表示该波段无有效值）."""
+
+    model_config = ConfigDict(extra="forbid")
+
+    wavelength: float
+    intensity: float | None
 
 
 class AnnotationSpectrumResponse(BaseModel):
@@ -73,12 +82,14 @@ class AnnotationSpectrumCreate(BaseModel):
     """创建光谱记录."""
 
     position: dict | None = None
-    points: list[dict] = Field(default_factory=list)
+    points: list[SpectrumPoint] = Field(default_factory=list)
 
 
 class AnnotationDetailCreate(BaseModel):
     """创建/更新标注详情."""
 
+    # 整体保存时携带已有的 detail_id 则原地更新该标注（ID 保持不变），省略则新建
+    detail_id: str | None = None
     label_name: str
     color: str
     tool_type: Literal["rect", "polygon", "point", "circle", "line", "grid"]
@@ -104,6 +115,16 @@ class AnnotationSampleBase(BaseModel):
     source_files: list[str]
     created_at: datetime
     updated_at: datetime
+    cube_samples: int | None = None
+    cube_lines: int | None = None
+    cube_bands: int | None = None
+    data_type: int | None = None
+    interleave: str | None = None
+    wavelength_min: float | None = None
+    wavelength_max: float | None = None
+    file_size: int | None = None
+    has_dark: bool = False
+    has_white: bool = False
 
 
 class AnnotationSampleSummary(AnnotationSampleBase):
@@ -115,18 +136,104 @@ class AnnotationSampleSummary(AnnotationSampleBase):
 class AnnotationSampleDetail(AnnotationSampleBase):
     """样本详情."""
 
+    wavelengths: list[float] | None = None
+    fwhm: list[float] | None = None
     annotations: list[AnnotationDetailResponse] = Field(default_factory=list)
 
 
+class SampleListFilters(BaseModel):
+    """样本列表筛选（状态、标注人与入库时保存的立方体元数据）."""
+
+    status: Literal["valid", "ignored", "missing"] | None = None
+    is_annotated: bool | None = None
+    sample_type: Literal["image", "hyperspectral"] | None = None
+    last_annotated_by: int | None = None
+    min_bands: int | None = Field(default=None, ge=1)
+    max_bands: int | None = Field(default=None, ge=1)
+    min_lines: int | None = Field(default=None, ge=1)
+    max_lines: int | None = Field(default=None, ge=1)
+    min_samples: int | None = Field(default=None, ge=1)
+    max_samples: int | None = Field(default=None, ge=1)
+    min_file_size: int | None = Field(default=None, ge=0)
+    max_file_size: int | None = Field(default=None, ge=0)
+    interleave: Literal["bil", "bsq", "bip"] | None = None
+    data_type: int | None = None
+    wavelength_min: float | None = Field(default=None, ge=0, description="波长覆盖下限 (nm)")
+    wavelength_max: float | None = Field(default=None, ge=0, description="波长覆盖上限 (nm)")
+    has_dark: bool | None = None
+    has_white: bool | None = None
+
+
+# 样本列表默认每页数量
+SAMPLE_PAGE_SIZE = 200
+
+
+class SampleListQuery(SampleListFilters):
+    """样本列表查询参数（筛选 + 按 id 的游标分页）."""
+
+    cursor: int | None = Field(default=None, ge=0, description="上一页返回的 next_cursor")
+    limit: int = Field(default=SAMPLE_PAGE_SIZE, ge=1, le=1000, description="每页数量")
+    with_total: bool = Field(default=False, description="分页时同时返回（估算的）总数")
+
+    def filters(self) -> SampleListFilters:
+        return SampleListFilters.model_validate(self.model_dump(include=set(SampleListFilters.model_fields)))
+
+
 class SampleListResponse(BaseModel):
-    """样本列表."""
+    """样本列表（按 id 的游标分页）."""
 
     items: list[AnnotationSampleSummary]
-    total: int
+    total: int | None = None
+    total_estimated: bool = False
+    next_cursor: int | None = None
+
+
+class AnnotationDetailPatch(BaseModel):
+    """按 detail_id 局部更新一条标注；只修改请求中出现的字段.
+
+    mode_snapshot / spectra 出现时整体替换（mode_snapshot 为 null 表示删除快照）。
+    """
+
+    detail_id: str
+    label_name: str | None = None
+    color: str | None = None
+    tool_type: Literal["rect", "polygon", "point", "circle", "line", "grid"] | None = None
+    coordinates: dict | None = None
+    radius: float | None = None
+    area: float | None = None
+    confidence: float | None = None
+    remark: str | None = None
+    mode_snapshot: AnnotationDetailModeCreate | None = None
+    spectra: list[AnnotationSpectrumCreate] | None = None
+
+    @model_validator(mode="after")
+    def check_required_fields(self) -> AnnotationDetailPatch:
+        for name in ("label_name", "color", "tool_type", "coordinates"):
+            if name in self.model_fields_set and getattr(self, name) is None:
+                raise ValueError(f"{name} cannot be null")
+        return self
+
+
+class SampleAnnotationsPatch(BaseModel):
+    """增量保存标注：新增、更新与删除."""
+
+    add: list[AnnotationDetailCreate] = Field(default_factory=list)
+    update: list[AnnotationDetailPatch] = Field(default_factory=list)
+    delete: list[str] = Field(default_factory=list, description="要删除的 detail_id")
+    mark_annotated: bool = True
+
+    @model_validator(mode="after")
+    def check_add_without_ids(self) -> SampleAnnotationsPatch:
+        if any(item.detail_id is not None for item in self.add):
+            raise ValueError("added annotations cannot carry detail_id")
+        return self
 
 
 class SampleStatusUpdate(BaseModel):
-    """样本状态更新."""
+    """样本状态更新.
+
+    missing 由数据源同步维护，不能手动设置；样本缺失期间设置的状态在文件恢复后生效。
+    """
 
     status: Literal["valid", "ignored"]
     is_annotated: bool | None = None
@@ -137,3 +244,126 @@ class SampleAnnotationsPayload(BaseModel):
 
     annotations: list[AnnotationDetailCreate] = Field(default_factory=list)
     mark_annotated: bool = True
+
+
+class EndmemberExtractionRequest(BaseModel):
+    """端元提取参数."""
+
+    n_endmembers: int = Field(default=5, ge=2, le=32)
+    subsample: int = Field(default=20000, ge=100, le=1_000_000)
+    seed: int = Field(default=0, ge=0)
+    wavelength_min: float | None = Field(default=None, ge=0)
+    wavelength_max: float | None = Field(default=None, ge=0)
+
+
+class EndmemberResult(BaseModel):
+    """端元提取结果."""
+
+    sample_id: str
+    n_endmembers: int
+    subsample: int
+    seed: int
+    bands: list[int]
+    endmembers: list[list[float]]
+    pixels: list[list[int]]
+    wavelengths: list[float] | None = None
+
+
+class BandQualityFlags(BaseModel):
+    """坏波段分类."""
+
+    constant: list[int] = Field(default_factory=list)
+    low_snr: list[int] = Field(default_factory=list)
+    saturated: list[int] = Field(default_factory=list)
+
+
+class BandPercentiles(BaseModel):
+    """排除饱和像元后的波段百分位."""
+
+    p2: list[float | None] = Field(default_factory=list)
+    p98: list[float | None] = Field(default_factory=list)
+
+
+class SampleQualityReport(BaseModel):
+    """导入时的坏波段/坏像元扫描结果."""
+
+    sample_id: str
+    status: Literal["pending", "completed", "failed"]
+    error: str | None = None
+    bands: int | None = None
+    bad_bands: list[int] = Field(default_factory=list)
+    good_bands: list[int] = Field(default_factory=list)
+    band_flags: BandQualityFlags | None = None
+    snr: list[float | None] = Field(default_factory=list)
+    saturated_fraction: list[float] = Field(default_factory=list)
+    percentiles: BandPercentiles | None = None
+    dead_columns: list[int] = Field(default_factory=list)
+    hot_columns: list[int] = Field(default_factory=list)
+
+
+class BandLookupItem(BaseModel):
+    """波长到波段的查找结果."""
+
+    wavelength: float
+    band: int
+    band_wavelength: float
+
+
+class BandLookupResponse(BaseModel):
+    """批量波段查找."""
+
+    items: list[BandLookupItem]
+
+
+class BandRangeResponse(BaseModel):
+    """波长范围内的波段."""
+
+    bands: list[int]
+    wavelengths: list[float]
+
+
+class ResolvedModeChannels(BaseModel):
+    """显示模式在某个样本上的实际波段."""
+
+    mode_id: int
+    r_channel: int
+    g_channel: int
+    b_channel: int
+    wavelengths: list[float] | None = None
+    matched_by_wavelength: bool
+
+
+class SpectralTransform(BaseModel):
+    """光谱变换：S-G 平滑、一/二阶导数、包络线去除."""
+
+    kind: Literal["savgol", "derivative1", "derivative2", "continuum_removal"]
+    window: int = Field(default=11, ge=3, le=101, description="S-G 窗口（奇数）")
+    order: int = Field(default=2, ge=0, le=6, description="S-G 多项式阶数")
+
+    @model_validator(mode="after")
+    def check_window(self) -> SpectralTransform:
+        if self.kind == "continuum_removal":
+            return self
+        if self.window % 2 == 0:
+            raise ValueError("window must be odd")
+        if self.window <= max(self.order, 2):
+            raise ValueError("window must be larger than polynomial order")
+        return self
+
+
+class SpectrumExtractionRequest(BaseModel):
+    """从立方体提取像元光谱."""
+
+    pixels: list[tuple[int, int]] = Field(min_length=1, max_length=100_000, description="(line, sample) 像元坐标")
+    average: bool = False
+    calibrated: bool = True
+    resample_to_project_grid: bool = False
+    resample_method: Literal["linear", "gaussian"] = "linear"
+    transforms: list[SpectralTransform] = Field(default_factory=list, max_length=8)
+
+
+class SpectrumExtractionResponse(BaseModel):
+    """提取的光谱（平均时只有一条）."""
+
+    wavelengths: list[float] | None = None
+    values: list[list[float | None]]
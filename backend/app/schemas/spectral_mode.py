@@ -10,6 +10,9 @@ class SpectralModeBase(BaseModel):
     r_channel: int = Field(ge=0, le=10000)
     g_channel: int = Field(ge=0, le=10000)
     b_channel: int = Field(ge=0, le=10000)
+    r_wavelength: float | None = Field(default=None, gt=0)
+    g_wavelength: float | None = Field(default=None, gt=0)
+    b_wavelength: float | None = Field(default=None, gt=0)
     r_gain: float = Field(ge=-4096, le=4096, default=1.0)
     g_gain: float = Field(ge=-4096, le=4096, default=1.0)
     b_gain: float = Field(ge=-4096, le=4096, default=1.0)
@@ -31,6 +34,9 @@ class SpectralModeUpdate(BaseModel):
     r_channel: int | None = Field(default=None, ge=0, le=10000)
     g_channel: int | None = Field(default=None, ge=0, le=10000)
     b_channel: int | None = Field(default=None, ge=0, le=10000)
+    r_wavelength: float | None = Field(default=None, gt=0)
+    g_wavelength: float | None = Field(default=None, gt=0)
+    b_wavelength: float | None = Field(default=None, gt=0)
     r_gain: float | None = Field(default=None, ge=-4096, le=4096)
     g_gain: float | None = Field(default=None, ge=-4096, le=4096)
     b_gain: float | None = Field(default=None, ge=-4096, le=4096)
@@ -0,0 +1,184 @@
+from __future__ import annotations
+
+import numpy as np
+from fastapi import HTTPException
+
+from app.schemas.sample import SampleQualityReport
+from app.services.hsi import (
+    HyperCube,
+    read_json,
+    sample_derived_dir,
+    write_json_atomic,
+)
+
+QUALITY_FILE = "quality.json"
+QUALITY_VERSION = 1
+
+# 单个行块的像元数上限
+BLOCK_PIXELS = 262_144
+# 百分位统计使用的随机像元数
+PERCENTILE_PIXELS = 50_000
+
+MIN_SNR = 10.0
+MAX_SATURATED_FRACTION = 0.01
+DEAD_COLUMN_RATIO = 0.2
+HOT_COLUMN_RATIO = 3.0
+COLUMN_WINDOW = 7
+
+
+def _saturation_value(cube: HyperCube) -> float:
+    dtype = cube.header.dtype
+    if dtype.kind in "ui":
+        return float(np.iinfo(dtype).max)
+    return float("inf")
+
+
+def _neighbor_median(profile: np.ndarray, window: int = COLUMN_WINDOW) -> np.ndarray:
+    """沿 sample 方向的滑动中值（不含自身）."""
+    half = window // 2
+    padded = np.pad(profile, half, mode="edge")
+    windows = np.lib.stride_tricks.sliding_window_view(padded, window).copy()
+    windows[:, half] = np.nan
+    return np.nanmedian(windows, axis=1)
+
+
+def scan_cube_quality(cube: HyperCube, *, seed: int = 0) -> dict:
+    """流式扫描立方体，标记坏波段与坏/热像元列.
+
+    每个波段累计均值、相邻行差分噪声、饱和比例与极值；每个 sample 列累计均值，
+    之后与邻域中值比较找出死列/热列。百分位在随机像元上计算并排除饱和值。
+    """
+    lines, samples, bands = cube.shape
+    saturation = _saturation_value(cube)
+
+    count = 0
+    band_sum = np.zeros(bands)
+    column_min = np.full((samples, bands), np.inf)
+    column_max = np.full((samples, bands), -np.inf)
+    band_saturated = np.zeros(bands)
+    diff_sq = np.zeros(bands)
+    diff_count = 0
+    column_sum = np.zeros((samples, bands))
+    column_saturated = np.zeros(samples)
+    previous: np.ndarray | None = None
+
+    block_lines = max(1, BLOCK_PIXELS // samples)
+    for start in range(0, lines, block_lines):
+        stop = min(lines, start + block_lines)
+        block = np.asarray(cube.data[start:stop], dtype=np.float64)  # raw counts
+        height = block.shape[0]
+        count += height * samples
+        band_sum += block.sum(axis=(0, 1))
+        np.minimum(column_min, block.min(axis=0), out=column_min)
+        np.maximum(column_max, block.max(axis=0), out=column_max)
+        saturated = block >= saturation
+        band_saturated += saturated.sum(axis=(0, 1))
+        column_sum += block.sum(axis=0)
+        column_saturated += saturated.sum(axis=(0, 2))
+
+        stacked = block if previous is None else np.concatenate([previous, block])
+        if stacked.shape[0] > 1:
+            diffs = np.diff(stacked, axis=0)
+            diff_sq += np.einsum("lsb,lsb->b", diffs, diffs)
+            diff_count += diffs.shape[0] * samples
+        previous = block[-1:]
+
+    band_mean = band_sum / count
+    noise = np.sqrt(diff_sq / max(diff_count, 1) / 2.0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        snr = np.where(noise > 0, band_mean / noise, np.inf)
+    saturated_fraction = band_saturated / count
+
+    # 先用全部波段找坏列，再在正常列上判断常数波段
+    profile = (column_sum / lines).mean(axis=1)
+    reference = _neighbor_median(profile) if samples > 1 else profile
+    with np.errstate(divide="ignore", invalid="ignore"):
+        ratio = np.where(reference > 0, profile / reference, 1.0)
+    dead_columns = np.flatnonzero((ratio < DEAD_COLUMN_RATIO) | (profile <= 0))
+    hot_columns = np.flatnonzero(
+        (ratio > HOT_COLUMN_RATIO) | (column_saturated / (lines * bands) > 0.5)
+    )
+    normal_columns = np.setdiff1d(np.arange(samples), np.union1d(dead_columns, hot_columns))
+    if normal_columns.size == 0:
+        normal_columns = np.arange(samples)
+    band_min = column_min[normal_columns].min(axis=0)
+    band_max = column_max[normal_columns].max(axis=0)
+
+    constant = np.flatnonzero(band_max <= band_min)
+    low_snr = np.setdiff1d(np.flatnonzero(snr < MIN_SNR), constant)
+    clipped = np.flatnonzero(saturated_fraction > MAX_SATURATED_FRACTION)
+    bad = np.union1d(np.union1d(constant, low_snr), clipped)
+    good = np.setdiff1d(np.arange(bands), bad)
+
+    rng = np.random.default_rng(seed)
+    picks = rng.choice(lines * samples, size=min(PERCENTILE_PIXELS, lines * samples), replace=False)
+    line_idx, sample_idx = np.divmod(picks, samples)
+    keep = np.isin(sample_idx, normal_columns)
+    if keep.any():
+        line_idx, sample_idx = line_idx[keep], sample_idx[keep]
+    pixels = np.asarray(cube.data[line_idx, sample_idx], dtype=np.float64)
+    pixels[pixels >= saturation] = np.nan
+    p2, p98 = np.nanpercentile(pixels, [2, 98], axis=0)
+
+    def _clean(values: np.ndarray) -> list[float | None]:
+        return [float(v) if np.isfinite(v) else None for v in values]
+
+    return {
+        "version": QUALITY_VERSION,
+        "status": "completed",
+        "bands": bands,
+        "bad_bands": bad.tolist(),
+        "good_bands": good.tolist(),
+        "band_flags": {
+            "constant": constant.tolist(),
+            "low_snr": low_snr.tolist(),
+            "saturated": clipped.tolist(),
+        },
+        "snr": _clean(snr),
+        "saturated_fraction": saturated_fraction.tolist(),
+        "percentiles": {"p2": _clean(p2), "p98": _clean(p98)},
+        "dead_columns": dead_columns.tolist(),
+        "hot_columns": hot_columns.tolist(),
+    }
+
+
+def run_quality_scan(sample_uid: str, source_files: list[str]) -> dict:
+    """扫描单个样本并写入 quality.json（失败时记录错误状态）."""
+    path = sample_derived_dir(sample_uid) / QUALITY_FILE
+    try:
+        cube = HyperCube.from_source_files(source_files, calibrated=False)
+        stat = cube.spe_path.stat()
+        fingerprint = [stat.st_size, stat.st_mtime_ns]
+        existing = read_json(path)
+        if existing and existing.get("fingerprint") == fingerprint and existing.get("version") == QUALITY_VERSION:
+            return existing
+        report = scan_cube_quality(cube)
+        report["fingerprint"] = fingerprint
+    except (HTTPException, OSError, ValueError) as exc:
+        detail = exc.detail if isinstance(exc, HTTPException) else str(exc)
+        report = {"version": QUALITY_VERSION, "status": "failed", "error": detail}
+    write_json_atomic(path, report)
+    return report
+
+
+def load_quality_report(sample_uid: str) -> dict | None:
+    return read_json(sample_derived_dir(sample_uid) / QUALITY_FILE)
+
+
+def get_quality_report(sample_uid: str, sample_type: str) -> SampleQualityReport:
+    """读取扫描结果；尚未完成时返回 pending."""
+    if sample_type != "hyperspectral":
+        raise HTTPException(status_code=400, detail="样本不是高光谱数据")
+    report = load_quality_report(sample_uid)
+    if report is None:
+        return SampleQualityReport(sample_id=sample_uid, status="pending")
+    return SampleQualityReport(sample_id=sample_uid, **report)
+
+
+def good_band_indices(sample_uid: str, bands: int) -> np.ndarray:
+    """可用波段索引；尚无扫描结果时返回全部波段."""
+    report = load_quality_report(sample_uid)
+    if not report or report.get("status") != "completed" or report.get("bands") != bands:
+        return np.arange(bands)
+    good = np.asarray(report.get("good_bands") or [], dtype=np.intp)
+    return good if good.size else np.arange(bands)
@@ -0,0 +1,145 @@
+from __future__ import annotations
+
+import hashlib
+import os
+import shutil
+import stat
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from uuid import uuid4
+
+from app.core.paths import BLOB_ROOT
+from app.core.workers import submit_background
+
+BLOB_TMP = BLOB_ROOT / "tmp"
+DIGEST_SIZE = 32
+HASH_CHUNK_SIZE = 1024 * 1024
+# 链接数刚变化过的 blob 可能正处于入库/链接过程中，回收时跳过
+ORPHAN_GRACE_SECONDS = 3600.0
+
+
+def new_hasher() -> hashlib.blake2b:
+    return hashlib.blake2b(digest_size=DIGEST_SIZE)
+
+
+def hash_file(path: Path) -> str:
+    """分块读取文件计算 BLAKE2b（写入时没能顺序哈希的文件在入库前补算）."""
+    hasher = new_hasher()
+    with path.open("rb") as f:
+        while chunk := f.read(HASH_CHUNK_SIZE):
+            hasher.update(chunk)
+    return hasher.hexdigest()
+
+
+def blob_path(digest: str) -> Path:
+    return BLOB_ROOT / digest[:2] / digest[2:4] / digest
+
+
+@dataclass
+class StoredFile:
+    """写入结果：deduplicated 表示内容已存在，只新增了硬链接."""
+
+    size: int
+    digest: str
+    deduplicated: bool
+
+
+def _adopt(path: Path, digest: str) -> bool:
+    """把已写完的文件登记为 blob；内容已存在时删除该文件并返回 True."""
+    target = blob_path(digest)
+    if target.exists():
+        path.unlink()
+        return True
+    target.parent.mkdir(parents=True, exist_ok=True)
+    # 只读，避免通过某个数据源硬链接修改到共享内容
+    os.chmod(path, stat.S_IRUSR | stat.S_IRGRP | stat.S_IROTH)
+    try:
+        os.link(path, target)
+    except FileExistsError:
+        path.unlink()
+        return True
+    return False
+
+
+def link_blob(digest: str, destination: Path) -> None:
+    """在数据源目录中为 blob 建立硬链接（跨文件系统时退化为复制）."""
+    destination.parent.mkdir(parents=True, exist_ok=True)
+    source = blob_path(digest)
+    try:
+        os.link(source, destination)
+    except OSError:
+        shutil.copyfile(source, destination)
+
+
+class BlobWriter:
+    """边写边算 BLAKE2b 的临时文件，commit 时按内容地址入库（只读一遍数据）."""
+
+    def __init__(self) -> None:
+        BLOB_TMP.mkdir(parents=True, exist_ok=True)
+        self.tmp_path = BLOB_TMP / uuid4().hex
+        self._file = self.tmp_path.open("wb")
+        self._hasher = new_hasher()
+        self.size = 0
+
+    def write(self, chunk: bytes) -> None:
+        self._file.write(chunk)
+        self._hasher.update(chunk)
+        self.size += len(chunk)
+
+    def commit(self, destination: Path) -> StoredFile:
+        self._file.close()
+        digest = self._hasher.hexdigest()
+        deduplicated = _adopt(self.tmp_path, digest)
+        if not deduplicated:
+            self.tmp_path.unlink()
+        link_blob(digest, destination)
+        return StoredFile(size=self.size, digest=digest, deduplicated=deduplicated)
+
+    def abort(self) -> None:
+        self._file.close()
+        self.tmp_path.unlink(missing_ok=True)
+
+
+def adopt_file(path: Path, digest: str) -> StoredFile:
+    """把已在原位写好的文件（哈希已在写入时算出）并入 blob 库."""
+    size = path.stat().st_size
+    deduplicated = _adopt(path, digest)
+    if deduplicated:
+        link_blob(digest, path)
+    return StoredFile(size=size, digest=digest, deduplicated=deduplicated)
+
+
+def discard_blobs(digests: list[str]) -> None:
+    """回滚失败的导入：删除其中已不再被任何数据源引用的 blob."""
+    for digest in digests:
+        path = blob_path(digest)
+        try:
+            if path.stat().st_nlink == 1:
+                path.unlink()
+        except OSError:
+            continue
+
+
+def collect_orphan_blobs(grace_seconds: float = ORPHAN_GRACE_SECONDS) -> int:
+    """删除已没有数据源引用的 blob（硬链接数为 1），返回删除数量.
+
+    建立/删除硬链接会更新 inode 的 ctime，grace_seconds 内变化过的 blob 不回收，
+    避免与正在提交的上传竞争。
+    """
+    cutoff = time.time() - grace_seconds
+    removed = 0
+    for path in BLOB_ROOT.glob("??/??/*"):
+        try:
+            info = path.stat()
+            if info.st_nlink == 1 and info.st_ctime < cutoff:
+                path.unlink()
+                removed += 1
+        except OSError:
+            continue
+    return removed
+
+
+def schedule_orphan_collection() -> None:
+    """在后台线程池中回收孤立 blob（启动、删除项目、上传失败后触发）."""
+    submit_background(collect_orphan_blobs)
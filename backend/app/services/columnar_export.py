@@ -0,0 +1,337 @@
+from __future__ import annotations
+
+import json
+import shutil
+import tarfile
+import tempfile
+from collections.abc import Sequence
+from datetime import datetime, timezone
+from pathlib import Path
+
+import numpy as np
+from sqlalchemy import Row, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.concurrency import run_in_threadpool
+
+from app.core.config import settings
+from app.core.paths import EXPORT_ROOT
+from app.models.annotation_detail import AnnotationDetail
+from app.models.annotation_detail_mode import AnnotationDetailMode
+from app.models.annotation_sample import AnnotationSample
+from app.models.annotation_spectrum import AnnotationSpectrum
+from app.models.project import AnnotationProject
+from app.models.spectrum_axis import SpectrumAxis
+from app.services.spectrum_codec import AXIS_DTYPE, VALUE_DTYPE
+
+MANIFEST_FILE = "manifest.json"
+FORMAT_NAME = "hsi-columnar"
+FORMAT_VERSION = 1
+ID_DTYPE = np.dtype("S64")
+
+# 列名 -> dtype；变长数据（光谱、波长轴）以 values + offsets 两列表示
+COLUMNS: dict[str, np.dtype] = {
+    "samples/sample_id": ID_DTYPE,
+    "samples/is_annotated": np.dtype("?"),
+    "samples/axis_index": np.dtype("<i4"),
+    "annotations/detail_id": ID_DTYPE,
+    "annotations/sample_index": np.dtype("<i4"),
+    "annotations/label": np.dtype("<i4"),
+    "annotations/tool_type": np.dtype("<i4"),
+    "annotations/mode_index": np.dtype("<i4"),
+    "annotations/area": np.dtype("<f8"),
+    "annotations/confidence": np.dtype("<f8"),
+    "spectra/annotation_index": np.dtype("<i4"),
+    "spectra/axis_index": np.dtype("<i4"),
+    "spectra/offsets": np.dtype("<i8"),
+    "spectra/values": VALUE_DTYPE,
+    "axes/offsets": np.dtype("<i8"),
+    "axes/wavelengths": AXIS_DTYPE,
+}
+# 每行一个 JSON 的非表格字段
+JSONL_FILES = ("annotations/coordinates.jsonl", "spectra/position.jsonl")
+
+
+class _ColumnWriter:
+    """追加写入原始字节，结束时加上 .npy 头，结果可直接 np.load(mmap_mode="r")."""
+
+    def __init__(self, directory: Path, name: str, dtype: np.dtype) -> None:
+        self.file = f"{name}.npy"
+        self.path = directory / self.file
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.dtype = dtype
+        self.length = 0
+        self._raw_path = self.path.with_suffix(".raw")
+        self._raw = self._raw_path.open("wb")
+
+    def append(self, values: object) -> None:
+        array = np.asarray(values, dtype=self.dtype)
+        self._raw.write(array.tobytes())
+        self.length += array.size
+
+    def finish(self) -> dict:
+        self._raw.close()
+        header = {
+            "descr": np.lib.format.dtype_to_descr(self.dtype),
+            "fortran_order": False,
+            "shape": (self.length,),
+        }
+        with self.path.open("wb") as target, self._raw_path.open("rb") as source:
+            np.lib.format.write_array_header_2_0(target, header)
+            shutil.copyfileobj(source, target, 1024 * 1024)
+        self._raw_path.unlink()
+        return {"file": self.file, "dtype": self.dtype.str, "shape": [self.length]}
+
+
+class _Dictionary:
+    """字符串字典编码."""
+
+    def __init__(self) -> None:
+        self.values: list[str] = []
+        self._codes: dict[str, int] = {}
+
+    def code(self, value: str) -> int:
+        if value not in self._codes:
+            self._codes[value] = len(self.values)
+            self.values.append(value)
+        return self._codes[value]
+
+
+class _ColumnarBuilder:
+    """把样本批次追加到各列文件."""
+
+    def __init__(self, directory: Path) -> None:
+        self.directory = directory
+        self.columns = {name: _ColumnWriter(directory, name, dtype) for name, dtype in COLUMNS.items()}
+        self.jsonl = {}
+        for name in JSONL_FILES:
+            path = directory / name
+            path.parent.mkdir(parents=True, exist_ok=True)
+            self.jsonl[name] = path.open("w", encoding="utf-8")
+        self.labels = _Dictionary()
+        self.tool_types = _Dictionary()
+        self.modes: dict[int, int] = {}
+        self.axes: dict[bytes, int] = {}
+        # spectrum_axes.id -> 导出中的波长轴序号
+        self.spectrum_axes: dict[int, int] = {}
+        self.sample_count = 0
+        self.annotation_count = 0
+        self.spectrum_count = 0
+        self.value_count = 0
+        self.axis_value_count = 0
+        self.columns["spectra/offsets"].append([0])
+        self.columns["axes/offsets"].append([0])
+
+    def axis_index(self, wavelengths: bytes | None) -> int:
+        """波长轴去重（同一样本的共享轴只写一次）."""
+        if not wavelengths:
+            return -1
+        if wavelengths not in self.axes:
+            self.axes[wavelengths] = len(self.axes)
+            axis = np.frombuffer(wavelengths, dtype=AXIS_DTYPE)
+            self.columns["axes/wavelengths"].append(axis)
+            self.axis_value_count += axis.size
+            self.columns["axes/offsets"].append([self.axis_value_count])
+        return self.axes[wavelengths]
+
+    def add_batch(
+        self,
+        samples: Sequence[Row],
+        details: Sequence[Row],
+        spectra: Sequence[Row],
+        axes: dict[int, bytes],
+    ) -> None:
+        sample_index: dict[int, int] = {}
+        sample_axes: dict[int, int] = {}
+        for row in samples:
+            sample_index[row.id] = self.sample_count + len(sample_index)
+            axis = None if row.wavelengths is None else np.asarray(row.wavelengths, dtype=AXIS_DTYPE).tobytes()
+            sample_axes[row.id] = self.axis_index(axis)
+        self.columns["samples/sample_id"].append([row.sample_id.encode("utf-8") for row in samples])
+        self.columns["samples/is_annotated"].append([row.is_annotated for row in samples])
+        self.columns["samples/axis_index"].append([sample_axes[row.id] for row in samples])
+        self.sample_count += len(samples)
+
+        annotation_index: dict[int, int] = {}
+        coordinates = self.jsonl["annotations/coordinates.jsonl"]
+        for row in details:
+            annotation_index[row.id] = self.annotation_count + len(annotation_index)
+            coordinates.write(json.dumps(row.coordinates, ensure_ascii=False) + "\n")
+        self.columns["annotations/detail_id"].append([row.detail_id.encode("utf-8") for row in details])
+        self.columns["annotations/sample_index"].append([sample_index[row.sample_id] for row in details])
+        self.columns["annotations/label"].append([self.labels.code(row.label_name) for row in details])
+        self.columns["annotations/tool_type"].append([self.tool_types.code(row.tool_type) for row in details])
+        self.columns["annotations/mode_index"].append(
+            [-1 if row.mode_id is None else self.modes.setdefault(row.mode_id, len(self.modes)) for row in details]
+        )
+        self.columns["annotations/area"].append([np.nan if row.area is None else row.area for row in details])
+        self.columns["annotations/confidence"].append(
+            [np.nan if row.confidence is None else row.confidence for row in details]
+        )
+        self.annotation_count += len(details)
+
+        positions = self.jsonl["spectra/position.jsonl"]
+        curves = [np.frombuffer(row.values, dtype=VALUE_DTYPE) for row in spectra]
+        lengths = np.fromiter((curve.size for curve in curves), dtype=np.int64, count=len(curves))
+        annotation_indexes = []
+        axis_indexes = []
+        for axis_id, wavelengths in axes.items():
+            self.spectrum_axes[axis_id] = self.axis_index(wavelengths)
+        for row in spectra:
+            annotation_indexes.append(annotation_index[row.detail_id])
+            axis_indexes.append(self.spectrum_axes[row.axis_id])
+            positions.write(json.dumps(row.position, ensure_ascii=False) + "\n")
+        if curves:
+            self.columns["spectra/values"].append(np.concatenate(curves))
+        self.columns["spectra/offsets"].append(self.value_count + np.cumsum(lengths))
+        self.columns["spectra/annotation_index"].append(annotation_indexes)
+        self.columns["spectra/axis_index"].append(axis_indexes)
+        self.value_count += int(lengths.sum())
+        self.spectrum_count += len(spectra)
+
+    def finish(self, manifest: dict) -> None:
+        for handle in self.jsonl.values():
+            handle.close()
+        manifest.update(
+            {
+                "arrays": {name: writer.finish() for name, writer in self.columns.items()},
+                "jsonl": list(JSONL_FILES),
+                "counts": {
+                    "samples": self.sample_count,
+                    "annotations": self.annotation_count,
+                    "spectra": self.spectrum_count,
+                    "axes": len(self.axes),
+                },
+                "labels": self.labels.values,
+                "tool_types": self.tool_types.values,
+            }
+        )
+        manifest_text = json.dumps(manifest, ensure_ascii=False, indent=2)
+        (self.directory / MANIFEST_FILE).write_text(manifest_text, encoding="utf-8")
+
+
+async def _mode_rows(db: AsyncSession, mode_ids: dict[int, int]) -> list[dict]:
+    if not mode_ids:
+        return []
+    result = await db.execute(select(AnnotationDetailMode).where(AnnotationDetailMode.id.in_(list(mode_ids))))
+    rows: list[dict] = [{} for _ in mode_ids]
+    for mode in result.scalars():
+        rows[mode_ids[mode.id]] = {
+            "r_channel": mode.r_channel,
+            "g_channel": mode.g_channel,
+            "b_channel": mode.b_channel,
+            "r_gain": mode.r_gain,
+            "g_gain": mode.g_gain,
+            "b_gain": mode.b_gain,
+            "gain_algorithm": mode.gain_algorithm,
+            "dark_calibration": mode.dark_calibration,
+            "white_calibration": mode.white_calibration,
+        }
+    return rows
+
+
+async def write_columnar_export(
+    db: AsyncSession,
+    project: AnnotationProject,
+    directory: Path,
+    batch_size: int | None = None,
+) -> dict:
+    """按样本批次流式写出列式导出目录，返回 manifest."""
+    batch_size = batch_size or settings.export_batch_size
+    builder = _ColumnarBuilder(directory)
+    sample_stmt = (
+        select(
+            AnnotationSample.id,
+            AnnotationSample.sample_id,
+            AnnotationSample.is_annotated,
+            AnnotationSample.wavelengths,
+        )
+        .where(AnnotationSample.project_id == project.id)
+        .order_by(AnnotationSample.id.asc())
+        .execution_options(yield_per=batch_size)
+    )
+    result = await db.stream(sample_stmt)
+    async for samples in result.partitions():
+        sample_ids = [row.id for row in samples]
+        details = (
+            await db.execute(
+                select(
+                    AnnotationDetail.id,
+                    AnnotationDetail.detail_id,
+                    AnnotationDetail.sample_id,
+                    AnnotationDetail.label_name,
+                    AnnotationDetail.tool_type,
+                    AnnotationDetail.area,
+                    AnnotationDetail.confidence,
+                    AnnotationDetail.mode_id,
+                    AnnotationDetail.coordinates,
+                )
+                .where(AnnotationDetail.sample_id.in_(sample_ids))
+                .order_by(AnnotationDetail.sample_id, AnnotationDetail.id)
+            )
+        ).all()
+        spectra: Sequence[Row] = []
+        if details:
+            # 按样本 id 关联，避免把整批标注主键作为 IN 参数
+            spectra = (
+                await db.execute(
+                    select(
+                        AnnotationSpectrum.detail_id,
+                        AnnotationSpectrum.values,
+                        AnnotationSpectrum.axis_id,
+                        AnnotationSpectrum.position,
+                    )
+                    .join(AnnotationDetail, AnnotationDetail.id == AnnotationSpectrum.detail_id)
+                    .where(AnnotationDetail.sample_id.in_(sample_ids))
+                    .order_by(AnnotationSpectrum.detail_id, AnnotationSpectrum.id)
+                )
+            ).all()
+        # 只取本批新出现的波长轴
+        axis_ids = {row.axis_id for row in spectra} - builder.spectrum_axes.keys()
+        axes: dict[int, bytes] = {}
+        if axis_ids:
+            found = await db.execute(
+                select(SpectrumAxis.id, SpectrumAxis.wavelengths).where(SpectrumAxis.id.in_(axis_ids))
+            )
+            axes = {axis_id: wavelengths for axis_id, wavelengths in found}
+        await run_in_threadpool(builder.add_batch, samples, details, spectra, axes)
+
+    manifest = {
+        "format": FORMAT_NAME,
+        "version": FORMAT_VERSION,
+        "project": {"id": project.id, "project_id": project.project_id, "name": project.name},
+        "generated_at": datetime.now(timezone.utc).isoformat(),
+        "modes": await _mode_rows(db, builder.modes),
+    }
+    await run_in_threadpool(builder.finish, manifest)
+    return manifest
+
+
+def _pack_directory(directory: Path, archive: Path) -> None:
+    # 不压缩：解包后的 .npy 可直接内存映射
+    with tarfile.open(archive, "w") as tar:
+        tar.add(directory, arcname=".")
+
+
+async def build_columnar_export_archive(db: AsyncSession, project: AnnotationProject) -> Path:
+    """生成列式导出 tar 包（调用方负责删除）."""
+    EXPORT_ROOT.mkdir(parents=True, exist_ok=True)
+    workdir = Path(tempfile.mkdtemp(prefix="columnar_", dir=EXPORT_ROOT))
+    archive = workdir.with_suffix(".tar")
+    try:
+        await write_columnar_export(db, project, workdir)
+        await run_in_threadpool(_pack_directory, workdir, archive)
+    except BaseException:
+        archive.unlink(missing_ok=True)
+        raise
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+    return archive
+
+
+def open_columnar_export(directory: Path) -> tuple[dict, dict[str, np.ndarray]]:
+    """读取解包后的导出目录：返回 manifest 与内存映射的列."""
+    manifest = json.loads((directory / MANIFEST_FILE).read_text(encoding="utf-8"))
+    arrays = {
+        name: np.load(directory / info["file"], mmap_mode="r") for name, info in manifest["arrays"].items()
+    }
+    return manifest, arrays
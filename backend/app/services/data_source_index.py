@@ -0,0 +1,201 @@
+from __future__ import annotations
+
+import json
+import os
+import threading
+import time
+from pathlib import Path
+
+from app.core.config import settings
+from app.core.logging import get_logger
+from app.core.paths import DATA_SOURCE_ROOT, UPLOAD_ROOT
+from app.core.workers import submit_background
+from app.schemas.project import DataSourceInfo
+
+logger = get_logger(__name__)
+
+IMAGE_EXTS = {".jpg", ".jpeg", ".png"}
+HYPER_EXTS = {".spe", ".hdr", ".figspecblack", ".figspecwhite"}
+
+INDEX_PATH = UPLOAD_ROOT / ".cache" / "datasource_index.json"
+INDEX_VERSION = 1
+# mtime 距扫描时间过近的目录可能在同一时间戳内再次被修改，记录为待重扫
+RACY_WINDOW_NS = 2_000_000_000
+
+# 目录记录：[mtime_ns, 文件数, 图像数, 高光谱组数, 子目录名]
+DirectoryRecord = list
+
+
+def scan_directory(path: Path, mtime_ns: int) -> DirectoryRecord:
+    """单次 os.scandir 统计一个目录（不递归）."""
+    files = images = 0
+    stems: set[str] = set()
+    subdirs: list[str] = []
+    with os.scandir(path) as entries:
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                subdirs.append(entry.name)
+                continue
+            if not entry.is_file():
+                continue
+            files += 1
+            stem, ext = os.path.splitext(entry.name)
+            ext = ext.lower()
+            if ext in IMAGE_EXTS:
+                images += 1
+            elif ext in HYPER_EXTS:
+                stems.add(stem)
+    if time.time_ns() - mtime_ns < RACY_WINDOW_NS:
+        mtime_ns = -1
+    return [mtime_ns, files, images, len(stems), sorted(subdirs)]
+
+
+def refresh_tree(root: Path, previous: dict[str, DirectoryRecord]) -> dict[str, DirectoryRecord]:
+    """增量刷新目录树：只重新扫描 mtime 变化的目录，其余目录只做一次 stat."""
+    records: dict[str, DirectoryRecord] = {}
+    pending = [""]
+    while pending:
+        rel = pending.pop()
+        path = root / rel if rel else root
+        try:
+            mtime_ns = path.stat().st_mtime_ns
+        except OSError:
+            continue
+        record = previous.get(rel)
+        if record is None or record[0] != mtime_ns:
+            try:
+                # 先取 mtime 再扫描，扫描期间的新变化会在下次刷新时发现
+                record = scan_directory(path, mtime_ns)
+            except OSError:
+                continue
+        records[rel] = record
+        pending.extend(f"{rel}/{name}" if rel else name for name in record[4])
+    return records
+
+
+def summarize_tree(records: dict[str, DirectoryRecord]) -> tuple[int, int]:
+    """(文件总数, 样本估算数)."""
+    total_files = sum(record[1] for record in records.values())
+    total_samples = sum(record[2] + record[3] for record in records.values())
+    return total_files, total_samples
+
+
+class DataSourceIndex:
+    """数据源目录索引（sidecar 持久化，按目录 mtime 增量更新）.
+
+    读取路径直接返回内存/sidecar 中的索引；TTL 过期后在后台线程增量刷新，
+    只有首次无索引或 invalidate 之后才在请求中同步刷新。
+    """
+
+    def __init__(self, root: Path, index_path: Path, ttl: float = 0.0) -> None:
+        self.root = root
+        self.index_path = index_path
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._folders: dict[str, dict[str, DirectoryRecord]] | None = None
+        self._summaries: dict[str, tuple[int, int]] = {}
+        self._root_mtime: int | None = None
+        self._checked_at = float("-inf")
+        self._invalidated = False
+        self._refreshing = False
+
+    def _load(self) -> dict[str, dict[str, DirectoryRecord]]:
+        try:
+            payload = json.loads(self.index_path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return {}
+        if payload.get("version") != INDEX_VERSION:
+            return {}
+        return payload.get("folders") or {}
+
+    def _save(self) -> None:
+        self.index_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.index_path.with_name(f".{self.index_path.name}.{os.getpid()}.tmp")
+        tmp.write_text(
+            json.dumps({"version": INDEX_VERSION, "folders": self._folders}, separators=(",", ":")),
+            encoding="utf-8",
+        )
+        os.replace(tmp, self.index_path)
+
+    def _is_fresh(self) -> bool:
+        if self._folders is None or time.monotonic() - self._checked_at >= self.ttl:
+            return False
+        try:
+            return self.root.stat().st_mtime_ns == self._root_mtime
+        except OSError:
+            return False
+
+    def refresh(self, *, force: bool = False) -> dict[str, tuple[int, int]]:
+        """刷新索引并返回 {文件夹: (文件数, 样本数)}；TTL 内直接返回缓存."""
+        with self._lock:
+            if not force and self._is_fresh():
+                return self._summaries
+            if self._folders is None:
+                self._folders = self._load()
+
+            self._root_mtime = self.root.stat().st_mtime_ns
+            folders: dict[str, dict[str, DirectoryRecord]] = {}
+            with os.scandir(self.root) as entries:
+                for entry in entries:
+                    if entry.is_dir():
+                        folders[entry.name] = refresh_tree(
+                            Path(entry.path), self._folders.get(entry.name, {})
+                        )
+
+            changed = folders != self._folders
+            self._folders = folders
+            self._summaries = {name: summarize_tree(records) for name, records in folders.items()}
+            self._checked_at = time.monotonic()
+            self._invalidated = False
+            if changed:
+                self._save()
+            return self._summaries
+
+    def invalidate(self) -> None:
+        """下次读取时同步刷新（上传、删除后调用）."""
+        with self._lock:
+            self._checked_at = float("-inf")
+            self._invalidated = True
+
+    def _schedule_refresh(self) -> None:
+        with self._lock:
+            if self._refreshing:
+                return
+            self._refreshing = True
+        submit_background(self._background_refresh)
+
+    def _background_refresh(self) -> None:
+        try:
+            self.refresh(force=True)
+        except OSError:
+            logger.exception("data source index refresh failed", root=str(self.root))
+        finally:
+            with self._lock:
+                self._refreshing = False
+
+    def snapshot(self) -> dict[str, tuple[int, int]]:
+        """返回当前索引，请求路径上不逐目录 stat；过期时交给后台刷新."""
+        with self._lock:
+            if self._folders is None:
+                folders = self._load()
+                if folders:
+                    # sidecar 原样使用，目录变化由随后的后台刷新补上
+                    self._folders = folders
+                    self._summaries = {name: summarize_tree(records) for name, records in folders.items()}
+            needs_sync = self._folders is None or self._invalidated
+            stale = time.monotonic() - self._checked_at >= self.ttl
+            summaries = self._summaries
+        if needs_sync:
+            return self.refresh(force=True)
+        if stale:
+            self._schedule_refresh()
+        return summaries
+
+    def list_sources(self) -> list[DataSourceInfo]:
+        summaries = self.snapshot()
+        return [
+            DataSourceInfo(name=name, total_files=total_files, total_samples=total_samples)
+            for name, (total_files, total_samples) in sorted(summaries.items())
+        ]
+
+data_source_index = DataSourceIndex(DATA_SOURCE_ROOT, INDEX_PATH, settings.data_source_index_ttl)
@@ -0,0 +1,183 @@
+from __future__ import annotations
+
+import math
+import os
+from collections.abc import Callable, Generator, Iterator
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from pathlib import Path
+from typing import TypeVar
+
+from app.core.config import settings
+from app.services.data_source_index import HYPER_EXTS, IMAGE_EXTS
+from app.services.hsi import header_axes, header_from_metadata, read_envi_metadata
+
+T = TypeVar("T")
+
+# (父目录相对路径, 文件名主干, 扩展名)
+ScanEntry = tuple[str, str, str]
+Subdirs = list[tuple[str, str]]
+
+
+def _list_directory(path: str, rel: str) -> tuple[list[ScanEntry], Subdirs]:
+    """单个目录的 os.scandir：返回文件条目与子目录 (绝对路径, 相对路径)."""
+    files: list[ScanEntry] = []
+    subdirs: Subdirs = []
+    try:
+        with os.scandir(path) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    subdirs.append((entry.path, f"{rel}/{entry.name}" if rel else entry.name))
+                elif entry.is_file():
+                    stem, ext = os.path.splitext(entry.name)
+                    files.append((rel, stem, ext))
+    except OSError:
+        return [], []
+    return files, subdirs
+
+
+def walk_parallel(
+    folder: Path,
+    task: Callable[[str, str], tuple[T, Subdirs]],
+    max_workers: int | None = None,
+) -> Iterator[T]:
+    """在线程池中并行遍历目录树，每个目录完成后立即产出 task 的结果."""
+    pool = ThreadPoolExecutor(
+        max_workers=max_workers or settings.scan_workers,
+        thread_name_prefix="folder-scan",
+    )
+    try:
+        pending: set[Future] = {pool.submit(task, str(folder), "")}
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                result, subdirs = future.result()
+                for path, rel in subdirs:
+                    pending.add(pool.submit(task, path, rel))
+                yield result
+    finally:
+        pool.shutdown(wait=True, cancel_futures=True)
+
+
+def scan_files(folder: Path, max_workers: int | None = None) -> Iterator[ScanEntry]:
+    """流式产出目录下全部文件的 (parent, stem, ext)."""
+    for files in walk_parallel(folder, _list_directory, max_workers):
+        yield from files
+
+
+def file_fingerprint(path: Path) -> list[int]:
+    """文件指纹 [size, mtime_ns]，用于同步时判断文件是否变化."""
+    try:
+        stat = path.stat()
+    except OSError:
+        return [-1, -1]
+    return [stat.st_size, stat.st_mtime_ns]
+
+
+def image_metadata(file_size: int) -> dict:
+    return {
+        "cube_samples": None,
+        "cube_lines": None,
+        "cube_bands": None,
+        "data_type": None,
+        "interleave": None,
+        "wavelength_min": None,
+        "wavelength_max": None,
+        "file_size": file_size if file_size >= 0 else None,
+        "has_dark": False,
+        "has_white": False,
+    }
+
+
+def read_cube_metadata(hdr_path: Path, names: list[str], spe_size: int) -> tuple[dict, dict]:
+    """头文件只解析一次，返回 (波长轴, 反范式化的立方体元数据)."""
+    try:
+        metadata = read_envi_metadata(hdr_path)
+    except OSError:
+        metadata = {}
+    wavelengths, fwhm = header_axes(metadata)
+    try:
+        header = header_from_metadata(metadata)
+    except ValueError:
+        header = None
+    suffixes = {os.path.splitext(name)[1].lower() for name in names}
+    finite = [value for value in wavelengths or [] if math.isfinite(value)]
+    cube = image_metadata(spe_size)
+    cube.update(
+        {
+            "cube_samples": header.samples if header else None,
+            "cube_lines": header.lines if header else None,
+            "cube_bands": header.bands if header else None,
+            "data_type": header.data_type if header else None,
+            "interleave": header.interleave if header else None,
+            "wavelength_min": min(finite) if finite else None,
+            "wavelength_max": max(finite) if finite else None,
+            "has_dark": ".figspecblack" in suffixes,
+            "has_white": ".figspecwhite" in suffixes,
+        }
+    )
+    return {"wavelengths": wavelengths, "fwhm": fwhm}, cube
+
+
+def group_directory(base: str, folder: Path, files: list[ScanEntry]) -> list[dict]:
+    """把同一目录的文件归组为样本（高光谱文件按主干名成组）."""
+    samples: list[dict] = []
+    hyper_groups: dict[str, list[tuple[str, str]]] = {}
+    for parent, stem, ext in files:
+        lowered = ext.lower()
+        if lowered in IMAGE_EXTS:
+            name = stem + ext
+            relative = os.path.join(base, parent, name)
+            fingerprint = file_fingerprint(folder / parent / name)
+            samples.append(
+                {
+                    "sample_type": "image",
+                    "files": [relative],
+                    "fingerprints": {relative: fingerprint},
+                    "metadata": image_metadata(fingerprint[0]),
+                }
+            )
+        elif lowered in HYPER_EXTS:
+            hyper_groups.setdefault(stem, []).append((parent, stem + ext))
+
+    for members in hyper_groups.values():
+        names = [name for _parent, name in members]
+        hdr = next((name for name in names if name.lower().endswith(".hdr")), None)
+        if hdr is None or not any(name.lower().endswith(".spe") for name in names):
+            continue
+        parent = members[0][0]
+        fingerprints = {
+            os.path.join(base, parent, name): file_fingerprint(folder / parent / name) for name in names
+        }
+        spe = next(name for name in names if name.lower().endswith(".spe"))
+        axes, metadata = read_cube_metadata(
+            folder / parent / hdr,
+            names,
+            fingerprints[os.path.join(base, parent, spe)][0],
+        )
+        samples.append(
+            {
+                "sample_type": "hyperspectral",
+                "files": [os.path.join(base, parent, name) for name in names],
+                "fingerprints": fingerprints,
+                "metadata": metadata,
+                **axes,
+            }
+        )
+    return samples
+
+
+def iter_samples(folder: Path, max_workers: int | None = None) -> Generator[list[dict], None, None]:
+    """并行扫描并逐目录产出样本批次.
+
+    一个目录的全部文件在同一个任务中列出，因此高光谱文件组在该目录扫描完时即完整，
+    分组与头文件读取都在工作线程中完成。
+    """
+    base = folder.name
+
+    def task(path: str, rel: str) -> tuple[list[dict], Subdirs]:
+        files, subdirs = _list_directory(path, rel)
+        return group_directory(base, folder, files), subdirs
+
+    for samples in walk_parallel(folder, task, max_workers):
+        if samples:
+            yield samples
@@ -0,0 +1,401 @@
+from __future__ import annotations
+
+import json
+import os
+import struct
+import zlib
+from collections.abc import Iterator
+from dataclasses import dataclass, field
+from pathlib import Path
+
+import numpy as np
+from fastapi import HTTPException, status
+
+from app.core.paths import DATA_SOURCE_ROOT, DERIVED_ROOT
+
+DERIVED_ROOT.mkdir(parents=True, exist_ok=True)
+
+# ENVI data type -> numpy dtype
+ENVI_DTYPES: dict[int, str] = {
+    1: "u1",
+    2: "i2",
+    3: "i4",
+    4: "f4",
+    5: "f8",
+    12: "u2",
+    13: "u4",
+    14: "i8",
+    15: "u8",
+}
+
+
+def parse_envi_header(text: str) -> dict[str, object]:
+    """解析 ENVI 头文件文本（支持跨行的 {...} 数组）."""
+    metadata: dict[str, object] = {}
+    key: str | None = None
+    buffer: list[str] = []
+
+    for raw_line in text.splitlines():
+        line = raw_line.strip()
+        if key is not None:
+            buffer.append(line)
+            if "}" in line:
+                metadata[key] = _parse_envi_value("".join(buffer))
+                key, buffer = None, []
+            continue
+        if "=" not in line:
+            continue
+        name, value = line.split("=", 1)
+        name = name.strip().lower()
+        value = value.strip()
+        if value.startswith("{") and "}" not in value:
+            key, buffer = name, [value]
+            continue
+        metadata[name] = _parse_envi_value(value)
+    return metadata
+
+
+def _parse_envi_value(value: str) -> object:
+    value = value.strip()
+    if value.startswith("{") and value.endswith("}"):
+        items = [item.strip() for item in value[1:-1].split(",")]
+        if len(items) == 1:
+            return items[0]
+        parsed: list[object] = []
+        for item in items:
+            try:
+                parsed.append(float(item))
+            except ValueError:
+                parsed.append(item)
+        return parsed
+    try:
+        number = float(value)
+    except ValueError:
+        return value
+    return int(number) if number.is_integer() else number
+
+
+@dataclass
+class CubeHeader:
+    """高光谱立方体头信息."""
+
+    samples: int
+    lines: int
+    bands: int
+    data_type: int = 12
+    interleave: str = "bil"
+    byte_order: int = 0
+    header_offset: int = 0
+    wavelengths: list[float] | None = None
+    fwhm: list[float] | None = None
+    default_bands: list[int] | None = None
+    raw: dict[str, object] = field(default_factory=dict, repr=False)
+
+    @property
+    def dtype(self) -> np.dtype:
+        code = ENVI_DTYPES.get(self.data_type, "u2")
+        return np.dtype(code).newbyteorder(">" if self.byte_order == 1 else "<")
+
+    @property
+    def file_shape(self) -> tuple[int, int, int]:
+        """按交织方式排列的磁盘数组形状."""
+        if self.interleave == "bsq":
+            return (self.bands, self.lines, self.samples)
+        if self.interleave == "bip":
+            return (self.lines, self.samples, self.bands)
+        return (self.lines, self.bands, self.samples)
+
+    @property
+    def expected_bytes(self) -> int:
+        return self.header_offset + self.samples * self.lines * self.bands * self.dtype.itemsize
+
+
+def _float_list(value: object) -> list[float] | None:
+    if not isinstance(value, list):
+        return None
+    try:
+        return [float(item) for item in value]  # type: ignore[arg-type]
+    except (TypeError, ValueError):
+        return None
+
+
+def header_axes(metadata: dict[str, object]) -> tuple[list[float] | None, list[float] | None]:
+    """取 wavelength / fwhm 数组（不要求头信息含尺寸）；长度不一致时丢弃 fwhm."""
+    wavelengths = _float_list(metadata.get("wavelength"))
+    fwhm = _float_list(metadata.get("fwhm"))
+    if wavelengths is not None and fwhm is not None and len(fwhm) != len(wavelengths):
+        fwhm = None
+    return wavelengths, fwhm
+
+
+def header_from_metadata(metadata: dict[str, object]) -> CubeHeader:
+    """从解析后的头信息构造 CubeHeader，缺少尺寸时抛出 ValueError."""
+    try:
+        samples = int(metadata["samples"])  # type: ignore[call-overload]
+        lines = int(metadata["lines"])  # type: ignore[call-overload]
+        bands = int(metadata["bands"])  # type: ignore[call-overload]
+    except (KeyError, TypeError, ValueError) as exc:
+        raise ValueError("header missing cube dimensions") from exc
+    if samples <= 0 or lines <= 0 or bands <= 0:
+        raise ValueError("header has non-positive cube dimensions")
+
+    interleave = str(metadata.get("interleave", "bil")).strip().lower()
+    if interleave not in {"bil", "bsq", "bip"}:
+        interleave = "bil"
+
+    wavelengths, fwhm = header_axes(metadata)
+    if wavelengths is not None and len(wavelengths) != bands:
+        wavelengths = None
+    if fwhm is not None and len(fwhm) != bands:
+        fwhm = None
+    default_bands = _float_list(metadata.get("default bands"))
+
+    return CubeHeader(
+        samples=samples,
+        lines=lines,
+        bands=bands,
+        data_type=int(metadata.get("data type", 12)),  # type: ignore[call-overload]
+        interleave=interleave,
+        byte_order=int(metadata.get("byte order", 0)),  # type: ignore[call-overload]
+        header_offset=int(metadata.get("header offset", 0)),  # type: ignore[call-overload]
+        wavelengths=wavelengths,
+        fwhm=fwhm,
+        default_bands=[int(b) for b in default_bands] if default_bands else None,
+        raw=metadata,
+    )
+
+
+def read_envi_metadata(path: Path) -> dict[str, object]:
+    """读取并解析 .hdr 文件（未校验尺寸）."""
+    return parse_envi_header(path.read_text(encoding="utf-8", errors="replace"))
+
+
+def read_cube_header(path: Path) -> CubeHeader:
+    """读取 .hdr 文件."""
+    return header_from_metadata(read_envi_metadata(path))
+
+
+@dataclass
+class HyperFiles:
+    """高光谱样本的文件组."""
+
+    spe: Path
+    hdr: Path
+    dark: Path | None = None
+    white: Path | None = None
+
+
+def resolve_hyper_files(source_files: list[str]) -> HyperFiles:
+    """从样本 source_files 中定位 .spe/.hdr 及标定文件."""
+    found: dict[str, Path] = {}
+    for relative in source_files:
+        path = DATA_SOURCE_ROOT / relative
+        found.setdefault(path.suffix.lower(), path)
+    if ".spe" not in found or ".hdr" not in found:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="样本不是高光谱数据")
+    return HyperFiles(
+        spe=found[".spe"],
+        hdr=found[".hdr"],
+        dark=found.get(".figspecblack"),
+        white=found.get(".figspecwhite"),
+    )
+
+
+class HyperCube:
+    """基于 memmap 的高光谱立方体，统一按 (line, sample, band) 访问."""
+
+    def __init__(
+        self,
+        header: CubeHeader,
+        spe_path: Path,
+        *,
+        dark_path: Path | None = None,
+        white_path: Path | None = None,
+    ) -> None:
+        self.header = header
+        self.spe_path = spe_path
+        if spe_path.stat().st_size < header.expected_bytes:
+            raise ValueError("cube file is smaller than header dimensions")
+        raw = np.memmap(
+            spe_path,
+            dtype=header.dtype,
+            mode="r",
+            offset=header.header_offset,
+            shape=header.file_shape,
+        )
+        self.data = self._as_lsb(raw)
+        self.dark = self._load_calibration(dark_path)
+        self.white = self._load_calibration(white_path)
+
+    @classmethod
+    def from_source_files(cls, source_files: list[str], *, calibrated: bool = True) -> HyperCube:
+        files = resolve_hyper_files(source_files)
+        try:
+            header = read_cube_header(files.hdr)
+            return cls(
+                header,
+                files.spe,
+                dark_path=files.dark if calibrated else None,
+                white_path=files.white if calibrated else None,
+            )
+        except (OSError, ValueError) as exc:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="高光谱数据无法读取",
+            ) from exc
+
+    def _as_lsb(self, array: np.ndarray) -> np.ndarray:
+        """把磁盘布局转换为 (line, sample, band) 视图（不复制数据）."""
+        if self.header.interleave == "bsq":
+            return array.transpose(1, 2, 0)
+        if self.header.interleave == "bip":
+            return array
+        return array.transpose(0, 2, 1)
+
+    def _load_calibration(self, path: Path | None) -> np.ndarray | None:
+        """标定文件可以是单条光谱 (bands,) 或与立方体同尺寸的帧."""
+        if path is None or not path.exists():
+            return None
+        header = self.header
+        count = path.stat().st_size // 2
+        if count == header.bands:
+            return np.fromfile(path, dtype="<u2", count=header.bands).astype(np.float32)
+        if count >= header.samples * header.lines * header.bands:
+            frame = np.memmap(path, dtype="<u2", mode="r", shape=header.file_shape)
+            return self._as_lsb(frame)
+        return None
+
+    @property
+    def shape(self) -> tuple[int, int, int]:
+        return (self.header.lines, self.header.samples, self.header.bands)
+
+    @staticmethod
+    def _calibrate(
+        block: np.ndarray,
+        dark: np.ndarray | None,
+        white: np.ndarray | None,
+    ) -> np.ndarray:
+        """与前端一致：先减暗场，再除以 (白场 - 暗场)."""
+        values = block.astype(np.float32)
+        if dark is not None:
+            np.maximum(values - dark, 0, out=values)
+        if white is not None:
+            denominator = white - dark if dark is not None else white
+            denominator = np.broadcast_to(denominator, values.shape)
+            np.divide(values, denominator, out=values, where=denominator > 0)
+        return values
+
+    def _calibration_at(self, index: tuple, *, band: int | None = None) -> tuple[np.ndarray | None, np.ndarray | None]:
+        """取出与数据块对应的暗场/白场."""
+        selected: list[np.ndarray | None] = []
+        for calibration in (self.dark, self.white):
+            if calibration is None:
+                selected.append(None)
+            elif calibration.ndim == 1:
+                selected.append(calibration if band is None else calibration[band])
+            else:
+                full_index = index if band is None else (*index, band)
+                selected.append(np.asarray(calibration[full_index], dtype=np.float32))
+        return selected[0], selected[1]
+
+    def read_lines(self, start: int, stop: int) -> np.ndarray:
+        """读取 [start, stop) 行，返回 (lines, samples, bands) float32."""
+        index = (slice(start, stop),)
+        return self._calibrate(np.asarray(self.data[index]), *self._calibration_at(index))
+
+    def iter_line_blocks(self, block_lines: int) -> Iterator[tuple[int, np.ndarray]]:
+        """按行块遍历立方体，内存占用与块大小成正比."""
+        total = self.header.lines
+        step = max(1, block_lines)
+        for start in range(0, total, step):
+            stop = min(total, start + step)
+            yield start, self.read_lines(start, stop)
+
+    def read_pixels(self, line_idx: np.ndarray, sample_idx: np.ndarray) -> np.ndarray:
+        """读取若干像元光谱，返回 (n, bands) float32."""
+        index = (np.asarray(line_idx, dtype=np.intp), np.asarray(sample_idx, dtype=np.intp))
+        return self._calibrate(np.asarray(self.data[index]), *self._calibration_at(index))
+
+    def read_band(self, band: int, step: int = 1) -> np.ndarray:
+        """读取单个波段，返回 (lines, samples) float32；step > 1 时按步长抽取像元."""
+        band = int(np.clip(band, 0, self.header.bands - 1))
+        index = (slice(None, None, step), slice(None, None, step))
+        return self._calibrate(
+            np.asarray(self.data[(*index, band)]),
+            *self._calibration_at(index, band=band),
+        )
+
+
+def sample_derived_dir(sample_uid: str) -> Path:
+    """样本派生数据（缓存结果）目录."""
+    path = DERIVED_ROOT / sample_uid
+    path.mkdir(parents=True, exist_ok=True)
+    return path
+
+
+def write_json_atomic(path: Path, payload: object) -> None:
+    """原子写入 JSON（先写临时文件再替换）."""
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    tmp.write_text(json.dumps(payload, ensure_ascii=False), encoding="utf-8")
+    os.replace(tmp, path)
+
+
+def read_json(path: Path) -> dict | None:
+    if not path.exists():
+        return None
+    try:
+        return json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+
+
+def to_display_orientation(image: np.ndarray) -> np.ndarray:
+    """(line, sample) 转为前端显示方向（行 = sample，列 = line）."""
+    return np.ascontiguousarray(np.swapaxes(image, 0, 1))
+
+
+def normalize_to_uint8(image: np.ndarray, low: float | None = None, high: float | None = None) -> np.ndarray:
+    """线性拉伸到 0-255."""
+    finite = np.isfinite(image)
+    if low is None:
+        low = float(image[finite].min()) if finite.any() else 0.0
+    if high is None:
+        high = float(image[finite].max()) if finite.any() else 1.0
+    scale = 255.0 / (high - low) if high > low else 0.0
+    scaled = np.clip((np.nan_to_num(image, nan=low) - low) * scale, 0, 255)
+    return scaled.astype(np.uint8)
+
+
+def encode_png(image: np.ndarray) -> bytes:
+    """把 uint8 灰度 (h, w) 或 RGB (h, w, 3) 数组编码为 PNG."""
+    if image.dtype != np.uint8:
+        raise ValueError("PNG encoder expects uint8 data")
+    if image.ndim == 2:
+        height, width = image.shape
+        color_type = 0
+    elif image.ndim == 3 and image.shape[2] == 3:
+        height, width = image.shape[:2]
+        color_type = 2
+    else:
+        raise ValueError("PNG encoder expects (h, w) or (h, w, 3) arrays")
+
+    rows = np.ascontiguousarray(image).reshape(height, -1)
+    scanlines = np.hstack([np.zeros((height, 1), dtype=np.uint8), rows])
+
+    def chunk(tag: bytes, data: bytes) -> bytes:
+        return (
+            struct.pack(">I", len(data))
+            + tag
+            + data
+            + struct.pack(">I", zlib.crc32(tag + data) & 0xFFFFFFFF)
+        )
+
+    ihdr = struct.pack(">IIBBBBB", width, height, 8, color_type, 0, 0, 0)
+    return b"".join(
+        [
+            b"\x89PNG\r\n\x1a\n",
+            chunk(b"IHDR", ihdr),
+            chunk(b"IDAT", zlib.compress(scanlines.tobytes(), 6)),
+            chunk(b"IEND", b""),
+        ]
+    )
@@ -0,0 +1,554 @@
+from __future__ import annotations
+
+import math
+import os
+import threading
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, cast
+from uuid import uuid4
+
+import numpy as np
+from fastapi import HTTPException
+from sqlalchemy import Table, bindparam, event, func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, SessionTransaction
+from starlette.concurrency import run_in_threadpool
+
+from app.core.config import settings
+from app.core.paths import INGEST_QUEUE_ROOT
+from app.core.workers import submit_background
+from app.models.annotation_sample import AnnotationSample
+from app.schemas.project import (
+    IngestStageStatus,
+    ProjectIngestStatus,
+    SampleIngestStatus,
+)
+from app.services.band_quality import good_band_indices, run_quality_scan
+from app.services.hsi import (
+    HyperCube,
+    encode_png,
+    normalize_to_uint8,
+    read_json,
+    resolve_hyper_files,
+    sample_derived_dir,
+    to_display_orientation,
+    write_json_atomic,
+)
+
+PIPELINE_FILE = "pipeline.json"
+PIPELINE_VERSION = 1
+HEADER_FILE = "header.json"
+THUMBNAIL_FILE = "thumbnail.png"
+
+# 缩略图长边像素数
+THUMBNAIL_SIZE = 256
+# 金字塔逐级 2×2 降采样，直到长边不超过该值
+OVERVIEW_MIN_SIZE = 256
+# 生成金字塔时每次读入的输出行数（输入为其两倍）
+OVERVIEW_BLOCK_LINES = 64
+# 每次轮询最多从 pipeline.json 回写的未完成样本数（按 id 顺序，与提交顺序一致）
+STATUS_SYNC_LIMIT = 500
+# 事务内登记、提交后才入队的样本（Session.info 键）
+PENDING_INGEST_KEY = "pending_ingest"
+
+_inflight: set[str] = set()
+_inflight_lock = threading.Lock()
+
+
+@dataclass
+class IngestContext:
+    """单个样本的后处理上下文."""
+
+    sample_uid: str
+    source_files: list[str]
+    directory: Path
+
+
+def source_fingerprint(source_files: list[str]) -> list[list[int]]:
+    """.spe 与 .hdr 的 [size, mtime_ns]；文件变化后所有阶段重新执行."""
+    files = resolve_hyper_files(source_files)
+    fingerprint = []
+    for path in (files.spe, files.hdr):
+        stat = path.stat()
+        fingerprint.append([stat.st_size, stat.st_mtime_ns])
+    return fingerprint
+
+
+def _write_bytes_atomic(path: Path, content: bytes) -> None:
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    tmp.write_bytes(content)
+    os.replace(tmp, path)
+
+
+def _run_header_stage(ctx: IngestContext) -> dict:
+    """解析头文件并校验数据文件大小，写入 header.json."""
+    files = resolve_hyper_files(ctx.source_files)
+    cube = HyperCube.from_source_files(ctx.source_files, calibrated=False)
+    header = cube.header
+    summary = {
+        "samples": header.samples,
+        "lines": header.lines,
+        "bands": header.bands,
+        "data_type": header.data_type,
+        "interleave": header.interleave,
+        "byte_order": header.byte_order,
+        "header_offset": header.header_offset,
+        "wavelengths": header.wavelengths,
+        "fwhm": header.fwhm,
+        "file_size": files.spe.stat().st_size,
+        "has_dark": files.dark is not None and files.dark.exists(),
+        "has_white": files.white is not None and files.white.exists(),
+    }
+    write_json_atomic(ctx.directory / HEADER_FILE, summary)
+    return {"shape": [header.lines, header.samples, header.bands]}
+
+
+def _run_band_stats_stage(ctx: IngestContext) -> dict:
+    """逐波段统计（坏波段、SNR、百分位），结果即 quality.json."""
+    report = run_quality_scan(ctx.sample_uid, ctx.source_files)
+    if report.get("status") != "completed":
+        raise ValueError(report.get("error") or "band statistics failed")
+    return {"bad_bands": len(report.get("bad_bands") or [])}
+
+
+def _stretch(channel: np.ndarray) -> np.ndarray:
+    finite = channel[np.isfinite(channel)]
+    if finite.size == 0:
+        return np.zeros(channel.shape, dtype=np.uint8)
+    low, high = np.percentile(finite, [2, 98])
+    scale = 255.0 / (high - low) if high > low else 0.0
+    scaled = np.clip((np.nan_to_num(channel, nan=low) - low) * scale, 0, 255)
+    return scaled.astype(np.uint8)
+
+
+def thumbnail_bands(cube: HyperCube, sample_uid: str) -> list[int]:
+    """缩略图使用的三个波段：头文件 default bands，否则在可用波段中均匀选取."""
+    bands = cube.header.bands
+    defaults = cube.header.default_bands
+    if defaults and len(defaults) == 3 and all(1 <= band <= bands for band in defaults):
+        return [band - 1 for band in defaults]
+    good = good_band_indices(sample_uid, bands)
+    picks = np.linspace(0, good.size - 1, 3).round().astype(int)
+    # 按波长从长到短排列，近似 R/G/B
+    return [int(good[index]) for index in picks[::-1]]
+
+
+def render_thumbnail(cube: HyperCube, sample_uid: str, size: int = THUMBNAIL_SIZE) -> bytes:
+    """按步长抽取像元生成 RGB 缩略图 PNG（只读取三个波段的稀疏像元）."""
+    lines, samples, _bands = cube.shape
+    step = max(1, math.ceil(max(lines, samples) / size))
+    channels = [_stretch(cube.read_band(band, step)) for band in thumbnail_bands(cube, sample_uid)]
+    return encode_png(to_display_orientation(np.stack(channels, axis=-1)))
+
+
+def _run_thumbnail_stage(ctx: IngestContext) -> dict:
+    cube = HyperCube.from_source_files(ctx.source_files)
+    _write_bytes_atomic(ctx.directory / THUMBNAIL_FILE, render_thumbnail(cube, ctx.sample_uid))
+    return {}
+
+
+def overview_path(directory: Path, level: int) -> Path:
+    return directory / f"overview_{level}.npy"
+
+
+def _existing_shape(path: Path) -> tuple[int, ...] | None:
+    try:
+        return np.load(path, mmap_mode="r").shape
+    except (OSError, ValueError):
+        return None
+
+
+def _level_reader(data: np.ndarray) -> Callable[[int, int], np.ndarray]:
+    return lambda start, stop: np.asarray(data[start:stop], dtype=np.float32)
+
+
+def build_overview_pyramid(cube: HyperCube, directory: Path) -> list[list[int]]:
+    """逐级 2×2 均值降采样生成概览金字塔（float32 .npy，可 memmap 读取）.
+
+    每级按行块流式生成并先写临时文件再替换，中断后已完成的级别直接复用。
+    """
+    lines, samples, bands = cube.shape
+    read: Callable[[int, int], np.ndarray] = cube.read_lines
+    shapes: list[list[int]] = []
+    level = 1
+    while max(lines, samples) > OVERVIEW_MIN_SIZE and min(lines, samples) >= 2:
+        out_lines, out_samples = lines // 2, samples // 2
+        shape = (out_lines, out_samples, bands)
+        path = overview_path(directory, level)
+        if _existing_shape(path) != shape:
+            tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+            out = np.lib.format.open_memmap(tmp, mode="w+", dtype=np.float32, shape=shape)
+            for start in range(0, out_lines, OVERVIEW_BLOCK_LINES):
+                stop = min(out_lines, start + OVERVIEW_BLOCK_LINES)
+                block = read(2 * start, 2 * stop)[:, : 2 * out_samples]
+                out[start:stop] = block.reshape(stop - start, 2, out_samples, 2, bands).mean(axis=(1, 3))
+            out.flush()
+            del out
+            os.replace(tmp, path)
+        shapes.append(list(shape))
+        read = _level_reader(np.load(path, mmap_mode="r"))
+        lines, samples = out_lines, out_samples
+        level += 1
+    # 清理上一次（尺寸更大时）留下的多余级别
+    while overview_path(directory, level).exists():
+        overview_path(directory, level).unlink()
+        level += 1
+    return shapes
+
+
+def _run_overview_stage(ctx: IngestContext) -> dict:
+    cube = HyperCube.from_source_files(ctx.source_files)
+    return {"levels": build_overview_pyramid(cube, ctx.directory)}
+
+
+INGEST_STAGES: dict[str, Callable[[IngestContext], dict]] = {
+    "header": _run_header_stage,
+    "band_stats": _run_band_stats_stage,
+    "thumbnail": _run_thumbnail_stage,
+    "overview": _run_overview_stage,
+}
+
+
+def load_pipeline_state(sample_uid: str) -> dict | None:
+    return read_json(sample_derived_dir(sample_uid) / PIPELINE_FILE)
+
+
+def run_ingest_pipeline(sample_uid: str, source_files: list[str], stages: list[str] | None = None) -> dict:
+    """按顺序执行后处理阶段，每个阶段完成后落盘状态.
+
+    已完成且源文件指纹未变的阶段直接跳过，因此重复执行或重启后续跑都是幂等的；
+    某阶段失败时记录错误并停止后续阶段。
+    """
+    directory = sample_derived_dir(sample_uid)
+    path = directory / PIPELINE_FILE
+    stages = list(stages or settings.ingest_stages)
+
+    def save(state: dict[str, Any]) -> None:
+        state["updated_at"] = datetime.now(timezone.utc).isoformat()
+        write_json_atomic(path, state)
+
+    state: dict[str, Any]
+    try:
+        fingerprint = source_fingerprint(source_files)
+    except (HTTPException, OSError) as exc:
+        detail = exc.detail if isinstance(exc, HTTPException) else str(exc)
+        state = {"version": PIPELINE_VERSION, "status": "failed", "error": detail, "stages": {}}
+        save(state)
+        return state
+
+    state = read_json(path) or {}
+    if state.get("version") != PIPELINE_VERSION or state.get("fingerprint") != fingerprint:
+        state = {"version": PIPELINE_VERSION, "fingerprint": fingerprint, "stages": {}}
+    state.pop("error", None)
+    state["status"] = "running"
+
+    ctx = IngestContext(sample_uid=sample_uid, source_files=source_files, directory=directory)
+    for name in stages:
+        if state["stages"].get(name, {}).get("status") == "completed":
+            continue
+        state["current_stage"] = name
+        save(state)
+        stage = INGEST_STAGES.get(name)
+        try:
+            if stage is None:
+                raise ValueError(f"unknown ingest stage: {name}")
+            result = stage(ctx)
+        except Exception as exc:  # noqa: BLE001
+            # 任何异常都记为失败，避免状态停留在 running
+            detail = exc.detail if isinstance(exc, HTTPException) else f"{type(exc).__name__}: {exc}"
+            state["stages"][name] = {"status": "failed", "error": detail}
+            state["status"] = "failed"
+            state["current_stage"] = None
+            save(state)
+            return state
+        state["stages"][name] = {"status": "completed", **result}
+
+    state["status"] = "completed"
+    state["current_stage"] = None
+    save(state)
+    return state
+
+
+def _queue_marker(sample_uid: str) -> Path:
+    return INGEST_QUEUE_ROOT / f"{sample_uid}.json"
+
+
+def _run_queued(sample_uid: str) -> None:
+    """执行队列中的样本；运行期间被重新入队时（token 变化）再跑一遍."""
+    with _inflight_lock:
+        if sample_uid in _inflight:
+            return
+        _inflight.add(sample_uid)
+    marker = _queue_marker(sample_uid)
+    try:
+        while (entry := read_json(marker)) is not None:
+            run_ingest_pipeline(sample_uid, entry["source_files"])
+            current = read_json(marker)
+            if current is None or current.get("token") == entry.get("token"):
+                marker.unlink(missing_ok=True)
+                break
+    except Exception:
+        # 状态无法落盘等意外错误：清除标记，避免每次重启都重跑
+        marker.unlink(missing_ok=True)
+        raise
+    finally:
+        with _inflight_lock:
+            _inflight.discard(sample_uid)
+
+
+def schedule_ingest(db: AsyncSession, samples: Iterable[tuple[str, str, list[str]]]) -> int:
+    """在当前事务中登记待处理的高光谱样本，返回登记数量.
+
+    队列标记与后台任务在事务提交后才写入/提交；回滚时直接丢弃，
+    不会为未落库的样本生成派生数据。
+    """
+    jobs = [job for job in samples if job[1] == "hyperspectral"]
+    db.sync_session.info.setdefault(PENDING_INGEST_KEY, []).extend(jobs)
+    return len(jobs)
+
+
+@event.listens_for(Session, "after_commit")
+def _enqueue_committed(session: Session) -> None:
+    jobs = session.info.pop(PENDING_INGEST_KEY, None)
+    if jobs:
+        enqueue_ingest(jobs)
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _discard_rolled_back(session: Session, previous_transaction: SessionTransaction) -> None:
+    # 只在最外层事务回滚时丢弃（SAVEPOINT 回滚不影响已登记的样本）
+    if previous_transaction.parent is None:
+        session.info.pop(PENDING_INGEST_KEY, None)
+
+
+def enqueue_ingest(samples: Iterable[tuple[str, str, list[str]]]) -> int:
+    """为高光谱样本写入持久化队列标记并提交后台任务，返回提交数量.
+
+    samples: (sample_uid, sample_type, source_files)
+    """
+    INGEST_QUEUE_ROOT.mkdir(parents=True, exist_ok=True)
+    submitted = 0
+    for sample_uid, sample_type, source_files in samples:
+        if sample_type != "hyperspectral":
+            continue
+        write_json_atomic(_queue_marker(sample_uid), {"source_files": source_files, "token": uuid4().hex})
+        submit_background(_run_queued, sample_uid)
+        submitted += 1
+    return submitted
+
+
+def resume_ingest_queue() -> int:
+    """启动时重新提交上次未完成的样本（已完成的阶段会被跳过）."""
+    if not INGEST_QUEUE_ROOT.exists():
+        return 0
+    resumed = 0
+    for marker in INGEST_QUEUE_ROOT.glob("*.json"):
+        submit_background(_run_queued, marker.stem)
+        resumed += 1
+    return resumed
+
+
+def summarize_pipeline_state(
+    row_id: int,
+    sample_uid: str,
+    state: dict | None,
+    stages: list[str],
+) -> SampleIngestStatus:
+    recorded = (state or {}).get("stages", {})
+    items = [
+        IngestStageStatus(
+            name=name,
+            status=recorded.get(name, {}).get("status", "pending"),
+            error=recorded.get(name, {}).get("error"),
+        )
+        for name in stages
+    ]
+    completed = sum(item.status == "completed" for item in items)
+    status = (state or {}).get("status", "pending")
+    if status == "completed" and completed < len(stages):
+        # 配置新增了阶段，等待下一次执行
+        status = "pending"
+    return SampleIngestStatus(
+        id=row_id,
+        sample_id=sample_uid,
+        status=status,
+        progress=completed / len(stages) if stages else 1.0,
+        current_stage=(state or {}).get("current_stage"),
+        error=(state or {}).get("error"),
+        stages=items,
+    )
+
+
+async def _sync_ingest_status(db: AsyncSession, project_id: int, stages: list[str]) -> None:
+    """把未完成样本的 pipeline.json 回写到数据库；已完成/失败的样本不再读盘."""
+    rows = (
+        await db.execute(
+            select(
+                AnnotationSample.id,
+                AnnotationSample.sample_id,
+                AnnotationSample.ingest_status,
+                AnnotationSample.ingest_progress,
+                AnnotationSample.ingest_stage,
+            )
+            .where(
+                AnnotationSample.project_id == project_id,
+                AnnotationSample.ingest_status.in_(("pending", "running")),
+            )
+            .order_by(AnnotationSample.id.asc())
+            .limit(STATUS_SYNC_LIMIT)
+        )
+    ).all()
+    if not rows:
+        return
+
+    def _collect() -> list[SampleIngestStatus]:
+        return [
+            summarize_pipeline_state(row.id, row.sample_id, load_pipeline_state(row.sample_id), stages)
+            for row in rows
+        ]
+
+    summaries = await run_in_threadpool(_collect)
+    changed = [
+        {
+            "_id": item.id,
+            "ingest_status": item.status,
+            "ingest_progress": item.progress,
+            "ingest_stage": item.current_stage,
+            "ingest_error": item.error,
+            "ingest_stages": [stage.model_dump() for stage in item.stages],
+        }
+        for row, item in zip(rows, summaries, strict=True)
+        if (row.ingest_status, row.ingest_progress, row.ingest_stage)
+        != (item.status, item.progress, item.current_stage)
+    ]
+    if not changed:
+        return
+    table = cast(Table, AnnotationSample.__table__)
+    await db.execute(
+        update(table)
+        .where(table.c.id == bindparam("_id"))
+        .values(
+            # 进度回写不算样本内容变化
+            updated_at=table.c.updated_at,
+            **{name: bindparam(name) for name in changed[0] if name != "_id"},
+        ),
+        changed,
+    )
+
+
+async def get_project_ingest_status(
+    db: AsyncSession,
+    project_id: int,
+    skip: int = 0,
+    limit: int = 50,
+) -> ProjectIngestStatus:
+    """汇总项目内高光谱样本的后处理状态（计数与分页都在 SQL 中完成）."""
+    stages = list(settings.ingest_stages)
+    await _sync_ingest_status(db, project_id, stages)
+
+    scope = (
+        AnnotationSample.project_id == project_id,
+        AnnotationSample.ingest_status.is_not(None),
+        AnnotationSample.status != "missing",
+    )
+    counts = {status: 0 for status in ("pending", "running", "completed", "failed")}
+    progress_sum = 0.0
+    grouped = await db.execute(
+        select(
+            AnnotationSample.ingest_status,
+            func.count(),
+            func.coalesce(func.sum(AnnotationSample.ingest_progress), 0.0),
+        )
+        .where(*scope)
+        .group_by(AnnotationSample.ingest_status)
+    )
+    for status, count, progress in grouped:
+        # scope 已排除 ingest_status 为 NULL 的行
+        counts[cast(str, status)] = count
+        progress_sum += progress
+    total = sum(counts.values())
+
+    rows = await db.execute(
+        select(
+            AnnotationSample.id,
+            AnnotationSample.sample_id,
+            AnnotationSample.ingest_status,
+            AnnotationSample.ingest_progress,
+            AnnotationSample.ingest_stage,
+            AnnotationSample.ingest_error,
+            AnnotationSample.ingest_stages,
+        )
+        .where(*scope)
+        .order_by(AnnotationSample.id.asc())
+        .offset(skip)
+        .limit(limit)
+    )
+    items = [
+        SampleIngestStatus(
+            id=row.id,
+            sample_id=row.sample_id,
+            status=row.ingest_status,
+            progress=row.ingest_progress,
+            current_stage=row.ingest_stage,
+            error=row.ingest_error,
+            stages=row.ingest_stages or [IngestStageStatus(name=name, status="pending") for name in stages],
+        )
+        for row in rows
+    ]
+    return ProjectIngestStatus(
+        project_id=project_id,
+        stages=stages,
+        total=total,
+        progress=progress_sum / total if total else 1.0,
+        items=items,
+        **counts,
+    )
+
+
+def _overview_ready(sample_uid: str, level: int) -> Path | None:
+    state = load_pipeline_state(sample_uid) or {}
+    record = state.get("stages", {}).get("overview", {})
+    if record.get("status") != "completed" or level > len(record.get("levels") or []):
+        return None
+    path = overview_path(sample_derived_dir(sample_uid), level)
+    return path if path.exists() else None
+
+
+def read_overview_band(sample_uid: str, source_files: list[str], level: int, band: int) -> tuple[np.ndarray, bool]:
+    """读取第 level 级概览的单个波段，返回 (图像, 是否来自金字塔).
+
+    金字塔尚未生成时退化为按 2**level 步长直接从立方体抽取像元。
+    """
+    path = _overview_ready(sample_uid, level)
+    if path is not None:
+        data = np.load(path, mmap_mode="r")
+        band = int(np.clip(band, 0, data.shape[2] - 1))
+        return np.asarray(data[:, :, band], dtype=np.float32), True
+    cube = HyperCube.from_source_files(source_files)
+    return cube.read_band(band, step=2**level), False
+
+
+def render_overview(sample_uid: str, source_files: list[str], level: int, band: int) -> tuple[bytes, bool]:
+    image, cached = read_overview_band(sample_uid, source_files, level, band)
+    return encode_png(to_display_orientation(normalize_to_uint8(image))), cached
+
+
+def load_thumbnail(sample_uid: str, source_files: list[str]) -> tuple[bytes, bool]:
+    """读取缩略图，返回 (PNG, 是否为缓存)；尚未生成时即时渲染（不落盘）."""
+    path = sample_derived_dir(sample_uid) / THUMBNAIL_FILE
+    state = load_pipeline_state(sample_uid) or {}
+    if state.get("stages", {}).get("thumbnail", {}).get("status") == "completed" and path.exists():
+        return path.read_bytes(), True
+    cube = HyperCube.from_source_files(source_files)
+    return render_thumbnail(cube, sample_uid), False
+
+
+async def render_overview_png(sample_uid: str, source_files: list[str], level: int, band: int) -> tuple[bytes, bool]:
+    return await run_in_threadpool(render_overview, sample_uid, source_files, level, band)
+
+
+async def get_thumbnail_png(sample_uid: str, source_files: list[str]) -> tuple[bytes, bool]:
+    return await run_in_threadpool(load_thumbnail, sample_uid, source_files)
@@ -1,19 +1,26 @@
 from __future__ import annotations
 
-from collections import defaultdict
+import json
+from collections.abc import AsyncGenerator, AsyncIterable, AsyncIterator
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Iterable
+from typing import Any, cast
+from uuid import uuid4
 
 from fastapi import HTTPException
-from sqlalchemy import func, select
+from sqlalchemy import Table, bindparam, case, func, insert, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import joinedload, selectinload
+from sqlalchemy.orm import QueryableAttribute, joinedload, selectinload
+from starlette.concurrency import run_in_threadpool
 
+from app.core.config import settings
+from app.core.logging import get_logger
+from app.core.paths import DATA_SOURCE_ROOT
 from app.models.annotation_detail import AnnotationDetail
 from app.models.annotation_detail_mode import AnnotationDetailMode
-from app.models.annotation_sample import AnnotationSample
+from app.models.annotation_sample import CUBE_METADATA_COLUMNS, AnnotationSample
 from app.models.annotation_spectrum import AnnotationSpectrum
+from app.models.annotation_tombstone import AnnotationTombstone
 from app.models.project import AnnotationProject
 from app.schemas.project import (
     DataSourceInfo,
@@ -28,14 +35,28 @@ from app.schemas.project import (
     ProjectExportResponse,
     ProjectExportSample,
     ProjectExportSampleBlock,
+    ProjectExportTombstone,
+    ProjectSyncResponse,
     ProjectUpdate,
 )
+from app.schemas.sample import SpectralTransform
+from app.services.data_source_index import (
+    data_source_index,
+    refresh_tree,
+    summarize_tree,
+)
+from app.services.folder_scanner import iter_samples
+from app.services.ingest_pipeline import schedule_ingest
+from app.services.resampling import resample_point_lists
+from app.services.spectral_transform import transform_point_lists
+from app.services.spectrum_codec import unpack_points
+
+logger = get_logger(__name__)
 
-DATA_SOURCE_ROOT = Path(__file__).parent.parent.parent / "uploads" / "datasource"
 DATA_SOURCE_ROOT.mkdir(parents=True, exist_ok=True)
 
-IMAGE_EXTS = {".jpg", ".jpeg", ".png"}
-HYPER_EXTS = {".spe", ".hdr", ".figspecblack", ".figspecwhite"}
+# 每条 INSERT 语句携带的样本行数
+SAMPLE_INSERT_BATCH = 1000
 
 
 def _ensure_within_root(path: Path) -> None:
@@ -47,37 +68,14 @@ def _ensure_within_root(path: Path) -> None:
 
 
 def list_data_sources() -> list[DataSourceInfo]:
-    """列出数据源文件夹."""
-    sources: list[DataSourceInfo] = []
-    for entry in DATA_SOURCE_ROOT.iterdir():
-        if not entry.is_dir():
-            continue
-        total_files = sum(1 for _ in entry.rglob("*") if _.is_file())
-        total_samples = estimate_samples(entry)
-        sources.append(
-            DataSourceInfo(
-                name=entry.name,
-                total_files=total_files,
-                total_samples=total_samples,
-            )
-        )
-    return sorted(sources, key=lambda x: x.name)
+    """列出数据源文件夹（读取增量维护的目录索引）."""
+    return data_source_index.list_sources()
 
 
 def estimate_samples(folder: Path) -> int:
     """估算目录中的样本数量."""
-    images = 0
-    hyper_groups: set[tuple[str, str]] = set()
-    for file in folder.rglob("*"):
-        if not file.is_file():
-            continue
-        ext = file.suffix.lower()
-        if ext in IMAGE_EXTS:
-            images += 1
-        elif ext in HYPER_EXTS:
-            rel = file.relative_to(folder)
-            hyper_groups.add((str(rel.parent), rel.stem))
-    return images + len(hyper_groups)
+    _total_files, total_samples = summarize_tree(refresh_tree(folder, {}))
+    return total_samples
 
 
 def validate_data_source_folder(folder_name: str) -> Path:
@@ -90,40 +88,9 @@ def validate_data_source_folder(folder_name: str) -> Path:
 
 
 def parse_samples_from_folder(folder: Path) -> list[dict]:
-    """从目录解析样本信息."""
-    samples: list[dict] = []
-    hyper_map: dict[tuple[str, str], list[str]] = defaultdict(list)
-    base = folder.name
-
-    for file in folder.rglob("*"):
-        if not file.is_file():
-            continue
-        rel = file.relative_to(folder)
-        ext = file.suffix.lower()
-        if ext in IMAGE_EXTS:
-            samples.append(
-                {
-                    "sample_type": "image",
-                    "files": [str(Path(base) / rel)],
-                }
-            )
-        elif ext in HYPER_EXTS:
-            key = (str(rel.parent), rel.stem)
-            hyper_map[key].append(str(rel))
-
-    for (_parent, _stem), files in hyper_map.items():
-        has_spe = any(Path(path).suffix.lower() == ".spe" for path in files)
-        has_hdr = any(Path(path).suffix.lower() == ".hdr" for path in files)
-        if not (has_spe and has_hdr):
-            continue
-        samples.append(
-            {
-                "sample_type": "hyperspectral",
-                "files": [str(Path(base) / Path(f)) for f in files],
-            }
-        )
-
-    return samples
+    """从目录解析样本信息（并行扫描，按首个文件路径排序）."""
+    samples = [sample for batch in iter_samples(folder) for sample in batch]
+    return sorted(samples, key=lambda item: item["files"][0])
 
 
 async def list_projects(
@@ -179,42 +146,227 @@ async def create_project(
 ) -> AnnotationProject:
     """创建项目并导入数据源."""
     folder = validate_data_source_folder(project_in.data_source_folder)
-    samples_payload = parse_samples_from_folder(folder)
-    if not samples_payload:
+    sample_batches = iter_folder_samples(folder)
+    first_batch = await anext(sample_batches, None)
+    if first_batch is None:
         raise HTTPException(status_code=400, detail="数据源中没有可用样本")
 
     project = AnnotationProject(
         name=project_in.name,
         priority=project_in.priority,
         completion_rate=0.0,
-        available_samples=len(samples_payload),
-        total_samples=len(samples_payload),
+        available_samples=0,
+        total_samples=0,
+        wavelength_grid=project_in.wavelength_grid,
+        data_source_folder=folder.name,
         created_by=user_id,
         updated_by=user_id,
     )
     db.add(project)
     await db.flush()
-    await create_samples(db, project.id, samples_payload)
+
+    async def _all_batches() -> AsyncIterator[list[dict]]:
+        yield first_batch
+        async for batch in sample_batches:
+            yield batch
+
+    total = await create_samples(db, project.id, _all_batches())
+    project.available_samples = total
+    project.total_samples = total
+    await db.flush()
     await db.refresh(project)
     return project
 
 
+async def iter_folder_samples(folder: Path) -> AsyncIterator[list[dict]]:
+    """在线程池中推进目录扫描器，逐批产出样本（不物化完整列表）."""
+    batches = iter_samples(folder)
+    try:
+        while True:
+            batch = await run_in_threadpool(next, batches, None)
+            if batch is None:
+                return
+            yield batch
+    finally:
+        await run_in_threadpool(batches.close)
+
+
 async def create_samples(
     db: AsyncSession,
     project_id: int,
-    samples_payload: Iterable[dict],
-) -> None:
-    """批量创建样本记录."""
-    for item in samples_payload:
-        sample = AnnotationSample(
-            project_id=project_id,
-            sample_type=item["sample_type"],
-            source_files=item["files"],
-            status="valid",
-            is_annotated=False,
+    sample_batches: AsyncIterable[list[dict]],
+) -> int:
+    """批量创建样本记录（Core executemany 分批插入），返回样本数."""
+    total = 0
+    pending: list[dict] = []
+    async for batch in sample_batches:
+        pending.extend(batch)
+        while len(pending) >= SAMPLE_INSERT_BATCH:
+            total += await _insert_sample_rows(db, project_id, pending[:SAMPLE_INSERT_BATCH])
+            del pending[:SAMPLE_INSERT_BATCH]
+    if pending:
+        total += await _insert_sample_rows(db, project_id, pending)
+    return total
+
+
+def _metadata_values(item: dict) -> dict:
+    """扫描结果中的立方体元数据（所有行的键一致，便于 executemany）."""
+    metadata = item.get("metadata") or {}
+    return {name: metadata.get(name) for name in CUBE_METADATA_COLUMNS}
+
+
+async def _insert_sample_rows(
+    db: AsyncSession,
+    project_id: int,
+    items: list[dict],
+    change_version: int = 0,
+) -> int:
+    rows = [
+        {
+            "project_id": project_id,
+            "sample_id": uuid4().hex,
+            "sample_type": item["sample_type"],
+            "source_files": item["files"],
+            "status": "valid",
+            "is_annotated": False,
+            "wavelengths": item.get("wavelengths"),
+            "fwhm": item.get("fwhm"),
+            "file_fingerprints": item.get("fingerprints"),
+            "ingest_status": "pending" if item["sample_type"] == "hyperspectral" else None,
+            "change_version": change_version,
+            **_metadata_values(item),
+        }
+        for item in items
+    ]
+    await db.execute(insert(cast(Table, AnnotationSample.__table__)), rows)
+    schedule_ingest(db, ((row["sample_id"], row["sample_type"], row["source_files"]) for row in rows))
+    return len(rows)
+
+
+def _sample_key(sample_type: str, files: list[str]) -> str:
+    """样本身份：高光谱取 .spe 路径，图像取文件路径."""
+    if sample_type == "hyperspectral":
+        return next((path for path in files if path.lower().endswith(".spe")), min(files))
+    return files[0]
+
+
+async def sync_project_samples(db: AsyncSession, project: AnnotationProject) -> ProjectSyncResponse:
+    """重新扫描数据源：插入新样本、标记缺失样本，已有样本与标注保持不变.
+
+    扫描结果与现有样本都按身份键放入内存字典，差异按集合运算得到，
+    不做逐文件的数据库查询；写入使用批量 INSERT / UPDATE。
+    """
+    if not project.data_source_folder:
+        raise HTTPException(status_code=400, detail="项目未关联数据源")
+    folder = validate_data_source_folder(project.data_source_folder)
+
+    scanned: dict[str, dict] = {}
+    async for batch in iter_folder_samples(folder):
+        for item in batch:
+            scanned[_sample_key(item["sample_type"], item["files"])] = item
+
+    rows = await db.execute(
+        select(
+            AnnotationSample.id,
+            AnnotationSample.sample_id,
+            AnnotationSample.sample_type,
+            AnnotationSample.source_files,
+            AnnotationSample.status,
+            AnnotationSample.file_fingerprints,
+            AnnotationSample.file_size,
+        ).where(AnnotationSample.project_id == project.id)
+    )
+    existing = {_sample_key(row.sample_type, row.source_files): row for row in rows}
+
+    added_keys = scanned.keys() - existing.keys()
+    gone_keys = existing.keys() - scanned.keys()
+    missing_ids = [existing[key].id for key in gone_keys if existing[key].status != "missing"]
+    restored_ids: list[int] = []
+    changed: list[dict] = []
+    rescans: list[tuple[str, str, list[str]]] = []
+    rescan_ids: list[int] = []
+    for key in scanned.keys() & existing.keys():
+        row, item = existing[key], scanned[key]
+        if row.status == "missing":
+            restored_ids.append(row.id)
+        backfill = row.file_size is None and _metadata_values(item)["file_size"] is not None
+        if row.file_fingerprints != item["fingerprints"] or backfill:
+            # 指纹变化，或旧样本尚无元数据（同步时回填；大小无法确定的样本不反复更新）
+            changed.append(
+                {
+                    "_id": row.id,
+                    "source_files": item["files"],
+                    "file_fingerprints": item["fingerprints"],
+                    "wavelengths": item.get("wavelengths"),
+                    "fwhm": item.get("fwhm"),
+                    **_metadata_values(item),
+                }
+            )
+        if row.file_fingerprints != item["fingerprints"]:
+            rescans.append((row.sample_id, row.sample_type, item["files"]))
+            if row.sample_type == "hyperspectral":
+                rescan_ids.append(row.id)
+
+    new_items = [scanned[key] for key in sorted(added_keys)]
+    version = 0
+    if missing_ids or restored_ids or changed or new_items:
+        version = await next_change_version(db, project.id)
+
+    table = cast(Table, AnnotationSample.__table__)
+    for start in range(0, len(missing_ids), SAMPLE_INSERT_BATCH):
+        chunk = missing_ids[start : start + SAMPLE_INSERT_BATCH]
+        # SET 右侧取更新前的值：记住原状态（如 ignored），恢复时还原
+        await db.execute(
+            update(table)
+            .where(table.c.id.in_(chunk))
+            .values(status_before_missing=table.c.status, status="missing", change_version=version)
         )
-        db.add(sample)
-    await db.flush()
+    for start in range(0, len(restored_ids), SAMPLE_INSERT_BATCH):
+        chunk = restored_ids[start : start + SAMPLE_INSERT_BATCH]
+        await db.execute(
+            update(table)
+            .where(table.c.id.in_(chunk))
+            .values(
+                status=func.coalesce(table.c.status_before_missing, "valid"),
+                status_before_missing=None,
+                change_version=version,
+            )
+        )
+    if changed:
+        await db.execute(
+            update(table)
+            .where(table.c.id == bindparam("_id"))
+            .values(
+                source_files=bindparam("source_files"),
+                file_fingerprints=bindparam("file_fingerprints"),
+                wavelengths=bindparam("wavelengths"),
+                fwhm=bindparam("fwhm"),
+                change_version=version,
+                **{name: bindparam(name) for name in CUBE_METADATA_COLUMNS},
+            ),
+            changed,
+        )
+    for start in range(0, len(rescan_ids), SAMPLE_INSERT_BATCH):
+        # 源文件变化：重新进入导入队列
+        await db.execute(
+            update(table)
+            .where(table.c.id.in_(rescan_ids[start : start + SAMPLE_INSERT_BATCH]))
+            .values(ingest_status="pending", ingest_progress=0.0, ingest_stage=None, ingest_error=None)
+        )
+    schedule_ingest(db, rescans)
+
+    for start in range(0, len(new_items), SAMPLE_INSERT_BATCH):
+        await _insert_sample_rows(db, project.id, new_items[start : start + SAMPLE_INSERT_BATCH], version)
+
+    await refresh_project_statistics(db, project.id)
+    return ProjectSyncResponse(
+        added=len(new_items),
+        missing=len(missing_ids),
+        restored=len(restored_ids),
+        changed=len(rescans),
+        unchanged=len(scanned.keys() & existing.keys()) - len(rescans),
+        total_samples=len(existing) + len(new_items),
+    )
 
 
 async def update_project(
@@ -240,34 +392,46 @@ async def delete_project(db: AsyncSession, project: AnnotationProject) -> None:
 
 
 async def refresh_project_statistics(db: AsyncSession, project_id: int) -> None:
-    """刷新项目统计信息."""
-    total_query = select(func.count(AnnotationSample.id)).where(
-        AnnotationSample.project_id == project_id
-    )
-    annotated_query = select(func.count(AnnotationSample.id)).where(
-        AnnotationSample.project_id == project_id,
-        AnnotationSample.is_annotated.is_(True),
-    )
-    available_query = select(func.count(AnnotationSample.id)).where(
-        AnnotationSample.project_id == project_id,
-        AnnotationSample.status != "ignored",
+    """刷新项目统计信息.
+
+    一次条件聚合扫描得到总数、已标注数与可用数，再用一条 UPDATE 写回；
+    不在此处提交，随调用方的事务一起提交。
+    """
+    available = AnnotationSample.status.not_in(("ignored", "missing"))
+    counts = (
+        await db.execute(
+            select(
+                func.count(AnnotationSample.id),
+                func.count(case((AnnotationSample.is_annotated.is_(True), 1))),
+                func.count(case((available, 1))),
+            ).where(AnnotationSample.project_id == project_id)
+        )
+    ).one()
+    total, annotated, available_count = counts
+    await db.execute(
+        update(AnnotationProject)
+        .where(AnnotationProject.id == project_id)
+        .values(
+            total_samples=total,
+            available_samples=available_count,
+            completion_rate=round((annotated / total) * 100, 2) if total > 0 else 0.0,
+        )
     )
 
-    total = await db.scalar(total_query) or 0
-    annotated = await db.scalar(annotated_query) or 0
-    available = await db.scalar(available_query) or 0
 
-    project = await db.get(AnnotationProject, project_id)
-    if not project:
-        return
+async def next_change_version(db: AsyncSession, project_id: int) -> int:
+    """为一次写入分配项目变更版本.
 
-    project.total_samples = total
-    project.available_samples = available
-    project.completion_rate = (
-        round((annotated / total) * 100, 2) if total > 0 else 0.0
+    版本在项目行上自增：行锁持有到事务提交，并发写入只能依次拿到更大的版本，
+    因此版本顺序与提交顺序一致，增量导出按版本取差异不会漏掉晚提交的修改。
+    """
+    result = await db.execute(
+        update(AnnotationProject)
+        .where(AnnotationProject.id == project_id)
+        .values(change_version=AnnotationProject.change_version + 1)
+        .returning(AnnotationProject.change_version)
     )
-    await db.flush()
-    await db.commit()
+    return result.scalar_one()
 
 
 async def archive_project(
@@ -293,13 +457,31 @@ async def restore_project(
     return project
 
 
-async def export_project_annotations(
-    db: AsyncSession,
+def _check_export_options(project: AnnotationProject, options: ProjectExportOptions) -> None:
+    if options.resample_to_project_grid and not project.wavelength_grid:
+        raise HTTPException(status_code=400, detail="项目未设置波长网格")
+
+
+
+async def _export_version(db: AsyncSession, project: AnnotationProject, options: ProjectExportOptions) -> int:
+    """读取导出开始时的项目变更版本，并检查增量基线是否仍可用."""
+    version, floor = (
+        await db.execute(
+            select(AnnotationProject.change_version, AnnotationProject.tombstone_floor).where(
+                AnnotationProject.id == project.id
+            )
+        )
+    ).one()
+    if options.since is not None and options.since < floor:
+        # 该版本之后的部分删除墓碑已过期清理，增量结果不完整
+        raise HTTPException(status_code=410, detail="增量导出基线已过期，请重新全量导出")
+    return version
+
+
+def _export_header(
     project: AnnotationProject,
     options: ProjectExportOptions,
-) -> ProjectExportResponse:
-    """导出项目标注."""
-
+) -> tuple[ProjectExportProjectMeta, ProjectExportIncludedSections]:
     included_sections = ProjectExportIncludedSections(
         project_meta=options.include_project_meta,
         sample_meta=options.include_sample_meta,
@@ -316,112 +498,292 @@ async def export_project_annotations(
         project_block.total_samples = project.total_samples
         project_block.created_at = project.created_at
         project_block.updated_at = project.updated_at
-
-    samples: list[AnnotationSample] = []
-    if options.include_sample_meta or options.include_annotation_bundle:
-        sample_stmt = (
-            select(AnnotationSample)
-            .where(AnnotationSample.project_id == project.id)
-            .options(
-                selectinload(AnnotationSample.details)
-                .selectinload(AnnotationDetail.spectra),
-                selectinload(AnnotationSample.details)
-                .selectinload(AnnotationDetail.mode_snapshot)
-                .joinedload(AnnotationDetailMode.algorithm),
-            )
-            .order_by(AnnotationSample.id.asc())
+    return project_block, included_sections
+
+
+def _export_sample_block(sample: AnnotationSample, options: ProjectExportOptions) -> ProjectExportSampleBlock:
+    meta_payload: ProjectExportSample | None = None
+    if options.include_sample_meta:
+        meta_payload = ProjectExportSample(
+            id=sample.id,
+            sample_id=sample.sample_id,
+            sample_type=sample.sample_type,
+            source_files=sample.source_files,
+            status=sample.status,
+            is_annotated=sample.is_annotated,
+            last_annotated_by=sample.last_annotated_by,
+            created_at=sample.created_at,
+            updated_at=sample.updated_at,
         )
-        result = await db.execute(sample_stmt)
-        samples = list(result.scalars().unique().all())
 
-    sample_blocks: list[ProjectExportSampleBlock] = []
-    if samples:
-        for sample in samples:
-            meta_payload: ProjectExportSample | None = None
-            if options.include_sample_meta:
-                meta_payload = ProjectExportSample(
-                    id=sample.id,
-                    sample_id=sample.sample_id,
-                    sample_type=sample.sample_type,
-                    source_files=sample.source_files,
-                    status=sample.status,
-                    is_annotated=sample.is_annotated,
-                    last_annotated_by=sample.last_annotated_by,
-                    created_at=sample.created_at,
-                    updated_at=sample.updated_at,
+    annotations_payload: list[ProjectExportAnnotationRecord] | None = None
+    if options.include_annotation_bundle:
+        annotations_payload = []
+        for detail in sample.details:
+            detail_payload = ProjectExportAnnotationDetail(
+                detail_id=detail.detail_id,
+                sample_id=sample.sample_id,
+                label_name=detail.label_name,
+                color=detail.color,
+                tool_type=detail.tool_type,
+                coordinates=detail.coordinates,
+                radius=detail.radius,
+                area=detail.area,
+                confidence=detail.confidence,
+                remark=detail.remark,
+                created_at=detail.created_at,
+                updated_at=detail.updated_at,
+            )
+            mode_payload = None
+            if (
+                sample.sample_type == "hyperspectral"
+                and detail.mode_snapshot is not None
+            ):
+                snapshot = detail.mode_snapshot
+                mode_payload = ProjectExportAnnotationDetailMode(
+                    detail_id=detail.detail_id,
+                    r_channel=snapshot.r_channel,
+                    g_channel=snapshot.g_channel,
+                    b_channel=snapshot.b_channel,
+                    r_gain=snapshot.r_gain,
+                    g_gain=snapshot.g_gain,
+                    b_gain=snapshot.b_gain,
+                    gain_algorithm=snapshot.gain_algorithm,
+                    dark_calibration=snapshot.dark_calibration,
+                    white_calibration=snapshot.white_calibration,
+                    created_at=detail.created_at,
+                    updated_at=detail.updated_at,
                 )
 
-            annotations_payload: list[ProjectExportAnnotationRecord] | None = None
-            if options.include_annotation_bundle:
-                annotations_payload = []
-                for detail in sample.details:
-                    detail_payload = ProjectExportAnnotationDetail(
-                        detail_id=detail.detail_id,
-                        sample_id=sample.sample_id,
-                        label_name=detail.label_name,
-                        color=detail.color,
-                        tool_type=detail.tool_type,
-                        coordinates=detail.coordinates,
-                        radius=detail.radius,
-                        area=detail.area,
-                        confidence=detail.confidence,
-                        remark=detail.remark,
-                        created_at=detail.created_at,
-                        updated_at=detail.updated_at,
-                    )
-                    mode_payload = None
-                    if (
-                        sample.sample_type == "hyperspectral"
-                        and detail.mode_snapshot is not None
-                    ):
-                        snapshot = detail.mode_snapshot
-                        mode_payload = ProjectExportAnnotationDetailMode(
+            spectra_payload: list[ProjectExportAnnotationSpectrum] = []
+            if sample.sample_type == "hyperspectral":
+                for spectrum in detail.spectra:
+                    spectra_payload.append(
+                        ProjectExportAnnotationSpectrum(
                             detail_id=detail.detail_id,
-                            r_channel=snapshot.r_channel,
-                            g_channel=snapshot.g_channel,
-                            b_channel=snapshot.b_channel,
-                            r_gain=snapshot.r_gain,
-                            g_gain=snapshot.g_gain,
-                            b_gain=snapshot.b_gain,
-                            gain_algorithm=snapshot.gain_algorithm,
-                            dark_calibration=snapshot.dark_calibration,
-                            white_calibration=snapshot.white_calibration,
-                            created_at=snapshot.created_at,
-                            updated_at=snapshot.updated_at,
-                        )
-
-                    spectra_payload: list[ProjectExportAnnotationSpectrum] = []
-                    if sample.sample_type == "hyperspectral":
-                        for spectrum in detail.spectra:
-                            spectra_payload.append(
-                                ProjectExportAnnotationSpectrum(
-                                    detail_id=detail.detail_id,
-                                    position=spectrum.position,
-                                    points=spectrum.points,
-                                    created_at=spectrum.created_at,
-                                    updated_at=spectrum.updated_at,
-                                )
-                            )
-
-                    annotations_payload.append(
-                        ProjectExportAnnotationRecord(
-                            detail=detail_payload,
-                            mode_snapshot=mode_payload,
-                            spectra=spectra_payload,
+                            position=spectrum.position,
+                            points=unpack_points(spectrum.values, spectrum.axis.wavelengths),
+                            created_at=spectrum.created_at,
+                            updated_at=spectrum.updated_at,
                         )
                     )
 
-            sample_blocks.append(
-                ProjectExportSampleBlock(
-                    sample_id=sample.sample_id,
-                    meta=meta_payload,
-                    annotations=annotations_payload,
+            annotations_payload.append(
+                ProjectExportAnnotationRecord(
+                    detail=detail_payload,
+                    mode_snapshot=mode_payload,
+                    spectra=spectra_payload,
                 )
             )
 
+    return ProjectExportSampleBlock(
+        sample_id=sample.sample_id,
+        meta=meta_payload,
+        annotations=annotations_payload,
+    )
+
+
+async def iter_export_sample_blocks(
+    db: AsyncSession,
+    project: AnnotationProject,
+    options: ProjectExportOptions,
+    batch_size: int | None = None,
+) -> AsyncIterator[list[ProjectExportSampleBlock]]:
+    """按批流式读取样本（服务端游标 + yield_per），每批构建导出块后即从会话中移除."""
+    if not (options.include_sample_meta or options.include_annotation_bundle):
+        return
+    batch_size = batch_size or settings.export_batch_size
+    sample_stmt = (
+        select(AnnotationSample)
+        .where(AnnotationSample.project_id == project.id)
+        .order_by(AnnotationSample.id.asc())
+        .execution_options(yield_per=batch_size)
+    )
+    details: QueryableAttribute[Any] = AnnotationSample.details
+    if options.since is not None:
+        # 标注写入会提升样本的变更版本，走 (project_id, change_version) 索引
+        sample_stmt = sample_stmt.where(AnnotationSample.change_version > options.since)
+        details = AnnotationSample.details.and_(AnnotationDetail.change_version > options.since)
+    if options.include_annotation_bundle:
+        sample_stmt = sample_stmt.options(
+            selectinload(details).selectinload(AnnotationDetail.spectra).selectinload(AnnotationSpectrum.axis),
+            selectinload(details)
+            .selectinload(AnnotationDetail.mode_snapshot)
+            .joinedload(AnnotationDetailMode.algorithm),
+        )
+    result = await db.stream_scalars(sample_stmt)
+    async for samples in result.partitions():
+        blocks = [_export_sample_block(sample, options) for sample in samples]
+        sensors = [(sample.wavelengths, sample.fwhm) for sample in samples]
+        for sample in samples:
+            db.expunge(sample)
+        if options.resample_to_project_grid and project.wavelength_grid:
+            _resample_export_spectra(blocks, sensors, project.wavelength_grid, options.resample_method)
+        if options.spectral_transforms:
+            _transform_export_spectra(blocks, options.spectral_transforms)
+        yield blocks
+
+
+async def iter_export_tombstones(
+    db: AsyncSession,
+    project: AnnotationProject,
+    since: int,
+    batch_size: int | None = None,
+) -> AsyncIterator[list[ProjectExportTombstone]]:
+    """按批读取版本 since 之后删除的标注（(project_id, change_version) 索引）."""
+    stmt = (
+        select(AnnotationTombstone)
+        .where(AnnotationTombstone.project_id == project.id, AnnotationTombstone.change_version > since)
+        .order_by(AnnotationTombstone.change_version.asc(), AnnotationTombstone.id.asc())
+        .execution_options(yield_per=batch_size or settings.export_batch_size)
+    )
+    result = await db.stream_scalars(stmt)
+    async for tombstones in result.partitions():
+        yield [
+            ProjectExportTombstone(
+                sample_id=tombstone.sample_id,
+                detail_id=tombstone.detail_id,
+                change_version=tombstone.change_version,
+                deleted_at=tombstone.deleted_at,
+            )
+            for tombstone in tombstones
+        ]
+        for tombstone in tombstones:
+            db.expunge(tombstone)
+
+
+async def export_project_annotations(
+    db: AsyncSession,
+    project: AnnotationProject,
+    options: ProjectExportOptions,
+) -> ProjectExportResponse:
+    """导出项目标注（指定 since 时为增量导出）."""
+    _check_export_options(project, options)
+    version = await _export_version(db, project, options)
+    project_block, included_sections = _export_header(project, options)
+
+    sample_blocks: list[ProjectExportSampleBlock] = []
+    async for blocks in iter_export_sample_blocks(db, project, options):
+        sample_blocks.extend(blocks)
+    tombstones: list[ProjectExportTombstone] = []
+    if options.since is not None:
+        async for batch in iter_export_tombstones(db, project, options.since):
+            tombstones.extend(batch)
+
     return ProjectExportResponse(
         project=project_block,
         included_sections=included_sections,
         generated_at=datetime.now(timezone.utc),
+        version=version,
+        since=options.since,
         samples=sample_blocks,
+        tombstones=tombstones,
+    )
+
+
+async def stream_project_export(
+    db: AsyncSession,
+    project: AnnotationProject,
+    options: ProjectExportOptions,
+) -> AsyncGenerator[bytes, None]:
+    """NDJSON 导出：首行项目信息，每个样本一行，增量时再加墓碑行，末行汇总；内存占用以批大小为上限."""
+    _check_export_options(project, options)
+    version = await _export_version(db, project, options)
+    project_block, included_sections = _export_header(project, options)
+    header = {
+        "type": "header",
+        "project": project_block.model_dump(mode="json"),
+        "included_sections": included_sections.model_dump(mode="json"),
+        "generated_at": datetime.now(timezone.utc).isoformat(),
+        "version": version,
+        "since": options.since,
+    }
+    yield _ndjson_line(header)
+
+    count = 0
+    deleted = 0
+    try:
+        async for blocks in iter_export_sample_blocks(db, project, options):
+            chunk = bytearray()
+            for block in blocks:
+                # 直接在 pydantic 生成的 JSON 前拼上类型字段，避免二次序列化
+                chunk += b'{"type":"sample",' + block.model_dump_json().encode("utf-8")[1:] + b"\n"
+            count += len(blocks)
+            yield bytes(chunk)
+        if options.since is not None:
+            async for tombstones in iter_export_tombstones(db, project, options.since):
+                yield b"".join(
+                    b'{"type":"tombstone",' + tombstone.model_dump_json().encode("utf-8")[1:] + b"\n"
+                    for tombstone in tombstones
+                )
+                deleted += len(tombstones)
+    except Exception as exc:
+        # 响应头已发送，错误以一行记录告知客户端后结束，避免客户端把截断的流当作完整导出
+        if isinstance(exc, HTTPException):
+            detail = exc.detail
+        else:
+            logger.exception("project export stream failed", project_id=project.id)
+            detail = "导出失败"
+        yield _ndjson_line({"type": "error", "detail": detail, "samples": count, "tombstones": deleted})
+        return
+    yield _ndjson_line({"type": "end", "samples": count, "tombstones": deleted})
+
+
+def _ndjson_line(payload: dict) -> bytes:
+    return json.dumps(payload, ensure_ascii=False, separators=(",", ":")).encode("utf-8") + b"\n"
+
+
+def _export_spectra(
+    sample_blocks: list[ProjectExportSampleBlock],
+) -> list[ProjectExportAnnotationSpectrum]:
+    return [
+        spectrum
+        for block in sample_blocks
+        for record in block.annotations or []
+        for spectrum in record.spectra
+    ]
+
+
+def _resample_export_spectra(
+    sample_blocks: list[ProjectExportSampleBlock],
+    sensors: list[tuple[list[float] | None, list[float] | None]],
+    grid: list[float],
+    method: str,
+) -> None:
+    """把导出中的全部光谱一次性重采样到项目波长网格.
+
+    sensors 与 sample_blocks 一一对应 (样本波长轴, fwhm)；曲线波长轴与样本一致时高斯核采用样本 fwhm。
+    """
+    spectra: list[ProjectExportAnnotationSpectrum] = []
+    fwhms: list[list[float] | None] = []
+    for block, (wavelengths, fwhm) in zip(sample_blocks, sensors):
+        for spectrum in _export_spectra([block]):
+            spectra.append(spectrum)
+            axis = [point["wavelength"] for point in spectrum.points]
+            fwhms.append(fwhm if fwhm is not None and axis == wavelengths else None)
+    if not spectra:
+        return
+    resampled = resample_point_lists(
+        [spectrum.points for spectrum in spectra],
+        grid,
+        "gaussian" if method == "gaussian" else "linear",
+        fwhms,
     )
+    for spectrum, points in zip(spectra, resampled):
+        spectrum.points = points
+
+
+def _transform_export_spectra(
+    sample_blocks: list[ProjectExportSampleBlock],
+    transforms: list[SpectralTransform],
+) -> None:
+    """对导出中的全部光谱批量应用光谱变换."""
+    spectra = _export_spectra(sample_blocks)
+    if not spectra:
+        return
+    try:
+        transformed = transform_point_lists([spectrum.points for spectrum in spectra], transforms)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail="光谱长度不足以应用变换") from exc
+    for spectrum, points in zip(spectra, transformed):
+        spectrum.points = points
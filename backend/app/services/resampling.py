@@ -0,0 +1,208 @@
+from __future__ import annotations
+
+from collections.abc import Sequence
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Literal
+
+import numpy as np
+
+ResampleMethod = Literal["linear", "gaussian"]
+
+# 高斯响应截断范围（标准差倍数）
+GAUSSIAN_SUPPORT = 3.0
+FWHM_TO_SIGMA = 1.0 / (2.0 * np.sqrt(2.0 * np.log(2.0)))
+
+
+@dataclass(frozen=True)
+class ResamplingMatrix:
+    """稀疏重采样矩阵（ELL 格式：每个目标波段固定数量的 (源波段, 权重)）.
+
+    indices / weights: (target, width)；valid: 目标波段是否落在源波长范围内。
+    """
+
+    indices: np.ndarray
+    weights: np.ndarray
+    valid: np.ndarray
+    source_size: int
+
+    @property
+    def target_size(self) -> int:
+        return int(self.indices.shape[0])
+
+    def apply(self, values: np.ndarray) -> np.ndarray:
+        """对最后一维做稀疏矩阵乘：(..., source) -> (..., target).
+
+        源强度中的 NaN 不参与加权，权重在剩余有效波段上重新归一化；
+        某个目标波段的有效权重全为 0 时才输出 NaN。
+        """
+        data = np.asarray(values, dtype=np.float32)
+        if data.shape[-1] != self.source_size:
+            raise ValueError("spectrum length does not match source grid")
+        finite = np.isfinite(data)
+        if finite.all():
+            result = np.einsum("...tw,tw->...t", data[..., self.indices], self.weights)
+        else:
+            gathered = np.where(finite, data, 0.0)[..., self.indices]
+            mask = finite[..., self.indices]
+            total = np.einsum("...tw,tw->...t", mask.astype(np.float32), self.weights)
+            weighted = np.einsum("...tw,tw->...t", gathered, self.weights)
+            with np.errstate(divide="ignore", invalid="ignore"):
+                result = np.where(total > 1e-6, weighted / total, np.nan).astype(np.float32)
+        result[..., ~self.valid] = np.nan
+        return result
+
+    def to_dense(self) -> np.ndarray:
+        """(target, source) 稠密矩阵，便于调试与测试."""
+        dense = np.zeros((self.target_size, self.source_size), dtype=np.float32)
+        rows = np.repeat(np.arange(self.target_size), self.indices.shape[1])
+        np.add.at(dense, (rows, self.indices.ravel()), self.weights.ravel())
+        return dense
+
+
+def _linear_kernel(source: np.ndarray, target: np.ndarray) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    order = np.argsort(source, kind="stable")
+    ordered = source[order]
+    right = np.clip(np.searchsorted(ordered, target), 1, ordered.size - 1)
+    left = right - 1
+    span = ordered[right] - ordered[left]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        fraction = np.where(span > 0, (target - ordered[left]) / span, 0.0)
+    fraction = np.clip(fraction, 0.0, 1.0)
+    indices = np.stack([order[left], order[right]], axis=1)
+    weights = np.stack([1.0 - fraction, fraction], axis=1)
+    valid = (target >= ordered[0]) & (target <= ordered[-1])
+    return indices, weights, valid
+
+
+def _gaussian_kernel(
+    source: np.ndarray,
+    target: np.ndarray,
+    target_fwhm: np.ndarray,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    order = np.argsort(source, kind="stable")
+    ordered = source[order]
+    sigma = np.maximum(target_fwhm * FWHM_TO_SIGMA, 1e-6)
+    low = np.searchsorted(ordered, target - GAUSSIAN_SUPPORT * sigma, side="left")
+    high = np.searchsorted(ordered, target + GAUSSIAN_SUPPORT * sigma, side="right")
+    # 支撑区间内没有源波段时退化为最近邻
+    nearest = np.clip(np.searchsorted(ordered, target), 0, ordered.size - 1)
+    empty = high <= low
+    low = np.where(empty, nearest, low)
+    high = np.where(empty, nearest + 1, high)
+
+    width = int((high - low).max())
+    offsets = low[:, None] + np.arange(width)[None, :]
+    inside = offsets < high[:, None]
+    positions = np.minimum(offsets, ordered.size - 1)
+    distance = ordered[positions] - target[:, None]
+    weights = np.exp(-0.5 * (distance / sigma[:, None]) ** 2) * inside
+    weights /= np.maximum(weights.sum(axis=1, keepdims=True), 1e-12)
+    valid = (target >= ordered[0] - sigma) & (target <= ordered[-1] + sigma)
+    return order[positions], weights, valid
+
+
+def _grid_fwhm(target: np.ndarray) -> np.ndarray:
+    if target.size == 1:
+        return np.ones(1)
+    return np.abs(np.gradient(target))
+
+
+def _kernel_fwhm(
+    source: np.ndarray,
+    target: np.ndarray,
+    source_fwhm: tuple[float, ...] | None,
+) -> np.ndarray:
+    """高斯核宽度：有传感器标定的 fwhm 时按波长插值到目标波段，否则用目标网格间距."""
+    if source_fwhm is None:
+        return _grid_fwhm(target)
+    order = np.argsort(source, kind="stable")
+    fwhm = np.asarray(source_fwhm, dtype=np.float64)[order]
+    return np.interp(target, source[order], fwhm)
+
+
+@lru_cache(maxsize=128)
+def _build_matrix(
+    source: tuple[float, ...],
+    target: tuple[float, ...],
+    method: ResampleMethod,
+    source_fwhm: tuple[float, ...] | None,
+) -> ResamplingMatrix:
+    source_arr = np.asarray(source, dtype=np.float64)
+    target_arr = np.asarray(target, dtype=np.float64)
+    if method == "gaussian":
+        indices, weights, valid = _gaussian_kernel(
+            source_arr, target_arr, _kernel_fwhm(source_arr, target_arr, source_fwhm)
+        )
+    else:
+        indices, weights, valid = _linear_kernel(source_arr, target_arr)
+    return ResamplingMatrix(
+        indices=indices.astype(np.intp),
+        weights=weights.astype(np.float32),
+        valid=valid,
+        source_size=source_arr.size,
+    )
+
+
+def _fwhm_key(source_fwhm: Sequence[float] | None, size: int) -> tuple[float, ...] | None:
+    """只采用与源网格等长且全为正的 fwhm."""
+    if source_fwhm is None or len(source_fwhm) != size:
+        return None
+    fwhm = tuple(map(float, source_fwhm))
+    return fwhm if all(value > 0 for value in fwhm) else None
+
+
+def get_resampling_matrix(
+    source: Sequence[float],
+    target: Sequence[float],
+    method: ResampleMethod = "linear",
+    source_fwhm: Sequence[float] | None = None,
+) -> ResamplingMatrix:
+    """获取 (源网格, 目标网格, 方法, 源 fwhm) 对应的重采样矩阵（进程内缓存）."""
+    if len(source) == 0 or len(target) == 0:
+        raise ValueError("wavelength grids must not be empty")
+    fwhm = _fwhm_key(source_fwhm, len(source)) if method == "gaussian" else None
+    return _build_matrix(tuple(map(float, source)), tuple(map(float, target)), method, fwhm)
+
+
+def resample_spectra(
+    values: np.ndarray,
+    source: Sequence[float],
+    target: Sequence[float],
+    method: ResampleMethod = "linear",
+    source_fwhm: Sequence[float] | None = None,
+) -> np.ndarray:
+    """把一批光谱 (..., source) 重采样到目标网格."""
+    return get_resampling_matrix(source, target, method, source_fwhm).apply(values)
+
+
+def resample_point_lists(
+    curves: list[list[dict]],
+    target: Sequence[float],
+    method: ResampleMethod = "linear",
+    fwhms: Sequence[Sequence[float] | None] | None = None,
+) -> list[list[dict]]:
+    """批量重采样 [{wavelength, intensity}, ...] 曲线.
+
+    fwhms 与 curves 一一对应（可选）。同一源网格与 fwhm 的曲线合并为一个矩阵，只做一次稀疏乘法。
+    """
+    groups: dict[tuple[tuple[float, ...], tuple[float, ...] | None], list[int]] = {}
+    columns: list[np.ndarray] = []
+    for position, points in enumerate(curves):
+        axis = tuple(float(point["wavelength"]) for point in points)
+        columns.append(np.asarray([point["intensity"] for point in points], dtype=np.float32))
+        if axis:
+            fwhm = _fwhm_key(fwhms[position], len(axis)) if fwhms is not None else None
+            groups.setdefault((axis, fwhm), []).append(position)
+
+    target_list = [float(value) for value in target]
+    results: list[list[dict]] = [[] for _ in curves]
+    for (axis, fwhm), positions in groups.items():
+        stacked = np.stack([columns[position] for position in positions])
+        resampled = resample_spectra(stacked, axis, target_list, method, fwhm)
+        for row, position in zip(resampled, positions):
+            results[position] = [
+                {"wavelength": wavelength, "intensity": None if np.isnan(value) else float(value)}
+                for wavelength, value in zip(target_list, row)
+            ]
+    return results
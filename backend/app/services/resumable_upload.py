@@ -0,0 +1,330 @@
+from __future__ import annotations
+
+import hashlib
+import os
+import re
+import shutil
+import time
+from collections import defaultdict
+from collections.abc import AsyncIterator
+from datetime import datetime, timezone
+from pathlib import Path
+from uuid import uuid4
+
+from fastapi import HTTPException, status
+from starlette.concurrency import run_in_threadpool
+
+from app.core.config import settings
+from app.core.paths import DATA_SOURCE_ROOT, STAGING_ROOT
+from app.core.workers import submit_background
+from app.schemas.project import (
+    DataSourceUploadResponse,
+    UploadSessionCreate,
+    UploadSessionFileStatus,
+    UploadSessionResponse,
+)
+from app.services.blob_store import adopt_file, hash_file, new_hasher
+from app.services.data_source_index import data_source_index
+from app.services.hsi import read_cube_header, read_json, write_json_atomic
+from app.services.upload import (
+    UPLOAD_CHUNK_SIZE,
+    normalize_relative_path,
+    validate_folder_name,
+)
+
+MAX_SESSION_FILES = 5000
+
+SESSION_FILE = "session.json"
+SESSION_ID_PATTERN = re.compile(r"[0-9a-f]{32}")
+CONTENT_RANGE_PATTERN = re.compile(r"^bytes (\d+)-(\d+)/(\d+)$")
+
+# 按顺序到达的区间可以边写边哈希：(session_id, index) -> (已哈希到的偏移, hasher)
+_sequential_hashers: dict[tuple[str, int], tuple[int, hashlib.blake2b]] = {}
+
+
+def _session_dir(session_id: str) -> Path:
+    if not SESSION_ID_PATTERN.fullmatch(session_id):
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="上传会话不存在")
+    return STAGING_ROOT / session_id
+
+
+def _load_session(session_id: str, user_id: int) -> tuple[Path, dict]:
+    """读取会话；其他用户的会话与不存在的会话同样返回 404."""
+    directory = _session_dir(session_id)
+    session = read_json(directory / SESSION_FILE)
+    if session is None or session.get("created_by") != user_id:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="上传会话不存在")
+    return directory, session
+
+
+def _merge_ranges(ranges: list[tuple[int, int]]) -> list[list[int]]:
+    merged: list[list[int]] = []
+    for start, end in sorted(ranges):
+        if merged and start <= merged[-1][1]:
+            merged[-1][1] = max(merged[-1][1], end)
+        else:
+            merged.append([start, end])
+    return merged
+
+
+def _received_ranges(directory: Path, index: int) -> list[list[int]]:
+    """读取已接收区间（每个完成的分块向日志追加一行 "start end"）."""
+    log = directory / "ranges" / f"{index}.log"
+    try:
+        lines = log.read_text(encoding="utf-8").split()
+    except OSError:
+        return []
+    pairs = [(int(lines[i]), int(lines[i + 1])) for i in range(0, len(lines) - 1, 2)]
+    return _merge_ranges(pairs)
+
+
+def _file_status(directory: Path, index: int, entry: dict) -> UploadSessionFileStatus:
+    received = _received_ranges(directory, index)
+    complete = entry["size"] == 0 or received == [[0, entry["size"]]]
+    return UploadSessionFileStatus(
+        index=index,
+        path=entry["path"],
+        size=entry["size"],
+        received=received,
+        complete=complete,
+    )
+
+
+def _session_status(directory: Path, session: dict) -> UploadSessionResponse:
+    files = [_file_status(directory, index, entry) for index, entry in enumerate(session["files"])]
+    return UploadSessionResponse(
+        session_id=session["session_id"],
+        folder_name=session["folder_name"],
+        files=files,
+        complete=all(item.complete for item in files),
+    )
+
+
+def create_upload_session(payload: UploadSessionCreate, *, user_id: int) -> UploadSessionResponse:
+    """创建会话并预分配（稀疏）目标文件；文件在 finalize 前对数据源列表不可见."""
+    safe_folder = validate_folder_name(payload.folder_name)
+    if len(payload.files) > MAX_SESSION_FILES:
+        raise HTTPException(status_code=400, detail="单次上传文件过多")
+    if (DATA_SOURCE_ROOT / safe_folder).exists():
+        raise HTTPException(status_code=400, detail="目标文件夹已存在")
+
+    entries: list[dict] = []
+    seen: set[str] = set()
+    for item in payload.files:
+        relative = normalize_relative_path(item.path, safe_folder, None).as_posix()
+        if relative.casefold() in seen:
+            raise HTTPException(status_code=400, detail="文件路径重复")
+        seen.add(relative.casefold())
+        entries.append({"path": relative, "size": item.size})
+
+    session_id = uuid4().hex
+    directory = STAGING_ROOT / session_id
+    (directory / "ranges").mkdir(parents=True)
+    for index, entry in enumerate(entries):
+        target = directory / "data" / entry["path"]
+        target.parent.mkdir(parents=True, exist_ok=True)
+        with target.open("wb") as f:
+            f.truncate(entry["size"])
+        _sequential_hashers[(session_id, index)] = (0, new_hasher())
+
+    session = {
+        "session_id": session_id,
+        "folder_name": safe_folder,
+        "created_by": user_id,
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "files": entries,
+    }
+    write_json_atomic(directory / SESSION_FILE, session)
+    schedule_session_cleanup()
+    return _session_status(directory, session)
+
+
+def get_upload_session(session_id: str, *, user_id: int) -> UploadSessionResponse:
+    directory, session = _load_session(session_id, user_id)
+    return _session_status(directory, session)
+
+
+def parse_content_range(header: str | None) -> tuple[int, int, int]:
+    """解析 "bytes start-end/total"，返回 (start, end_exclusive, total)."""
+    match = CONTENT_RANGE_PATTERN.match((header or "").strip())
+    if not match:
+        raise HTTPException(status_code=400, detail="Content-Range 格式错误")
+    start, last, total = (int(value) for value in match.groups())
+    if last < start or last >= total:
+        raise HTTPException(status_code=400, detail="Content-Range 范围无效")
+    return start, last + 1, total
+
+
+def _pwrite_all(fd: int, data: bytes, offset: int, hasher: hashlib.blake2b | None = None) -> int:
+    view = memoryview(data)
+    if hasher is not None:
+        hasher.update(view)
+    while view:
+        written = os.pwrite(fd, view, offset)
+        view = view[written:]
+        offset += written
+    return offset
+
+
+def _record_range(directory: Path, index: int, start: int, end: int) -> None:
+    # O_APPEND 的单次短写入是原子的，并行分块可以安全地写同一个日志
+    fd = os.open(directory / "ranges" / f"{index}.log", os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+    try:
+        os.write(fd, f"{start} {end}\n".encode())
+    finally:
+        os.close(fd)
+
+
+async def write_upload_range(
+    session_id: str,
+    index: int,
+    content_range: str | None,
+    body: AsyncIterator[bytes],
+    *,
+    user_id: int,
+) -> UploadSessionFileStatus:
+    """把一个字节区间用 pwrite 写到文件偏移处；多个区间可并行上传."""
+    directory, session = _load_session(session_id, user_id)
+    if index < 0 or index >= len(session["files"]):
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="文件不存在")
+    entry = session["files"][index]
+    start, end, total = parse_content_range(content_range)
+    if total != entry["size"]:
+        raise HTTPException(status_code=400, detail="文件大小与会话记录不符")
+
+    # 区间恰好接在已哈希部分之后时接管 hasher；失败的区间不会归还，该文件不再参与去重
+    key = (session_id, index)
+    hasher: hashlib.blake2b | None = None
+    if key in _sequential_hashers and _sequential_hashers[key][0] == start:
+        hasher = _sequential_hashers.pop(key)[1]
+
+    fd = await run_in_threadpool(os.open, directory / "data" / entry["path"], os.O_WRONLY)
+    offset = start
+    buffer = bytearray()
+    try:
+        async for chunk in body:
+            if offset + len(buffer) + len(chunk) > end:
+                raise HTTPException(status_code=400, detail="分块长度与 Content-Range 不符")
+            buffer += chunk
+            if len(buffer) >= UPLOAD_CHUNK_SIZE:
+                offset = await run_in_threadpool(_pwrite_all, fd, bytes(buffer), offset, hasher)
+                buffer.clear()
+        if buffer:
+            offset = await run_in_threadpool(_pwrite_all, fd, bytes(buffer), offset, hasher)
+    finally:
+        await run_in_threadpool(os.close, fd)
+    if offset != end:
+        raise HTTPException(status_code=400, detail="分块长度与 Content-Range 不符")
+
+    await run_in_threadpool(_record_range, directory, index, start, end)
+    # 会话文件的 mtime 记录最后一次写入，过期清理以此为准
+    await run_in_threadpool(os.utime, directory / SESSION_FILE)
+    if hasher is not None:
+        _sequential_hashers[key] = (end, hasher)
+    return _file_status(directory, index, entry)
+
+
+def _validate_cube_sizes(data_dir: Path, entries: list[dict]) -> None:
+    """校验每个 .spe 的大小与同名 .hdr 声明的尺寸一致."""
+    headers: dict[tuple[str, str], str] = {}
+    cubes: defaultdict[tuple[str, str], list[dict]] = defaultdict(list)
+    for entry in entries:
+        relative = Path(entry["path"])
+        key = (relative.parent.as_posix(), relative.stem)
+        suffix = relative.suffix.lower()
+        if suffix == ".hdr":
+            headers[key] = entry["path"]
+        elif suffix == ".spe":
+            cubes[key].append(entry)
+
+    for key, items in cubes.items():
+        header_path = headers.get(key)
+        if header_path is None:
+            continue
+        try:
+            header = read_cube_header(data_dir / header_path)
+        except (OSError, ValueError) as exc:
+            raise HTTPException(status_code=400, detail=f"头文件无法解析: {header_path}") from exc
+        for item in items:
+            if item["size"] != header.expected_bytes:
+                raise HTTPException(
+                    status_code=400,
+                    detail=f"立方体文件大小与头文件不符: {item['path']}",
+                )
+
+
+def finalize_upload_session(session_id: str, *, user_id: int) -> DataSourceUploadResponse:
+    """校验完整性与立方体尺寸后，把暂存目录原子地移动到数据源目录."""
+    directory, session = _load_session(session_id, user_id)
+    state = _session_status(directory, session)
+    if not state.complete:
+        raise HTTPException(status_code=400, detail="文件尚未上传完成")
+
+    data_dir = directory / "data"
+    _validate_cube_sizes(data_dir, session["files"])
+    target_dir = DATA_SOURCE_ROOT / session["folder_name"]
+    if target_dir.exists():
+        raise HTTPException(status_code=400, detail="目标文件夹已存在")
+
+    deduplicated_files = deduplicated_bytes = 0
+    for index, entry in enumerate(session["files"]):
+        hashed = _sequential_hashers.pop((session_id, index), None)
+        path = data_dir / entry["path"]
+        if hashed is not None and hashed[0] == entry["size"]:
+            digest = hashed[1].hexdigest()
+        else:
+            # 乱序/并行上传、由其他 worker 接收或进程重启后没有完整哈希，重新读一遍文件
+            digest = hash_file(path)
+        stored = adopt_file(path, digest)
+        if stored.deduplicated:
+            deduplicated_files += 1
+            deduplicated_bytes += stored.size
+    # 暂存目录与数据源在同一文件系统下，rename 使整个文件夹一次性可见
+    os.rename(data_dir, target_dir)
+    shutil.rmtree(directory, ignore_errors=True)
+    data_source_index.invalidate()
+    return DataSourceUploadResponse(
+        name=session["folder_name"],
+        total_files=len(session["files"]),
+        deduplicated_files=deduplicated_files,
+        deduplicated_bytes=deduplicated_bytes,
+    )
+
+
+def _discard_session(directory: Path, session_id: str, file_count: int) -> None:
+    for index in range(file_count):
+        _sequential_hashers.pop((session_id, index), None)
+    shutil.rmtree(directory, ignore_errors=True)
+
+
+def abort_upload_session(session_id: str, *, user_id: int) -> None:
+    directory, session = _load_session(session_id, user_id)
+    _discard_session(directory, session_id, len(session["files"]))
+
+
+def collect_expired_sessions(now: float | None = None) -> int:
+    """删除超过 TTL 没有写入的上传会话及其暂存文件，返回删除数量."""
+    if not STAGING_ROOT.is_dir():
+        return 0
+    cutoff = (time.time() if now is None else now) - settings.upload_session_ttl_hours * 3600
+    removed = 0
+    for directory in STAGING_ROOT.iterdir():
+        if not SESSION_ID_PATTERN.fullmatch(directory.name):
+            continue
+        session_file = directory / SESSION_FILE
+        try:
+            # 会话文件尚未写入（创建中途崩溃）时以目录时间为准
+            last_active = (session_file if session_file.exists() else directory).stat().st_mtime
+        except OSError:
+            continue
+        if last_active >= cutoff:
+            continue
+        session = read_json(session_file) or {}
+        _discard_session(directory, directory.name, len(session.get("files") or []))
+        removed += 1
+    return removed
+
+
+def schedule_session_cleanup() -> None:
+    """在后台线程池中清理过期会话（启动时与每次创建会话时触发）."""
+    submit_background(collect_expired_sessions)
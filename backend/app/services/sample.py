@@ -1,31 +1,45 @@
 from __future__ import annotations
 
+import hashlib
+import json
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
-from typing import Iterable
+from typing import Iterable, cast
+from uuid import uuid4
 
 from fastapi import HTTPException, status
-from sqlalchemy import select
-from sqlalchemy.orm import joinedload, selectinload
+from sqlalchemy import Table, bindparam, delete, func, insert, literal, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import joinedload, load_only, selectinload
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.config import settings
 from app.models.annotation_detail import AnnotationDetail
 from app.models.annotation_detail_mode import AnnotationDetailMode
-from app.models.annotation_sample import AnnotationSample
+from app.models.annotation_sample import CUBE_METADATA_COLUMNS, AnnotationSample
 from app.models.annotation_spectrum import AnnotationSpectrum
+from app.models.annotation_tombstone import AnnotationTombstone
+from app.models.project import AnnotationProject
+from app.models.spectrum_axis import SpectrumAxis
 from app.schemas.sample import (
     AnnotationDetailCreate,
     AnnotationDetailModeCreate,
     AnnotationDetailModeResponse,
+    AnnotationDetailPatch,
     AnnotationDetailResponse,
     AnnotationSampleDetail,
     AnnotationSampleSummary,
+    AnnotationSpectrumCreate,
     AnnotationSpectrumResponse,
+    SampleAnnotationsPatch,
     SampleAnnotationsPayload,
+    SampleListFilters,
     SampleListResponse,
     SampleStatusUpdate,
 )
 from app.services.display_algorithm import get_display_algorithm_by_code
-from app.services.project import DATA_SOURCE_ROOT, refresh_project_statistics
+from app.services.project import DATA_SOURCE_ROOT, next_change_version, refresh_project_statistics
+from app.services.spectrum_codec import axis_content_hash, pack_points, unpack_points
 
 
 def _ensure_sample_asset(path: Path) -> None:
@@ -36,17 +50,106 @@ def _ensure_sample_asset(path: Path) -> None:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="非法文件路径") from exc
 
 
+async def get_sample_or_404(db: AsyncSession, sample_id: int) -> AnnotationSample:
+    """获取样本（不加载标注）."""
+    sample = await db.get(AnnotationSample, sample_id)
+    if not sample:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="样本不存在")
+    return sample
+
+
+def _cube_metadata(sample: AnnotationSample) -> dict:
+    return {name: getattr(sample, name) for name in CUBE_METADATA_COLUMNS}
+
+
+def _filter_conditions(filters: SampleListFilters) -> list:
+    """把筛选参数转换为 WHERE 条件（均落在 project_id 前缀的复合索引上）."""
+    columns = AnnotationSample
+    ranges = (
+        (columns.cube_bands, filters.min_bands, filters.max_bands),
+        (columns.cube_lines, filters.min_lines, filters.max_lines),
+        (columns.cube_samples, filters.min_samples, filters.max_samples),
+        (columns.file_size, filters.min_file_size, filters.max_file_size),
+    )
+    conditions = []
+    for column, low, high in ranges:
+        if low is not None:
+            conditions.append(column >= low)
+        if high is not None:
+            conditions.append(column <= high)
+    if filters.status is not None:
+        conditions.append(columns.status == filters.status)
+    if filters.is_annotated is not None:
+        conditions.append(columns.is_annotated.is_(filters.is_annotated))
+    if filters.last_annotated_by is not None:
+        conditions.append(columns.last_annotated_by == filters.last_annotated_by)
+    if filters.sample_type is not None:
+        conditions.append(columns.sample_type == filters.sample_type)
+    if filters.interleave is not None:
+        conditions.append(columns.interleave == filters.interleave)
+    if filters.data_type is not None:
+        conditions.append(columns.data_type == filters.data_type)
+    # 波长范围：样本需覆盖所请求的区间
+    if filters.wavelength_min is not None:
+        conditions.append(columns.wavelength_min <= filters.wavelength_min)
+    if filters.wavelength_max is not None:
+        conditions.append(columns.wavelength_max >= filters.wavelength_max)
+    if filters.has_dark is not None:
+        conditions.append(columns.has_dark.is_(filters.has_dark))
+    if filters.has_white is not None:
+        conditions.append(columns.has_white.is_(filters.has_white))
+    return conditions
+
+
 async def list_samples_for_project(
     db: AsyncSession,
     project_id: int,
+    filters: SampleListFilters | None = None,
+    *,
+    cursor: int | None = None,
+    limit: int | None = None,
+    with_total: bool = False,
 ) -> SampleListResponse:
+    """按 id 游标分页列出样本.
+
+    取 id > cursor 的前 limit 条（多取一条判断是否还有下一页），走 (project_id, id) 索引；
+    API 默认每页 SAMPLE_PAGE_SIZE 条；with_total 且无筛选条件时直接使用项目上维护的样本数。
+    """
+    conditions = [AnnotationSample.project_id == project_id]
+    if filters is not None:
+        conditions.extend(_filter_conditions(filters))
     query = (
         select(AnnotationSample)
-        .where(AnnotationSample.project_id == project_id)
+        .options(
+            load_only(
+                AnnotationSample.id,
+                AnnotationSample.sample_id,
+                AnnotationSample.project_id,
+                AnnotationSample.sample_type,
+                AnnotationSample.status,
+                AnnotationSample.is_annotated,
+                AnnotationSample.last_annotated_by,
+                AnnotationSample.source_files,
+                AnnotationSample.created_at,
+                AnnotationSample.updated_at,
+                *(getattr(AnnotationSample, name) for name in CUBE_METADATA_COLUMNS),
+            )
+        )
+        .where(*conditions)
         .order_by(AnnotationSample.id.asc())
     )
+    if cursor is not None:
+        query = query.where(AnnotationSample.id > cursor)
+    if limit is not None:
+        query = query.limit(limit + 1)
     result = await db.execute(query)
-    samples = result.scalars().all()
+    samples = list(result.scalars().all())
+
+    next_cursor = None
+    if limit is not None and len(samples) > limit:
+        samples = samples[:limit]
+        next_cursor = samples[-1].id
+
     items = [
         AnnotationSampleSummary(
             id=sample.id,
@@ -60,10 +163,31 @@ async def list_samples_for_project(
             created_at=sample.created_at,
             updated_at=sample.updated_at,
             has_annotations=sample.is_annotated,
+            **_cube_metadata(sample),
         )
         for sample in samples
     ]
-    return SampleListResponse(items=items, total=len(items))
+
+    total: int | None = None
+    total_estimated = False
+    if cursor is None and next_cursor is None:
+        # 第一页即全部结果，总数精确可得
+        total = len(items)
+    elif with_total:
+        unfiltered = filters is None or not filters.model_dump(exclude_none=True)
+        if unfiltered:
+            total = await db.scalar(
+                select(AnnotationProject.total_samples).where(AnnotationProject.id == project_id)
+            )
+            total_estimated = True
+        else:
+            total = await db.scalar(select(func.count(AnnotationSample.id)).where(*conditions))
+    return SampleListResponse(
+        items=items,
+        total=total,
+        total_estimated=total_estimated,
+        next_cursor=next_cursor,
+    )
 
 
 async def get_sample_detail(
@@ -80,6 +204,7 @@ async def get_sample_detail(
         .options(
             selectinload(AnnotationSample.details)
             .selectinload(AnnotationDetail.spectra)
+            .selectinload(AnnotationSpectrum.axis)
         )
         .where(AnnotationSample.id == sample_id)
     )
@@ -94,7 +219,7 @@ async def get_sample_detail(
             snapshot = detail.mode_snapshot
             mode_snapshot = AnnotationDetailModeResponse(
                 id=snapshot.id,
-                detail_id=snapshot.detail_id,
+                detail_id=detail.id,
                 r_channel=snapshot.r_channel,
                 g_channel=snapshot.g_channel,
                 b_channel=snapshot.b_channel,
@@ -104,8 +229,8 @@ async def get_sample_detail(
                 gain_algorithm=snapshot.gain_algorithm,
                 dark_calibration=snapshot.dark_calibration,
                 white_calibration=snapshot.white_calibration,
-                created_at=snapshot.created_at,
-                updated_at=snapshot.updated_at,
+                created_at=detail.created_at,
+                updated_at=detail.updated_at,
             )
 
         spectra = [
@@ -113,7 +238,7 @@ async def get_sample_detail(
                 id=spectrum.id,
                 detail_id=spectrum.detail_id,
                 position=spectrum.position,
-                points=spectrum.points or [],
+                points=unpack_points(spectrum.values, spectrum.axis.wavelengths),
                 created_at=spectrum.created_at,
                 updated_at=spectrum.updated_at,
             )
@@ -151,7 +276,10 @@ async def get_sample_detail(
         source_files=sample.source_files,
         created_at=sample.created_at,
         updated_at=sample.updated_at,
+        wavelengths=sample.wavelengths,
+        fwhm=sample.fwhm,
         annotations=annotations,
+        **_cube_metadata(sample),
     )
 
 
@@ -166,9 +294,13 @@ async def update_sample_status(
     if not sample:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="样本不存在")
 
-    sample.status = payload.status
+    if sample.status == "missing":
+        sample.status_before_missing = payload.status
+    else:
+        sample.status = payload.status
     if payload.is_annotated is not None:
         sample.is_annotated = payload.is_annotated
+    sample.change_version = await next_change_version(db, sample.project_id)
 
     await db.flush()
     await refresh_project_statistics(db, sample.project_id)
@@ -182,70 +314,366 @@ async def replace_annotations(
     *,
     user_id: int | None,
 ) -> AnnotationSampleDetail:
-    sample_query = (
-        select(AnnotationSample)
-        .options(selectinload(AnnotationSample.details))
-        .where(AnnotationSample.id == sample_id)
+    """整体保存标注：按 detail_id 与已有标注比对，只写入新增、修改与删除的部分."""
+    sample = await get_sample_or_404(db, sample_id)
+
+    kept_ids = [item.detail_id for item in payload.annotations if item.detail_id is not None]
+    if len(set(kept_ids)) != len(kept_ids):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="标注 ID 重复")
+    rows = await db.execute(
+        select(AnnotationDetail.detail_id, AnnotationDetail.id).where(AnnotationDetail.sample_id == sample.id)
     )
-    result = await db.execute(sample_query)
-    sample = result.scalar_one_or_none()
-    if not sample:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="样本不存在")
+    existing: dict[str, int] = {detail_id: pk for detail_id, pk in rows}
+    retained = set(kept_ids)
+    if not existing.keys() >= retained:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="标注不存在")
 
-    for detail in list(sample.details):
-        await db.delete(detail)
+    version = await next_change_version(db, sample.project_id)
+    kept = [(existing[item.detail_id], item) for item in payload.annotations if item.detail_id is not None]
+    unchanged = await _unchanged_details(db, kept)
+    await _delete_details(db, sample, [pk for detail_id, pk in existing.items() if detail_id not in retained], version)
+    await _update_details(
+        db,
+        [
+            (pk, AnnotationDetailPatch(**{name: getattr(item, name) for name in AnnotationDetailPatch.model_fields}))
+            for pk, item in kept
+            if pk not in unchanged
+        ],
+        version,
+    )
+    await _insert_details(db, sample, [item for item in payload.annotations if item.detail_id is None], version)
 
+    sample.is_annotated = payload.mark_annotated and bool(payload.annotations)
+    sample.last_annotated_by = user_id
+    sample.change_version = version
     await db.flush()
+    await refresh_project_statistics(db, sample.project_id)
+    db.expire_all()
+    return await get_sample_detail(db, sample_id)
+
+
+# 按内容哈希去重写入时，并发冲突后的最多尝试次数
+INTERN_ATTEMPTS = 3
+# 快照内容字段及归一化类型（数据库读回的 0/1 与 bool 哈希一致）
+MODE_FIELDS = (
+    ("r_channel", int),
+    ("g_channel", int),
+    ("b_channel", int),
+    ("r_gain", float),
+    ("g_gain", float),
+    ("b_gain", float),
+    ("gain_algorithm_id", int),
+    ("dark_calibration", bool),
+    ("white_calibration", bool),
+)
+DETAIL_FIELDS = (
+    "label_name",
+    "color",
+    "tool_type",
+    "coordinates",
+    "radius",
+    "area",
+    "confidence",
+    "remark",
+)
+
+
+async def _resolve_algorithm_ids(db: AsyncSession, codes: Iterable[str]) -> dict[str, int]:
+    ids: dict[str, int] = {}
+    for code in set(codes):
+        algorithm = await get_display_algorithm_by_code(db, code)
+        ids[code] = algorithm.id
+    return ids
+
+
+def mode_content_hash(row: dict) -> str:
+    """显示模式快照的内容哈希（与字段类型归一化后的取值一一对应）."""
+    content = [convert(row[name]) for name, convert in MODE_FIELDS]
+    return hashlib.sha256(json.dumps(content).encode("utf-8")).hexdigest()
 
-    algorithm_cache: dict[str, int] = {}
-
-    for detail_payload in payload.annotations:
-        detail = AnnotationDetail(
-            sample_id=sample.id,
-            label_name=detail_payload.label_name,
-            color=detail_payload.color,
-            tool_type=detail_payload.tool_type,
-            coordinates=detail_payload.coordinates,
-            radius=detail_payload.radius,
-            area=detail_payload.area,
-            confidence=detail_payload.confidence,
-            remark=detail_payload.remark,
-        )
-        db.add(detail)
-        await db.flush()
-
-        if detail_payload.mode_snapshot:
-            algorithm_code = detail_payload.mode_snapshot.gain_algorithm
-            if algorithm_code not in algorithm_cache:
-                algorithm = await get_display_algorithm_by_code(db, algorithm_code)
-                algorithm_cache[algorithm_code] = algorithm.id
-            algorithm_id = algorithm_cache[algorithm_code]
-            db.add(
-                AnnotationDetailMode(
-                    detail_id=detail.id,
-                    r_channel=detail_payload.mode_snapshot.r_channel,
-                    g_channel=detail_payload.mode_snapshot.g_channel,
-                    b_channel=detail_payload.mode_snapshot.b_channel,
-                    r_gain=detail_payload.mode_snapshot.r_gain,
-                    g_gain=detail_payload.mode_snapshot.g_gain,
-                    b_gain=detail_payload.mode_snapshot.b_gain,
-                    gain_algorithm_id=algorithm_id,
-                    dark_calibration=detail_payload.mode_snapshot.dark_calibration,
-                    white_calibration=detail_payload.mode_snapshot.white_calibration,
-                )
-            )
 
-        for spectrum_payload in detail_payload.spectra or []:
-            db.add(
-                AnnotationSpectrum(
-                    detail_id=detail.id,
-                    position=spectrum_payload.position,
-                    points=spectrum_payload.points,
+async def _intern_rows(db: AsyncSession, table: Table, rows: dict[str, dict]) -> dict[str, int]:
+    """按 content_hash 复用已有行，只插入缺少的；返回 {content_hash: id}.
+
+    并发请求抢先写入时 SAVEPOINT 整批回滚，重新查询后只重试仍缺少的哈希。
+    """
+    ids: dict[str, int] = {}
+    pending = list(rows)
+    for _ in range(INTERN_ATTEMPTS):
+        found = await db.execute(select(table.c.content_hash, table.c.id).where(table.c.content_hash.in_(pending)))
+        ids.update({digest: pk for digest, pk in found})
+        pending = [digest for digest in pending if digest not in ids]
+        if not pending:
+            return ids
+        try:
+            async with db.begin_nested():
+                result = await db.execute(
+                    insert(table).returning(table.c.content_hash, table.c.id),
+                    [rows[digest] for digest in pending],
                 )
+                ids.update({digest: pk for digest, pk in result})
+            return ids
+        except IntegrityError:
+            continue
+    raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="并发写入冲突，请重试")
+
+
+async def _hash_modes(
+    db: AsyncSession,
+    modes: list[AnnotationDetailModeCreate | None],
+) -> tuple[dict[str, dict], list[str | None]]:
+    """快照载荷 -> ({哈希: 待写入行}, 与 modes 对齐的哈希)."""
+    algorithm_ids = await _resolve_algorithm_ids(db, (mode.gain_algorithm for mode in modes if mode is not None))
+    rows: dict[str, dict] = {}
+    hashes: list[str | None] = []
+    for mode in modes:
+        if mode is None:
+            hashes.append(None)
+            continue
+        row = mode.model_dump(exclude={"gain_algorithm"})
+        row["gain_algorithm_id"] = algorithm_ids[mode.gain_algorithm]
+        digest = mode_content_hash(row)
+        rows.setdefault(digest, {**row, "content_hash": digest})
+        hashes.append(digest)
+    return rows, hashes
+
+
+async def _intern_modes(db: AsyncSession, modes: list[AnnotationDetailModeCreate | None]) -> list[int | None]:
+    """按内容哈希复用已有快照行，只插入缺少的；返回与 modes 对齐的快照 id."""
+    if not any(mode is not None for mode in modes):
+        return [None] * len(modes)
+    rows, hashes = await _hash_modes(db, modes)
+    ids = await _intern_rows(db, cast(Table, AnnotationDetailMode.__table__), rows)
+    return [None if digest is None else ids[digest] for digest in hashes]
+
+
+async def _intern_axes(db: AsyncSession, axes: list[bytes]) -> list[int]:
+    """波长轴按内容哈希去重入库，返回与 axes 对齐的 id."""
+    rows: dict[str, dict] = {}
+    hashes = []
+    for wavelengths in axes:
+        digest = axis_content_hash(wavelengths)
+        rows.setdefault(digest, {"content_hash": digest, "wavelengths": wavelengths})
+        hashes.append(digest)
+    if not rows:
+        return []
+    ids = await _intern_rows(db, cast(Table, SpectrumAxis.__table__), rows)
+    return [ids[digest] for digest in hashes]
+
+
+async def _insert_spectra(
+    db: AsyncSession,
+    children: list[tuple[int, list[AnnotationSpectrumCreate]]],
+) -> None:
+    """为已有主键的标注批量插入光谱（一条语句）；波长轴去重后引用."""
+    rows = []
+    axes = []
+    for detail_pk, spectra in children:
+        for spectrum in spectra:
+            values, wavelengths = pack_points(spectrum.points)
+            rows.append({"detail_id": detail_pk, "position": spectrum.position, "values": values})
+            axes.append(wavelengths)
+    if rows:
+        for row, axis_id in zip(rows, await _intern_axes(db, axes), strict=True):
+            row["axis_id"] = axis_id
+        await db.execute(insert(cast(Table, AnnotationSpectrum.__table__)), rows)
+
+
+async def _insert_details(
+    db: AsyncSession,
+    sample: AnnotationSample,
+    payloads: list[AnnotationDetailCreate],
+    version: int,
+) -> None:
+    """批量插入标注：detail_id 在客户端生成，INSERT … RETURNING 取回主键，光谱一条语句."""
+    if not payloads:
+        return
+    table = cast(Table, AnnotationDetail.__table__)
+    detail_ids = [uuid4().hex for _ in payloads]
+    mode_ids = await _intern_modes(db, [payload.mode_snapshot for payload in payloads])
+    result = await db.execute(
+        insert(table).returning(table.c.detail_id, table.c.id),
+        [
+            {
+                "detail_id": detail_id,
+                "sample_id": sample.id,
+                "mode_id": mode_id,
+                "change_version": version,
+                **payload.model_dump(include=set(DETAIL_FIELDS)),
+            }
+            for detail_id, mode_id, payload in zip(detail_ids, mode_ids, payloads)
+        ],
+    )
+    # RETURNING 不保证顺序，按 detail_id 对应回请求
+    pks: dict[str, int] = {detail_id: pk for detail_id, pk in result.all()}
+    await _insert_spectra(
+        db,
+        [(pks[detail_id], payload.spectra or []) for detail_id, payload in zip(detail_ids, payloads)],
+    )
+
+
+async def _delete_details(
+    db: AsyncSession,
+    sample: AnnotationSample,
+    detail_pks: list[int],
+    version: int,
+) -> None:
+    """删除标注及其光谱并写入墓碑（不依赖数据库级联；共享的模式快照保留）."""
+    if not detail_pks:
+        return
+    await db.execute(
+        insert(cast(Table, AnnotationTombstone.__table__)).from_select(
+            ["project_id", "sample_id", "detail_id", "change_version"],
+            select(
+                literal(sample.project_id),
+                literal(sample.sample_id),
+                AnnotationDetail.detail_id,
+                literal(version),
+            ).where(AnnotationDetail.id.in_(detail_pks)),
+        )
+    )
+    await db.execute(delete(AnnotationSpectrum).where(AnnotationSpectrum.detail_id.in_(detail_pks)))
+    await db.execute(delete(AnnotationDetail).where(AnnotationDetail.id.in_(detail_pks)))
+    await _prune_tombstones(db, sample.project_id)
+
+
+async def _prune_tombstones(db: AsyncSession, project_id: int) -> None:
+    """清理超过保留期的墓碑，并把项目的墓碑下限推进到已清理的最大版本."""
+    cutoff = datetime.now(timezone.utc) - timedelta(days=settings.tombstone_retention_days)
+    floor = await db.scalar(
+        select(func.max(AnnotationTombstone.change_version)).where(
+            AnnotationTombstone.project_id == project_id,
+            AnnotationTombstone.deleted_at < cutoff,
+        )
+    )
+    if floor is None:
+        return
+    await db.execute(
+        delete(AnnotationTombstone).where(
+            AnnotationTombstone.project_id == project_id,
+            AnnotationTombstone.change_version <= floor,
+        )
+    )
+    await db.execute(
+        update(AnnotationProject).where(AnnotationProject.id == project_id).values(tombstone_floor=floor)
+    )
+
+
+async def _unchanged_details(db: AsyncSession, pairs: list[tuple[int, AnnotationDetailCreate]]) -> set[int]:
+    """比较整体保存中沿用 detail_id 的标注（字段、快照哈希、光谱字节），返回内容未变的主键."""
+    if not pairs:
+        return set()
+    pks = [pk for pk, _ in pairs]
+    columns = [getattr(AnnotationDetail, name) for name in DETAIL_FIELDS]
+    rows = await db.execute(
+        select(AnnotationDetail.id, AnnotationDetailMode.content_hash, *columns)
+        .outerjoin(AnnotationDetailMode, AnnotationDetailMode.id == AnnotationDetail.mode_id)
+        .where(AnnotationDetail.id.in_(pks))
+    )
+    stored = {row[0]: (row[1], dict(zip(DETAIL_FIELDS, row[2:], strict=True))) for row in rows}
+    spectra: dict[int, list[tuple]] = {pk: [] for pk in pks}
+    spectrum_rows = await db.execute(
+        select(
+            AnnotationSpectrum.detail_id,
+            AnnotationSpectrum.position,
+            AnnotationSpectrum.values,
+            SpectrumAxis.content_hash,
+        )
+        .join(SpectrumAxis, SpectrumAxis.id == AnnotationSpectrum.axis_id)
+        .where(AnnotationSpectrum.detail_id.in_(pks))
+        .order_by(AnnotationSpectrum.id)
+    )
+    for detail_pk, position, values, axis_hash in spectrum_rows:
+        spectra[detail_pk].append((position, values, axis_hash))
+
+    _rows, mode_hashes = await _hash_modes(db, [payload.mode_snapshot for _, payload in pairs])
+    unchanged: set[int] = set()
+    for (pk, payload), mode_hash in zip(pairs, mode_hashes, strict=True):
+        stored_hash, fields = stored[pk]
+        if stored_hash != mode_hash or fields != payload.model_dump(include=set(DETAIL_FIELDS)):
+            continue
+        packed = []
+        for spectrum in payload.spectra or []:
+            values, wavelengths = pack_points(spectrum.points)
+            packed.append((spectrum.position, values, axis_content_hash(wavelengths)))
+        if packed == spectra[pk]:
+            unchanged.add(pk)
+    return unchanged
+
+
+async def _update_details(
+    db: AsyncSession,
+    patches: list[tuple[int, AnnotationDetailPatch]],
+    version: int,
+) -> None:
+    """按修改的字段集合分组，每组一条 executemany UPDATE；光谱按需整体替换."""
+    mode_indexes = [index for index, (_pk, patch) in enumerate(patches) if "mode_snapshot" in patch.model_fields_set]
+    interned = await _intern_modes(db, [patches[index][1].mode_snapshot for index in mode_indexes])
+    mode_ids = dict(zip(mode_indexes, interned))
+
+    table = cast(Table, AnnotationDetail.__table__)
+    groups: dict[tuple[str, ...], list[dict]] = {}
+    for index, (detail_pk, patch) in enumerate(patches):
+        values = {name: getattr(patch, name) for name in DETAIL_FIELDS if name in patch.model_fields_set}
+        if index in mode_ids:
+            values["mode_id"] = mode_ids[index]
+        groups.setdefault(tuple(values), []).append({"_id": detail_pk, **values})
+    for fields, rows in groups.items():
+        await db.execute(
+            update(table)
+            .where(table.c.id == bindparam("_id"))
+            .values(updated_at=func.now(), change_version=version, **{name: bindparam(name) for name in fields}),
+            rows,
+        )
+
+    spectra_patches = [(pk, patch.spectra or []) for pk, patch in patches if "spectra" in patch.model_fields_set]
+    if spectra_patches:
+        await db.execute(
+            delete(AnnotationSpectrum).where(AnnotationSpectrum.detail_id.in_([pk for pk, _ in spectra_patches]))
+        )
+    await _insert_spectra(db, spectra_patches)
+
+
+async def patch_annotations(
+    db: AsyncSession,
+    sample_id: int,
+    payload: SampleAnnotationsPatch,
+    *,
+    user_id: int | None,
+) -> AnnotationSampleDetail:
+    """按 detail_id 增量保存标注，只改动涉及的行（批量语句）."""
+    sample = await get_sample_or_404(db, sample_id)
+
+    update_ids = [patch.detail_id for patch in payload.update]
+    if len(set(update_ids)) != len(update_ids) or len(set(payload.delete)) != len(payload.delete):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="标注 ID 重复")
+    if set(update_ids) & set(payload.delete):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="同一标注不能同时更新和删除")
+
+    targets = update_ids + payload.delete
+    pks: dict[str, int] = {}
+    if targets:
+        rows = await db.execute(
+            select(AnnotationDetail.detail_id, AnnotationDetail.id).where(
+                AnnotationDetail.sample_id == sample.id,
+                AnnotationDetail.detail_id.in_(targets),
             )
+        )
+        pks = dict(rows.all())
+        if len(pks) != len(targets):
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="标注不存在")
 
-    sample.is_annotated = payload.mark_annotated and bool(payload.annotations)
+    version = await next_change_version(db, sample.project_id)
+    await _delete_details(db, sample, [pks[detail_id] for detail_id in payload.delete], version)
+    await _update_details(db, [(pks[patch.detail_id], patch) for patch in payload.update], version)
+    await _insert_details(db, sample, payload.add, version)
+
+    remaining = await db.scalar(
+        select(func.count(AnnotationDetail.id)).where(AnnotationDetail.sample_id == sample.id)
+    )
+    sample.is_annotated = payload.mark_annotated and bool(remaining)
     sample.last_annotated_by = user_id
+    sample.change_version = version
     await db.flush()
     await refresh_project_statistics(db, sample.project_id)
     db.expire_all()
@@ -57,6 +57,9 @@ async def create_spectral_mode(
         r_channel=mode_in.r_channel,
         g_channel=mode_in.g_channel,
         b_channel=mode_in.b_channel,
+        r_wavelength=mode_in.r_wavelength,
+        g_wavelength=mode_in.g_wavelength,
+        b_wavelength=mode_in.b_wavelength,
         r_gain=mode_in.r_gain,
         g_gain=mode_in.g_gain,
         b_gain=mode_in.b_gain,
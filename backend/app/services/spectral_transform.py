@@ -0,0 +1,173 @@
+from __future__ import annotations
+
+from collections.abc import Sequence
+from functools import lru_cache
+from math import factorial
+
+import numpy as np
+
+from app.schemas.sample import SpectralTransform
+
+
+@lru_cache(maxsize=64)
+def savgol_coefficients(window: int, order: int, deriv: int = 0) -> np.ndarray:
+    """Savitzky–Golay 卷积核（按 (window, order, deriv) 缓存）."""
+    if window % 2 == 0 or window <= order:
+        raise ValueError("window must be odd and larger than polynomial order")
+    half = window // 2
+    positions = np.arange(-half, half + 1, dtype=np.float64)
+    vandermonde = positions[:, None] ** np.arange(order + 1)[None, :]
+    coefficients = np.linalg.pinv(vandermonde)[deriv] * factorial(deriv)
+    coefficients.setflags(write=False)
+    return coefficients
+
+
+def _fit_window(window: int, order: int, length: int) -> int:
+    """光谱短于窗口时缩小到可用的最大奇数窗口."""
+    if window <= length:
+        return window
+    fitted = length if length % 2 == 1 else length - 1
+    if fitted <= order:
+        raise ValueError("spectrum is too short for the requested window")
+    return fitted
+
+
+def savgol_filter(
+    values: np.ndarray,
+    window: int,
+    order: int,
+    *,
+    deriv: int = 0,
+    delta: float = 1.0,
+) -> np.ndarray:
+    """沿最后一维做 S-G 平滑/求导；批量光谱或 (lines, samples, bands) 块均可."""
+    data = np.asarray(values, dtype=np.float64)
+    window = _fit_window(window, order, data.shape[-1])
+    kernel = savgol_coefficients(window, order, deriv)
+    half = window // 2
+    pad = [(0, 0)] * (data.ndim - 1) + [(half, half)]
+    padded = np.pad(data, pad, mode="edge")
+    windows = np.lib.stride_tricks.sliding_window_view(padded, window, axis=-1)
+    return (windows @ kernel) / (delta**deriv)
+
+
+def continuum_removal(values: np.ndarray, wavelengths: Sequence[float]) -> np.ndarray:
+    """包络线去除：光谱除以其上凸包.
+
+    所有光谱同时迭代：每轮为每条光谱加入高出当前包络最多的点，
+    迭代次数等于凸包顶点数，而不是光谱条数。
+    """
+    data = np.asarray(values, dtype=np.float64)
+    shape = data.shape
+    axis = np.asarray(wavelengths, dtype=np.float64)
+    flat = data.reshape(-1, shape[-1])
+    rows, length = flat.shape
+    if length < 3:
+        return np.ones_like(data)
+
+    positions = np.arange(length)
+    row_index = np.arange(rows)[:, None]
+    hull = np.zeros(flat.shape, dtype=bool)
+    hull[:, [0, -1]] = True
+    # NaN（如重采样到源范围之外）不参与容差与选点，否则整批光谱都会提前停止细化
+    finite = np.isfinite(flat)
+    peak = float(np.abs(flat[finite]).max()) if finite.any() else 0.0
+    tolerance = 1e-9 * max(peak, 1.0)
+
+    continuum = flat
+    for _ in range(length):
+        previous = np.maximum.accumulate(np.where(hull, positions, -1), axis=1)
+        following = np.minimum.accumulate(
+            np.where(hull, positions, length)[:, ::-1], axis=1
+        )[:, ::-1]
+        x0, x1 = axis[previous], axis[following]
+        y0, y1 = flat[row_index, previous], flat[row_index, following]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            fraction = np.where(x1 > x0, (axis - x0) / (x1 - x0), 0.0)
+        continuum = y0 + fraction * (y1 - y0)
+        excess = np.where(finite, flat - continuum, -np.inf)
+        best = np.argmax(excess, axis=1)
+        needs_point = excess[np.arange(rows), best] > tolerance
+        if not needs_point.any():
+            break
+        hull[np.flatnonzero(needs_point), best[needs_point]] = True
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        removed = np.where(continuum > 0, flat / continuum, 1.0)
+    removed[np.isnan(flat)] = np.nan
+    return removed.reshape(shape)
+
+
+def _derivative(
+    values: np.ndarray,
+    wavelengths: Sequence[float] | None,
+    window: int,
+    order: int,
+    deriv: int,
+) -> np.ndarray:
+    """对波长求 1/2 阶导数.
+
+    先按波段序号做 S-G 求导，再用链式法则换算到波长：
+    dy/dλ = y' / λ'，d²y/dλ² = (y'' - y' λ'' / λ') / λ'²，非等间距网格同样成立。
+    没有波长时按波段序号求导。
+    """
+    first = savgol_filter(values, window, order, deriv=1)
+    if wavelengths is None:
+        return first if deriv == 1 else savgol_filter(values, window, order, deriv=2)
+    step = np.gradient(np.asarray(wavelengths, dtype=np.float64))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        if deriv == 1:
+            return first / step
+        second = savgol_filter(values, window, order, deriv=2)
+        curvature = np.gradient(step) if step.size > 1 else np.zeros_like(step)
+        return (second - first * curvature / step) / step**2
+
+
+def apply_transforms(
+    values: np.ndarray,
+    wavelengths: Sequence[float] | None,
+    transforms: Sequence[SpectralTransform],
+) -> np.ndarray:
+    """按顺序对最后一维应用变换链."""
+    result = np.asarray(values, dtype=np.float64)
+    for transform in transforms:
+        if transform.kind == "continuum_removal":
+            axis = wavelengths if wavelengths is not None else [float(index) for index in range(result.shape[-1])]
+            result = continuum_removal(result, axis)
+            continue
+        deriv = {"savgol": 0, "derivative1": 1, "derivative2": 2}[transform.kind]
+        order = max(transform.order, deriv)
+        if deriv == 0:
+            result = savgol_filter(result, transform.window, order)
+        else:
+            result = _derivative(result, wavelengths, transform.window, order, deriv)
+    return result
+
+
+def transform_point_lists(
+    curves: list[list[dict]],
+    transforms: Sequence[SpectralTransform],
+) -> list[list[dict]]:
+    """批量变换 [{wavelength, intensity}, ...] 曲线（同一波长轴的曲线合并计算）."""
+    groups: dict[tuple[float, ...], list[int]] = {}
+    for position, points in enumerate(curves):
+        axis = tuple(float(point.get("wavelength", 0.0)) for point in points)
+        if axis:
+            groups.setdefault(axis, []).append(position)
+
+    results: list[list[dict]] = [list(points) for points in curves]
+    for axis, positions in groups.items():
+        stacked = np.asarray(
+            [
+                [np.nan if point.get("intensity") is None else point["intensity"] for point in curves[position]]
+                for position in positions
+            ],
+            dtype=np.float64,
+        )
+        transformed = apply_transforms(stacked, axis, transforms)
+        for row, position in zip(transformed, positions):
+            results[position] = [
+                {"wavelength": wavelength, "intensity": None if np.isnan(value) else float(value)}
+                for wavelength, value in zip(axis, row)
+            ]
+    return results
@@ -0,0 +1,65 @@
+from __future__ import annotations
+
+import numpy as np
+from fastapi import HTTPException, status
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.concurrency import run_in_threadpool
+
+from app.models.annotation_sample import AnnotationSample
+from app.models.project import AnnotationProject
+from app.schemas.sample import SpectrumExtractionRequest, SpectrumExtractionResponse
+from app.services.hsi import HyperCube
+from app.services.resampling import resample_spectra
+from app.services.spectral_transform import apply_transforms
+
+
+def _read_spectra(
+    source_files: list[str],
+    payload: SpectrumExtractionRequest,
+) -> tuple[np.ndarray, list[float] | None, list[float] | None]:
+    cube = HyperCube.from_source_files(source_files, calibrated=payload.calibrated)
+    lines, samples, _bands = cube.shape
+    coords = np.asarray(payload.pixels, dtype=np.intp)
+    line_idx, sample_idx = coords[:, 0], coords[:, 1]
+    if (
+        (line_idx < 0).any()
+        or (line_idx >= lines).any()
+        or (sample_idx < 0).any()
+        or (sample_idx >= samples).any()
+    ):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="像元坐标超出范围")
+    values = cube.read_pixels(line_idx, sample_idx)
+    if payload.average:
+        values = values.mean(axis=0, keepdims=True)
+    return values, cube.header.wavelengths, cube.header.fwhm
+
+
+async def extract_sample_spectra(
+    db: AsyncSession,
+    sample: AnnotationSample,
+    payload: SpectrumExtractionRequest,
+) -> SpectrumExtractionResponse:
+    """批量读取像元光谱，可选重采样到项目波长网格并应用光谱变换."""
+    grid: list[float] | None = None
+    if payload.resample_to_project_grid:
+        project = await db.get(AnnotationProject, sample.project_id)
+        if not project or not project.wavelength_grid:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="项目未设置波长网格")
+        grid = project.wavelength_grid
+
+    values, wavelengths, fwhm = await run_in_threadpool(_read_spectra, sample.source_files, payload)
+    if grid is not None:
+        if not wavelengths:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="样本缺少波长信息")
+        values = resample_spectra(values, wavelengths, grid, payload.resample_method, fwhm)
+        wavelengths = grid
+    if payload.transforms:
+        try:
+            values = apply_transforms(values, wavelengths, payload.transforms)
+        except ValueError as exc:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="光谱长度不足以应用变换") from exc
+
+    return SpectrumExtractionResponse(
+        wavelengths=wavelengths,
+        values=[[None if np.isnan(v) else float(v) for v in row] for row in values],
+    )
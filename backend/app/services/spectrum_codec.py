@@ -0,0 +1,54 @@
+from __future__ import annotations
+
+import hashlib
+from collections.abc import Sequence
+
+import numpy as np
+
+from app.schemas.sample import SpectrumPoint
+
+# 强度按 float32 小端存储，波长轴按 float64 存储
+VALUE_DTYPE = np.dtype("<f4")
+AXIS_DTYPE = np.dtype("<f8")
+
+
+def pack_points(points: Sequence[SpectrumPoint]) -> tuple[bytes, bytes]:
+    """[{wavelength, intensity}] -> (强度字节, 波长轴字节)；缺失的强度存为 NaN."""
+    count = len(points)
+    wavelengths = np.fromiter((point.wavelength for point in points), dtype=AXIS_DTYPE, count=count)
+    values = np.fromiter(
+        (np.nan if point.intensity is None else point.intensity for point in points),
+        dtype=VALUE_DTYPE,
+        count=count,
+    )
+    return values.tobytes(), wavelengths.tobytes()
+
+
+def axis_content_hash(wavelengths: bytes) -> str:
+    """波长轴字节的内容哈希（spectrum_axes 去重键）."""
+    return hashlib.sha256(wavelengths).hexdigest()
+
+
+def unpack_values(values: bytes) -> np.ndarray:
+    """强度字节 -> float32 数组（零拷贝，只读）."""
+    return np.frombuffer(values, dtype=VALUE_DTYPE)
+
+
+def unpack_axis(wavelengths: bytes) -> np.ndarray:
+    """波长轴字节 -> float64 数组（零拷贝，只读）."""
+    return np.frombuffer(wavelengths, dtype=AXIS_DTYPE)
+
+
+def unpack_points(values: bytes, wavelengths: bytes) -> list[dict]:
+    """解码为 API 使用的 [{wavelength, intensity}] 列表（NaN 还原为 None）.
+
+    强度按 float32 精度返回（0.1 读出为 0.10000000149011612），不做字符串往返。
+    """
+    array = unpack_values(values)
+    intensities: list[float | None] = array.astype(np.float64).tolist()
+    for index in np.flatnonzero(np.isnan(array)).tolist():
+        intensities[index] = None
+    axis = unpack_axis(wavelengths).tolist()
+    return [
+        {"wavelength": wavelength, "intensity": value} for wavelength, value in zip(axis, intensities, strict=True)
+    ]
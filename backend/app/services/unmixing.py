@@ -0,0 +1,221 @@
+from __future__ import annotations
+
+import os
+import threading
+from pathlib import Path
+
+import numpy as np
+from fastapi import HTTPException, status
+from starlette.concurrency import run_in_threadpool
+
+from app.schemas.sample import EndmemberExtractionRequest, EndmemberResult
+from app.services.band_quality import good_band_indices
+from app.services.hsi import (
+    HyperCube,
+    encode_png,
+    normalize_to_uint8,
+    read_json,
+    sample_derived_dir,
+    to_display_orientation,
+    write_json_atomic,
+)
+from app.services.wavelength import WavelengthIndex
+
+# 每个行块最多处理的像元数，控制求解时的内存占用
+BLOCK_PIXELS = 262_144
+
+# 按缓存键散列到固定数量的锁上，锁表大小不随样本数增长
+LOCK_STRIPES = 64
+_locks = tuple(threading.Lock() for _ in range(LOCK_STRIPES))
+
+
+def _lock_for(key: str) -> threading.Lock:
+    return _locks[hash(key) % LOCK_STRIPES]
+
+
+def atgp(pixels: np.ndarray, n_endmembers: int) -> list[int]:
+    """自动目标生成过程 (ATGP)：逐个选取正交子空间残差最大的像元."""
+    data = np.asarray(pixels, dtype=np.float64)
+    norms = np.einsum("ij,ij->i", data, data)
+    selected = [int(np.argmax(norms))]
+    for _ in range(1, n_endmembers):
+        basis, _r = np.linalg.qr(data[selected].T)
+        projected = data @ basis
+        residual = norms - np.einsum("ij,ij->i", projected, projected)
+        residual[selected] = -np.inf
+        selected.append(int(np.argmax(residual)))
+    return selected
+
+
+def nnls_batched(
+    endmembers: np.ndarray,
+    pixels: np.ndarray,
+    *,
+    max_iter: int = 300,
+    tol: float = 1e-5,
+) -> np.ndarray:
+    """批量非负最小二乘：min ||E h - x||, h >= 0，对所有像元同时求解.
+
+    endmembers: (bands, k)；pixels: (bands, n)；返回 (k, n)。
+    使用加速投影梯度 (FISTA)，只有矩阵运算，没有逐像元循环。
+    """
+    gram = endmembers.T @ endmembers
+    lipschitz = float(np.linalg.eigvalsh(gram).max())
+    if lipschitz <= 0:
+        return np.zeros((endmembers.shape[1], pixels.shape[1]), dtype=np.float32)
+    target = endmembers.T @ pixels
+
+    current = np.maximum(np.linalg.lstsq(gram, target, rcond=None)[0], 0)
+    momentum = current.copy()
+    step = 1.0
+    for _ in range(max_iter):
+        updated = np.maximum(momentum - (gram @ momentum - target) / lipschitz, 0)
+        delta = np.linalg.norm(updated - current)
+        next_step = (1 + np.sqrt(1 + 4 * step * step)) / 2
+        momentum = updated + ((step - 1) / next_step) * (updated - current)
+        current, step = updated, next_step
+        if delta <= tol * max(float(np.linalg.norm(current)), 1e-12):
+            break
+    return current.astype(np.float32)
+
+
+def _cache_key(params: EndmemberExtractionRequest) -> str:
+    key = f"unmixing_k{params.n_endmembers}_n{params.subsample}_s{params.seed}"
+    if params.wavelength_min is not None or params.wavelength_max is not None:
+        key += f"_w{params.wavelength_min}-{params.wavelength_max}"
+    return key
+
+
+def _cube_fingerprint(cube: HyperCube) -> list[int]:
+    stat = cube.spe_path.stat()
+    return [stat.st_size, stat.st_mtime_ns]
+
+
+def _load_cached(directory: Path, key: str, fingerprint: list[int], bands: list[int]) -> dict | None:
+    meta = read_json(directory / f"{key}.json")
+    if not meta or meta.get("fingerprint") != fingerprint or meta.get("bands") != bands:
+        return None
+    if not (directory / f"{key}.abundance.npy").exists():
+        return None
+    return meta
+
+
+def compute_unmixing(
+    sample_uid: str,
+    source_files: list[str],
+    params: EndmemberExtractionRequest,
+) -> dict:
+    """提取端元并生成丰度图（结果按样本缓存在派生目录）."""
+    cube = HyperCube.from_source_files(source_files)
+    directory = sample_derived_dir(sample_uid)
+    key = _cache_key(params)
+    fingerprint = _cube_fingerprint(cube)
+    lines, samples, bands = cube.shape
+    # 跳过导入扫描标记的坏波段，并按波长范围截取
+    band_idx = good_band_indices(sample_uid, bands)
+    if params.wavelength_min is not None or params.wavelength_max is not None:
+        if not cube.header.wavelengths:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="样本缺少波长信息")
+        in_range = WavelengthIndex(cube.header.wavelengths).band_range(
+            params.wavelength_min, params.wavelength_max
+        )
+        band_idx = np.intersect1d(band_idx, in_range)
+    used_bands = band_idx.tolist()
+
+    with _lock_for(f"{sample_uid}:{key}"):
+        cached = _load_cached(directory, key, fingerprint, used_bands)
+        if cached is not None:
+            return cached
+
+        total = lines * samples
+        if params.n_endmembers > min(band_idx.size, total):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="端元数量超过波段或像元数量",
+            )
+
+        rng = np.random.default_rng(params.seed)
+        count = min(params.subsample, total)
+        flat = np.sort(rng.choice(total, size=count, replace=False))
+        line_idx, sample_idx = np.divmod(flat, samples)
+        candidates = cube.read_pixels(line_idx, sample_idx)[:, band_idx]
+        chosen = atgp(candidates, params.n_endmembers)
+        endmembers = candidates[chosen].astype(np.float64)
+
+        abundance_path = directory / f"{key}.abundance.npy"
+        tmp_path = directory / f".{key}.{os.getpid()}.{threading.get_ident()}.npy"
+        output = np.lib.format.open_memmap(
+            tmp_path,
+            mode="w+",
+            dtype=np.float32,
+            shape=(params.n_endmembers, lines, samples),
+        )
+        block_lines = max(1, BLOCK_PIXELS // samples)
+        for start, block in cube.iter_line_blocks(block_lines):
+            height = block.shape[0]
+            matrix = block[:, :, band_idx].reshape(-1, band_idx.size).T.astype(np.float64)
+            solved = nnls_batched(endmembers.T, matrix)
+            output[:, start : start + height, :] = solved.reshape(-1, height, samples)
+        output.flush()
+        del output
+        os.replace(tmp_path, abundance_path)
+
+        meta = {
+            "n_endmembers": params.n_endmembers,
+            "subsample": count,
+            "seed": params.seed,
+            "fingerprint": fingerprint,
+            "bands": used_bands,
+            "endmembers": endmembers.astype(np.float32).tolist(),
+            "pixels": [[int(line_idx[i]), int(sample_idx[i])] for i in chosen],
+            "wavelengths": (
+                [cube.header.wavelengths[i] for i in used_bands] if cube.header.wavelengths else None
+            ),
+        }
+        write_json_atomic(directory / f"{key}.json", meta)
+        return meta
+
+
+def render_abundance(
+    sample_uid: str,
+    source_files: list[str],
+    params: EndmemberExtractionRequest,
+    index: int,
+) -> bytes:
+    """把第 index 个端元的丰度图渲染为 PNG（未缓存时先计算）."""
+    if index < 0 or index >= params.n_endmembers:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="端元不存在")
+    compute_unmixing(sample_uid, source_files, params)
+    path = sample_derived_dir(sample_uid) / f"{_cache_key(params)}.abundance.npy"
+    abundance = np.load(path, mmap_mode="r")
+    image = np.asarray(abundance[index])
+    high = max(float(image.max()), 1e-6)
+    return encode_png(to_display_orientation(normalize_to_uint8(image, 0.0, high)))
+
+
+async def extract_endmembers(
+    sample_uid: str,
+    source_files: list[str],
+    params: EndmemberExtractionRequest,
+) -> EndmemberResult:
+    """在线程池中运行端元提取任务."""
+    meta = await run_in_threadpool(compute_unmixing, sample_uid, source_files, params)
+    return EndmemberResult(
+        sample_id=sample_uid,
+        n_endmembers=meta["n_endmembers"],
+        subsample=meta["subsample"],
+        seed=meta["seed"],
+        bands=meta["bands"],
+        endmembers=meta["endmembers"],
+        pixels=meta["pixels"],
+        wavelengths=meta.get("wavelengths"),
+    )
+
+
+async def render_abundance_png(
+    sample_uid: str,
+    source_files: list[str],
+    params: EndmemberExtractionRequest,
+    index: int,
+) -> bytes:
+    return await run_in_threadpool(render_abundance, sample_uid, source_files, params, index)
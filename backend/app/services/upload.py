@@ -0,0 +1,211 @@
+from __future__ import annotations
+
+import asyncio
+import os
+import shutil
+import stat
+import tarfile
+import zipfile
+from collections.abc import Callable, Iterator
+from pathlib import Path
+from typing import IO, Any, BinaryIO, TypeVar
+from uuid import uuid4
+
+from fastapi import HTTPException, UploadFile
+from starlette.concurrency import run_in_threadpool
+
+from app.core.config import settings
+from app.core.paths import DATA_SOURCE_ROOT, STAGING_ROOT
+from app.services.blob_store import BlobWriter, StoredFile, discard_blobs
+
+MAX_NESTED_DIRS = 3
+# 单次读写的块大小；每个请求的内存上限约为 块大小 × 并发数
+UPLOAD_CHUNK_SIZE = 1024 * 1024
+# 压缩包中忽略的系统元数据目录
+IGNORED_ARCHIVE_PREFIXES = ("__MACOSX/",)
+
+T = TypeVar("T")
+
+
+def validate_folder_name(folder_name: str) -> str:
+    """校验上传目标文件夹名称，空名称时生成随机名称."""
+    if not folder_name.strip():
+        raise HTTPException(status_code=400, detail="文件夹名称不能为空")
+    safe_folder = folder_name.strip().strip("/").strip()
+    safe_folder = safe_folder or f"dataset_{uuid4().hex[:8]}"
+    if ".." in safe_folder or "/" in safe_folder or "\\" in safe_folder:
+        raise HTTPException(status_code=400, detail="非法文件夹名称")
+    return safe_folder
+
+
+def normalize_relative_path(rel: str, safe_folder: str, fallback_name: str | None) -> Path:
+    """规范化上传文件的相对路径（去掉重复的顶层目录，限制嵌套深度）."""
+    rel_path = Path(rel.strip().strip("/"))
+    if rel_path.is_absolute() or ".." in rel_path.parts:
+        raise HTTPException(status_code=400, detail="包含非法路径")
+    cleaned_parts = [part for part in rel_path.parts if part and part not in {".", ""}]
+    if cleaned_parts and cleaned_parts[0].casefold() == safe_folder.casefold():
+        cleaned_parts = cleaned_parts[1:]
+    dir_depth = max(len(cleaned_parts) - 1, 0)
+    if dir_depth > MAX_NESTED_DIRS:
+        raise HTTPException(status_code=400, detail=f"目录嵌套不能超过 {MAX_NESTED_DIRS} 层")
+    return Path(*cleaned_parts) if cleaned_parts else Path(fallback_name or uuid4().hex)
+
+
+async def _in_thread(func: Callable[..., T], *args: Any) -> T:
+    """在线程池中执行；被取消时先等线程执行完再抛出取消（线程本身无法中断）."""
+    future = asyncio.ensure_future(run_in_threadpool(func, *args))
+    try:
+        return await asyncio.shield(future)
+    except asyncio.CancelledError:
+        await asyncio.wait([future])
+        if not future.cancelled():
+            future.exception()
+        raise
+
+
+async def stream_to_file(
+    upload: UploadFile,
+    destination: Path,
+    chunk_size: int | None = None,
+) -> StoredFile:
+    """分块写入上传文件，同一遍内计算 BLAKE2b 并按内容地址去重."""
+    chunk_size = chunk_size or UPLOAD_CHUNK_SIZE
+    writer = await _in_thread(BlobWriter)
+    try:
+        while chunk := await upload.read(chunk_size):
+            # 写入与哈希在同一个线程调用中完成（hashlib 计算时释放 GIL）
+            await _in_thread(writer.write, chunk)
+    except BaseException:
+        await _in_thread(writer.abort)
+        raise
+    return await _in_thread(writer.commit, destination)
+
+
+async def write_upload_files(
+    target_dir: Path,
+    safe_folder: str,
+    files: list[UploadFile],
+    relative_paths: list[str],
+) -> list[StoredFile]:
+    """并发写入一批上传文件（信号量限制同时写入数量）.
+
+    任一文件失败时取消其余写入并等待其结束后再抛出，调用方随后删除目标目录是安全的。
+    """
+    destinations = [
+        target_dir / normalize_relative_path(rel, safe_folder, upload_file.filename)
+        for upload_file, rel in zip(files, relative_paths)
+    ]
+    semaphore = asyncio.Semaphore(settings.upload_concurrency)
+
+    async def _write(upload_file: UploadFile, destination: Path) -> StoredFile:
+        async with semaphore:
+            return await stream_to_file(upload_file, destination)
+
+    tasks = [
+        asyncio.ensure_future(_write(upload_file, destination))
+        for upload_file, destination in zip(files, destinations)
+    ]
+    try:
+        return list(await asyncio.gather(*tasks))
+    except BaseException:
+        for task in tasks:
+            task.cancel()
+        # 等其余写入真正结束（进行中的 commit 会先完成），避免在清理后重新建出目录
+        await asyncio.gather(*tasks, return_exceptions=True)
+        raise
+
+
+def _iter_zip_members(archive: zipfile.ZipFile) -> Iterator[tuple[str, IO[bytes]]]:
+    for info in archive.infolist():
+        if info.is_dir() or stat.S_ISLNK(info.external_attr >> 16):
+            continue
+        with archive.open(info) as stream:
+            yield info.filename, stream
+
+
+def _iter_tar_members(archive: tarfile.TarFile) -> Iterator[tuple[str, IO[bytes]]]:
+    # 流式模式 (r|*)：成员按顺序读取，必须在取下一个成员前读完
+    for member in archive:
+        if not member.isfile():
+            continue
+        stream = archive.extractfile(member)
+        if stream is not None:
+            yield member.name, stream
+
+
+def _check_zip_limits(archive: zipfile.ZipFile) -> None:
+    """zip 的中央目录记录了成员数与解压后大小，超限时在解压前拒绝."""
+    infos = archive.infolist()
+    if len(infos) > settings.archive_max_members:
+        raise HTTPException(status_code=400, detail="压缩包文件过多")
+    if sum(info.file_size for info in infos) > settings.archive_max_bytes:
+        raise HTTPException(status_code=400, detail="压缩包解压后超过大小限制")
+
+
+def _iter_archive_members(fileobj: BinaryIO) -> Iterator[tuple[str, IO[bytes]]]:
+    if zipfile.is_zipfile(fileobj):
+        fileobj.seek(0)
+        with zipfile.ZipFile(fileobj) as zip_archive:
+            _check_zip_limits(zip_archive)
+            yield from _iter_zip_members(zip_archive)
+        return
+    fileobj.seek(0)
+    opened = False
+    try:
+        with tarfile.open(fileobj=fileobj, mode="r|*") as tar_archive:
+            opened = True
+            yield from _iter_tar_members(tar_archive)
+    except tarfile.TarError as exc:
+        detail = "压缩包已损坏" if opened else "不支持的压缩包格式"
+        raise HTTPException(status_code=400, detail=detail) from exc
+
+
+def extract_archive(fileobj: BinaryIO, safe_folder: str) -> list[StoredFile]:
+    """流式解压 zip/tar 到数据源目录（逐块复制成员，并按内容地址去重）.
+
+    先解压到暂存目录，全部成功后再整体 rename 到数据源目录。成员数与解压后总字节数
+    按实际读出的数据计数（不信任头信息），超过配置上限即中止；失败时回收本次新建的 blob。
+    """
+    staging = STAGING_ROOT / f"archive_{uuid4().hex}"
+    stored: list[StoredFile] = []
+    members = 0
+    total_bytes = 0
+    committed = False
+    try:
+        for name, stream in _iter_archive_members(fileobj):
+            members += 1
+            if members > settings.archive_max_members:
+                raise HTTPException(status_code=400, detail="压缩包文件过多")
+            name = name.replace("\\", "/")
+            if name.startswith(IGNORED_ARCHIVE_PREFIXES):
+                continue
+            destination = staging / normalize_relative_path(name, safe_folder, None)
+            if destination.exists():
+                raise HTTPException(status_code=400, detail="压缩包中存在重复路径")
+            writer = BlobWriter()
+            try:
+                while chunk := stream.read(UPLOAD_CHUNK_SIZE):
+                    total_bytes += len(chunk)
+                    if total_bytes > settings.archive_max_bytes:
+                        raise HTTPException(status_code=400, detail="压缩包解压后超过大小限制")
+                    writer.write(chunk)
+            except BaseException:
+                writer.abort()
+                raise
+            stored.append(writer.commit(destination))
+
+        if not stored:
+            raise HTTPException(status_code=400, detail="上传内容为空")
+        target_dir = DATA_SOURCE_ROOT / safe_folder
+        if target_dir.exists():
+            raise HTTPException(status_code=400, detail="目标文件夹已存在")
+        os.rename(staging, target_dir)
+        committed = True
+        return stored
+    except (OSError, zipfile.BadZipFile) as exc:
+        raise HTTPException(status_code=400, detail="压缩包解压失败") from exc
+    finally:
+        shutil.rmtree(staging, ignore_errors=True)
+        if not committed:
+            discard_blobs([item.digest for item in stored if not item.deduplicated])
@@ -0,0 +1,136 @@
+from __future__ import annotations
+
+from collections import OrderedDict
+
+import numpy as np
+from fastapi import HTTPException, status
+
+from app.models.annotation_sample import AnnotationSample
+from app.models.spectral_mode import SpectralDisplayMode
+from app.schemas.sample import (
+    BandLookupItem,
+    BandLookupResponse,
+    BandRangeResponse,
+    ResolvedModeChannels,
+)
+
+INDEX_CACHE_SIZE = 256
+
+
+class WavelengthIndex:
+    """样本波长轴索引：最近波段查找 O(log n)，范围截取 O(log n + k)."""
+
+    def __init__(self, wavelengths: list[float], fwhm: list[float] | None = None) -> None:
+        values = np.asarray(wavelengths, dtype=np.float64)
+        # 头文件中的波长通常已升序，这里保留原始波段号以兼容乱序
+        self.order = np.argsort(values, kind="stable")
+        self.sorted = values[self.order]
+        self.wavelengths = values
+        self.fwhm = None if fwhm is None else np.asarray(fwhm, dtype=np.float64)
+
+    def __len__(self) -> int:
+        return int(self.wavelengths.size)
+
+    def nearest_band(self, wavelength: float) -> int:
+        return int(self.nearest_bands(np.asarray([wavelength]))[0])
+
+    def nearest_bands(self, wavelengths: np.ndarray) -> np.ndarray:
+        """批量最近波段查找."""
+        targets = np.asarray(wavelengths, dtype=np.float64)
+        right = np.clip(np.searchsorted(self.sorted, targets), 1, self.sorted.size - 1)
+        left = right - 1
+        if self.sorted.size == 1:
+            return np.zeros(targets.shape, dtype=np.intp)
+        pick_right = np.abs(self.sorted[right] - targets) < np.abs(targets - self.sorted[left])
+        positions = np.where(pick_right, right, left)
+        return self.order[positions]
+
+    def band_range(self, low: float | None, high: float | None) -> np.ndarray:
+        """[low, high] 范围内的波段号（按波长排序）."""
+        start = 0 if low is None else int(np.searchsorted(self.sorted, low, side="left"))
+        stop = self.sorted.size if high is None else int(np.searchsorted(self.sorted, high, side="right"))
+        return self.order[start:stop]
+
+
+_AxisKey = tuple[tuple[float, ...], tuple[float, ...] | None]
+_index_cache: OrderedDict[str, tuple[_AxisKey, WavelengthIndex]] = OrderedDict()
+
+
+def get_wavelength_index(sample: AnnotationSample) -> WavelengthIndex:
+    """按样本缓存的波长索引（基于入库时保存的波长，不重复读头文件）.
+
+    缓存同时记录来源波长轴，同步改写 wavelengths/fwhm 后自动重建。
+    """
+    if not sample.wavelengths:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="样本缺少波长信息")
+    axis: _AxisKey = (
+        tuple(sample.wavelengths),
+        None if sample.fwhm is None else tuple(sample.fwhm),
+    )
+    cached = _index_cache.get(sample.sample_id)
+    if cached is not None and cached[0] == axis:
+        _index_cache.move_to_end(sample.sample_id)
+        return cached[1]
+    index = WavelengthIndex(sample.wavelengths, sample.fwhm)
+    _index_cache[sample.sample_id] = (axis, index)
+    _index_cache.move_to_end(sample.sample_id)
+    if len(_index_cache) > INDEX_CACHE_SIZE:
+        _index_cache.popitem(last=False)
+    return index
+
+
+def lookup_bands(sample: AnnotationSample, wavelengths: list[float]) -> BandLookupResponse:
+    index = get_wavelength_index(sample)
+    bands = index.nearest_bands(np.asarray(wavelengths))
+    return BandLookupResponse(
+        items=[
+            BandLookupItem(
+                wavelength=float(target),
+                band=int(band),
+                band_wavelength=float(index.wavelengths[band]),
+            )
+            for target, band in zip(wavelengths, bands)
+        ]
+    )
+
+
+def select_band_range(
+    sample: AnnotationSample,
+    wavelength_min: float | None,
+    wavelength_max: float | None,
+) -> BandRangeResponse:
+    index = get_wavelength_index(sample)
+    bands = index.band_range(wavelength_min, wavelength_max)
+    return BandRangeResponse(
+        bands=bands.tolist(),
+        wavelengths=index.wavelengths[bands].tolist(),
+    )
+
+
+def resolve_mode_channels(
+    sample: AnnotationSample,
+    mode: SpectralDisplayMode,
+) -> ResolvedModeChannels:
+    """把显示模式解析为当前样本的波段号：优先按波长匹配，否则使用原始通道号."""
+    requested = (mode.r_wavelength, mode.g_wavelength, mode.b_wavelength)
+    channels = [mode.r_channel, mode.g_channel, mode.b_channel]
+    by_wavelength = False
+    if sample.wavelengths and all(value is not None for value in requested):
+        index = get_wavelength_index(sample)
+        channels = [int(band) for band in index.nearest_bands(np.asarray(requested, dtype=np.float64))]
+        by_wavelength = True
+    elif sample.wavelengths:
+        upper = len(sample.wavelengths) - 1
+        channels = [min(max(channel, 0), upper) for channel in channels]
+
+    wavelengths = (
+        [float(sample.wavelengths[channel]) for channel in channels] if sample.wavelengths else None
+    )
+    return ResolvedModeChannels(
+        mode_id=mode.id,
+        r_channel=channels[0],
+        g_channel=channels[1],
+        b_channel=channels[2],
+        wavelengths=wavelengths,
+        matched_by_wavelength=by_wavelength,
+    )
@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+"""Benchmark saving a sample's annotations: per-detail flush vs bulk insert.
+
+Saves N annotations (each with a mode snapshot and spectra) through the old
+ORM path, which flushes once per detail to learn its primary key, and through
+``replace_annotations``, which inserts details with INSERT ... RETURNING and
+then spectra as one statement (mode snapshots are interned and shared). Prints
+the median latency and the number of statements sent to the database. The
+legacy path skips mode snapshots, so it is a lower bound for the old cost.
+"""
+
+import argparse
+import asyncio
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Add the project root to Python path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from sqlalchemy import delete, event, func, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app.models import Base
+from app.models.annotation_detail import AnnotationDetail
+from app.models.annotation_sample import AnnotationSample
+from app.models.annotation_spectrum import AnnotationSpectrum
+from app.models.display_algorithm import DisplayAlgorithm
+from app.models.project import AnnotationProject
+from app.models.user import User
+from app.schemas.sample import SampleAnnotationsPayload
+from app.services.sample import _intern_axes, replace_annotations
+from app.services.spectrum_codec import pack_points
+
+
+def build_payload(annotations: int, spectra: int, bands: int) -> SampleAnnotationsPayload:
+    points = [{"wavelength": 400 + 2 * band, "intensity": band / bands} for band in range(bands)]
+    return SampleAnnotationsPayload(
+        annotations=[
+            {
+                "label_name": f"label {index % 7}",
+                "color": "#ff0000",
+                "tool_type": "rect",
+                "coordinates": {"x": index, "y": index, "width": 4, "height": 4},
+                "area": 16.0,
+                "mode_snapshot": {
+                    "r_channel": 10,
+                    "g_channel": 20,
+                    "b_channel": 30,
+                    "r_gain": 1.0,
+                    "g_gain": 1.0,
+                    "b_gain": 1.0,
+                    "gain_algorithm": "linear",
+                    "dark_calibration": False,
+                    "white_calibration": False,
+                },
+                "spectra": [{"position": {"x": index, "y": s}, "points": points} for s in range(spectra)],
+            }
+            for index in range(annotations)
+        ]
+    )
+
+
+async def legacy_save(db: AsyncSession, sample_id: int, payload: SampleAnnotationsPayload) -> None:
+    """The previous save path: one flush per detail to obtain its primary key."""
+    detail_ids = select(AnnotationDetail.id).where(AnnotationDetail.sample_id == sample_id)
+    await db.execute(delete(AnnotationSpectrum).where(AnnotationSpectrum.detail_id.in_(detail_ids)))
+    await db.execute(delete(AnnotationDetail).where(AnnotationDetail.sample_id == sample_id))
+    for item in payload.annotations:
+        detail = AnnotationDetail(
+            sample_id=sample_id,
+            label_name=item.label_name,
+            color=item.color,
+            tool_type=item.tool_type,
+            coordinates=item.coordinates,
+            radius=item.radius,
+            area=item.area,
+            confidence=item.confidence,
+            remark=item.remark,
+        )
+        db.add(detail)
+        await db.flush()
+        for spectrum in item.spectra or []:
+            values, wavelengths = pack_points(spectrum.points)
+            [axis_id] = await _intern_axes(db, [wavelengths])
+            db.add(
+                AnnotationSpectrum(
+                    detail_id=detail.id,
+                    position=spectrum.position,
+                    values=values,
+                    axis_id=axis_id,
+                )
+            )
+    await db.flush()
+
+
+async def bulk_save(db: AsyncSession, sample_id: int, payload: SampleAnnotationsPayload) -> None:
+    await replace_annotations(db, sample_id, payload, user_id=1)
+
+
+async def seed(sessions: async_sessionmaker) -> int:
+    async with sessions() as db:
+        db.add(User(id=1, email="bench@example.com", hashed_password="x"))
+        db.add(DisplayAlgorithm(code="linear", name="linear"))
+        db.add(AnnotationProject(id=1, name="bench", created_by=1))
+        db.add(
+            AnnotationSample(
+                id=1,
+                project_id=1,
+                sample_type="hyperspectral",
+                source_files=["ds/cube.spe", "ds/cube.hdr"],
+                status="valid",
+            )
+        )
+        await db.commit()
+    return 1
+
+
+async def run(url: str, annotations: int, spectra: int, bands: int, repeat: int) -> None:
+    engine = create_async_engine(url)
+    statements = 0
+
+    @event.listens_for(engine.sync_engine, "before_cursor_execute")
+    def _count(*_args: object) -> None:
+        nonlocal statements
+        statements += 1
+
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    sessions = async_sessionmaker(engine, expire_on_commit=False)
+    sample_id = await seed(sessions)
+    payload = build_payload(annotations, spectra, bands)
+
+    results = {}
+    try:
+        for name, save in (("per-detail flush", legacy_save), ("bulk insert", bulk_save)):
+            timings = []
+            for _ in range(repeat):
+                async with sessions() as db:
+                    statements = 0
+                    start = time.perf_counter()
+                    await save(db, sample_id, payload)
+                    await db.commit()
+                    timings.append(time.perf_counter() - start)
+            results[name] = statistics.median(timings) * 1000
+            print(f"{name:<17} {results[name]:9.1f} ms  {statements:6d} statements")
+
+            async with sessions() as db:
+                count = await db.scalar(select(func.count(AnnotationSpectrum.id)))
+            assert count == annotations * spectra, (name, count)
+        print(f"speedup {results['per-detail flush'] / results['bulk insert']:.1f}x")
+    finally:
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.drop_all)
+        await engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument(
+        "--url", default=None, help="async SQLAlchemy URL of an empty scratch database (default: temp SQLite)"
+    )
+    parser.add_argument("--annotations", type=int, default=1000)
+    parser.add_argument("--spectra", type=int, default=2, help="spectra per annotation")
+    parser.add_argument("--bands", type=int, default=200, help="points per spectrum")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    workdir = None
+    url = args.url
+    if url is None:
+        workdir = tempfile.TemporaryDirectory(prefix="save_bench_")
+        url = f"sqlite+aiosqlite:///{workdir.name}/bench.db"
+    try:
+        asyncio.run(run(url, args.annotations, args.spectra, args.bands, args.repeat))
+    finally:
+        if workdir is not None:
+            workdir.cleanup()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""Benchmark data-source folder scanning on a synthetic tree."""
+
+import argparse
+import shutil
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from pathlib import Path
+
+# Add the project root to Python path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.services.data_source_index import HYPER_EXTS, IMAGE_EXTS
+from app.services.folder_scanner import iter_samples
+
+HEADER = "ENVI\nbands = 4\nwavelength = {400, 410, 420, 430}\n"
+
+
+def build_tree(root: Path, total_files: int, files_per_dir: int) -> None:
+    """Create nested folders holding images and spe/hdr pairs."""
+    created = 0
+    index = 0
+    while created < total_files:
+        directory = root / f"group_{index // 100:04d}" / f"batch_{index:05d}"
+        directory.mkdir(parents=True, exist_ok=True)
+        count = min(files_per_dir, total_files - created)
+        for i in range(count // 2):
+            if i % 2:
+                (directory / f"img_{i:05d}.png").touch()
+                (directory / f"img_{i:05d}_b.jpg").touch()
+            else:
+                (directory / f"cube_{i:05d}.spe").touch()
+                (directory / f"cube_{i:05d}.hdr").write_text(HEADER)
+        if count % 2:
+            (directory / "extra.png").touch()
+        created += count
+        index += 1
+
+
+def legacy_scan(folder: Path) -> int:
+    """Serial rglob scan as used before the parallel scanner."""
+    images = 0
+    hyper_map: dict[tuple[str, str], list[str]] = defaultdict(list)
+    for file in folder.rglob("*"):
+        if not file.is_file():
+            continue
+        rel = file.relative_to(folder)
+        ext = file.suffix.lower()
+        if ext in IMAGE_EXTS:
+            images += 1
+        elif ext in HYPER_EXTS:
+            hyper_map[(str(rel.parent), rel.stem)].append(str(rel))
+    groups = 0
+    for files in hyper_map.values():
+        if any(path.endswith(".hdr") for path in files):
+            (folder / next(path for path in files if path.endswith(".hdr"))).read_text()
+            groups += 1
+    return images + groups
+
+
+def parallel_scan(folder: Path, workers: int) -> int:
+    return sum(len(batch) for batch in iter_samples(folder, max_workers=workers))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--files", type=int, default=500_000)
+    parser.add_argument("--files-per-dir", type=int, default=1000)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 4, 8, 16])
+    parser.add_argument("--root", type=Path, default=None, help="reuse an existing tree")
+    args = parser.parse_args()
+
+    temporary = args.root is None
+    root = Path(tempfile.mkdtemp(prefix="scan_bench_")) / "dataset" if temporary else args.root
+    try:
+        if temporary:
+            start = time.perf_counter()
+            build_tree(root, args.files, args.files_per_dir)
+            print(f"built {args.files} files in {time.perf_counter() - start:.1f}s at {root}")
+
+        start = time.perf_counter()
+        expected = legacy_scan(root)
+        print(f"rglob serial        : {time.perf_counter() - start:7.2f}s  samples={expected}")
+        for workers in args.workers:
+            start = time.perf_counter()
+            found = parallel_scan(root, workers)
+            print(f"scandir {workers:>2} workers : {time.perf_counter() - start:7.2f}s  samples={found}")
+            assert found == expected
+    finally:
+        if temporary:
+            shutil.rmtree(root.parent, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
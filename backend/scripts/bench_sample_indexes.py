@@ -0,0 +1,237 @@
+#!/usr/bin/env python3
+"""Benchmark hot-path queries before and after the composite indexes.
+
+Seeds a large synthetic dataset, then runs the sample list, project statistics,
+sample detail, spectrum lookup and project list queries without and with the
+indexes added in migration f2b8d5e1c904, printing query plans and median latency.
+"""
+
+import argparse
+import random
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from uuid import uuid4
+
+# Add the project root to Python path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import numpy as np
+from sqlalchemy import Engine, Index, create_engine, insert, text
+
+from app.models import Base
+from app.models.annotation_detail import AnnotationDetail
+from app.models.annotation_sample import AnnotationSample
+from app.models.annotation_spectrum import AnnotationSpectrum
+from app.models.project import AnnotationProject
+from app.models.user import User
+
+# Indexes added by migration f2b8d5e1c904 (declared on the models as well)
+HOT_PATH_INDEXES = {
+    "ix_annotation_samples_project_id_id",
+    "ix_annotation_samples_project_status_annotated",
+    "ix_annotation_details_sample_id_id",
+    "ix_annotation_spectra_detail_id",
+    "ix_annotation_projects_created_at",
+    "ix_annotation_projects_archived_created_at",
+}
+BATCH = 5000
+SPECTRUM_VALUES = np.full(200, 0.5, dtype="<f4").tobytes()
+
+QUERIES: dict[str, str] = {
+    "sample list": (
+        "SELECT id, sample_id, status, is_annotated FROM annotation_samples "
+        "WHERE project_id = :project_id ORDER BY id LIMIT 100"
+    ),
+    "project stats": (
+        "SELECT count(id), "
+        "count(CASE WHEN is_annotated THEN 1 END), "
+        "count(CASE WHEN status NOT IN ('ignored', 'missing') THEN 1 END) "
+        "FROM annotation_samples WHERE project_id = :project_id"
+    ),
+    "sample details": "SELECT * FROM annotation_details WHERE sample_id = :sample_id ORDER BY id",
+    "detail spectra": "SELECT * FROM annotation_spectra WHERE detail_id = :detail_id",
+    "project list": (
+        "SELECT id, name FROM annotation_projects WHERE is_archived = false "
+        "ORDER BY created_at DESC LIMIT 10"
+    ),
+}
+
+
+def hot_path_indexes() -> list[Index]:
+    return [
+        index
+        for table in Base.metadata.sorted_tables
+        for index in table.indexes
+        if index.name in HOT_PATH_INDEXES
+    ]
+
+
+def _insert(engine: Engine, table, rows: list[dict]) -> None:
+    with engine.begin() as conn:
+        for start in range(0, len(rows), BATCH):
+            conn.execute(insert(table), rows[start : start + BATCH])
+
+
+def seed(engine: Engine, projects: int, samples: int, annotated_ratio: float, details: int, spectra: int) -> dict:
+    """Insert users, projects, samples, details and spectra; return probe ids."""
+    rng = random.Random(0)
+    now = datetime.now(timezone.utc)
+    _insert(engine, User.__table__, [{"id": 1, "email": "bench@example.com", "hashed_password": "x"}])
+    _insert(
+        engine,
+        AnnotationProject.__table__,
+        [
+            {
+                "id": index + 1,
+                "project_id": uuid4().hex,
+                "name": f"project {index}",
+                "is_archived": index % 5 == 0,
+                "created_by": 1,
+                "created_at": now - timedelta(minutes=index),
+                "updated_at": now,
+            }
+            for index in range(projects)
+        ],
+    )
+
+    sample_rows = []
+    annotated_ids = []
+    for index in range(samples):
+        annotated = rng.random() < annotated_ratio
+        sample_rows.append(
+            {
+                "id": index + 1,
+                "project_id": index % projects + 1,
+                "sample_id": uuid4().hex,
+                "sample_type": "hyperspectral",
+                "source_files": [f"ds/cube_{index}.spe", f"ds/cube_{index}.hdr"],
+                "status": "ignored" if index % 17 == 0 else "valid",
+                "is_annotated": annotated,
+                "has_dark": False,
+                "has_white": False,
+                "created_at": now,
+                "updated_at": now,
+            }
+        )
+        if annotated:
+            annotated_ids.append(index + 1)
+    _insert(engine, AnnotationSample.__table__, sample_rows)
+
+    detail_rows = []
+    spectrum_rows = []
+    for sample_id in annotated_ids:
+        for _ in range(details):
+            detail_id = len(detail_rows) + 1
+            detail_rows.append(
+                {
+                    "id": detail_id,
+                    "detail_id": uuid4().hex,
+                    "sample_id": sample_id,
+                    "label_name": "label",
+                    "color": "#ff0000",
+                    "tool_type": "point",
+                    "coordinates": {"x": 1, "y": 1},
+                    "created_at": now,
+                    "updated_at": now,
+                }
+            )
+            spectrum_rows.extend(
+                {
+                    "detail_id": detail_id,
+                    "values": SPECTRUM_VALUES,
+                    "created_at": now,
+                    "updated_at": now,
+                }
+                for _ in range(spectra)
+            )
+    _insert(engine, AnnotationDetail.__table__, detail_rows)
+    _insert(engine, AnnotationSpectrum.__table__, spectrum_rows)
+    return {
+        "project_id": projects // 2 + 1,
+        "sample_id": annotated_ids[len(annotated_ids) // 2] if annotated_ids else 1,
+        "detail_id": len(detail_rows) // 2 or 1,
+    }
+
+
+def explain(engine: Engine, sql: str, params: dict) -> list[str]:
+    prefix = "EXPLAIN QUERY PLAN " if engine.dialect.name == "sqlite" else "EXPLAIN "
+    with engine.connect() as conn:
+        rows = conn.execute(text(prefix + sql), params).all()
+    return [str(row[-1]) for row in rows]
+
+
+def measure(engine: Engine, sql: str, params: dict, repeat: int) -> float:
+    timings = []
+    with engine.connect() as conn:
+        statement = text(sql)
+        conn.execute(statement, params).all()
+        for _ in range(repeat):
+            start = time.perf_counter()
+            conn.execute(statement, params).all()
+            timings.append(time.perf_counter() - start)
+    return statistics.median(timings) * 1000
+
+
+def run_queries(engine: Engine, probes: dict, repeat: int, label: str) -> dict[str, float]:
+    print(f"\n=== {label} ===")
+    results = {}
+    for name, sql in QUERIES.items():
+        results[name] = measure(engine, sql, probes, repeat)
+        print(f"{name:<15} {results[name]:9.3f} ms")
+        for line in explain(engine, sql, probes):
+            print(f"    {line}")
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", default=None, help="SQLAlchemy URL of an empty scratch database (default: temp SQLite)")
+    parser.add_argument("--projects", type=int, default=20)
+    parser.add_argument("--samples", type=int, default=200_000)
+    parser.add_argument("--annotated-ratio", type=float, default=0.3)
+    parser.add_argument("--details", type=int, default=3, help="details per annotated sample")
+    parser.add_argument("--spectra", type=int, default=2, help="spectra per detail")
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    workdir = None
+    url = args.url
+    if url is None:
+        workdir = tempfile.TemporaryDirectory(prefix="index_bench_")
+        url = f"sqlite:///{workdir.name}/bench.db"
+    engine = create_engine(url)
+    indexes = hot_path_indexes()
+    try:
+        Base.metadata.create_all(engine)
+        for index in indexes:
+            index.drop(engine)
+
+        start = time.perf_counter()
+        probes = seed(engine, args.projects, args.samples, args.annotated_ratio, args.details, args.spectra)
+        print(f"seeded {args.samples} samples in {time.perf_counter() - start:.1f}s ({url})")
+        with engine.begin() as conn:
+            conn.execute(text("ANALYZE"))
+
+        before = run_queries(engine, probes, args.repeat, "without hot-path indexes")
+        for index in indexes:
+            index.create(engine)
+        with engine.begin() as conn:
+            conn.execute(text("ANALYZE"))
+        after = run_queries(engine, probes, args.repeat, "with hot-path indexes")
+
+        print("\n=== speedup ===")
+        for name in QUERIES:
+            print(f"{name:<15} {before[name]:9.3f} ms -> {after[name]:9.3f} ms  ({before[name] / after[name]:6.1f}x)")
+    finally:
+        Base.metadata.drop_all(engine)
+        engine.dispose()
+        if workdir is not None:
+            workdir.cleanup()
+
+
+if __name__ == "__main__":
+    main()
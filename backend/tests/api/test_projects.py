@@ -1,12 +1,34 @@
+import asyncio
+import io
+import json
 import shutil
+import tarfile
+import time
+import zipfile
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
 from uuid import uuid4
 
+import numpy as np
 import pytest
 from httpx import AsyncClient
+from sqlalchemy import select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.api.deps import get_session_factory
+from app.core.config import settings
+from app.core.paths import EXPORT_ROOT, STAGING_ROOT
+from app.main import app
+from app.models.annotation_tombstone import AnnotationTombstone
 from app.models.display_algorithm import DisplayAlgorithm
+from app.services import blob_store
+from app.services import project as project_service
+from app.services.blob_store import collect_orphan_blobs
+from app.services.columnar_export import open_columnar_export
+from app.services.data_source_index import data_source_index
 from app.services.project import DATA_SOURCE_ROOT
+from app.services.resumable_upload import collect_expired_sessions
 
 
 async def get_auth_token(client: AsyncClient, email: str, password: str) -> str:
@@ -104,6 +126,50 @@ async def test_list_projects(client: AsyncClient) -> None:
     assert len(data["items"]) == 2
 
 
+@pytest.mark.asyncio
+async def test_project_statistics_follow_sample_updates(client: AsyncClient) -> None:
+    token = await get_auth_token(client, "project_stats@example.com", "password123")
+    headers = {"Authorization": f"Bearer {token}"}
+    folder = prepare_data_source()
+    try:
+        created = await client.post(
+            "/api/v1/projects",
+            json={"name": "统计", "data_source_folder": folder},
+            headers=headers,
+        )
+        project_id = created.json()["id"]
+        samples = (await client.get(f"/api/v1/projects/{project_id}/samples", headers=headers)).json()["items"]
+
+        response = await client.patch(
+            f"/api/v1/samples/{samples[0]['id']}",
+            json={"status": "ignored"},
+            headers=headers,
+        )
+        assert response.status_code == 200
+        response = await client.put(
+            f"/api/v1/samples/{samples[1]['id']}/annotations",
+            json={
+                "annotations": [
+                    {
+                        "label_name": "植被",
+                        "color": "#00ff00",
+                        "tool_type": "rect",
+                        "coordinates": {"x": 1, "y": 1, "width": 2, "height": 2},
+                    }
+                ]
+            },
+            headers=headers,
+        )
+        assert response.status_code == 200
+
+        data = (await client.get(f"/api/v1/projects/{project_id}", headers=headers)).json()
+        assert data["total_samples"] == 2
+        assert data["available_samples"] == 1
+        assert data["completion_rate"] == 50
+    finally:
+        shutil.rmtree(DATA_SOURCE_ROOT / folder, ignore_errors=True)
+
+
 @pytest.mark.asyncio
 async def test_update_project(client: AsyncClient) -> None:
     token = await get_auth_token(client, "project_update@example.com", "password123")
@@ -283,3 +349,769 @@ async def test_export_project_annotations(client: AsyncClient, db_session: Async
     assert detail["label_name"] == "鼻子"
     assert annotations[0]["mode_snapshot"]["r_channel"] == 0
     assert len(annotations[0]["spectra"]) == 1
+
+
+@pytest.mark.asyncio
+async def test_columnar_export_is_memory_mappable(client: AsyncClient, tmp_path: Path) -> None:
+    token = await get_auth_token(client, "columnar_export@example.com", "password123")
+    headers = {"Authorization": f"Bearer {token}"}
+    folder = prepare_data_source()
+    try:
+        create_resp = await client.post(
+            "/api/v1/projects",
+            json={"name": "列式导出", "data_source_folder": folder},
+            headers=headers,
+        )
+        project_id = create_resp.json()["id"]
+        samples = (await client.get(f"/api/v1/projects/{project_id}/samples", headers=headers)).json()["items"]
+
+        def spectrum(*values: float) -> dict:
+            return {"points": [{"wavelength": 400 + 5 * i, "intensity": v} for i, v in enumerate(values)]}
+
+        await client.put(
+            f"/api/v1/samples/{samples[1]['id']}/annotations",
+            json={
+                "annotations": [
+                    {
+                        "label_name": "叶片",
+                        "color": "#00ff00",
+                        "tool_type": "point",
+                        "coordinates": {"x": 1, "y": 2},
+                        "spectra": [spectrum(0.5, 0.25, 1.0), spectrum(2.0, 4.0)],
+                    },
+                    {
+                        "label_name": "茎",
+                        "color": "#0000ff",
+                        "tool_type": "rect",
+                        "coordinates": {"x": 0, "y": 0, "width": 3, "height": 3},
+                        "area": 9.0,
+                    },
+                ]
+            },
+            headers=headers,
+        )
+
+        export_resp = await client.post(f"/api/v1/projects/{project_id}/export/columnar", headers=headers)
+        assert export_resp.status_code == 200
+        assert export_resp.headers["content-type"] == "application/x-tar"
+        with tarfile.open(fileobj=io.BytesIO(export_resp.content)) as tar:
+            tar.extractall(tmp_path, filter="data")
+
+        manifest, arrays = open_columnar_export(tmp_path)
+        assert manifest["counts"] == {"samples": 2, "annotations": 2, "spectra": 2, "axes": 2}
+        assert isinstance(arrays["spectra/values"], np.memmap)
+        assert [sid.decode() for sid in arrays["samples/sample_id"]] == [item["sample_id"] for item in samples]
+        assert list(arrays["annotations/sample_index"]) == [1, 1]
+        assert [manifest["labels"][code] for code in arrays["annotations/label"]] == ["叶片", "茎"]
+        assert np.isnan(arrays["annotations/area"][0]) and arrays["annotations/area"][1] == 9.0
+
+        offsets = arrays["spectra/offsets"]
+        assert list(offsets) == [0, 3, 5]
+        assert list(arrays["spectra/values"][offsets[1] : offsets[2]]) == [2.0, 4.0]
+        axis = arrays["spectra/axis_index"][0]
+        axis_offsets = arrays["axes/offsets"]
+        assert list(arrays["axes/wavelengths"][axis_offsets[axis] : axis_offsets[axis + 1]]) == [400, 405, 410]
+        coordinates = (tmp_path / "annotations/coordinates.jsonl").read_text(encoding="utf-8").splitlines()
+        assert json.loads(coordinates[0]) == {"x": 1, "y": 2}
+        assert not list(EXPORT_ROOT.glob("*.tar"))
+    finally:
+        shutil.rmtree(DATA_SOURCE_ROOT / folder, ignore_errors=True)
+
+
+@pytest.mark.asyncio
+async def test_delta_export_since_version(client: AsyncClient) -> None:
+    token = await get_auth_token(client, "delta_export@example.com", "password123")
+    headers = {"Authorization": f"Bearer {token}"}
+    folder = prepare_data_source()
+    try:
+        create_resp = await client.post(
+            "/api/v1/projects",
+            json={"name": "增量导出", "data_source_folder": folder},
+            headers=headers,
+        )
+        project_id = create_resp.json()["id"]
+        samples = (await client.get(f"/api/v1/projects/{project_id}/samples", headers=headers)).json()["items"]
+
+        def annotation(label: str) -> dict:
+            return {"label_name": label, "color": "#ff0000", "tool_type": "point", "coordinates": {"x": 0, "y": 0}}
+
+        saved = await client.put(
+            f"/api/v1/samples/{samples[0]['id']}/annotations",
+            json={"annotations": [annotation("a"), annotation("b")]},
+            headers=headers,
+        )
+        detail_ids = {item["label_name"]: item["detail_id"] for item in saved.json()["annotations"]}
+        await client.put(
+            f"/api/v1/samples/{samples[1]['id']}/annotations",
+            json={"annotations": [annotation("c")]},
+            headers=headers,
+        )
+
+        baseline = (await client.post(f"/api/v1/projects/{project_id}/export", json={}, headers=headers)).json()
+        since = baseline["version"]
+        assert len(baseline["samples"]) == 2
+        assert baseline["tombstones"] == []
+
+        await client.patch(
+            f"/api/v1/samples/{samples[0]['id']}/annotations",
+            json={"update": [{"detail_id": detail_ids["a"], "remark": "新"}], "delete": [detail_ids["b"]]},
+            headers=headers,
+        )
+
+        delta = (
+            await client.post(f"/api/v1/projects/{project_id}/export", json={"since": since}, headers=headers)
+        ).json()
+        assert delta["since"] == since and delta["version"] > since
+        assert [block["sample_id"] for block in delta["samples"]] == [samples[0]["sample_id"]]
+        assert [record["detail"]["remark"] for record in delta["samples"][0]["annotations"]] == ["新"]
+        assert [(t["sample_id"], t["detail_id"]) for t in delta["tombstones"]] == [
+            (samples[0]["sample_id"], detail_ids["b"])
+        ]
+
+        stream_resp = await client.post(
+            f"/api/v1/projects/{project_id}/export/stream", json={"since": since}, headers=headers
+        )
+        lines = [json.loads(line) for line in stream_resp.text.splitlines()]
+        assert [line["type"] for line in lines] == ["header", "sample", "tombstone", "end"]
+        assert lines[0]["version"] == delta["version"]
+        assert lines[-1] == {"type": "end", "samples": 1, "tombstones": 1}
+
+        unchanged = (
+            await client.post(
+                f"/api/v1/projects/{project_id}/export", json={"since": delta["version"]}, headers=headers
+            )
+        ).json()
+        assert unchanged["samples"] == [] and unchanged["tombstones"] == []
+    finally:
+        shutil.rmtree(DATA_SOURCE_ROOT / folder, ignore_errors=True)
+
+
+@pytest.mark.asyncio
+async def test_replace_annotations_keeps_detail_ids(client: AsyncClient) -> None:
+    token = await get_auth_token(client, "stable_ids@example.com", "password123")
+    headers = {"Authorization": f"Bearer {token}"}
+    folder = prepare_data_source()
+    try:
+        create_resp = await client.post(
+            "/api/v1/projects",
+            json={"name": "整体保存", "data_source_folder": folder},
+            headers=headers,
+        )
+        project_id = create_resp.json()["id"]
+        sample = (await client.get(f"/api/v1/projects/{project_id}/samples", headers=headers)).json()["items"][0]
+        url = f"/api/v1/samples/{sample['id']}/annotations"
+
+        def annotation(label: str, **extra: object) -> dict:
+            return {
+                "label_name": label,
+                "color": "#ff0000",
+                "tool_type": "point",
+                "coordinates": {"x": 0, "y": 0},
+                **extra,
+            }
+
+        saved = (await client.put(url, json={"annotations": [annotation("a"), annotation("b")]}, headers=headers))
+        ids = {item["label_name"]: item["detail_id"] for item in saved.json()["annotations"]}
+        since = (await client.post(f"/api/v1/projects/{project_id}/export", json={}, headers=headers)).json()[
+            "version"
+        ]
+
+        # a 原样保留，b 删除，c 新建
+        resaved = await client.put(
+            url,
+            json={"annotations": [annotation("a", detail_id=ids["a"]), annotation("c")]},
+            headers=headers,
+        )
+        assert resaved.status_code == 200
+        current = {item["label_name"]: item["detail_id"] for item in resaved.json()["annotations"]}
+        assert current["a"] == ids["a"] and set(current) == {"a", "c"}
+
+        delta = (
+            await client.post(f"/api/v1/projects/{project_id}/export", json={"since": since}, headers=headers)
+        ).json()
+        assert [record["detail"]["label_name"] for record in delta["samples"][0]["annotations"]] == ["c"]
+        assert [tombstone["detail_id"] for tombstone in delta["tombstones"]] == [ids["b"]]
+
+        # 改动沿用 ID 的标注时原地更新
+        since = delta["version"]
+        await client.put(
+            url,
+            json={
+                "annotations": [
+                    annotation("a2", detail_id=ids["a"]),
+                    annotation("c", detail_id=current["c"]),
+                ]
+            },
+            headers=headers,
+        )
+        delta = (
+            await client.post(f"/api/v1/projects/{project_id}/export", json={"since": since}, headers=headers)
+        ).json()
+        assert [record["detail"]["detail_id"] for record in delta["samples"][0]["annotations"]] == [ids["a"]]
+        assert delta["samples"][0]["annotations"][0]["detail"]["label_name"] == "a2"
+        assert delta["tombstones"] == []
+
+        unknown = await client.put(
+            url, json={"annotations": [annotation("x", detail_id="missing")]}, headers=headers
+        )
+        assert unknown.status_code == 404
+        duplicated = await client.put(
+            url,
+            json={"annotations": [annotation("x", detail_id=ids["a"]), annotation("y", detail_id=ids["a"])]},
+            headers=headers,
+        )
+        assert duplicated.status_code == 400
+    finally:
+        shutil.rmtree(DATA_SOURCE_ROOT / folder, ignore_errors=True)
+
+
+@pytest.mark.asyncio
+async def test_expired_tombstones_require_full_export(
+    client: AsyncClient, db_session: AsyncSession, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    token = await get_auth_token(client, "tombstone_retention@example.com", "password123")
+    headers = {"Authorization": f"Bearer {token}"}
+    folder = prepare_data_source()
+    try:
+        create_resp = await client.post(
+            "/api/v1/projects",
+            json={"name": "墓碑清理", "data_source_folder": folder},
+            headers=headers,
+        )
+        project_id = create_resp.json()["id"]
+        sample = (await client.get(f"/api/v1/projects/{project_id}/samples", headers=headers)).json()["items"][0]
+        url = f"/api/v1/samples/{sample['id']}/annotations"
+        annotation = {"label_name": "a", "color": "#ff0000", "tool_type": "point", "coordinates": {"x": 0, "y": 0}}
+
+        await client.put(url, json={"annotations": [annotation]}, headers=headers)
+        since = (await client.post(f"/api/v1/projects/{project_id}/export", json={}, headers=headers)).json()[
+            "version"
+        ]
+        await client.put(url, json={"annotations": [annotation]}, headers=headers)
+        await db_session.execute(
+            update(AnnotationTombstone).values(deleted_at=datetime.now(timezone.utc) - timedelta(days=2))
+        )
+
+        # 下一次删除时清理过期墓碑
+        monkeypatch.setattr(settings, "tombstone_retention_days", 1)
+        await client.put(url, json={"annotations": [annotation]}, headers=headers)
+        remaining = (await db_session.execute(select(AnnotationTombstone.change_version))).scalars().all()
+        assert len(remaining) == 1 and remaining[0] > since + 1
+
+        expired = await client.post(f"/api/v1/projects/{project_id}/export", json={"since": since}, headers=headers)
+        assert expired.status_code == 410
+        stream = await client.post(
+            f"/api/v1/projects/{project_id}/export/stream", json={"since": since}, headers=headers
+        )
+        assert stream.status_code == 410
+    finally:
+        shutil.rmtree(DATA_SOURCE_ROOT / folder, ignore_errors=True)
+
+
+@pytest.mark.asyncio
+async def test_stream_project_export_ndjson(
+    client: AsyncClient, db_session: AsyncSession, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(settings, "export_batch_size", 2)
+    opened: list[bool] = []
+
+    @asynccontextmanager
+    async def tracked_session():
+        # 记录流式导出会话的打开与关闭
+        opened.append(True)
+        try:
+            yield db_session
+        finally:
+            opened[-1] = False
+
+    app.dependency_overrides[get_session_factory] = lambda: tracked_session
+    token = await get_auth_token(client, "stream_export@example.com", "password123")
+    headers = {"Authorization": f"Bearer {token}"}
+    folder = prepare_data_source()
+    (DATA_SOURCE_ROOT / folder / "sample3.png").write_bytes(b"dummy")
+    try:
+        create_resp = await client.post(
+            "/api/v1/projects",
+            json={"name": "流式导出", "data_source_folder": folder},
+            headers=headers,
+        )
+        project_id = create_resp.json()["id"]
+
+        stream_resp = await client.post(f"/api/v1/projects/{project_id}/export/stream", json={}, headers=headers)
+        assert stream_resp.status_code == 200
+        assert stream_resp.headers["content-type"] == "application/x-ndjson"
+        lines = [json.loads(line) for line in stream_resp.text.splitlines()]
+        assert [line["type"] for line in lines] == ["header", "sample", "sample", "sample", "end"]
+        assert lines[0]["project"]["id"] == project_id
+        assert lines[-1]["samples"] == 3
+        # 独立会话在响应体发送完毕后关闭
+        assert opened == [False]
+
+        full = (await client.post(f"/api/v1/projects/{project_id}/export", json={}, headers=headers)).json()
+        streamed = [{key: value for key, value in line.items() if key != "type"} for line in lines[1:-1]]
+        assert streamed == full["samples"]
+
+        build_block = project_service._export_sample_block
+        built: list[int] = []
+
+        def failing_block(sample, options):  # 第二批时模拟意外错误
+            built.append(sample.id)
+            if len(built) > 2:
+                raise RuntimeError("boom")
+            return build_block(sample, options)
+
+        monkeypatch.setattr(project_service, "_export_sample_block", failing_block)
+        failed = await client.post(f"/api/v1/projects/{project_id}/export/stream", json={}, headers=headers)
+        failed_lines = [json.loads(line) for line in failed.text.splitlines()]
+        assert [line["type"] for line in failed_lines] == ["header", "sample", "sample", "error"]
+        assert failed_lines[-1]["detail"] == "导出失败"
+        assert failed_lines[-1]["samples"] == 2
+
+        invalid = await client.post(
+            f"/api/v1/projects/{project_id}/export/stream",
+            json={"resample_to_project_grid": True},
+            headers=headers,
+        )
+        assert invalid.status_code == 400
+        assert opened == [False, False, False]
+    finally:
+        shutil.rmtree(DATA_SOURCE_ROOT / folder, ignore_errors=True)
+
+
+@pytest.mark.asyncio
+async def test_list_data_sources(client: AsyncClient) -> None:
+    token = await get_auth_token(client, "datasource@example.com", "password123")
+    image_folder = prepare_data_source()
+    hyper_folder = prepare_hyper_data_source()
+    # 直接写入磁盘的目录由后台刷新发现，这里显式失效以同步读取
+    data_source_index.invalidate()
+    try:
+        response = await client.get(
+            "/api/v1/projects/data-sources",
+            headers={"Authorization": f"Bearer {token}"},
+        )
+        assert response.status_code == 200
+        sources = {item["name"]: item for item in response.json()}
+        assert sources[image_folder]["total_files"] == 2
+        assert sources[image_folder]["total_samples"] == 2
+        assert sources[hyper_folder]["total_files"] == 2
+        assert sources[hyper_folder]["total_samples"] == 1
+    finally:
+        shutil.rmtree(DATA_SOURCE_ROOT / image_folder, ignore_errors=True)
+        shutil.rmtree(DATA_SOURCE_ROOT / hyper_folder, ignore_errors=True)
+
+
+@pytest.mark.asyncio
+async def test_create_project_inserts_samples_in_batches(
+    client: AsyncClient, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    from app.services import project as project_service
+
+    monkeypatch.setattr(project_service, "SAMPLE_INSERT_BATCH", 2)
+    token = await get_auth_token(client, "project_batch@example.com", "password123")
+    folder = prepare_data_source()
+    nested = DATA_SOURCE_ROOT / folder / "nested"
+    nested.mkdir()
+    for idx in range(3):
+        (nested / f"extra{idx}.jpg").write_bytes(b"dummy")
+    try:
+        response = await client.post(
+            "/api/v1/projects",
+            json={"name": "批量导入", "priority": "normal", "data_source_folder": folder},
+            headers={"Authorization": f"Bearer {token}"},
+        )
+        assert response.status_code == 201
+        data = response.json()
+        assert data["total_samples"] == 5
+        assert data["available_samples"] == 5
+
+        samples = await client.get(
+            f"/api/v1/projects/{data['id']}/samples",
+            headers={"Authorization": f"Bearer {token}"},
+        )
+        assert samples.status_code == 200
+        assert samples.json()["total"] == 5
+    finally:
+        shutil.rmtree(DATA_SOURCE_ROOT / folder, ignore_errors=True)
+
+
+@pytest.mark.asyncio
+async def test_upload_folder_streams_files(client: AsyncClient, monkeypatch: pytest.MonkeyPatch) -> None:
+    from app.services import upload as upload_service
+
+    monkeypatch.setattr(upload_service, "UPLOAD_CHUNK_SIZE", 7)
+    token = await get_auth_token(client, "upload_folder@example.com", "password123")
+    headers = {"Authorization": f"Bearer {token}"}
+    folder_name = f"upload_{uuid4().hex[:8]}"
+    payload = bytes(range(256)) * 40
+    try:
+        response = await client.post(
+            "/api/v1/projects/data-sources/upload-folder",
+            data={
+                "folder_name": folder_name,
+                "relative_paths": [f"{folder_name}/cubes/a.spe", "b.png"],
+            },
+            files=[
+                ("files", ("a.spe", payload, "application/octet-stream")),
+                ("files", ("b.png", b"png-bytes", "image/png")),
+            ],
+            headers=headers,
+        )
+        assert response.status_code == 200
+        assert response.json()["name"] == folder_name
+        assert response.json()["total_files"] == 2
+        assert (DATA_SOURCE_ROOT / folder_name / "cubes" / "a.spe").read_bytes() == payload
+
+        rejected = await client.post(
+            "/api/v1/projects/data-sources/upload-folder",
+            data={"folder_name": f"{folder_name}_bad", "relative_paths": ["../escape.png"]},
+            files=[("files", ("escape.png", b"x", "image/png"))],
+            headers=headers,
+        )
+        assert rejected.status_code == 400
+        assert not (DATA_SOURCE_ROOT / f"{folder_name}_bad").exists()
+    finally:
+        shutil.rmtree(DATA_SOURCE_ROOT / folder_name, ignore_errors=True)
+
+
+@pytest.mark.asyncio
+async def test_upload_folder_failure_stops_other_writes(client: AsyncClient, monkeypatch: pytest.MonkeyPatch) -> None:
+    from app.services import upload as upload_service
+
+    class FlakyWriter(upload_service.BlobWriter):
+        def write(self, chunk: bytes) -> None:
+            if chunk.startswith(b"BAD"):
+                raise RuntimeError("disk error")
+            super().write(chunk)
+
+        def commit(self, destination: Path) -> upload_service.StoredFile:
+            # 慢提交：失败的写入先返回，清理目录时这次提交仍在进行
+            time.sleep(0.2)
+            return super().commit(destination)
+
+    monkeypatch.setattr(upload_service, "UPLOAD_CHUNK_SIZE", 64)
+    monkeypatch.setattr(upload_service, "BlobWriter", FlakyWriter)
+    token = await get_auth_token(client, "upload_failure@example.com", "password123")
+    folder_name = f"upload_{uuid4().hex[:8]}"
+    try:
+        response = await client.post(
+            "/api/v1/projects/data-sources/upload-folder",
+            data={"folder_name": folder_name, "relative_paths": ["cubes/a.spe", "b.png"]},
+            files=[
+                ("files", ("a.spe", b"x" * 64, "application/octet-stream")),
+                ("files", ("b.png", b"BAD" * 30, "image/png")),
+            ],
+            headers={"Authorization": f"Bearer {token}"},
+        )
+        assert response.status_code == 400
+        # 其余写入已在清理前结束，不会重新建出半截目录
+        await asyncio.sleep(0.5)
+        assert not (DATA_SOURCE_ROOT / folder_name).exists()
+    finally:
+        shutil.rmtree(DATA_SOURCE_ROOT / folder_name, ignore_errors=True)
+
+
+@pytest.mark.asyncio
+async def test_resumable_upload_session(client: AsyncClient) -> None:
+    token = await get_auth_token(client, "resumable@example.com", "password123")
+    headers = {"Authorization": f"Bearer {token}"}
+    folder_name = f"resumable_{uuid4().hex[:8]}"
+    header_text = b"ENVI\nsamples = 2\nlines = 2\nbands = 2\ndata type = 12\ninterleave = bil\n"
+    cube = bytes(range(16))
+    try:
+        created = await client.post(
+            "/api/v1/projects/data-sources/uploads",
+            json={
+                "folder_name": folder_name,
+                "files": [
+                    {"path": "cubes/c.hdr", "size": len(header_text)},
+                    {"path": "cubes/c.spe", "size": len(cube)},
+                ],
+            },
+            headers=headers,
+        )
+        assert created.status_code == 201
+        session_id = created.json()["session_id"]
+        base = f"/api/v1/projects/data-sources/uploads/{session_id}"
+
+        async def put_range(index: int, data: bytes, start: int, total: int) -> dict:
+            response = await client.put(
+                f"{base}/files/{index}",
+                content=data,
+                headers={**headers, "Content-Range": f"bytes {start}-{start + len(data) - 1}/{total}"},
+            )
+            assert response.status_code == 200
+            return response.json()
+
+        await put_range(0, header_text, 0, len(header_text))
+        partial = await put_range(1, cube[8:], 8, 16)
+        assert partial["received"] == [[8, 16]] and not partial["complete"]
+        assert folder_name not in {item["name"] for item in (await client.get("/api/v1/projects/data-sources", headers=headers)).json()}
+
+        early = await client.post(f"{base}/finalize", headers=headers)
+        assert early.status_code == 400
+
+        complete = await put_range(1, cube[:8], 0, 16)
+        assert complete["received"] == [[0, 16]] and complete["complete"]
+        finalized = await client.post(f"{base}/finalize", headers=headers)
+        assert finalized.status_code == 200
+        assert finalized.json()["name"] == folder_name
+        assert finalized.json()["total_files"] == 2
+        assert (DATA_SOURCE_ROOT / folder_name / "cubes" / "c.spe").read_bytes() == cube
+        # 乱序上传没有顺序哈希，finalize 时补算后同样并入 blob 库
+        assert (DATA_SOURCE_ROOT / folder_name / "cubes" / "c.spe").stat().st_nlink == 2
+        assert (await client.get(base, headers=headers)).status_code == 404
+    finally:
+        shutil.rmtree(DATA_SOURCE_ROOT / folder_name, ignore_errors=True)
+
+
+@pytest.mark.asyncio
+async def test_resumable_upload_rejects_cube_size_mismatch(client: AsyncClient) -> None:
+    token = await get_auth_token(client, "resumable_bad@example.com", "password123")
+    headers = {"Authorization": f"Bearer {token}"}
+    header_text = b"samples = 4\nlines = 4\nbands = 4\ndata type = 12\n"
+    created = await client.post(
+        "/api/v1/projects/data-sources/uploads",
+        json={
+            "folder_name": f"resumable_bad_{uuid4().hex[:8]}",
+            "files": [{"path": "c.hdr", "size": len(header_text)}, {"path": "c.spe", "size": 4}],
+        },
+        headers=headers,
+    )
+    base = f"/api/v1/projects/data-sources/uploads/{created.json()['session_id']}"
+    for index, data in enumerate([header_text, b"abcd"]):
+        await client.put(
+            f"{base}/files/{index}",
+            content=data,
+            headers={**headers, "Content-Range": f"bytes 0-{len(data) - 1}/{len(data)}"},
+        )
+    mismatch = await client.put(
+        f"{base}/files/1",
+        content=b"abcdef",
+        headers={**headers, "Content-Range": "bytes 0-3/4"},
+    )
+    assert mismatch.status_code == 400
+
+    finalized = await client.post(f"{base}/finalize", headers=headers)
+    assert finalized.status_code == 400
+    assert "头文件" in finalized.json()["detail"]
+    assert (await client.delete(base, headers=headers)).status_code == 204
+
+
+@pytest.mark.asyncio
+async def test_upload_session_is_private_and_expires(client: AsyncClient) -> None:
+    owner = {"Authorization": f"Bearer {await get_auth_token(client, 'session_owner@example.com', 'password123')}"}
+    other = {"Authorization": f"Bearer {await get_auth_token(client, 'session_other@example.com', 'password123')}"}
+    created = await client.post(
+        "/api/v1/projects/data-sources/uploads",
+        json={"folder_name": f"private_{uuid4().hex[:8]}", "files": [{"path": "a.txt", "size": 3}]},
+        headers=owner,
+    )
+    session_id = created.json()["session_id"]
+    base = f"/api/v1/projects/data-sources/uploads/{session_id}"
+
+    assert (await client.get(base, headers=other)).status_code == 404
+    foreign = await client.put(
+        f"{base}/files/0", content=b"abc", headers={**other, "Content-Range": "bytes 0-2/3"}
+    )
+    assert foreign.status_code == 404
+    assert (await client.delete(base, headers=other)).status_code == 404
+    assert (await client.get(base, headers=owner)).status_code == 200
+
+    assert collect_expired_sessions() == 0
+    assert collect_expired_sessions(now=time.time() + 48 * 3600) >= 1
+    assert not (STAGING_ROOT / session_id).exists()
+    assert (await client.get(base, headers=owner)).status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_upload_deduplicates_identical_files(client: AsyncClient) -> None:
+    token = await get_auth_token(client, "dedup@example.com", "password123")
+    headers = {"Authorization": f"Bearer {token}"}
+    calibration = uuid4().bytes * 64
+    folders = [f"dedup_{uuid4().hex[:8]}" for _ in range(2)]
+    try:
+        responses = []
+        for folder_name in folders:
+            response = await client.post(
+                "/api/v1/projects/data-sources/upload-folder",
+                data={"folder_name": folder_name, "relative_paths": ["c.figspecblack", "unique.png"]},
+                files=[
+                    ("files", ("c.figspecblack", calibration, "application/octet-stream")),
+                    ("files", ("unique.png", folder_name.encode(), "image/png")),
+                ],
+                headers=headers,
+            )
+            assert response.status_code == 200
+            responses.append(response.json())
+
+        assert responses[0]["deduplicated_files"] == 0
+        assert responses[1]["deduplicated_files"] == 1
+        assert responses[1]["deduplicated_bytes"] == len(calibration)
+        first, second = (DATA_SOURCE_ROOT / name / "c.figspecblack" for name in folders)
+        assert first.read_bytes() == second.read_bytes() == calibration
+        assert first.stat().st_ino == second.stat().st_ino
+    finally:
+        for folder_name in folders:
+            shutil.rmtree(DATA_SOURCE_ROOT / folder_name, ignore_errors=True)
+        collect_orphan_blobs(grace_seconds=0)
+
+
+@pytest.mark.asyncio
+async def test_sync_project_with_data_source(client: AsyncClient) -> None:
+    token = await get_auth_token(client, "project_sync@example.com", "password123")
+    headers = {"Authorization": f"Bearer {token}"}
+    folder = prepare_data_source()
+    root = DATA_SOURCE_ROOT / folder
+    try:
+        created = await client.post(
+            "/api/v1/projects",
+            json={"name": "同步", "priority": "normal", "data_source_folder": folder},
+            headers=headers,
+        )
+        project = created.json()
+        assert project["data_source_folder"] == folder
+        listed = (await client.get(f"/api/v1/projects/{project['id']}/samples", headers=headers)).json()
+        ignored_id = next(item["id"] for item in listed["items"] if item["source_files"][0].endswith("sample1.png"))
+        await client.patch(f"/api/v1/samples/{ignored_id}", json={"status": "ignored"}, headers=headers)
+        export_url = f"/api/v1/projects/{project['id']}/export"
+        since = (await client.post(export_url, json={}, headers=headers)).json()["version"]
+
+        (root / "sample3.png").write_bytes(b"dummy")
+        (root / "sample1.png").unlink()
+        (root / "sample2.png").write_bytes(b"changed-content")
+        sync = await client.post(f"/api/v1/projects/{project['id']}/sync", headers=headers)
+        assert sync.status_code == 200
+        assert sync.json() == {
+            "added": 1,
+            "missing": 1,
+            "restored": 0,
+            "changed": 1,
+            "unchanged": 0,
+            "total_samples": 3,
+        }
+
+        samples = (await client.get(f"/api/v1/projects/{project['id']}/samples", headers=headers)).json()
+        statuses = {item["source_files"][0].split("/")[-1]: item["status"] for item in samples["items"]}
+        assert statuses == {"sample1.png": "missing", "sample2.png": "valid", "sample3.png": "valid"}
+        refreshed = (await client.get(f"/api/v1/projects/{project['id']}", headers=headers)).json()
+        assert refreshed["total_samples"] == 3
+        assert refreshed["available_samples"] == 2
+        # 缺失、变化与新增的样本都进入增量导出
+        delta = (await client.post(export_url, json={"since": since}, headers=headers)).json()
+        assert len(delta["samples"]) == 3
+        since = delta["version"]
+
+        (root / "sample1.png").write_bytes(b"dummy")
+        again = await client.post(f"/api/v1/projects/{project['id']}/sync", headers=headers)
+        assert again.json()["restored"] == 1
+        assert again.json()["added"] == 0
+        # 缺失前被忽略的样本恢复后仍为 ignored
+        restored = (await client.get(f"/api/v1/samples/{ignored_id}", headers=headers)).json()
+        assert restored["status"] == "ignored"
+        delta = (await client.post(export_url, json={"since": since}, headers=headers)).json()
+        assert [block["meta"]["id"] for block in delta["samples"]] == [ignored_id]
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+
+@pytest.mark.asyncio
+async def test_upload_archive_enforces_extraction_limits(
+    client: AsyncClient, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    token = await get_auth_token(client, "archive_limits@example.com", "password123")
+    headers = {"Authorization": f"Bearer {token}"}
+    monkeypatch.setattr(settings, "archive_max_bytes", 1000)
+    monkeypatch.setattr(settings, "archive_max_members", 3)
+    blobs_before = set(blob_store.BLOB_ROOT.glob("??/??/*"))
+
+    zip_buffer = io.BytesIO()
+    with zipfile.ZipFile(zip_buffer, "w", compression=zipfile.ZIP_DEFLATED) as archive:
+        archive.writestr("bomb.bin", b"\0" * 10_000)
+    tar_buffer = io.BytesIO()
+    with tarfile.open(fileobj=tar_buffer, mode="w:gz") as archive:
+        for index, size in enumerate([600, 600]):
+            info = tarfile.TarInfo(f"part{index}.bin")
+            info.size = size
+            archive.addfile(info, io.BytesIO(bytes([index + 1]) * size))
+    many_buffer = io.BytesIO()
+    with zipfile.ZipFile(many_buffer, "w") as archive:
+        for index in range(4):
+            archive.writestr(f"f{index}.txt", b"x")
+
+    for filename, payload, detail in [
+        ("bomb.zip", zip_buffer, "超过大小限制"),
+        ("big.tar.gz", tar_buffer, "超过大小限制"),
+        ("many.zip", many_buffer, "文件过多"),
+    ]:
+        folder_name = f"limits_{uuid4().hex[:8]}"
+        response = await client.post(
+            "/api/v1/projects/data-sources/upload-archive",
+            data={"folder_name": folder_name},
+            files={"file": (filename, payload.getvalue(), "application/octet-stream")},
+            headers=headers,
+        )
+        assert response.status_code == 400
+        assert detail in response.json()["detail"]
+        assert not (DATA_SOURCE_ROOT / folder_name).exists()
+    # 中途失败时已入库的 blob 被回收
+    assert set(blob_store.BLOB_ROOT.glob("??/??/*")) == blobs_before
+
+
+@pytest.mark.asyncio
+async def test_upload_archive_extracts_zip_and_tar(client: AsyncClient) -> None:
+    token = await get_auth_token(client, "archive@example.com", "password123")
+    headers = {"Authorization": f"Bearer {token}"}
+    zip_folder = f"archive_zip_{uuid4().hex[:8]}"
+    tar_folder = f"archive_tar_{uuid4().hex[:8]}"
+
+    zip_buffer = io.BytesIO()
+    with zipfile.ZipFile(zip_buffer, "w") as archive:
+        archive.writestr(f"{zip_folder}/", "")
+        archive.writestr(f"{zip_folder}/cubes/a.spe", b"spe" * 1000)
+        archive.writestr(f"{zip_folder}/cubes/a.hdr", b"header")
+        archive.writestr("__MACOSX/._a.spe", b"junk")
+
+    tar_buffer = io.BytesIO()
+    with tarfile.open(fileobj=tar_buffer, mode="w:gz") as archive:
+        data = b"image-bytes"
+        info = tarfile.TarInfo("images/one.png")
+        info.size = len(data)
+        archive.addfile(info, io.BytesIO(data))
+
+    try:
+        zipped = await client.post(
+            "/api/v1/projects/data-sources/upload-archive",
+            data={"folder_name": zip_folder},
+            files={"file": ("data.zip", zip_buffer.getvalue(), "application/zip")},
+            headers=headers,
+        )
+        assert zipped.status_code == 200
+        assert zipped.json()["total_files"] == 2
+        assert (DATA_SOURCE_ROOT / zip_folder / "cubes" / "a.spe").read_bytes() == b"spe" * 1000
+        assert not (DATA_SOURCE_ROOT / zip_folder / "__MACOSX").exists()
+
+        tarred = await client.post(
+            "/api/v1/projects/data-sources/upload-archive",
+            data={"folder_name": tar_folder},
+            files={"file": ("data.tar.gz", tar_buffer.getvalue(), "application/gzip")},
+            headers=headers,
+        )
+        assert tarred.status_code == 200
+        assert (DATA_SOURCE_ROOT / tar_folder / "images" / "one.png").read_bytes() == b"image-bytes"
+
+        unsafe_buffer = io.BytesIO()
+        with zipfile.ZipFile(unsafe_buffer, "w") as archive:
+            archive.writestr("a/b/c/d/e.png", b"too-deep")
+        unsafe = await client.post(
+            "/api/v1/projects/data-sources/upload-archive",
+            data={"folder_name": f"{zip_folder}_deep"},
+            files={"file": ("deep.zip", unsafe_buffer.getvalue(), "application/zip")},
+            headers=headers,
+        )
+        assert unsafe.status_code == 400
+        assert not (DATA_SOURCE_ROOT / f"{zip_folder}_deep").exists()
+    finally:
+        shutil.rmtree(DATA_SOURCE_ROOT / zip_folder, ignore_errors=True)
+        shutil.rmtree(DATA_SOURCE_ROOT / tar_folder, ignore_errors=True)
+        collect_orphan_blobs(grace_seconds=0)
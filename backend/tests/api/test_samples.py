@@ -0,0 +1,650 @@
+import asyncio
+import shutil
+from uuid import uuid4
+
+import numpy as np
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.annotation_detail_mode import AnnotationDetailMode
+from app.models.annotation_sample import AnnotationSample
+from app.models.display_algorithm import DisplayAlgorithm
+from app.models.spectrum_axis import SpectrumAxis
+from app.schemas.sample import SAMPLE_PAGE_SIZE, SampleListQuery
+from app.services.project import DATA_SOURCE_ROOT
+
+
+async def get_auth_token(client: AsyncClient, email: str, password: str) -> str:
+    await client.post(
+        "/api/v1/auth/register",
+        json={"email": email, "password": password},
+    )
+    response = await client.post(
+        "/api/v1/auth/login",
+        data={"username": email, "password": password},
+    )
+    return response.json()["access_token"]
+
+
+def prepare_cube_data_source(lines: int = 12, samples: int = 10, bands: int = 8) -> str:
+    """Create a small BIL uint16 cube made of three pure materials."""
+    folder_name = f"cube_ds_{uuid4().hex[:8]}"
+    folder = DATA_SOURCE_ROOT / folder_name
+    folder.mkdir(parents=True, exist_ok=True)
+    rng = np.random.default_rng(7)
+    materials = rng.uniform(500, 4000, size=(3, bands))
+    labels = np.arange(lines * samples).reshape(lines, samples) % 3
+    cube = materials[labels]  # (lines, samples, bands)
+    bil = np.ascontiguousarray(cube.transpose(0, 2, 1)).astype("<u2")
+    (folder / "scene.spe").write_bytes(bil.tobytes())
+    wavelengths = ",".join(f"{400 + 10 * i}" for i in range(bands))
+    (folder / "scene.hdr").write_text(
+        "ENVI\n"
+        f"samples = {samples}\nlines = {lines}\nbands = {bands}\n"
+        "header offset = 0\ndata type = 12\ninterleave = bil\nbyte order = 0\n"
+        f"wavelength = {{{wavelengths}}}\n",
+        encoding="utf-8",
+    )
+    return folder_name
+
+
+async def create_cube_project(
+    client: AsyncClient,
+    token: str,
+    folder: str,
+    **extra: object,
+) -> dict:
+    create_resp = await client.post(
+        "/api/v1/projects",
+        json={"name": "立方体", "data_source_folder": folder, **extra},
+        headers={"Authorization": f"Bearer {token}"},
+    )
+    assert create_resp.status_code == 201
+    project_id = create_resp.json()["id"]
+    samples_resp = await client.get(
+        f"/api/v1/projects/{project_id}/samples",
+        headers={"Authorization": f"Bearer {token}"},
+    )
+    return samples_resp.json()["items"][0]
+
+
+@pytest.mark.asyncio
+async def test_endmember_extraction_and_abundance(client: AsyncClient) -> None:
+    token = await get_auth_token(client, "unmix@example.com", "password123")
+    folder = prepare_cube_data_source()
+    try:
+        sample = await create_cube_project(client, token, folder)
+
+        response = await client.post(
+            f"/api/v1/samples/{sample['id']}/endmembers",
+            json={"n_endmembers": 3, "subsample": 120},
+            headers={"Authorization": f"Bearer {token}"},
+        )
+        assert response.status_code == 200
+        data = response.json()
+        assert data["n_endmembers"] == 3
+        assert len(data["endmembers"]) == 3
+        assert len(data["endmembers"][0]) == 8
+        assert data["wavelengths"][0] == 400
+
+        render = await client.get(
+            f"/api/v1/samples/{sample['id']}/endmembers/0/abundance",
+            params={"n_endmembers": 3, "subsample": 120},
+            headers={"Authorization": f"Bearer {token}"},
+        )
+        assert render.status_code == 200
+        assert render.headers["content-type"] == "image/png"
+        assert render.content.startswith(b"\x89PNG")
+
+        missing = await client.get(
+            f"/api/v1/samples/{sample['id']}/endmembers/5/abundance",
+            params={"n_endmembers": 3, "subsample": 120},
+            headers={"Authorization": f"Bearer {token}"},
+        )
+        assert missing.status_code == 404
+    finally:
+        shutil.rmtree(DATA_SOURCE_ROOT / folder, ignore_errors=True)
+
+
+@pytest.mark.asyncio
+async def test_quality_scan_runs_after_import(client: AsyncClient, db_session: AsyncSession) -> None:
+    token = await get_auth_token(client, "quality@example.com", "password123")
+    folder = prepare_cube_data_source()
+    try:
+        sample = await create_cube_project(client, token, folder)
+        await db_session.commit()
+
+        data: dict = {}
+        for _ in range(50):
+            response = await client.get(
+                f"/api/v1/samples/{sample['id']}/quality",
+                headers={"Authorization": f"Bearer {token}"},
+            )
+            assert response.status_code == 200
+            data = response.json()
+            if data["status"] != "pending":
+                break
+            await asyncio.sleep(0.1)
+
+        assert data["status"] == "completed"
+        assert data["bands"] == 8
+        assert len(data["snr"]) == 8
+        assert len(data["percentiles"]["p2"]) == 8
+    finally:
+        shutil.rmtree(DATA_SOURCE_ROOT / folder, ignore_errors=True)
+
+
+@pytest.mark.asyncio
+async def test_list_samples_keyset_pagination(client: AsyncClient) -> None:
+    token = await get_auth_token(client, "paging@example.com", "password123")
+    headers = {"Authorization": f"Bearer {token}"}
+    folder = f"paging_ds_{uuid4().hex[:8]}"
+    (DATA_SOURCE_ROOT / folder).mkdir(parents=True)
+    for index in range(5):
+        (DATA_SOURCE_ROOT / folder / f"img_{index}.png").write_bytes(b"dummy")
+    try:
+        created = await client.post(
+            "/api/v1/projects",
+            json={"name": "分页", "data_source_folder": folder},
+            headers=headers,
+        )
+        url = f"/api/v1/projects/{created.json()['id']}/samples"
+
+        seen: list[int] = []
+        cursor = None
+        pages = 0
+        while True:
+            params: dict = {"limit": 2, "with_total": "true"}
+            if cursor is not None:
+                params["cursor"] = cursor
+            data = (await client.get(url, params=params, headers=headers)).json()
+            assert data["total"] == 5
+            assert data["total_estimated"] is True
+            seen.extend(item["id"] for item in data["items"])
+            pages += 1
+            cursor = data["next_cursor"]
+            if cursor is None:
+                break
+        assert pages == 3
+        assert seen == sorted(seen) and len(set(seen)) == 5
+
+        await client.patch(f"/api/v1/samples/{seen[1]}", json={"status": "ignored"}, headers=headers)
+        data = (
+            await client.get(url, params={"status": "ignored", "limit": 10, "with_total": "true"}, headers=headers)
+        ).json()
+        assert [item["id"] for item in data["items"]] == [seen[1]]
+        assert data["total"] == 1
+        assert data["total_estimated"] is False
+        assert data["next_cursor"] is None
+
+        data = (
+            await client.get(url, params={"is_annotated": "false", "cursor": seen[2], "limit": 10}, headers=headers)
+        ).json()
+        assert [item["id"] for item in data["items"]] == seen[3:]
+        assert data["total"] is None
+
+        data = (await client.get(url, params={"last_annotated_by": 999}, headers=headers)).json()
+        assert data["items"] == []
+        assert data["total"] == 0
+
+        # Without limit the endpoint still returns a bounded first page
+        data = (await client.get(url, headers=headers)).json()
+        assert len(data["items"]) == 5
+        assert data["total"] == 5
+        assert data["next_cursor"] is None
+        assert SampleListQuery().limit == SAMPLE_PAGE_SIZE
+    finally:
+        shutil.rmtree(DATA_SOURCE_ROOT / folder, ignore_errors=True)
+
+
+@pytest.mark.asyncio
+async def test_spectrum_axis_survives_header_rewrite(client: AsyncClient, db_session: AsyncSession) -> None:
+    token = await get_auth_token(client, "axis@example.com", "password123")
+    headers = {"Authorization": f"Bearer {token}"}
+    folder = prepare_cube_data_source()
+    try:
+        sample = await create_cube_project(client, token, folder)
+        url = f"/api/v1/samples/{sample['id']}/annotations"
+        points = [{"wavelength": 400 + 10 * band, "intensity": band / 4} for band in range(8)]
+        annotation = {
+            "label_name": "a",
+            "color": "#ff0000",
+            "tool_type": "rect",
+            "coordinates": {"x": 0, "y": 0, "width": 2, "height": 2},
+            "spectra": [{"points": points}, {"points": points}],
+        }
+        saved = await client.put(url, json={"annotations": [annotation]}, headers=headers)
+        assert saved.status_code == 200
+        assert await db_session.scalar(select(func.count(SpectrumAxis.id))) == 1
+
+        # A sync rewrites the sample header; stored curves keep their own axis
+        row = await db_session.get(AnnotationSample, sample["id"])
+        row.wavelengths = [500.0 + band for band in range(8)]
+        await db_session.flush()
+        detail = (await client.get(f"/api/v1/samples/{sample['id']}", headers=headers)).json()
+        assert detail["annotations"][0]["spectra"][0]["points"] == points
+
+        for bad in ({"intensity": 0.5}, {"wavelength": 400, "intensity": 0.5, "extra": 1}):
+            rejected = await client.put(
+                url,
+                json={"annotations": [{**annotation, "spectra": [{"points": [bad]}]}]},
+                headers=headers,
+            )
+            assert rejected.status_code == 422
+    finally:
+        shutil.rmtree(DATA_SOURCE_ROOT / folder, ignore_errors=True)
+
+
+@pytest.mark.asyncio
+async def test_patch_annotations_touches_only_changed_rows(client: AsyncClient) -> None:
+    token = await get_auth_token(client, "patcher@example.com", "password123")
+    headers = {"Authorization": f"Bearer {token}"}
+    folder = f"patch_ds_{uuid4().hex[:8]}"
+    (DATA_SOURCE_ROOT / folder).mkdir(parents=True)
+    (DATA_SOURCE_ROOT / folder / "img.png").write_bytes(b"dummy")
+    try:
+        created = await client.post(
+            "/api/v1/projects",
+            json={"name": "增量", "data_source_folder": folder},
+            headers=headers,
+        )
+        project_id = created.json()["id"]
+        samples = await client.get(f"/api/v1/projects/{project_id}/samples", headers=headers)
+        sample_id = samples.json()["items"][0]["id"]
+        url = f"/api/v1/samples/{sample_id}/annotations"
+
+        def annotation(label: str, value: float) -> dict:
+            return {
+                "label_name": label,
+                "color": "#ff0000",
+                "tool_type": "rect",
+                "coordinates": {"x": 0, "y": 0, "width": 2, "height": 2},
+                "spectra": [{"points": [{"wavelength": 400, "intensity": value}]}],
+            }
+
+        saved = await client.put(
+            url,
+            json={"annotations": [annotation("a", 0.1), annotation("b", 0.2), annotation("c", 0.3)]},
+            headers=headers,
+        )
+        before = {item["label_name"]: item for item in saved.json()["annotations"]}
+
+        patched = await client.patch(
+            url,
+            json={
+                "add": [annotation("d", 0.4)],
+                "update": [
+                    {"detail_id": before["a"]["detail_id"], "remark": "改过"},
+                    {
+                        "detail_id": before["b"]["detail_id"],
+                        "spectra": [{"points": [{"wavelength": 400, "intensity": 0.9}]}],
+                    },
+                ],
+                "delete": [before["c"]["detail_id"]],
+            },
+            headers=headers,
+        )
+        assert patched.status_code == 200
+        data = patched.json()
+        after = {item["label_name"]: item for item in data["annotations"]}
+        assert sorted(after) == ["a", "b", "d"]
+        assert data["is_annotated"] is True
+
+        assert after["a"]["remark"] == "改过"
+        assert after["a"]["spectra"] == before["a"]["spectra"]
+        assert after["b"]["remark"] is None
+        assert after["b"]["spectra"][0]["points"][0]["intensity"] == pytest.approx(0.9)
+        assert after["d"]["spectra"][0]["points"][0]["intensity"] == pytest.approx(0.4)
+
+        missing = await client.patch(url, json={"delete": [before["c"]["detail_id"]]}, headers=headers)
+        assert missing.status_code == 404
+        conflict = await client.patch(
+            url,
+            json={"update": [{"detail_id": before["a"]["detail_id"]}], "delete": [before["a"]["detail_id"]]},
+            headers=headers,
+        )
+        assert conflict.status_code == 400
+        invalid = await client.patch(
+            url,
+            json={"update": [{"detail_id": before["a"]["detail_id"], "label_name": None}]},
+            headers=headers,
+        )
+        assert invalid.status_code == 422
+
+        cleared = await client.patch(
+            url,
+            json={"delete": [after[label]["detail_id"] for label in ("a", "b", "d")]},
+            headers=headers,
+        )
+        assert cleared.json()["annotations"] == []
+        assert cleared.json()["is_annotated"] is False
+    finally:
+        shutil.rmtree(DATA_SOURCE_ROOT / folder, ignore_errors=True)
+
+
+@pytest.mark.asyncio
+async def test_mode_snapshots_are_shared_between_annotations(
+    client: AsyncClient,
+    db_session: AsyncSession,
+) -> None:
+    db_session.add(DisplayAlgorithm(code="linear", name="Linear"))
+    await db_session.flush()
+    token = await get_auth_token(client, "modes@example.com", "password123")
+    headers = {"Authorization": f"Bearer {token}"}
+    folder = prepare_cube_data_source()
+    try:
+        sample = await create_cube_project(client, token, folder)
+        url = f"/api/v1/samples/{sample['id']}/annotations"
+        mode = {
+            "r_channel": 5,
+            "g_channel": 3,
+            "b_channel": 1,
+            "r_gain": 1.0,
+            "g_gain": 1.0,
+            "b_gain": 1.0,
+            "gain_algorithm": "linear",
+            "dark_calibration": False,
+            "white_calibration": False,
+        }
+
+        def annotation(label: str, snapshot: dict) -> dict:
+            return {
+                "label_name": label,
+                "color": "#00ff00",
+                "tool_type": "point",
+                "coordinates": {"x": 1, "y": 1},
+                "mode_snapshot": snapshot,
+            }
+
+        saved = await client.put(
+            url,
+            json={"annotations": [annotation(str(index), mode) for index in range(3)]},
+            headers=headers,
+        )
+        assert saved.status_code == 200
+        annotations = saved.json()["annotations"]
+        snapshots = [item["mode_snapshot"] for item in annotations]
+        assert len({snapshot["id"] for snapshot in snapshots}) == 1
+        assert [snapshot["detail_id"] for snapshot in snapshots] == [item["id"] for item in annotations]
+        assert snapshots[0]["r_channel"] == 5 and snapshots[0]["gain_algorithm"] == "linear"
+
+        # 再次保存同样的快照不产生新行；修改一条的快照只新增一行
+        patched = await client.patch(
+            url,
+            json={
+                "add": [annotation("3", mode)],
+                "update": [{"detail_id": annotations[0]["detail_id"], "mode_snapshot": {**mode, "r_gain": 2.0}}],
+            },
+            headers=headers,
+        )
+        by_label = {item["label_name"]: item["mode_snapshot"] for item in patched.json()["annotations"]}
+        assert by_label["3"]["id"] == snapshots[0]["id"]
+        assert by_label["0"]["id"] != snapshots[0]["id"]
+        assert by_label["0"]["r_gain"] == 2.0
+        count = await db_session.scalar(select(func.count(AnnotationDetailMode.id)))
+        assert count == 2
+
+        cleared = await client.patch(
+            url,
+            json={"update": [{"detail_id": annotations[1]["detail_id"], "mode_snapshot": None}]},
+            headers=headers,
+        )
+        by_label = {item["label_name"]: item["mode_snapshot"] for item in cleared.json()["annotations"]}
+        assert by_label["1"] is None
+        assert by_label["2"]["id"] == snapshots[0]["id"]
+    finally:
+        shutil.rmtree(DATA_SOURCE_ROOT / folder, ignore_errors=True)
+
+
+@pytest.mark.asyncio
+async def test_list_samples_returns_and_filters_cube_metadata(client: AsyncClient) -> None:
+    token = await get_auth_token(client, "metadata@example.com", "password123")
+    headers = {"Authorization": f"Bearer {token}"}
+    folder = prepare_cube_data_source()
+    (DATA_SOURCE_ROOT / folder / "scene.figspecwhite").write_bytes(b"\x00\x01" * 8)
+    try:
+        sample = await create_cube_project(client, token, folder)
+        assert sample["cube_lines"] == 12
+        assert sample["cube_samples"] == 10
+        assert sample["cube_bands"] == 8
+        assert sample["data_type"] == 12
+        assert sample["interleave"] == "bil"
+        assert sample["wavelength_min"] == 400
+        assert sample["wavelength_max"] == 470
+        assert sample["file_size"] == 12 * 10 * 8 * 2
+        assert sample["has_white"] is True
+        assert sample["has_dark"] is False
+
+        url = f"/api/v1/projects/{sample['project_id']}/samples"
+        cases = [
+            ({"min_bands": 8, "max_bands": 8}, 1),
+            ({"min_bands": 9}, 0),
+            ({"min_lines": 12, "max_samples": 10}, 1),
+            ({"max_file_size": 100}, 0),
+            ({"wavelength_min": 420, "wavelength_max": 450}, 1),
+            ({"wavelength_max": 500}, 0),
+            ({"interleave": "bsq"}, 0),
+            ({"has_white": "true", "sample_type": "hyperspectral"}, 1),
+            ({"has_dark": "true"}, 0),
+        ]
+        for params, expected in cases:
+            response = await client.get(url, params=params, headers=headers)
+            assert response.status_code == 200
+            assert response.json()["total"] == expected, params
+    finally:
+        shutil.rmtree(DATA_SOURCE_ROOT / folder, ignore_errors=True)
+
+
+@pytest.mark.asyncio
+async def test_ingest_pipeline_progress_and_derivatives(client: AsyncClient, db_session: AsyncSession) -> None:
+    token = await get_auth_token(client, "ingest@example.com", "password123")
+    headers = {"Authorization": f"Bearer {token}"}
+    folder = prepare_cube_data_source()
+    try:
+        sample = await create_cube_project(client, token, folder)
+        # The test get_db never commits; ingest is only queued once the import is committed
+        await db_session.commit()
+
+        # Viewers fall back to rendering from the cube until derivatives exist
+        overview = await client.get(
+            f"/api/v1/samples/{sample['id']}/overview",
+            params={"band": 2, "level": 1},
+            headers=headers,
+        )
+        assert overview.status_code == 200
+        assert overview.headers["content-type"] == "image/png"
+        assert overview.headers["x-derivative"] == "live"
+
+        data: dict = {}
+        for _ in range(50):
+            response = await client.get(
+                f"/api/v1/projects/{sample['project_id']}/ingest",
+                headers=headers,
+            )
+            assert response.status_code == 200
+            data = response.json()
+            if data["completed"] + data["failed"] == data["total"]:
+                break
+            await asyncio.sleep(0.1)
+
+        assert data["total"] == 1
+        assert data["completed"] == 1
+        assert data["progress"] == 1.0
+        item = data["items"][0]
+        assert item["sample_id"] == sample["sample_id"]
+        assert [stage["status"] for stage in item["stages"]] == ["completed"] * len(data["stages"])
+
+        thumbnail = await client.get(f"/api/v1/samples/{sample['id']}/thumbnail", headers=headers)
+        assert thumbnail.status_code == 200
+        assert thumbnail.content.startswith(b"\x89PNG")
+        assert thumbnail.headers["x-derivative"] == "cached"
+    finally:
+        shutil.rmtree(DATA_SOURCE_ROOT / folder, ignore_errors=True)
+
+
+@pytest.mark.asyncio
+async def test_wavelength_lookup_and_mode_resolution(
+    client: AsyncClient,
+    db_session: AsyncSession,
+) -> None:
+    db_session.add(DisplayAlgorithm(code="linear", name="Linear"))
+    await db_session.flush()
+    token = await get_auth_token(client, "wavelength@example.com", "password123")
+    folder = prepare_cube_data_source()
+    try:
+        sample = await create_cube_project(client, token, folder)
+        headers = {"Authorization": f"Bearer {token}"}
+
+        detail = await client.get(f"/api/v1/samples/{sample['id']}", headers=headers)
+        assert detail.json()["wavelengths"] == [400 + 10 * i for i in range(8)]
+
+        lookup = await client.get(
+            f"/api/v1/samples/{sample['id']}/bands/lookup",
+            params=[("wavelength", 444), ("wavelength", 446)],
+            headers=headers,
+        )
+        assert lookup.status_code == 200
+        assert [item["band"] for item in lookup.json()["items"]] == [4, 5]
+
+        band_range = await client.get(
+            f"/api/v1/samples/{sample['id']}/bands/range",
+            params={"wavelength_min": 420, "wavelength_max": 450},
+            headers=headers,
+        )
+        assert band_range.json()["bands"] == [2, 3, 4, 5]
+
+        mode = await client.post(
+            "/api/v1/spectral-modes",
+            json={
+                "name": "可见光",
+                "r_channel": 100,
+                "g_channel": 60,
+                "b_channel": 20,
+                "r_wavelength": 471,
+                "g_wavelength": 449,
+                "b_wavelength": 402,
+            },
+            headers=headers,
+        )
+        assert mode.status_code == 201
+        resolved = await client.get(
+            f"/api/v1/samples/{sample['id']}/spectral-modes/{mode.json()['id']}/channels",
+            headers=headers,
+        )
+        assert resolved.status_code == 200
+        data = resolved.json()
+        assert data["matched_by_wavelength"] is True
+        assert [data["r_channel"], data["g_channel"], data["b_channel"]] == [7, 5, 0]
+    finally:
+        shutil.rmtree(DATA_SOURCE_ROOT / folder, ignore_errors=True)
+
+
+@pytest.mark.asyncio
+async def test_spectrum_extraction_and_export_resampling(client: AsyncClient) -> None:
+    token = await get_auth_token(client, "resample@example.com", "password123")
+    folder = prepare_cube_data_source()
+    try:
+        sample = await create_cube_project(
+            client, token, folder, wavelength_grid=[405.0, 425.0, 445.0, 500.0]
+        )
+        headers = {"Authorization": f"Bearer {token}"}
+
+        raw = await client.post(
+            f"/api/v1/samples/{sample['id']}/spectra/extract",
+            json={"pixels": [[0, 0], [3, 4]]},
+            headers=headers,
+        )
+        assert raw.status_code == 200
+        raw_values = raw.json()["values"]
+        assert len(raw_values) == 2 and len(raw_values[0]) == 8
+
+        resampled = await client.post(
+            f"/api/v1/samples/{sample['id']}/spectra/extract",
+            json={"pixels": [[0, 0]], "resample_to_project_grid": True},
+            headers=headers,
+        )
+        data = resampled.json()
+        assert data["wavelengths"] == [405.0, 425.0, 445.0, 500.0]
+        expected = (raw_values[0][0] + raw_values[0][1]) / 2
+        assert data["values"][0][0] == pytest.approx(expected, rel=1e-5)
+        assert data["values"][0][3] is None
+
+        out_of_range = await client.post(
+            f"/api/v1/samples/{sample['id']}/spectra/extract",
+            json={"pixels": [[99, 0]]},
+            headers=headers,
+        )
+        assert out_of_range.status_code == 400
+
+        save = await client.put(
+            f"/api/v1/samples/{sample['id']}/annotations",
+            json={
+                "annotations": [
+                    {
+                        "label_name": "叶片",
+                        "color": "#00ff00",
+                        "tool_type": "point",
+                        "coordinates": {"x": 0, "y": 0},
+                        "spectra": [
+                            {
+                                "points": [
+                                    {"wavelength": 400, "intensity": 0.0},
+                                    {"wavelength": 450, "intensity": 1.0},
+                                ]
+                            }
+                        ],
+                    }
+                ]
+            },
+            headers=headers,
+        )
+        assert save.status_code == 200
+        export_resp = await client.post(
+            f"/api/v1/projects/{sample['project_id']}/export",
+            json={"resample_to_project_grid": True},
+            headers=headers,
+        )
+        assert export_resp.status_code == 200
+        points = export_resp.json()["samples"][0]["annotations"][0]["spectra"][0]["points"]
+        assert [p["intensity"] for p in points[:3]] == pytest.approx([0.1, 0.5, 0.9])
+        assert points[3]["intensity"] is None
+    finally:
+        shutil.rmtree(DATA_SOURCE_ROOT / folder, ignore_errors=True)
+
+
+@pytest.mark.asyncio
+async def test_spectrum_extraction_with_transforms(client: AsyncClient) -> None:
+    token = await get_auth_token(client, "transform@example.com", "password123")
+    folder = prepare_cube_data_source()
+    try:
+        sample = await create_cube_project(client, token, folder)
+        headers = {"Authorization": f"Bearer {token}"}
+
+        removed = await client.post(
+            f"/api/v1/samples/{sample['id']}/spectra/extract",
+            json={"pixels": [[2, 3]], "transforms": [{"kind": "continuum_removal"}]},
+            headers=headers,
+        )
+        assert removed.status_code == 200
+        values = removed.json()["values"][0]
+        assert values[0] == pytest.approx(1.0) and values[-1] == pytest.approx(1.0)
+        assert max(values) <= 1.0 + 1e-6
+
+        derivative = await client.post(
+            f"/api/v1/samples/{sample['id']}/spectra/extract",
+            json={"pixels": [[2, 3]], "transforms": [{"kind": "derivative1", "window": 11}]},
+            headers=headers,
+        )
+        assert derivative.status_code == 200
+        assert len(derivative.json()["values"][0]) == 8
+
+        invalid = await client.post(
+            f"/api/v1/samples/{sample['id']}/spectra/extract",
+            json={"pixels": [[2, 3]], "transforms": [{"kind": "savgol", "window": 4}]},
+            headers=headers,
+        )
+        assert invalid.status_code == 422
+    finally:
+        shutil.rmtree(DATA_SOURCE_ROOT / folder, ignore_errors=True)
@@ -0,0 +1,37 @@
+from pathlib import Path
+
+import numpy as np
+
+from app.services.band_quality import scan_cube_quality
+from app.services.hsi import CubeHeader, HyperCube
+
+
+def write_cube(path: Path, cube: np.ndarray) -> HyperCube:
+    """Write a (lines, samples, bands) uint16 cube as BIL and open it."""
+    lines, samples, bands = cube.shape
+    path.write_bytes(np.ascontiguousarray(cube.transpose(0, 2, 1)).astype("<u2").tobytes())
+    header = CubeHeader(samples=samples, lines=lines, bands=bands)
+    return HyperCube(header, path)
+
+
+def test_scan_flags_bad_bands_and_columns(tmp_path: Path) -> None:
+    rng = np.random.default_rng(1)
+    lines, samples, bands = 40, 30, 6
+    smooth = np.linspace(1000, 3000, lines)[:, None, None]
+    cube = smooth + rng.normal(0, 5, size=(lines, samples, bands))
+    cube[:, :, 1] = 1234  # constant band
+    cube[:, :, 2] = rng.uniform(2000, 2100, size=(lines, samples))
+    cube[: lines // 2, :, 2] = 65535  # clipped band
+    cube[:, :, 3] = rng.uniform(0, 4000, size=(lines, samples))  # pure noise
+    cube[:, 7, :] = 0  # dead column
+    cube[:, 20, :] = 50000  # hot column
+    report = scan_cube_quality(write_cube(tmp_path / "cube.spe", np.clip(cube, 0, 65535)))
+
+    assert report["status"] == "completed"
+    assert report["band_flags"]["constant"] == [1]
+    assert 2 in report["band_flags"]["saturated"]
+    assert 3 in report["band_flags"]["low_snr"]
+    assert report["good_bands"] == [0, 4, 5]
+    assert report["dead_columns"] == [7]
+    assert report["hot_columns"] == [20]
+    assert report["percentiles"]["p98"][0] < 65535
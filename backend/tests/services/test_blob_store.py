@@ -0,0 +1,41 @@
+from pathlib import Path
+
+import pytest
+
+from app.services import blob_store
+
+
+@pytest.fixture
+def blob_root(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    root = tmp_path / "blobs"
+    monkeypatch.setattr(blob_store, "BLOB_ROOT", root)
+    monkeypatch.setattr(blob_store, "BLOB_TMP", root / "tmp")
+    return root
+
+
+def test_writer_hashes_in_single_pass_and_deduplicates(tmp_path: Path, blob_root: Path) -> None:
+    stored = []
+    for name in ("a.bin", "b.bin"):
+        writer = blob_store.BlobWriter()
+        for chunk in (b"hello ", b"world"):
+            writer.write(chunk)
+        stored.append(writer.commit(tmp_path / "ds" / name))
+
+    expected = blob_store.new_hasher()
+    expected.update(b"hello world")
+    assert stored[0].digest == stored[1].digest == expected.hexdigest()
+    assert [item.deduplicated for item in stored] == [False, True]
+    assert (tmp_path / "ds" / "a.bin").stat().st_ino == (tmp_path / "ds" / "b.bin").stat().st_ino
+    assert list((blob_root / "tmp").iterdir()) == []
+
+
+def test_orphan_blobs_are_collected(tmp_path: Path, blob_root: Path) -> None:
+    writer = blob_store.BlobWriter()
+    writer.write(b"payload")
+    stored = writer.commit(tmp_path / "ds" / "a.bin")
+    assert blob_store.collect_orphan_blobs(grace_seconds=0) == 0
+    (tmp_path / "ds" / "a.bin").unlink()
+    # 刚解除链接的 blob 在宽限期内保留
+    assert blob_store.collect_orphan_blobs() == 0
+    assert blob_store.collect_orphan_blobs(grace_seconds=0) == 1
+    assert not blob_store.blob_path(stored.digest).exists()
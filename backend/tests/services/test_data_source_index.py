@@ -0,0 +1,104 @@
+import os
+
+from app.services.data_source_index import DataSourceIndex
+
+
+def _touch(path, name: str) -> None:
+    path.mkdir(parents=True, exist_ok=True)
+    (path / name).write_bytes(b"x")
+
+
+def _age(root, seconds: int = 3600) -> None:
+    """把目录 mtime 调早，避免被当作刚修改的目录重扫."""
+    for directory in [root, *[p for p in root.rglob("*") if p.is_dir()]]:
+        stat = directory.stat()
+        os.utime(directory, ns=(stat.st_atime_ns, stat.st_mtime_ns - seconds * 1_000_000_000))
+
+
+def test_index_counts_files_and_samples(tmp_path) -> None:
+    root = tmp_path / "datasource"
+    _touch(root / "alpha", "a.png")
+    _touch(root / "alpha" / "cubes", "c1.spe")
+    _touch(root / "alpha" / "cubes", "c1.hdr")
+    _touch(root / "alpha" / "cubes", "notes.txt")
+    _touch(root / "beta", "b.jpg")
+
+    index = DataSourceIndex(root, tmp_path / "index.json")
+    sources = {item.name: item for item in index.list_sources()}
+    assert (sources["alpha"].total_files, sources["alpha"].total_samples) == (4, 2)
+    assert (sources["beta"].total_files, sources["beta"].total_samples) == (1, 1)
+    assert (tmp_path / "index.json").exists()
+
+
+def test_index_rescans_only_changed_directories(tmp_path, monkeypatch) -> None:
+    root = tmp_path / "datasource"
+    _touch(root / "alpha" / "one", "a.png")
+    _touch(root / "alpha" / "two", "b.png")
+    _age(root)
+    DataSourceIndex(root, tmp_path / "index.json").refresh()
+
+    _touch(root / "alpha" / "two", "c.png")
+
+    scanned: list[str] = []
+    from app.services import data_source_index as module
+
+    original = module.scan_directory
+
+    def tracking(path, mtime_ns):
+        scanned.append(path.name)
+        return original(path, mtime_ns)
+
+    monkeypatch.setattr(module, "scan_directory", tracking)
+    # 新实例从 sidecar 加载，只重新扫描 mtime 变化的目录
+    summaries = DataSourceIndex(root, tmp_path / "index.json").refresh()
+    assert scanned == ["two"]
+    assert summaries["alpha"] == (3, 3)
+
+
+def test_index_serves_cache_within_ttl(tmp_path) -> None:
+    root = tmp_path / "datasource"
+    _touch(root / "alpha", "a.png")
+    index = DataSourceIndex(root, tmp_path / "index.json", ttl=3600)
+    assert index.refresh()["alpha"] == (1, 1)
+
+    _touch(root / "alpha", "b.png")
+    assert index.refresh()["alpha"] == (1, 1)
+    index.invalidate()
+    assert index.refresh()["alpha"] == (2, 2)
+
+
+def test_recently_modified_directories_are_rescanned(tmp_path) -> None:
+    root = tmp_path / "datasource"
+    _touch(root / "alpha", "a.png")
+    index = DataSourceIndex(root, tmp_path / "index.json")
+    assert index.refresh()["alpha"] == (1, 1)
+    # 同一时间戳内的修改不会改变 mtime，依赖“过新即重扫”
+    _touch(root / "alpha", "b.png")
+    assert index.refresh()["alpha"] == (2, 2)
+
+
+def test_expired_index_is_served_as_is_and_refreshed_in_background(tmp_path, monkeypatch) -> None:
+    from app.services import data_source_index as module
+
+    root = tmp_path / "datasource"
+    _touch(root / "alpha", "a.png")
+    _age(root)
+    DataSourceIndex(root, tmp_path / "index.json").refresh()
+    _touch(root / "alpha", "b.png")
+
+    scheduled: list = []
+
+    def no_walk(*args):
+        raise AssertionError("请求路径不应遍历目录")
+
+    monkeypatch.setattr(module, "submit_background", scheduled.append)
+    monkeypatch.setattr(module, "refresh_tree", no_walk)
+    index = DataSourceIndex(root, tmp_path / "index.json", ttl=3600)
+    # 新实例原样使用 sidecar，请求路径上不遍历目录
+    assert index.snapshot()["alpha"] == (1, 1)
+    assert index.snapshot()["alpha"] == (1, 1)
+    assert len(scheduled) == 1
+
+    monkeypatch.undo()
+    scheduled[0]()
+    assert index.snapshot()["alpha"] == (2, 2)
@@ -0,0 +1,43 @@
+import os
+from pathlib import Path
+
+from app.services.folder_scanner import iter_samples, scan_files
+from app.services.project import parse_samples_from_folder
+
+
+def _build_tree(root: Path) -> None:
+    (root / "a" / "b").mkdir(parents=True)
+    (root / "top.png").write_bytes(b"x")
+    (root / "a" / "img.JPG").write_bytes(b"x")
+    (root / "a" / "cube.spe").write_bytes(b"x")
+    (root / "a" / "cube.hdr").write_text("wavelength = {400, 410}\n")
+    (root / "a" / "b" / "orphan.spe").write_bytes(b"x")
+    (root / "a" / "b" / "notes.txt").write_bytes(b"x")
+
+
+def test_scan_files_streams_all_entries(tmp_path: Path) -> None:
+    root = tmp_path / "ds"
+    _build_tree(root)
+    entries = set(scan_files(root, max_workers=4))
+    assert ("", "top", ".png") in entries
+    assert ("a/b", "notes", ".txt") in entries
+    assert len(entries) == 6
+
+
+def test_iter_samples_groups_hyperspectral_sets(tmp_path: Path) -> None:
+    root = tmp_path / "ds"
+    _build_tree(root)
+    batches = list(iter_samples(root, max_workers=4))
+    samples = [sample for batch in batches for sample in batch]
+    assert len(samples) == 3
+    hyper = next(sample for sample in samples if sample["sample_type"] == "hyperspectral")
+    assert sorted(hyper["files"]) == [os.path.join("ds", "a", "cube.hdr"), os.path.join("ds", "a", "cube.spe")]
+    assert hyper["wavelengths"] == [400.0, 410.0]
+
+
+def test_parse_samples_is_deterministic(tmp_path: Path) -> None:
+    root = tmp_path / "ds"
+    _build_tree(root)
+    first = parse_samples_from_folder(root)
+    assert first == parse_samples_from_folder(root)
+    assert [sample["files"][0] for sample in first] == sorted(sample["files"][0] for sample in first)
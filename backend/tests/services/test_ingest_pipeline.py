@@ -0,0 +1,150 @@
+import shutil
+from pathlib import Path
+from uuid import uuid4
+
+import numpy as np
+import pytest
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.services import ingest_pipeline
+from app.services.hsi import sample_derived_dir
+from app.services.project import DATA_SOURCE_ROOT
+
+
+@pytest.fixture
+def cube_sample() -> tuple[str, list[str]]:
+    """A 20 x 12 x 5 BIL cube under the data source root."""
+    folder = DATA_SOURCE_ROOT / f"ingest_{uuid4().hex[:8]}"
+    folder.mkdir(parents=True)
+    lines, samples, bands = 20, 12, 5
+    cube = np.arange(lines * samples * bands).reshape(lines, samples, bands) % 4000 + 100
+    (folder / "scene.spe").write_bytes(np.ascontiguousarray(cube.transpose(0, 2, 1)).astype("<u2").tobytes())
+    (folder / "scene.hdr").write_text(
+        f"ENVI\nsamples = {samples}\nlines = {lines}\nbands = {bands}\n"
+        "header offset = 0\ndata type = 12\ninterleave = bil\nbyte order = 0\n",
+        encoding="utf-8",
+    )
+    sample_uid = uuid4().hex
+    yield sample_uid, [f"{folder.name}/scene.spe", f"{folder.name}/scene.hdr"]
+    shutil.rmtree(folder, ignore_errors=True)
+    shutil.rmtree(sample_derived_dir(sample_uid), ignore_errors=True)
+
+
+def test_pipeline_runs_all_stages_and_skips_completed(
+    cube_sample: tuple[str, list[str]],
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    sample_uid, files = cube_sample
+    monkeypatch.setattr(ingest_pipeline, "OVERVIEW_MIN_SIZE", 5)
+    state = ingest_pipeline.run_ingest_pipeline(sample_uid, files)
+
+    assert state["status"] == "completed"
+    assert state["stages"]["header"]["shape"] == [20, 12, 5]
+    assert state["stages"]["overview"]["levels"] == [[10, 6, 5], [5, 3, 5]]
+    directory = sample_derived_dir(sample_uid)
+    assert (directory / "thumbnail.png").read_bytes().startswith(b"\x89PNG")
+    level1 = np.load(directory / "overview_1.npy")
+    assert level1.shape == (10, 6, 5)
+
+    # Simulate a restart after the overview stage was interrupted
+    state["stages"].pop("overview")
+    state["status"] = "running"
+    ingest_pipeline.write_json_atomic(directory / "pipeline.json", state)
+    (directory / "overview_2.npy").unlink()
+
+    def _fail(_ctx: object) -> dict:
+        raise AssertionError("completed stage must not run again")
+
+    monkeypatch.setitem(ingest_pipeline.INGEST_STAGES, "header", _fail)
+    resumed = ingest_pipeline.run_ingest_pipeline(sample_uid, files)
+    assert resumed["status"] == "completed"
+    assert np.array_equal(np.load(directory / "overview_1.npy"), level1)
+    assert np.load(directory / "overview_2.npy").shape == (5, 3, 5)
+
+
+def test_pipeline_records_failed_stage(cube_sample: tuple[str, list[str]]) -> None:
+    sample_uid, files = cube_sample
+    spe = DATA_SOURCE_ROOT / files[0]
+    spe.write_bytes(spe.read_bytes()[:100])
+
+    state = ingest_pipeline.run_ingest_pipeline(sample_uid, files)
+    assert state["status"] == "failed"
+    assert state["stages"]["header"]["status"] == "failed"
+    assert "thumbnail" not in state["stages"]
+
+    status = ingest_pipeline.summarize_pipeline_state(1, sample_uid, state, ["header", "thumbnail"])
+    assert status.status == "failed"
+    assert status.progress == 0.0
+
+
+def test_queue_markers_are_resumed(
+    cube_sample: tuple[str, list[str]],
+    monkeypatch: pytest.MonkeyPatch,
+    tmp_path: Path,
+) -> None:
+    sample_uid, files = cube_sample
+    queue_root = tmp_path / "queue"
+    submitted: list[tuple] = []
+    monkeypatch.setattr(ingest_pipeline, "INGEST_QUEUE_ROOT", queue_root)
+    monkeypatch.setattr(ingest_pipeline, "submit_background", lambda fn, *args: submitted.append((fn, args)))
+
+    assert ingest_pipeline.enqueue_ingest([(sample_uid, "hyperspectral", files), ("x", "image", ["a.png"])]) == 1
+    assert (queue_root / f"{sample_uid}.json").exists()
+
+    # The process "restarts" before the job ran: the marker is picked up again
+    submitted.clear()
+    assert ingest_pipeline.resume_ingest_queue() == 1
+    fn, args = submitted[0]
+    fn(*args)
+
+    assert not (queue_root / f"{sample_uid}.json").exists()
+    assert ingest_pipeline.load_pipeline_state(sample_uid)["status"] == "completed"
+
+
+def test_unexpected_stage_error_clears_marker(
+    cube_sample: tuple[str, list[str]],
+    monkeypatch: pytest.MonkeyPatch,
+    tmp_path: Path,
+) -> None:
+    sample_uid, files = cube_sample
+    queue_root = tmp_path / "queue"
+    monkeypatch.setattr(ingest_pipeline, "INGEST_QUEUE_ROOT", queue_root)
+    monkeypatch.setattr(ingest_pipeline, "submit_background", lambda fn, *args: fn(*args))
+
+    def _boom(_ctx: object) -> dict:
+        raise RuntimeError("decoder crashed")
+
+    monkeypatch.setitem(ingest_pipeline.INGEST_STAGES, "thumbnail", _boom)
+    ingest_pipeline.enqueue_ingest([(sample_uid, "hyperspectral", files)])
+
+    state = ingest_pipeline.load_pipeline_state(sample_uid)
+    assert state["status"] == "failed"
+    assert state["current_stage"] is None
+    assert state["stages"]["thumbnail"] == {"status": "failed", "error": "RuntimeError: decoder crashed"}
+    assert not (queue_root / f"{sample_uid}.json").exists()
+
+
+@pytest.mark.asyncio
+async def test_ingest_is_enqueued_only_after_commit(
+    db_session: AsyncSession,
+    monkeypatch: pytest.MonkeyPatch,
+    tmp_path: Path,
+) -> None:
+    queue_root = tmp_path / "queue"
+    submitted: list[tuple] = []
+    monkeypatch.setattr(ingest_pipeline, "INGEST_QUEUE_ROOT", queue_root)
+    monkeypatch.setattr(ingest_pipeline, "submit_background", lambda fn, *args: submitted.append(args))
+
+    await db_session.execute(text("SELECT 1"))
+    assert ingest_pipeline.schedule_ingest(db_session, [("rolled", "hyperspectral", ["a.spe"])]) == 1
+    await db_session.rollback()
+    await db_session.execute(text("SELECT 1"))
+    assert ingest_pipeline.schedule_ingest(db_session, [("kept", "hyperspectral", ["b.spe"])]) == 1
+    assert submitted == []
+    assert not queue_root.exists()
+
+    await db_session.commit()
+    assert submitted == [("kept",)]
+    assert (queue_root / "kept.json").exists()
+    assert not (queue_root / "rolled.json").exists()
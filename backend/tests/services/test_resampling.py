@@ -0,0 +1,66 @@
+import numpy as np
+
+from app.services.resampling import (
+    get_resampling_matrix,
+    resample_point_lists,
+    resample_spectra,
+)
+
+
+def test_linear_resampling_is_exact_for_linear_spectra() -> None:
+    source = np.linspace(400, 1000, 61)
+    target = np.array([405.0, 512.5, 999.0])
+    spectra = np.stack([2 * source + 1, -source])
+    result = resample_spectra(spectra, source, target)
+    np.testing.assert_allclose(result, np.stack([2 * target + 1, -target]), rtol=1e-5)
+
+
+def test_targets_outside_source_range_are_nan() -> None:
+    result = resample_spectra(np.ones(3), [400, 410, 420], [390, 410, 430])
+    assert np.isnan(result[0]) and np.isnan(result[2])
+    assert result[1] == 1
+
+
+def test_gaussian_rows_are_normalized_and_cached() -> None:
+    source = np.arange(400, 500, 2.0)
+    target = np.arange(410, 490, 10.0)
+    matrix = get_resampling_matrix(source, target, "gaussian")
+    np.testing.assert_allclose(matrix.to_dense().sum(axis=1), 1.0, rtol=1e-5)
+    assert get_resampling_matrix(list(source), list(target), "gaussian") is matrix
+    flat = resample_spectra(np.full(source.size, 3.0), source, target, "gaussian")
+    np.testing.assert_allclose(flat, 3.0, rtol=1e-5)
+
+
+def test_resample_point_lists_groups_by_axis() -> None:
+    curves = [
+        [{"wavelength": 400, "intensity": 0.0}, {"wavelength": 500, "intensity": 1.0}],
+        [{"wavelength": 400, "intensity": 1.0}, {"wavelength": 500, "intensity": 1.0}],
+        [{"wavelength": 450, "intensity": 2.0}, {"wavelength": 550, "intensity": 4.0}],
+        [],
+    ]
+    result = resample_point_lists(curves, [450, 500])
+    assert [p["intensity"] for p in result[0]] == [0.5, 1.0]
+    assert [p["intensity"] for p in result[1]] == [1.0, 1.0]
+    assert [p["intensity"] for p in result[2]] == [2.0, 3.0]
+    assert result[3] == []
+
+
+def test_nan_sources_do_not_leak_into_unrelated_targets() -> None:
+    source = [400.0, 410.0, 420.0, 430.0]
+    values = np.array([1.0, np.nan, 3.0, 4.0])
+    linear = resample_spectra(values, source, [400.0, 425.0, 430.0])
+    np.testing.assert_allclose(linear, [1.0, 3.5, 4.0])
+    gaussian = resample_spectra(values, source, [400.0, 420.0, 430.0], "gaussian")
+    assert not np.isnan(gaussian).any()
+    assert np.isnan(resample_spectra(np.full(4, np.nan), source, [410.0]))[0]
+
+
+def test_gaussian_kernel_uses_source_fwhm() -> None:
+    source = np.arange(400, 500, 1.0)
+    target = [450.0]
+    default = get_resampling_matrix(source, target, "gaussian").to_dense()
+    wide = get_resampling_matrix(source, target, "gaussian", np.full(source.size, 20.0)).to_dense()
+    assert np.count_nonzero(wide) > np.count_nonzero(default)
+    curve = [{"wavelength": float(w), "intensity": None if w == 430 else 1.0} for w in source]
+    (points,) = resample_point_lists([curve], target, "gaussian", [np.full(source.size, 20.0)])
+    assert points[0]["intensity"] == 1.0
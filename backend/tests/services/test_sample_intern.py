@@ -0,0 +1,49 @@
+from typing import cast
+
+import pytest
+from sqlalchemy import Insert, Table, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models import SpectrumAxis
+from app.services.sample import _intern_rows
+
+
+def _axis_rows(*digests: str) -> dict[str, dict]:
+    return {digest: {"content_hash": digest, "wavelengths": digest.encode()} for digest in digests}
+
+
+@pytest.mark.asyncio
+async def test_intern_rows_reuses_existing_and_inserts_missing(db_session: AsyncSession) -> None:
+    table = cast(Table, SpectrumAxis.__table__)
+    first = await _intern_rows(db_session, table, _axis_rows("a"))
+    ids = await _intern_rows(db_session, table, _axis_rows("a", "b"))
+
+    assert ids["a"] == first["a"]
+    assert len((await db_session.execute(select(table.c.id))).all()) == 2
+
+
+@pytest.mark.asyncio
+async def test_intern_rows_retries_only_missing_after_conflict(
+    db_session: AsyncSession, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    table = cast(Table, SpectrumAxis.__table__)
+    rows = _axis_rows("a", "b", "c")
+    inserted: list[list[str]] = []
+    execute = db_session.execute
+
+    async def racing_execute(statement, params=None, *args, **kwargs):
+        if isinstance(statement, Insert):
+            inserted.append([row["content_hash"] for row in params])
+            return await execute(statement, params, *args, **kwargs)
+        result = await execute(statement, params, *args, **kwargs)
+        if not inserted:
+            # 模拟并发请求在查询之后、插入之前抢先写入同一哈希
+            await execute(insert(table), [rows["b"]])
+        return result
+
+    monkeypatch.setattr(db_session, "execute", racing_execute)
+    ids = await _intern_rows(db_session, table, rows)
+
+    assert inserted == [["a", "b", "c"], ["a", "c"]]
+    stored = dict((await execute(select(table.c.content_hash, table.c.id))).all())
+    assert ids == stored
@@ -0,0 +1,96 @@
+import numpy as np
+import pytest
+
+from app.schemas.sample import SpectralTransform
+from app.services.spectral_transform import (
+    apply_transforms,
+    continuum_removal,
+    savgol_coefficients,
+    savgol_filter,
+    transform_point_lists,
+)
+
+
+def test_savgol_preserves_polynomials_and_differentiates() -> None:
+    x = np.linspace(400, 500, 51)
+    spectra = np.stack([0.01 * x**2, 3 * x + 1])
+    np.testing.assert_allclose(savgol_filter(spectra, 7, 2)[:, 3:-3], spectra[:, 3:-3], rtol=1e-9)
+    delta = x[1] - x[0]
+    first = savgol_filter(spectra, 7, 2, deriv=1, delta=delta)
+    np.testing.assert_allclose(first[0, 3:-3], 0.02 * x[3:-3], rtol=1e-9)
+    np.testing.assert_allclose(first[1, 3:-3], 3.0, rtol=1e-9)
+    second = savgol_filter(spectra, 7, 2, deriv=2, delta=delta)
+    np.testing.assert_allclose(second[0, 3:-3], 0.02, rtol=1e-9)
+
+
+def test_derivatives_follow_non_uniform_wavelength_grid() -> None:
+    index = np.arange(40, dtype=float)
+    axis = 400 + index + 0.05 * index**2
+    spectra = np.stack([3 * axis + 1])
+    first = apply_transforms(spectra, axis, [SpectralTransform(kind="derivative1", window=5, order=2)])
+    np.testing.assert_allclose(first[0, 2:-2], 3.0, rtol=1e-9)
+    second = apply_transforms(spectra, axis, [SpectralTransform(kind="derivative2", window=5, order=2)])
+    np.testing.assert_allclose(second[0, 2:-2], 0.0, atol=1e-9)
+
+
+def test_savgol_coefficients_are_cached() -> None:
+    assert savgol_coefficients(9, 3) is savgol_coefficients(9, 3)
+    with pytest.raises(ValueError):
+        savgol_coefficients(4, 2)
+
+
+def test_savgol_applies_to_cube_blocks() -> None:
+    rng = np.random.default_rng(0)
+    block = rng.random((4, 5, 30))
+    result = savgol_filter(block, 9, 2)
+    expected = np.stack([savgol_filter(row, 9, 2) for row in block.reshape(-1, 30)])
+    np.testing.assert_allclose(result.reshape(-1, 30), expected)
+
+
+def test_continuum_removal_matches_upper_hull() -> None:
+    x = np.arange(7, dtype=float)
+    spectra = np.array(
+        [
+            [1.0, 2.0, 1.0, 3.0, 2.0, 2.5, 1.0],
+            [2.0, 2.0, 2.0, 2.0, 2.0, 2.0, 2.0],
+        ]
+    )
+    removed = continuum_removal(spectra, x)
+    hull = np.array([1.0, 2.0, 2.5, 3.0, 2.75, 2.5, 1.0])
+    np.testing.assert_allclose(removed[0], spectra[0] / hull)
+    np.testing.assert_allclose(removed[1], 1.0)
+    assert (removed <= 1.0 + 1e-12).all()
+
+
+def test_continuum_removal_batch_with_nan_matches_single_curves() -> None:
+    x = np.arange(7, dtype=float)
+    clean = np.array([1.0, 2.0, 1.0, 3.0, 2.0, 2.5, 1.0])
+    # 重采样到源范围之外的波段为 NaN
+    gappy = np.array([1.0, 3.0, 1.0, np.nan, 2.0, 2.5, 1.0])
+    batched = continuum_removal(np.stack([clean, gappy]), x)
+
+    np.testing.assert_allclose(batched[0], continuum_removal(clean, x))
+    np.testing.assert_allclose(batched[1], continuum_removal(gappy, x))
+    assert np.nanmax(batched) <= 1.0 + 1e-12
+    assert np.isnan(batched[1, 3])
+
+
+def test_transform_chain_on_point_lists() -> None:
+    curves = [
+        [{"wavelength": 400 + 10 * i, "intensity": float(i)} for i in range(13)],
+        [{"wavelength": 400 + 10 * i, "intensity": 2.0 * i} for i in range(13)],
+        [],
+    ]
+    chain = [SpectralTransform(kind="savgol", window=5), SpectralTransform(kind="derivative1", window=5)]
+    result = transform_point_lists(curves, chain)
+    assert [p["intensity"] for p in result[0][4:-4]] == pytest.approx([0.1] * 5)
+    assert [p["intensity"] for p in result[1][4:-4]] == pytest.approx([0.2] * 5)
+    assert result[2] == []
+    np.testing.assert_allclose(
+        apply_transforms(np.ones(5), None, [SpectralTransform(kind="continuum_removal")]), 1.0
+    )
+
+
+def test_transform_rejects_even_window() -> None:
+    with pytest.raises(ValueError):
+        SpectralTransform(kind="savgol", window=6)
@@ -0,0 +1,46 @@
+import numpy as np
+import pytest
+from pydantic import ValidationError
+
+from app.schemas.sample import AnnotationSpectrumCreate, SpectrumPoint
+from app.services.spectrum_codec import axis_content_hash, pack_points, unpack_points
+
+
+def _points(axis: list[float], values: list[float | None]) -> list[SpectrumPoint]:
+    return [SpectrumPoint(wavelength=w, intensity=v) for w, v in zip(axis, values)]
+
+
+def test_points_round_trip_with_their_own_axis() -> None:
+    axis = [400.0, 410.5, 421.0]
+    values, wavelengths = pack_points(_points(axis, [0.25, None, 3.5]))
+
+    assert len(values) == 3 * np.dtype("<f4").itemsize
+    assert unpack_points(values, wavelengths) == [
+        {"wavelength": 400.0, "intensity": 0.25},
+        {"wavelength": 410.5, "intensity": None},
+        {"wavelength": 421.0, "intensity": 3.5},
+    ]
+
+
+def test_float32_intensities_keep_float32_precision() -> None:
+    values, wavelengths = pack_points(_points([405.25, 455.75], [0.1, 1234.5678]))
+    decoded = [point["intensity"] for point in unpack_points(values, wavelengths)]
+    assert decoded == [float(np.float32(0.1)), float(np.float32(1234.5678))]
+    assert decoded == pytest.approx([0.1, 1234.5678], rel=1e-7)
+
+
+def test_identical_axes_share_a_content_hash() -> None:
+    _, first = pack_points(_points([400.0, 410.0], [1.0, 2.0]))
+    _, second = pack_points(_points([400.0, 410.0], [5.0, None]))
+    _, other = pack_points(_points([400.0, 410.5], [1.0, 2.0]))
+    assert axis_content_hash(first) == axis_content_hash(second)
+    assert axis_content_hash(first) != axis_content_hash(other)
+
+
+@pytest.mark.parametrize(
+    "point",
+    [{"intensity": 0.5}, {"wavelength": 400}, {"wavelength": 400, "intensity": 0.5, "x": 1}],
+)
+def test_malformed_points_are_rejected(point: dict) -> None:
+    with pytest.raises(ValidationError):
+        AnnotationSpectrumCreate(points=[point])
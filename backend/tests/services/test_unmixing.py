@@ -0,0 +1,33 @@
+import numpy as np
+
+from app.services.unmixing import atgp, nnls_batched
+
+
+def make_mixture(seed: int = 0) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    rng = np.random.default_rng(seed)
+    endmembers = rng.uniform(0.1, 1.0, size=(30, 3))
+    abundances = rng.dirichlet(np.ones(3), size=500).T
+    abundances[:, :3] = np.eye(3)
+    pixels = endmembers @ abundances
+    return endmembers, abundances, pixels
+
+
+def test_atgp_selects_pure_pixels() -> None:
+    _endmembers, _abundances, pixels = make_mixture()
+    chosen = atgp(pixels.T, 3)
+    assert sorted(chosen) == [0, 1, 2]
+
+
+def test_nnls_batched_recovers_abundances() -> None:
+    endmembers, abundances, pixels = make_mixture()
+    solved = nnls_batched(endmembers, pixels)
+    assert solved.shape == abundances.shape
+    assert (solved >= 0).all()
+    np.testing.assert_allclose(solved, abundances, atol=1e-3)
+
+
+def test_nnls_batched_clips_negative_solutions() -> None:
+    endmembers = np.eye(4)[:, :2]
+    pixels = np.array([[-1.0, 2.0], [3.0, -4.0], [0.0, 0.0], [0.0, 0.0]])
+    solved = nnls_batched(endmembers, pixels)
+    np.testing.assert_allclose(solved, [[0.0, 2.0], [3.0, 0.0]], atol=1e-6)
@@ -0,0 +1,55 @@
+from pathlib import Path
+
+import numpy as np
+
+from app.models.annotation_sample import AnnotationSample
+from app.services.hsi import header_axes, read_envi_metadata
+from app.services.wavelength import WavelengthIndex, get_wavelength_index, lookup_bands
+
+
+def test_nearest_band_lookup() -> None:
+    index = WavelengthIndex([400.0, 410.0, 420.0, 430.0])
+    assert index.nearest_band(399) == 0
+    assert index.nearest_band(414) == 1
+    assert index.nearest_band(416) == 2
+    assert index.nearest_band(1000) == 3
+    np.testing.assert_array_equal(index.nearest_bands(np.array([405.1, 425.1])), [1, 3])
+
+
+def test_lookup_keeps_original_band_numbers_for_unsorted_axes() -> None:
+    index = WavelengthIndex([430.0, 400.0, 420.0, 410.0])
+    assert index.nearest_band(401) == 1
+    assert index.band_range(405, 425).tolist() == [3, 2]
+
+
+def test_band_range_is_inclusive() -> None:
+    index = WavelengthIndex([400.0, 410.0, 420.0, 430.0])
+    assert index.band_range(410, 420).tolist() == [1, 2]
+    assert index.band_range(None, 405).tolist() == [0]
+    assert index.band_range(431, None).tolist() == []
+
+
+def test_index_cache_follows_rewritten_wavelengths() -> None:
+    sample = AnnotationSample(sample_id="cache-axis", wavelengths=[400.0, 410.0, 420.0], fwhm=None)
+    assert lookup_bands(sample, [412.0]).items[0].band_wavelength == 410.0
+
+    # 同步改写头文件后，样本的波长轴变化，查找结果应随之更新
+    sample.wavelengths = [500.0, 510.0, 520.0, 530.0]
+    item = lookup_bands(sample, [528.0]).items[0]
+    assert (item.band, item.band_wavelength) == (3, 530.0)
+
+    sample.fwhm = [5.0, 5.0, 5.0, 5.0]
+    index = get_wavelength_index(sample)
+    assert index.fwhm is not None and index.fwhm.tolist() == [5.0, 5.0, 5.0, 5.0]
+
+
+def test_header_axes_multiline(tmp_path: Path) -> None:
+    header = tmp_path / "cube.hdr"
+    header.write_text(
+        "ENVI\nsamples = 2\nlines = 2\nbands = 3\n"
+        "wavelength = {\n 400.5, 410.5,\n 420.5}\nfwhm = {2, 2, 2}\n",
+        encoding="utf-8",
+    )
+    wavelengths, fwhm = header_axes(read_envi_metadata(header))
+    assert wavelengths == [400.5, 410.5, 420.5]
+    assert fwhm == [2.0, 2.0, 2.0]
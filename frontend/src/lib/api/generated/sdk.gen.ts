@@ -1,7 +1,7 @@
 // This file is auto-generated by @hey-api/openapi-ts
 
 import { createClient, createConfig, type OptionsLegacyParser, urlSearchParamsBodySerializer, formDataBodySerializer } from '@hey-api/client-fetch';
-import type { HealthCheckApiV1HealthGetError, HealthCheckApiV1HealthGetResponse, ReadinessCheckApiV1ReadyGetError, ReadinessCheckApiV1ReadyGetResponse, LoginForAccessTokenApiV1AuthLoginPostData, LoginForAccessTokenApiV1AuthLoginPostError, LoginForAccessTokenApiV1AuthLoginPostResponse, RegisterApiV1AuthRegisterPostData, RegisterApiV1AuthRegisterPostError, RegisterApiV1AuthRegisterPostResponse, ReadCurrentUserApiV1UsersMeGetError, ReadCurrentUserApiV1UsersMeGetResponse, DeleteCurrentUserApiV1UsersMeDeleteError, DeleteCurrentUserApiV1UsersMeDeleteResponse, UpdateCurrentUserApiV1UsersMePatchData, UpdateCurrentUserApiV1UsersMePatchError, UpdateCurrentUserApiV1UsersMePatchResponse, UploadAvatarApiV1UsersMeAvatarPostData, UploadAvatarApiV1UsersMeAvatarPostError, UploadAvatarApiV1UsersMeAvatarPostResponse, GetAvatarApiV1UsersAvatarFilenameGetData, GetAvatarApiV1UsersAvatarFilenameGetError, GetAvatarApiV1UsersAvatarFilenameGetResponse, ListTodosApiV1TodosGetData, ListTodosApiV1TodosGetError, ListTodosApiV1TodosGetResponse, CreateNewTodoApiV1TodosPostData, CreateNewTodoApiV1TodosPostError, CreateNewTodoApiV1TodosPostResponse, GetTodoApiV1TodosTodoIdGetData, GetTodoApiV1TodosTodoIdGetError, GetTodoApiV1TodosTodoIdGetResponse, UpdateExistingTodoApiV1TodosTodoIdPatchData, UpdateExistingTodoApiV1TodosTodoIdPatchError, UpdateExistingTodoApiV1TodosTodoIdPatchResponse, DeleteExistingTodoApiV1TodosTodoIdDeleteData, DeleteExistingTodoApiV1TodosTodoIdDeleteError, DeleteExistingTodoApiV1TodosTodoIdDeleteResponse, ToggleTodoStatusApiV1TodosTodoIdTogglePostData, ToggleTodoStatusApiV1TodosTodoIdTogglePostError, ToggleTodoStatusApiV1TodosTodoIdTogglePostResponse, ListLabelGroupsEndpointApiV1LabelGroupsGetData, ListLabelGroupsEndpointApiV1LabelGroupsGetError, ListLabelGroupsEndpointApiV1LabelGroupsGetResponse, CreateLabelGroupEndpointApiV1LabelGroupsPostData, CreateLabelGroupEndpointApiV1LabelGroupsPostError, CreateLabelGroupEndpointApiV1LabelGroupsPostResponse, GetLabelGroupEndpointApiV1LabelGroupsGroupIdGetData, GetLabelGroupEndpointApiV1LabelGroupsGroupIdGetError, GetLabelGroupEndpointApiV1LabelGroupsGroupIdGetResponse, UpdateLabelGroupEndpointApiV1LabelGroupsGroupIdPatchData, UpdateLabelGroupEndpointApiV1LabelGroupsGroupIdPatchError, UpdateLabelGroupEndpointApiV1LabelGroupsGroupIdPatchResponse, DeleteLabelGroupEndpointApiV1LabelGroupsGroupIdDeleteData, DeleteLabelGroupEndpointApiV1LabelGroupsGroupIdDeleteError, DeleteLabelGroupEndpointApiV1LabelGroupsGroupIdDeleteResponse, ListSpectralModesEndpointApiV1SpectralModesGetData, ListSpectralModesEndpointApiV1SpectralModesGetError, ListSpectralModesEndpointApiV1SpectralModesGetResponse, CreateSpectralModeEndpointApiV1SpectralModesPostData, CreateSpectralModeEndpointApiV1SpectralModesPostError, CreateSpectralModeEndpointApiV1SpectralModesPostResponse, GetSpectralModeEndpointApiV1SpectralModesModeIdGetData, GetSpectralModeEndpointApiV1SpectralModesModeIdGetError, GetSpectralModeEndpointApiV1SpectralModesModeIdGetResponse, UpdateSpectralModeEndpointApiV1SpectralModesModeIdPatchData, UpdateSpectralModeEndpointApiV1SpectralModesModeIdPatchError, UpdateSpectralModeEndpointApiV1SpectralModesModeIdPatchResponse, DeleteSpectralModeEndpointApiV1SpectralModesModeIdDeleteData, DeleteSpectralModeEndpointApiV1SpectralModesModeIdDeleteError, DeleteSpectralModeEndpointApiV1SpectralModesModeIdDeleteResponse, ListProjectsEndpointApiV1ProjectsGetData, ListProjectsEndpointApiV1ProjectsGetError, ListProjectsEndpointApiV1ProjectsGetResponse, CreateProjectEndpointApiV1ProjectsPostData, CreateProjectEndpointApiV1ProjectsPostError, CreateProjectEndpointApiV1ProjectsPostResponse, ListDataSourcesEndpointApiV1ProjectsDataSourcesGetError, ListDataSourcesEndpointApiV1ProjectsDataSourcesGetResponse, UploadDataSourceFolderEndpointApiV1ProjectsDataSourcesUploadFolderPostData, UploadDataSourceFolderEndpointApiV1ProjectsDataSourcesUploadFolderPostError, UploadDataSourceFolderEndpointApiV1ProjectsDataSourcesUploadFolderPostResponse, GetProjectEndpointApiV1ProjectsProjectIdGetData, GetProjectEndpointApiV1ProjectsProjectIdGetError, GetProjectEndpointApiV1ProjectsProjectIdGetResponse, UpdateProjectEndpointApiV1ProjectsProjectIdPatchData, UpdateProjectEndpointApiV1ProjectsProjectIdPatchError, UpdateProjectEndpointApiV1ProjectsProjectIdPatchResponse, DeleteProjectEndpointApiV1ProjectsProjectIdDeleteData, DeleteProjectEndpointApiV1ProjectsProjectIdDeleteError, DeleteProjectEndpointApiV1ProjectsProjectIdDeleteResponse, ArchiveProjectEndpointApiV1ProjectsProjectIdArchivePostData, ArchiveProjectEndpointApiV1ProjectsProjectIdArchivePostError, ArchiveProjectEndpointApiV1ProjectsProjectIdArchivePostResponse, RestoreProjectEndpointApiV1ProjectsProjectIdRestorePostData, RestoreProjectEndpointApiV1ProjectsProjectIdRestorePostError, RestoreProjectEndpointApiV1ProjectsProjectIdRestorePostResponse, ListProjectSamplesEndpointApiV1ProjectsProjectIdSamplesGetData, ListProjectSamplesEndpointApiV1ProjectsProjectIdSamplesGetError, ListProjectSamplesEndpointApiV1ProjectsProjectIdSamplesGetResponse, GetSampleDetailEndpointApiV1SamplesSampleIdGetData, GetSampleDetailEndpointApiV1SamplesSampleIdGetError, GetSampleDetailEndpointApiV1SamplesSampleIdGetResponse, UpdateSampleStatusEndpointApiV1SamplesSampleIdPatchData, UpdateSampleStatusEndpointApiV1SamplesSampleIdPatchError, UpdateSampleStatusEndpointApiV1SamplesSampleIdPatchResponse, ReplaceSampleAnnotationsEndpointApiV1SamplesSampleIdAnnotationsPutData, ReplaceSampleAnnotationsEndpointApiV1SamplesSampleIdAnnotationsPutError, ReplaceSampleAnnotationsEndpointApiV1SamplesSampleIdAnnotationsPutResponse, GetSampleAssetEndpointApiV1SamplesSampleIdAssetsGetData, GetSampleAssetEndpointApiV1SamplesSampleIdAssetsGetError, GetSampleAssetEndpointApiV1SamplesSampleIdAssetsGetResponse, RootGetError, RootGetResponse } from './types.gen';
+import type { HealthCheckApiV1HealthGetError, HealthCheckApiV1HealthGetResponse, ReadinessCheckApiV1ReadyGetError, ReadinessCheckApiV1ReadyGetResponse, LoginForAccessTokenApiV1AuthLoginPostData, LoginForAccessTokenApiV1AuthLoginPostError, LoginForAccessTokenApiV1AuthLoginPostResponse, RegisterApiV1AuthRegisterPostData, RegisterApiV1AuthRegisterPostError, RegisterApiV1AuthRegisterPostResponse, ReadCurrentUserApiV1UsersMeGetError, ReadCurrentUserApiV1UsersMeGetResponse, DeleteCurrentUserApiV1UsersMeDeleteError, DeleteCurrentUserApiV1UsersMeDeleteResponse, UpdateCurrentUserApiV1UsersMePatchData, UpdateCurrentUserApiV1UsersMePatchError, UpdateCurrentUserApiV1UsersMePatchResponse, UploadAvatarApiV1UsersMeAvatarPostData, UploadAvatarApiV1UsersMeAvatarPostError, UploadAvatarApiV1UsersMeAvatarPostResponse, GetAvatarApiV1UsersAvatarFilenameGetData, GetAvatarApiV1UsersAvatarFilenameGetError, GetAvatarApiV1UsersAvatarFilenameGetResponse, ListTodosApiV1TodosGetData, ListTodosApiV1TodosGetError, ListTodosApiV1TodosGetResponse, CreateNewTodoApiV1TodosPostData, CreateNewTodoApiV1TodosPostError, CreateNewTodoApiV1TodosPostResponse, GetTodoApiV1TodosTodoIdGetData, GetTodoApiV1TodosTodoIdGetError, GetTodoApiV1TodosTodoIdGetResponse, UpdateExistingTodoApiV1TodosTodoIdPatchData, UpdateExistingTodoApiV1TodosTodoIdPatchError, UpdateExistingTodoApiV1TodosTodoIdPatchResponse, DeleteExistingTodoApiV1TodosTodoIdDeleteData, DeleteExistingTodoApiV1TodosTodoIdDeleteError, DeleteExistingTodoApiV1TodosTodoIdDeleteResponse, ToggleTodoStatusApiV1TodosTodoIdTogglePostData, ToggleTodoStatusApiV1TodosTodoIdTogglePostError, ToggleTodoStatusApiV1TodosTodoIdTogglePostResponse, ListLabelGroupsEndpointApiV1LabelGroupsGetData, ListLabelGroupsEndpointApiV1LabelGroupsGetError, ListLabelGroupsEndpointApiV1LabelGroupsGetResponse, CreateLabelGroupEndpointApiV1LabelGroupsPostData, CreateLabelGroupEndpointApiV1LabelGroupsPostError, CreateLabelGroupEndpointApiV1LabelGroupsPostResponse, GetLabelGroupEndpointApiV1LabelGroupsGroupIdGetData, GetLabelGroupEndpointApiV1LabelGroupsGroupIdGetError, GetLabelGroupEndpointApiV1LabelGroupsGroupIdGetResponse, UpdateLabelGroupEndpointApiV1LabelGroupsGroupIdPatchData, UpdateLabelGroupEndpointApiV1LabelGroupsGroupIdPatchError, UpdateLabelGroupEndpointApiV1LabelGroupsGroupIdPatchResponse, DeleteLabelGroupEndpointApiV1LabelGroupsGroupIdDeleteData, DeleteLabelGroupEndpointApiV1LabelGroupsGroupIdDeleteError, DeleteLabelGroupEndpointApiV1LabelGroupsGroupIdDeleteResponse, ListSpectralModesEndpointApiV1SpectralModesGetData, ListSpectralModesEndpointApiV1SpectralModesGetError, ListSpectralModesEndpointApiV1SpectralModesGetResponse, CreateSpectralModeEndpointApiV1SpectralModesPostData, CreateSpectralModeEndpointApiV1SpectralModesPostError, CreateSpectralModeEndpointApiV1SpectralModesPostResponse, GetSpectralModeEndpointApiV1SpectralModesModeIdGetData, GetSpectralModeEndpointApiV1SpectralModesModeIdGetError, GetSpectralModeEndpointApiV1SpectralModesModeIdGetResponse, UpdateSpectralModeEndpointApiV1SpectralModesModeIdPatchData, UpdateSpectralModeEndpointApiV1SpectralModesModeIdPatchError, UpdateSpectralModeEndpointApiV1SpectralModesModeIdPatchResponse, DeleteSpectralModeEndpointApiV1SpectralModesModeIdDeleteData, DeleteSpectralModeEndpointApiV1SpectralModesModeIdDeleteError, DeleteSpectralModeEndpointApiV1SpectralModesModeIdDeleteResponse, ListProjectsEndpointApiV1ProjectsGetData, ListProjectsEndpointApiV1ProjectsGetError, ListProjectsEndpointApiV1ProjectsGetResponse, CreateProjectEndpointApiV1ProjectsPostData, CreateProjectEndpointApiV1ProjectsPostError, CreateProjectEndpointApiV1ProjectsPostResponse, ListDataSourcesEndpointApiV1ProjectsDataSourcesGetError, ListDataSourcesEndpointApiV1ProjectsDataSourcesGetResponse, UploadDataSourceFolderEndpointApiV1ProjectsDataSourcesUploadFolderPostData, UploadDataSourceFolderEndpointApiV1ProjectsDataSourcesUploadFolderPostError, UploadDataSourceFolderEndpointApiV1ProjectsDataSourcesUploadFolderPostResponse, UploadDataSourceArchiveEndpointApiV1ProjectsDataSourcesUploadArchivePostData, UploadDataSourceArchiveEndpointApiV1ProjectsDataSourcesUploadArchivePostError, UploadDataSourceArchiveEndpointApiV1ProjectsDataSourcesUploadArchivePostResponse, CreateUploadSessionEndpointApiV1ProjectsDataSourcesUploadsPostData, CreateUploadSessionEndpointApiV1ProjectsDataSourcesUploadsPostError, CreateUploadSessionEndpointApiV1ProjectsDataSourcesUploadsPostResponse, GetUploadSessionEndpointApiV1ProjectsDataSourcesUploadsSessionIdGetData, GetUploadSessionEndpointApiV1ProjectsDataSourcesUploadsSessionIdGetError, GetUploadSessionEndpointApiV1ProjectsDataSourcesUploadsSessionIdGetResponse, AbortUploadSessionEndpointApiV1ProjectsDataSourcesUploadsSessionIdDeleteData, AbortUploadSessionEndpointApiV1ProjectsDataSourcesUploadsSessionIdDeleteError, AbortUploadSessionEndpointApiV1ProjectsDataSourcesUploadsSessionIdDeleteResponse, UploadSessionRangeEndpointApiV1ProjectsDataSourcesUploadsSessionIdFilesIndexPutData, UploadSessionRangeEndpointApiV1ProjectsDataSourcesUploadsSessionIdFilesIndexPutError, UploadSessionRangeEndpointApiV1ProjectsDataSourcesUploadsSessionIdFilesIndexPutResponse, FinalizeUploadSessionEndpointApiV1ProjectsDataSourcesUploadsSessionIdFinalizePostData, FinalizeUploadSessionEndpointApiV1ProjectsDataSourcesUploadsSessionIdFinalizePostError, FinalizeUploadSessionEndpointApiV1ProjectsDataSourcesUploadsSessionIdFinalizePostResponse, GetProjectEndpointApiV1ProjectsProjectIdGetData, GetProjectEndpointApiV1ProjectsProjectIdGetError, GetProjectEndpointApiV1ProjectsProjectIdGetResponse, UpdateProjectEndpointApiV1ProjectsProjectIdPatchData, UpdateProjectEndpointApiV1ProjectsProjectIdPatchError, UpdateProjectEndpointApiV1ProjectsProjectIdPatchResponse, DeleteProjectEndpointApiV1ProjectsProjectIdDeleteData, DeleteProjectEndpointApiV1ProjectsProjectIdDeleteError, DeleteProjectEndpointApiV1ProjectsProjectIdDeleteResponse, ArchiveProjectEndpointApiV1ProjectsProjectIdArchivePostData, ArchiveProjectEndpointApiV1ProjectsProjectIdArchivePostError, ArchiveProjectEndpointApiV1ProjectsProjectIdArchivePostResponse, RestoreProjectEndpointApiV1ProjectsProjectIdRestorePostData, RestoreProjectEndpointApiV1ProjectsProjectIdRestorePostError, RestoreProjectEndpointApiV1ProjectsProjectIdRestorePostResponse, SyncProjectEndpointApiV1ProjectsProjectIdSyncPostData, SyncProjectEndpointApiV1ProjectsProjectIdSyncPostError, SyncProjectEndpointApiV1ProjectsProjectIdSyncPostResponse, GetProjectIngestStatusEndpointApiV1ProjectsProjectIdIngestGetData, GetProjectIngestStatusEndpointApiV1ProjectsProjectIdIngestGetError, GetProjectIngestStatusEndpointApiV1ProjectsProjectIdIngestGetResponse, ExportProjectAnnotationsEndpointApiV1ProjectsProjectIdExportPostData, ExportProjectAnnotationsEndpointApiV1ProjectsProjectIdExportPostError, ExportProjectAnnotationsEndpointApiV1ProjectsProjectIdExportPostResponse, ExportProjectColumnarEndpointApiV1ProjectsProjectIdExportColumnarPostData, ExportProjectColumnarEndpointApiV1ProjectsProjectIdExportColumnarPostError, ExportProjectColumnarEndpointApiV1ProjectsProjectIdExportColumnarPostResponse, StreamProjectExportEndpointApiV1ProjectsProjectIdExportStreamPostData, StreamProjectExportEndpointApiV1ProjectsProjectIdExportStreamPostError, StreamProjectExportEndpointApiV1ProjectsProjectIdExportStreamPostResponse, ListProjectSamplesEndpointApiV1ProjectsProjectIdSamplesGetData, ListProjectSamplesEndpointApiV1ProjectsProjectIdSamplesGetError, ListProjectSamplesEndpointApiV1ProjectsProjectIdSamplesGetResponse, GetSampleDetailEndpointApiV1SamplesSampleIdGetData, GetSampleDetailEndpointApiV1SamplesSampleIdGetError, GetSampleDetailEndpointApiV1SamplesSampleIdGetResponse, UpdateSampleStatusEndpointApiV1SamplesSampleIdPatchData, UpdateSampleStatusEndpointApiV1SamplesSampleIdPatchError, UpdateSampleStatusEndpointApiV1SamplesSampleIdPatchResponse, ReplaceSampleAnnotationsEndpointApiV1SamplesSampleIdAnnotationsPutData, ReplaceSampleAnnotationsEndpointApiV1SamplesSampleIdAnnotationsPutError, ReplaceSampleAnnotationsEndpointApiV1SamplesSampleIdAnnotationsPutResponse, PatchSampleAnnotationsEndpointApiV1SamplesSampleIdAnnotationsPatchData, PatchSampleAnnotationsEndpointApiV1SamplesSampleIdAnnotationsPatchError, PatchSampleAnnotationsEndpointApiV1SamplesSampleIdAnnotationsPatchResponse, GetSampleAssetEndpointApiV1SamplesSampleIdAssetsGetData, GetSampleAssetEndpointApiV1SamplesSampleIdAssetsGetError, GetSampleAssetEndpointApiV1SamplesSampleIdAssetsGetResponse, ExtractSampleEndmembersEndpointApiV1SamplesSampleIdEndmembersPostData, ExtractSampleEndmembersEndpointApiV1SamplesSampleIdEndmembersPostError, ExtractSampleEndmembersEndpointApiV1SamplesSampleIdEndmembersPostResponse, RenderSampleAbundanceEndpointApiV1SamplesSampleIdEndmembersIndexAbundanceGetData, RenderSampleAbundanceEndpointApiV1SamplesSampleIdEndmembersIndexAbundanceGetError, RenderSampleAbundanceEndpointApiV1SamplesSampleIdEndmembersIndexAbundanceGetResponse, GetSampleQualityEndpointApiV1SamplesSampleIdQualityGetData, GetSampleQualityEndpointApiV1SamplesSampleIdQualityGetError, GetSampleQualityEndpointApiV1SamplesSampleIdQualityGetResponse, GetSampleThumbnailEndpointApiV1SamplesSampleIdThumbnailGetData, GetSampleThumbnailEndpointApiV1SamplesSampleIdThumbnailGetError, GetSampleThumbnailEndpointApiV1SamplesSampleIdThumbnailGetResponse, RenderSampleOverviewEndpointApiV1SamplesSampleIdOverviewGetData, RenderSampleOverviewEndpointApiV1SamplesSampleIdOverviewGetError, RenderSampleOverviewEndpointApiV1SamplesSampleIdOverviewGetResponse, LookupSampleBandsEndpointApiV1SamplesSampleIdBandsLookupGetData, LookupSampleBandsEndpointApiV1SamplesSampleIdBandsLookupGetError, LookupSampleBandsEndpointApiV1SamplesSampleIdBandsLookupGetResponse, SelectSampleBandRangeEndpointApiV1SamplesSampleIdBandsRangeGetData, SelectSampleBandRangeEndpointApiV1SamplesSampleIdBandsRangeGetError, SelectSampleBandRangeEndpointApiV1SamplesSampleIdBandsRangeGetResponse, ResolveSampleModeChannelsEndpointApiV1SamplesSampleIdSpectralModesModeIdChannelsGetData, ResolveSampleModeChannelsEndpointApiV1SamplesSampleIdSpectralModesModeIdChannelsGetError, ResolveSampleModeChannelsEndpointApiV1SamplesSampleIdSpectralModesModeIdChannelsGetResponse, ExtractSampleSpectraEndpointApiV1SamplesSampleIdSpectraExtractPostData, ExtractSampleSpectraEndpointApiV1SamplesSampleIdSpectraExtractPostError, ExtractSampleSpectraEndpointApiV1SamplesSampleIdSpectraExtractPostResponse, RootGetError, RootGetResponse } from './types.gen';
 
 export const client = createClient(createConfig());
 
@@ -325,7 +325,7 @@ export const listDataSourcesEndpointApiV1ProjectsDataSourcesGet = <ThrowOnError
 
 /**
  * Upload Data Source Folder Endpoint
- * 上传整個文件夹（逐文件）.
+ * 上传整個文件夹（逐文件分块流式写入）.
  */
 export const uploadDataSourceFolderEndpointApiV1ProjectsDataSourcesUploadFolderPost = <ThrowOnError extends boolean = false>(options: OptionsLegacyParser<UploadDataSourceFolderEndpointApiV1ProjectsDataSourcesUploadFolderPostData, ThrowOnError>) => {
     return (options?.client ?? client).post<UploadDataSourceFolderEndpointApiV1ProjectsDataSourcesUploadFolderPostResponse, UploadDataSourceFolderEndpointApiV1ProjectsDataSourcesUploadFolderPostError, ThrowOnError>({
@@ -339,6 +339,77 @@ export const uploadDataSourceFolderEndpointApiV1ProjectsDataSourcesUploadFolderP
     });
 };
 
+/**
+ * Upload Data Source Archive Endpoint
+ * 上传单个 zip/tar 压缩包并流式解压为数据源.
+ */
+export const uploadDataSourceArchiveEndpointApiV1ProjectsDataSourcesUploadArchivePost = <ThrowOnError extends boolean = false>(options: OptionsLegacyParser<UploadDataSourceArchiveEndpointApiV1ProjectsDataSourcesUploadArchivePostData, ThrowOnError>) => {
+    return (options?.client ?? client).post<UploadDataSourceArchiveEndpointApiV1ProjectsDataSourcesUploadArchivePostResponse, UploadDataSourceArchiveEndpointApiV1ProjectsDataSourcesUploadArchivePostError, ThrowOnError>({
+        ...options,
+        ...formDataBodySerializer,
+        headers: {
+            'Content-Type': null,
+            ...options?.headers
+        },
+        url: '/api/v1/projects/data-sources/upload-archive'
+    });
+};
+
+/**
+ * Create Upload Session Endpoint
+ * 创建断点续传会话.
+ */
+export const createUploadSessionEndpointApiV1ProjectsDataSourcesUploadsPost = <ThrowOnError extends boolean = false>(options: OptionsLegacyParser<CreateUploadSessionEndpointApiV1ProjectsDataSourcesUploadsPostData, ThrowOnError>) => {
+    return (options?.client ?? client).post<CreateUploadSessionEndpointApiV1ProjectsDataSourcesUploadsPostResponse, CreateUploadSessionEndpointApiV1ProjectsDataSourcesUploadsPostError, ThrowOnError>({
+        ...options,
+        url: '/api/v1/projects/data-sources/uploads'
+    });
+};
+
+/**
+ * Get Upload Session Endpoint
+ * 查询会话进度（断线后据此续传缺失区间）.
+ */
+export const getUploadSessionEndpointApiV1ProjectsDataSourcesUploadsSessionIdGet = <ThrowOnError extends boolean = false>(options: OptionsLegacyParser<GetUploadSessionEndpointApiV1ProjectsDataSourcesUploadsSessionIdGetData, ThrowOnError>) => {
+    return (options?.client ?? client).get<GetUploadSessionEndpointApiV1ProjectsDataSourcesUploadsSessionIdGetResponse, GetUploadSessionEndpointApiV1ProjectsDataSourcesUploadsSessionIdGetError, ThrowOnError>({
+        ...options,
+        url: '/api/v1/projects/data-sources/uploads/{session_id}'
+    });
+};
+
+/**
+ * Abort Upload Session Endpoint
+ * 放弃上传会话.
+ */
+export const abortUploadSessionEndpointApiV1ProjectsDataSourcesUploadsSessionIdDelete = <ThrowOnError extends boolean = false>(options: OptionsLegacyParser<AbortUploadSessionEndpointApiV1ProjectsDataSourcesUploadsSessionIdDeleteData, ThrowOnError>) => {
+    return (options?.client ?? client).delete<AbortUploadSessionEndpointApiV1ProjectsDataSourcesUploadsSessionIdDeleteResponse, AbortUploadSessionEndpointApiV1ProjectsDataSourcesUploadsSessionIdDeleteError, ThrowOnError>({
+        ...options,
+        url: '/api/v1/projects/data-sources/uploads/{session_id}'
+    });
+};
+
+/**
+ * Upload Session Range Endpoint
+ * 上传文件的一个字节区间（请求体为原始字节，需携带 Content-Range）.
+ */
+export const uploadSessionRangeEndpointApiV1ProjectsDataSourcesUploadsSessionIdFilesIndexPut = <ThrowOnError extends boolean = false>(options: OptionsLegacyParser<UploadSessionRangeEndpointApiV1ProjectsDataSourcesUploadsSessionIdFilesIndexPutData, ThrowOnError>) => {
+    return (options?.client ?? client).put<UploadSessionRangeEndpointApiV1ProjectsDataSourcesUploadsSessionIdFilesIndexPutResponse, UploadSessionRangeEndpointApiV1ProjectsDataSourcesUploadsSessionIdFilesIndexPutError, ThrowOnError>({
+        ...options,
+        url: '/api/v1/projects/data-sources/uploads/{session_id}/files/{index}'
+    });
+};
+
+/**
+ * Finalize Upload Session Endpoint
+ * 完成上传：校验后使数据源可见.
+ */
+export const finalizeUploadSessionEndpointApiV1ProjectsDataSourcesUploadsSessionIdFinalizePost = <ThrowOnError extends boolean = false>(options: OptionsLegacyParser<FinalizeUploadSessionEndpointApiV1ProjectsDataSourcesUploadsSessionIdFinalizePostData, ThrowOnError>) => {
+    return (options?.client ?? client).post<FinalizeUploadSessionEndpointApiV1ProjectsDataSourcesUploadsSessionIdFinalizePostResponse, FinalizeUploadSessionEndpointApiV1ProjectsDataSourcesUploadsSessionIdFinalizePostError, ThrowOnError>({
+        ...options,
+        url: '/api/v1/projects/data-sources/uploads/{session_id}/finalize'
+    });
+};
+
 /**
  * Get Project Endpoint
  * 获取单个项目.
@@ -394,9 +465,64 @@ export const restoreProjectEndpointApiV1ProjectsProjectIdRestorePost = <ThrowOnE
     });
 };
 
+/**
+ * Sync Project Endpoint
+ * 与数据源目录增量同步样本.
+ */
+export const syncProjectEndpointApiV1ProjectsProjectIdSyncPost = <ThrowOnError extends boolean = false>(options: OptionsLegacyParser<SyncProjectEndpointApiV1ProjectsProjectIdSyncPostData, ThrowOnError>) => {
+    return (options?.client ?? client).post<SyncProjectEndpointApiV1ProjectsProjectIdSyncPostResponse, SyncProjectEndpointApiV1ProjectsProjectIdSyncPostError, ThrowOnError>({
+        ...options,
+        url: '/api/v1/projects/{project_id}/sync'
+    });
+};
+
+/**
+ * Get Project Ingest Status Endpoint
+ * 导入后处理（头文件校验、波段统计、缩略图、概览金字塔）进度.
+ */
+export const getProjectIngestStatusEndpointApiV1ProjectsProjectIdIngestGet = <ThrowOnError extends boolean = false>(options: OptionsLegacyParser<GetProjectIngestStatusEndpointApiV1ProjectsProjectIdIngestGetData, ThrowOnError>) => {
+    return (options?.client ?? client).get<GetProjectIngestStatusEndpointApiV1ProjectsProjectIdIngestGetResponse, GetProjectIngestStatusEndpointApiV1ProjectsProjectIdIngestGetError, ThrowOnError>({
+        ...options,
+        url: '/api/v1/projects/{project_id}/ingest'
+    });
+};
+
+/**
+ * Export Project Annotations Endpoint
+ * 导出项目标注.
+ */
+export const exportProjectAnnotationsEndpointApiV1ProjectsProjectIdExportPost = <ThrowOnError extends boolean = false>(options: OptionsLegacyParser<ExportProjectAnnotationsEndpointApiV1ProjectsProjectIdExportPostData, ThrowOnError>) => {
+    return (options?.client ?? client).post<ExportProjectAnnotationsEndpointApiV1ProjectsProjectIdExportPostResponse, ExportProjectAnnotationsEndpointApiV1ProjectsProjectIdExportPostError, ThrowOnError>({
+        ...options,
+        url: '/api/v1/projects/{project_id}/export'
+    });
+};
+
+/**
+ * Export Project Columnar Endpoint
+ * 列式导出（.npy 列 + manifest.json 的 tar 包，解包后可内存映射读取）.
+ */
+export const exportProjectColumnarEndpointApiV1ProjectsProjectIdExportColumnarPost = <ThrowOnError extends boolean = false>(options: OptionsLegacyParser<ExportProjectColumnarEndpointApiV1ProjectsProjectIdExportColumnarPostData, ThrowOnError>) => {
+    return (options?.client ?? client).post<ExportProjectColumnarEndpointApiV1ProjectsProjectIdExportColumnarPostResponse, ExportProjectColumnarEndpointApiV1ProjectsProjectIdExportColumnarPostError, ThrowOnError>({
+        ...options,
+        url: '/api/v1/projects/{project_id}/export/columnar'
+    });
+};
+
+/**
+ * Stream Project Export Endpoint
+ * 流式导出项目标注（NDJSON，每行一个样本）.
+ */
+export const streamProjectExportEndpointApiV1ProjectsProjectIdExportStreamPost = <ThrowOnError extends boolean = false>(options: OptionsLegacyParser<StreamProjectExportEndpointApiV1ProjectsProjectIdExportStreamPostData, ThrowOnError>) => {
+    return (options?.client ?? client).post<StreamProjectExportEndpointApiV1ProjectsProjectIdExportStreamPostResponse, StreamProjectExportEndpointApiV1ProjectsProjectIdExportStreamPostError, ThrowOnError>({
+        ...options,
+        url: '/api/v1/projects/{project_id}/export/stream'
+    });
+};
+
 /**
  * List Project Samples Endpoint
- * 项目下样本列表.
+ * 项目下样本列表（游标分页，可按状态、标注人及立方体元数据筛选）.
  */
 export const listProjectSamplesEndpointApiV1ProjectsProjectIdSamplesGet = <ThrowOnError extends boolean = false>(options: OptionsLegacyParser<ListProjectSamplesEndpointApiV1ProjectsProjectIdSamplesGetData, ThrowOnError>) => {
     return (options?.client ?? client).get<ListProjectSamplesEndpointApiV1ProjectsProjectIdSamplesGetResponse, ListProjectSamplesEndpointApiV1ProjectsProjectIdSamplesGetError, ThrowOnError>({
@@ -438,6 +564,17 @@ export const replaceSampleAnnotationsEndpointApiV1SamplesSampleIdAnnotationsPut
     });
 };
 
+/**
+ * Patch Sample Annotations Endpoint
+ * 增量保存标注（按 detail_id 新增、更新、删除）.
+ */
+export const patchSampleAnnotationsEndpointApiV1SamplesSampleIdAnnotationsPatch = <ThrowOnError extends boolean = false>(options: OptionsLegacyParser<PatchSampleAnnotationsEndpointApiV1SamplesSampleIdAnnotationsPatchData, ThrowOnError>) => {
+    return (options?.client ?? client).patch<PatchSampleAnnotationsEndpointApiV1SamplesSampleIdAnnotationsPatchResponse, PatchSampleAnnotationsEndpointApiV1SamplesSampleIdAnnotationsPatchError, ThrowOnError>({
+        ...options,
+        url: '/api/v1/samples/{sample_id}/annotations'
+    });
+};
+
 /**
  * Get Sample Asset Endpoint
  * 下载样本文件.
@@ -449,6 +586,105 @@ export const getSampleAssetEndpointApiV1SamplesSampleIdAssetsGet = <ThrowOnError
     });
 };
 
+/**
+ * Extract Sample Endmembers Endpoint
+ * 提取端元并缓存丰度图.
+ */
+export const extractSampleEndmembersEndpointApiV1SamplesSampleIdEndmembersPost = <ThrowOnError extends boolean = false>(options: OptionsLegacyParser<ExtractSampleEndmembersEndpointApiV1SamplesSampleIdEndmembersPostData, ThrowOnError>) => {
+    return (options?.client ?? client).post<ExtractSampleEndmembersEndpointApiV1SamplesSampleIdEndmembersPostResponse, ExtractSampleEndmembersEndpointApiV1SamplesSampleIdEndmembersPostError, ThrowOnError>({
+        ...options,
+        url: '/api/v1/samples/{sample_id}/endmembers'
+    });
+};
+
+/**
+ * Render Sample Abundance Endpoint
+ * 渲染端元丰度图 (PNG).
+ */
+export const renderSampleAbundanceEndpointApiV1SamplesSampleIdEndmembersIndexAbundanceGet = <ThrowOnError extends boolean = false>(options: OptionsLegacyParser<RenderSampleAbundanceEndpointApiV1SamplesSampleIdEndmembersIndexAbundanceGetData, ThrowOnError>) => {
+    return (options?.client ?? client).get<RenderSampleAbundanceEndpointApiV1SamplesSampleIdEndmembersIndexAbundanceGetResponse, RenderSampleAbundanceEndpointApiV1SamplesSampleIdEndmembersIndexAbundanceGetError, ThrowOnError>({
+        ...options,
+        url: '/api/v1/samples/{sample_id}/endmembers/{index}/abundance'
+    });
+};
+
+/**
+ * Get Sample Quality Endpoint
+ * 坏波段与坏像元列扫描结果.
+ */
+export const getSampleQualityEndpointApiV1SamplesSampleIdQualityGet = <ThrowOnError extends boolean = false>(options: OptionsLegacyParser<GetSampleQualityEndpointApiV1SamplesSampleIdQualityGetData, ThrowOnError>) => {
+    return (options?.client ?? client).get<GetSampleQualityEndpointApiV1SamplesSampleIdQualityGetResponse, GetSampleQualityEndpointApiV1SamplesSampleIdQualityGetError, ThrowOnError>({
+        ...options,
+        url: '/api/v1/samples/{sample_id}/quality'
+    });
+};
+
+/**
+ * Get Sample Thumbnail Endpoint
+ * 样本缩略图；后处理未完成时即时渲染（X-Derivative: live）.
+ */
+export const getSampleThumbnailEndpointApiV1SamplesSampleIdThumbnailGet = <ThrowOnError extends boolean = false>(options: OptionsLegacyParser<GetSampleThumbnailEndpointApiV1SamplesSampleIdThumbnailGetData, ThrowOnError>) => {
+    return (options?.client ?? client).get<GetSampleThumbnailEndpointApiV1SamplesSampleIdThumbnailGetResponse, GetSampleThumbnailEndpointApiV1SamplesSampleIdThumbnailGetError, ThrowOnError>({
+        ...options,
+        url: '/api/v1/samples/{sample_id}/thumbnail'
+    });
+};
+
+/**
+ * Render Sample Overview Endpoint
+ * 概览金字塔单波段图 (PNG)；金字塔未就绪时按步长从原立方体抽取.
+ */
+export const renderSampleOverviewEndpointApiV1SamplesSampleIdOverviewGet = <ThrowOnError extends boolean = false>(options: OptionsLegacyParser<RenderSampleOverviewEndpointApiV1SamplesSampleIdOverviewGetData, ThrowOnError>) => {
+    return (options?.client ?? client).get<RenderSampleOverviewEndpointApiV1SamplesSampleIdOverviewGetResponse, RenderSampleOverviewEndpointApiV1SamplesSampleIdOverviewGetError, ThrowOnError>({
+        ...options,
+        url: '/api/v1/samples/{sample_id}/overview'
+    });
+};
+
+/**
+ * Lookup Sample Bands Endpoint
+ * 按波长查找最近波段.
+ */
+export const lookupSampleBandsEndpointApiV1SamplesSampleIdBandsLookupGet = <ThrowOnError extends boolean = false>(options: OptionsLegacyParser<LookupSampleBandsEndpointApiV1SamplesSampleIdBandsLookupGetData, ThrowOnError>) => {
+    return (options?.client ?? client).get<LookupSampleBandsEndpointApiV1SamplesSampleIdBandsLookupGetResponse, LookupSampleBandsEndpointApiV1SamplesSampleIdBandsLookupGetError, ThrowOnError>({
+        ...options,
+        url: '/api/v1/samples/{sample_id}/bands/lookup'
+    });
+};
+
+/**
+ * Select Sample Band Range Endpoint
+ * 截取波长范围内的波段.
+ */
+export const selectSampleBandRangeEndpointApiV1SamplesSampleIdBandsRangeGet = <ThrowOnError extends boolean = false>(options: OptionsLegacyParser<SelectSampleBandRangeEndpointApiV1SamplesSampleIdBandsRangeGetData, ThrowOnError>) => {
+    return (options?.client ?? client).get<SelectSampleBandRangeEndpointApiV1SamplesSampleIdBandsRangeGetResponse, SelectSampleBandRangeEndpointApiV1SamplesSampleIdBandsRangeGetError, ThrowOnError>({
+        ...options,
+        url: '/api/v1/samples/{sample_id}/bands/range'
+    });
+};
+
+/**
+ * Resolve Sample Mode Channels Endpoint
+ * 把显示模式解析为该样本的波段号.
+ */
+export const resolveSampleModeChannelsEndpointApiV1SamplesSampleIdSpectralModesModeIdChannelsGet = <ThrowOnError extends boolean = false>(options: OptionsLegacyParser<ResolveSampleModeChannelsEndpointApiV1SamplesSampleIdSpectralModesModeIdChannelsGetData, ThrowOnError>) => {
+    return (options?.client ?? client).get<ResolveSampleModeChannelsEndpointApiV1SamplesSampleIdSpectralModesModeIdChannelsGetResponse, ResolveSampleModeChannelsEndpointApiV1SamplesSampleIdSpectralModesModeIdChannelsGetError, ThrowOnError>({
+        ...options,
+        url: '/api/v1/samples/{sample_id}/spectral-modes/{mode_id}/channels'
+    });
+};
+
+/**
+ * Extract Sample Spectra Endpoint
+ * 提取像元光谱.
+ */
+export const extractSampleSpectraEndpointApiV1SamplesSampleIdSpectraExtractPost = <ThrowOnError extends boolean = false>(options: OptionsLegacyParser<ExtractSampleSpectraEndpointApiV1SamplesSampleIdSpectraExtractPostData, ThrowOnError>) => {
+    return (options?.client ?? client).post<ExtractSampleSpectraEndpointApiV1SamplesSampleIdSpectraExtractPostResponse, ExtractSampleSpectraEndpointApiV1SamplesSampleIdSpectraExtractPostError, ThrowOnError>({
+        ...options,
+        url: '/api/v1/samples/{sample_id}/spectra/extract'
+    });
+};
+
 /**
  * Root
  * Root endpoint.
@@ -4,6 +4,7 @@
  * 创建/更新标注详情.
  */
 export type AnnotationDetailCreate = {
+    detail_id?: (string | null);
     label_name: string;
     color: string;
     tool_type: 'rect' | 'polygon' | 'point' | 'circle' | 'line' | 'grid';
@@ -54,6 +55,27 @@ export type AnnotationDetailModeResponse = {
     updated_at: string;
 };
 
+/**
+ * 按 detail_id 局部更新一条标注；只修改请求中出现的字段.
+ *
+ * mode_snapshot / spectra 出现时整体替换（mode_snapshot 为 null 表示删除快照）。
+ */
+export type AnnotationDetailPatch = {
+    detail_id: string;
+    label_name?: (string | null);
+    color?: (string | null);
+    tool_type?: ('rect' | 'polygon' | 'point' | 'circle' | 'line' | 'grid' | null);
+    coordinates?: ({
+    [key: string]: unknown;
+} | null);
+    radius?: (number | null);
+    area?: (number | null);
+    confidence?: (number | null);
+    remark?: (string | null);
+    mode_snapshot?: (AnnotationDetailModeCreate | null);
+    spectra?: (Array<AnnotationSpectrumCreate> | null);
+};
+
 /**
  * 标注详情.
  */
@@ -91,6 +113,18 @@ export type AnnotationSampleDetail = {
     source_files: Array<(string)>;
     created_at: string;
     updated_at: string;
+    cube_samples?: (number | null);
+    cube_lines?: (number | null);
+    cube_bands?: (number | null);
+    data_type?: (number | null);
+    interleave?: (string | null);
+    wavelength_min?: (number | null);
+    wavelength_max?: (number | null);
+    file_size?: (number | null);
+    has_dark?: boolean;
+    has_white?: boolean;
+    wavelengths?: (Array<(number)> | null);
+    fwhm?: (Array<(number)> | null);
     annotations?: Array<AnnotationDetailResponse>;
 };
 
@@ -108,6 +142,16 @@ export type AnnotationSampleSummary = {
     source_files: Array<(string)>;
     created_at: string;
     updated_at: string;
+    cube_samples?: (number | null);
+    cube_lines?: (number | null);
+    cube_bands?: (number | null);
+    data_type?: (number | null);
+    interleave?: (string | null);
+    wavelength_min?: (number | null);
+    wavelength_max?: (number | null);
+    file_size?: (number | null);
+    has_dark?: boolean;
+    has_white?: boolean;
     has_annotations: boolean;
 };
 
@@ -118,9 +162,7 @@ export type AnnotationSpectrumCreate = {
     position?: ({
     [key: string]: unknown;
 } | null);
-    points?: Array<{
-        [key: string]: unknown;
-    }>;
+    points?: Array<SpectrumPoint>;
 };
 
 /**
@@ -139,6 +181,47 @@ export type AnnotationSpectrumResponse = {
     updated_at: string;
 };
 
+/**
+ * 波长到波段的查找结果.
+ */
+export type BandLookupItem = {
+    wavelength: number;
+    band: number;
+    band_wavelength: number;
+};
+
+/**
+ * 批量波段查找.
+ */
+export type BandLookupResponse = {
+    items: Array<BandLookupItem>;
+};
+
+/**
+ * 排除饱和像元后的波段百分位.
+ */
+export type BandPercentiles = {
+    p2?: Array<(number | null)>;
+    p98?: Array<(number | null)>;
+};
+
+/**
+ * 坏波段分类.
+ */
+export type BandQualityFlags = {
+    constant?: Array<(number)>;
+    low_snr?: Array<(number)>;
+    saturated?: Array<(number)>;
+};
+
+/**
+ * 波长范围内的波段.
+ */
+export type BandRangeResponse = {
+    bands: Array<(number)>;
+    wavelengths: Array<(number)>;
+};
+
 export type Body_login_for_access_token_api_v1_auth_login_post = {
     grant_type?: (string | null);
     username: string;
@@ -152,6 +235,11 @@ export type Body_upload_avatar_api_v1_users_me_avatar_post = {
     file: (Blob | File);
 };
 
+export type Body_upload_data_source_archive_endpoint_api_v1_projects_data_sources_upload_archive_post = {
+    folder_name: string;
+    file: (Blob | File);
+};
+
 export type Body_upload_data_source_folder_endpoint_api_v1_projects_data_sources_upload_folder_post = {
     folder_name: string;
     files: Array<((Blob | File))>;
@@ -173,12 +261,50 @@ export type DataSourceInfo = {
 export type DataSourceUploadResponse = {
     name: string;
     total_files: number;
+    deduplicated_files?: number;
+    deduplicated_bytes?: number;
+};
+
+/**
+ * 端元提取参数.
+ */
+export type EndmemberExtractionRequest = {
+    n_endmembers?: number;
+    subsample?: number;
+    seed?: number;
+    wavelength_min?: (number | null);
+    wavelength_max?: (number | null);
+};
+
+/**
+ * 端元提取结果.
+ */
+export type EndmemberResult = {
+    sample_id: string;
+    n_endmembers: number;
+    subsample: number;
+    seed: number;
+    bands: Array<(number)>;
+    endmembers: Array<(Array<(number)>)>;
+    pixels: Array<(Array<(number)>)>;
+    wavelengths?: (Array<(number)> | null);
 };
 
 export type HTTPValidationError = {
     detail?: Array<ValidationError>;
 };
 
+/**
+ * 单个后处理阶段的状态.
+ */
+export type IngestStageStatus = {
+    name: string;
+    status: 'pending' | 'completed' | 'failed';
+    error?: (string | null);
+};
+
+export type status = 'pending' | 'completed' | 'failed';
+
 /**
  * 标签种类公共字段.
  */
@@ -251,11 +377,176 @@ export type ProjectCreate = {
     completion_rate?: number;
     available_samples?: number;
     total_samples?: number;
+    wavelength_grid?: (Array<(number)> | null);
     data_source_folder: string;
 };
 
 export type priority = 'normal' | 'high';
 
+/**
+ * 导出标注细节.
+ */
+export type ProjectExportAnnotationDetail = {
+    detail_id: string;
+    sample_id: string;
+    label_name: string;
+    color: string;
+    tool_type: string;
+    coordinates: {
+        [key: string]: unknown;
+    };
+    radius?: (number | null);
+    area?: (number | null);
+    confidence?: (number | null);
+    remark?: (string | null);
+    created_at: string;
+    updated_at: string;
+};
+
+/**
+ * 导出显示模式快照.
+ */
+export type ProjectExportAnnotationDetailMode = {
+    detail_id: string;
+    r_channel: number;
+    g_channel: number;
+    b_channel: number;
+    r_gain: number;
+    g_gain: number;
+    b_gain: number;
+    gain_algorithm: string;
+    dark_calibration: boolean;
+    white_calibration: boolean;
+    created_at: string;
+    updated_at: string;
+};
+
+/**
+ * 单条标注记录（含模式及光谱）.
+ */
+export type ProjectExportAnnotationRecord = {
+    detail: ProjectExportAnnotationDetail;
+    mode_snapshot?: (ProjectExportAnnotationDetailMode | null);
+    spectra?: Array<ProjectExportAnnotationSpectrum>;
+};
+
+/**
+ * 导出光谱曲线.
+ */
+export type ProjectExportAnnotationSpectrum = {
+    detail_id: string;
+    position?: ({
+    [key: string]: unknown;
+} | null);
+    points?: Array<{
+        [key: string]: unknown;
+    }>;
+    created_at: string;
+    updated_at: string;
+};
+
+/**
+ * 导出内容标记.
+ */
+export type ProjectExportIncludedSections = {
+    project_meta: boolean;
+    sample_meta: boolean;
+    annotation_bundle: boolean;
+    always?: Array<(string)>;
+};
+
+/**
+ * 项目导出选项.
+ */
+export type ProjectExportOptions = {
+    include_project_meta?: boolean;
+    include_sample_meta?: boolean;
+    include_annotation_bundle?: boolean;
+    resample_to_project_grid?: boolean;
+    resample_method?: 'linear' | 'gaussian';
+    spectral_transforms?: Array<SpectralTransform>;
+    since?: (number | null);
+};
+
+export type resample_method = 'linear' | 'gaussian';
+
+/**
+ * 导出中的项目信息.
+ */
+export type ProjectExportProjectMeta = {
+    project_id: string;
+    id?: (number | null);
+    name?: (string | null);
+    priority?: ('normal' | 'high' | null);
+    completion_rate?: (number | null);
+    available_samples?: (number | null);
+    total_samples?: (number | null);
+    created_at?: (string | null);
+    updated_at?: (string | null);
+};
+
+/**
+ * 导出返回.
+ */
+export type ProjectExportResponse = {
+    project: ProjectExportProjectMeta;
+    included_sections: ProjectExportIncludedSections;
+    generated_at: string;
+    version: number;
+    since?: (number | null);
+    samples?: Array<ProjectExportSampleBlock>;
+    tombstones?: Array<ProjectExportTombstone>;
+};
+
+/**
+ * 导出样本信息.
+ */
+export type ProjectExportSample = {
+    id: number;
+    sample_id: string;
+    sample_type: string;
+    source_files: Array<(string)>;
+    status: string;
+    is_annotated: boolean;
+    last_annotated_by?: (number | null);
+    created_at: string;
+    updated_at: string;
+};
+
+/**
+ * 每个样本的导出块.
+ */
+export type ProjectExportSampleBlock = {
+    sample_id: string;
+    meta?: (ProjectExportSample | null);
+    annotations?: (Array<ProjectExportAnnotationRecord> | null);
+};
+
+/**
+ * 增量导出中的已删除标注.
+ */
+export type ProjectExportTombstone = {
+    sample_id: string;
+    detail_id: string;
+    change_version: number;
+    deleted_at: string;
+};
+
+/**
+ * 项目内高光谱样本的后处理汇总.
+ */
+export type ProjectIngestStatus = {
+    project_id: number;
+    stages: Array<(string)>;
+    total: number;
+    pending: number;
+    running: number;
+    completed: number;
+    failed: number;
+    progress: number;
+    items?: Array<SampleIngestStatus>;
+};
+
 /**
  * 分页响应.
  */
@@ -276,6 +567,7 @@ export type ProjectResponse = {
     completion_rate?: number;
     available_samples?: number;
     total_samples?: number;
+    wavelength_grid?: (Array<(number)> | null);
     id: number;
     project_id: string;
     created_at: string;
@@ -283,6 +575,19 @@ export type ProjectResponse = {
     created_by: (number | null);
     updated_by: (number | null);
     is_archived: boolean;
+    data_source_folder?: (string | null);
+};
+
+/**
+ * 数据源同步结果.
+ */
+export type ProjectSyncResponse = {
+    added: number;
+    missing: number;
+    restored: number;
+    changed: number;
+    unchanged: number;
+    total_samples: number;
 };
 
 /**
@@ -294,6 +599,32 @@ export type ProjectUpdate = {
     completion_rate?: (number | null);
     available_samples?: (number | null);
     total_samples?: (number | null);
+    wavelength_grid?: (Array<(number)> | null);
+};
+
+/**
+ * 显示模式在某个样本上的实际波段.
+ */
+export type ResolvedModeChannels = {
+    mode_id: number;
+    r_channel: number;
+    g_channel: number;
+    b_channel: number;
+    wavelengths?: (Array<(number)> | null);
+    matched_by_wavelength: boolean;
+};
+
+/**
+ * 增量保存标注：新增、更新与删除.
+ */
+export type SampleAnnotationsPatch = {
+    add?: Array<AnnotationDetailCreate>;
+    update?: Array<AnnotationDetailPatch>;
+    /**
+     * 要删除的 detail_id
+     */
+    delete?: Array<(string)>;
+    mark_annotated?: boolean;
 };
 
 /**
@@ -305,22 +636,59 @@ export type SampleAnnotationsPayload = {
 };
 
 /**
- * 样本列表.
+ * 样本的导入后处理进度.
+ */
+export type SampleIngestStatus = {
+    id: number;
+    sample_id: string;
+    status: 'pending' | 'running' | 'completed' | 'failed';
+    progress: number;
+    current_stage?: (string | null);
+    error?: (string | null);
+    stages?: Array<IngestStageStatus>;
+};
+
+export type status2 = 'pending' | 'running' | 'completed' | 'failed';
+
+/**
+ * 样本列表（按 id 的游标分页）.
  */
 export type SampleListResponse = {
     items: Array<AnnotationSampleSummary>;
-    total: number;
+    total?: (number | null);
+    total_estimated?: boolean;
+    next_cursor?: (number | null);
+};
+
+/**
+ * 导入时的坏波段/坏像元扫描结果.
+ */
+export type SampleQualityReport = {
+    sample_id: string;
+    status: 'pending' | 'completed' | 'failed';
+    error?: (string | null);
+    bands?: (number | null);
+    bad_bands?: Array<(number)>;
+    good_bands?: Array<(number)>;
+    band_flags?: (BandQualityFlags | null);
+    snr?: Array<(number | null)>;
+    saturated_fraction?: Array<(number)>;
+    percentiles?: (BandPercentiles | null);
+    dead_columns?: Array<(number)>;
+    hot_columns?: Array<(number)>;
 };
 
 /**
  * 样本状态更新.
+ *
+ * missing 由数据源同步维护，不能手动设置；样本缺失期间设置的状态在文件恢复后生效。
  */
 export type SampleStatusUpdate = {
     status: 'valid' | 'ignored';
     is_annotated?: (boolean | null);
 };
 
-export type status = 'valid' | 'ignored';
+export type status3 = 'valid' | 'ignored';
 
 /**
  * 创建模式.
@@ -330,6 +698,9 @@ export type SpectralModeCreate = {
     r_channel: number;
     g_channel: number;
     b_channel: number;
+    r_wavelength?: (number | null);
+    g_wavelength?: (number | null);
+    b_wavelength?: (number | null);
     r_gain?: number;
     g_gain?: number;
     b_gain?: number;
@@ -357,6 +728,9 @@ export type SpectralModeResponse = {
     r_channel: number;
     g_channel: number;
     b_channel: number;
+    r_wavelength?: (number | null);
+    g_wavelength?: (number | null);
+    b_wavelength?: (number | null);
     r_gain?: number;
     g_gain?: number;
     b_gain?: number;
@@ -376,6 +750,9 @@ export type SpectralModeUpdate = {
     r_channel?: (number | null);
     g_channel?: (number | null);
     b_channel?: (number | null);
+    r_wavelength?: (number | null);
+    g_wavelength?: (number | null);
+    b_wavelength?: (number | null);
     r_gain?: (number | null);
     g_gain?: (number | null);
     b_gain?: (number | null);
@@ -384,6 +761,54 @@ export type SpectralModeUpdate = {
     white_calibration?: (boolean | null);
 };
 
+/**
+ * 光谱变换：S-G 平滑、一/二阶导数、包络线去除.
+ */
+export type SpectralTransform = {
+    kind: 'savgol' | 'derivative1' | 'derivative2' | 'continuum_removal';
+    /**
+     * S-G 窗口（奇数）
+     */
+    window?: number;
+    /**
+     * S-G 多项式阶数
+     */
+    order?: number;
+};
+
+export type kind = 'savgol' | 'derivative1' | 'derivative2' | 'continuum_removal';
+
+/**
+ * 从立方体提取像元光谱.
+ */
+export type SpectrumExtractionRequest = {
+    /**
+     * (line, sample) 像元坐标
+     */
+    pixels: Array<(Array<(unknown)>)>;
+    average?: boolean;
+    calibrated?: boolean;
+    resample_to_project_grid?: boolean;
+    resample_method?: 'linear' | 'gaussian';
+    transforms?: Array<SpectralTransform>;
+};
+
+/**
+ * 提取的光谱（平均时只有一条）.
+ */
+export type SpectrumExtractionResponse = {
+    wavelengths?: (Array<(number)> | null);
+    values: Array<(Array<(number | null)>)>;
+};
+
+/**
+ * 光谱曲线上的一个点（intensity 为 null 表示该波段无有效值）.
+ */
+export type SpectrumPoint = {
+    wavelength: number;
+    intensity: (number | null);
+};
+
 /**
  * Schema for creating a todo.
  */
@@ -436,6 +861,43 @@ export type Token = {
     token_type?: string;
 };
 
+/**
+ * 创建断点续传会话.
+ */
+export type UploadSessionCreate = {
+    folder_name: string;
+    files: Array<UploadSessionFile>;
+};
+
+/**
+ * 断点续传会话中的单个文件.
+ */
+export type UploadSessionFile = {
+    path: string;
+    size: number;
+};
+
+/**
+ * 文件接收进度（received 为已接收的 [start, end) 区间）.
+ */
+export type UploadSessionFileStatus = {
+    index: number;
+    path: string;
+    size: number;
+    received?: Array<(Array<(number)>)>;
+    complete: boolean;
+};
+
+/**
+ * 断点续传会话状态.
+ */
+export type UploadSessionResponse = {
+    session_id: string;
+    folder_name: string;
+    files: Array<UploadSessionFileStatus>;
+    complete: boolean;
+};
+
 /**
  * Schema for creating a user.
  */
@@ -733,6 +1195,66 @@ export type UploadDataSourceFolderEndpointApiV1ProjectsDataSourcesUploadFolderPo
 
 export type UploadDataSourceFolderEndpointApiV1ProjectsDataSourcesUploadFolderPostError = (HTTPValidationError);
 
+export type UploadDataSourceArchiveEndpointApiV1ProjectsDataSourcesUploadArchivePostData = {
+    body: Body_upload_data_source_archive_endpoint_api_v1_projects_data_sources_upload_archive_post;
+};
+
+export type UploadDataSourceArchiveEndpointApiV1ProjectsDataSourcesUploadArchivePostResponse = (DataSourceUploadResponse);
+
+export type UploadDataSourceArchiveEndpointApiV1ProjectsDataSourcesUploadArchivePostError = (HTTPValidationError);
+
+export type CreateUploadSessionEndpointApiV1ProjectsDataSourcesUploadsPostData = {
+    body: UploadSessionCreate;
+};
+
+export type CreateUploadSessionEndpointApiV1ProjectsDataSourcesUploadsPostResponse = (UploadSessionResponse);
+
+export type CreateUploadSessionEndpointApiV1ProjectsDataSourcesUploadsPostError = (HTTPValidationError);
+
+export type GetUploadSessionEndpointApiV1ProjectsDataSourcesUploadsSessionIdGetData = {
+    path: {
+        session_id: string;
+    };
+};
+
+export type GetUploadSessionEndpointApiV1ProjectsDataSourcesUploadsSessionIdGetResponse = (UploadSessionResponse);
+
+export type GetUploadSessionEndpointApiV1ProjectsDataSourcesUploadsSessionIdGetError = (HTTPValidationError);
+
+export type AbortUploadSessionEndpointApiV1ProjectsDataSourcesUploadsSessionIdDeleteData = {
+    path: {
+        session_id: string;
+    };
+};
+
+export type AbortUploadSessionEndpointApiV1ProjectsDataSourcesUploadsSessionIdDeleteResponse = (void);
+
+export type AbortUploadSessionEndpointApiV1ProjectsDataSourcesUploadsSessionIdDeleteError = (HTTPValidationError);
+
+export type UploadSessionRangeEndpointApiV1ProjectsDataSourcesUploadsSessionIdFilesIndexPutData = {
+    headers?: {
+        'content-range'?: (string | null);
+    };
+    path: {
+        index: number;
+        session_id: string;
+    };
+};
+
+export type UploadSessionRangeEndpointApiV1ProjectsDataSourcesUploadsSessionIdFilesIndexPutResponse = (UploadSessionFileStatus);
+
+export type UploadSessionRangeEndpointApiV1ProjectsDataSourcesUploadsSessionIdFilesIndexPutError = (HTTPValidationError);
+
+export type FinalizeUploadSessionEndpointApiV1ProjectsDataSourcesUploadsSessionIdFinalizePostData = {
+    path: {
+        session_id: string;
+    };
+};
+
+export type FinalizeUploadSessionEndpointApiV1ProjectsDataSourcesUploadsSessionIdFinalizePostResponse = (DataSourceUploadResponse);
+
+export type FinalizeUploadSessionEndpointApiV1ProjectsDataSourcesUploadsSessionIdFinalizePostError = (HTTPValidationError);
+
 export type GetProjectEndpointApiV1ProjectsProjectIdGetData = {
     path: {
         project_id: number;
@@ -784,10 +1306,104 @@ export type RestoreProjectEndpointApiV1ProjectsProjectIdRestorePostResponse = (P
 
 export type RestoreProjectEndpointApiV1ProjectsProjectIdRestorePostError = (HTTPValidationError);
 
+export type SyncProjectEndpointApiV1ProjectsProjectIdSyncPostData = {
+    path: {
+        project_id: number;
+    };
+};
+
+export type SyncProjectEndpointApiV1ProjectsProjectIdSyncPostResponse = (ProjectSyncResponse);
+
+export type SyncProjectEndpointApiV1ProjectsProjectIdSyncPostError = (HTTPValidationError);
+
+export type GetProjectIngestStatusEndpointApiV1ProjectsProjectIdIngestGetData = {
+    path: {
+        project_id: number;
+    };
+    query?: {
+        limit?: number;
+        skip?: number;
+    };
+};
+
+export type GetProjectIngestStatusEndpointApiV1ProjectsProjectIdIngestGetResponse = (ProjectIngestStatus);
+
+export type GetProjectIngestStatusEndpointApiV1ProjectsProjectIdIngestGetError = (HTTPValidationError);
+
+export type ExportProjectAnnotationsEndpointApiV1ProjectsProjectIdExportPostData = {
+    body?: ProjectExportOptions;
+    path: {
+        project_id: number;
+    };
+};
+
+export type ExportProjectAnnotationsEndpointApiV1ProjectsProjectIdExportPostResponse = (ProjectExportResponse);
+
+export type ExportProjectAnnotationsEndpointApiV1ProjectsProjectIdExportPostError = (HTTPValidationError);
+
+export type ExportProjectColumnarEndpointApiV1ProjectsProjectIdExportColumnarPostData = {
+    path: {
+        project_id: number;
+    };
+};
+
+export type ExportProjectColumnarEndpointApiV1ProjectsProjectIdExportColumnarPostResponse = (unknown);
+
+export type ExportProjectColumnarEndpointApiV1ProjectsProjectIdExportColumnarPostError = (HTTPValidationError);
+
+export type StreamProjectExportEndpointApiV1ProjectsProjectIdExportStreamPostData = {
+    body?: ProjectExportOptions;
+    path: {
+        project_id: number;
+    };
+};
+
+export type StreamProjectExportEndpointApiV1ProjectsProjectIdExportStreamPostResponse = (unknown);
+
+export type StreamProjectExportEndpointApiV1ProjectsProjectIdExportStreamPostError = (HTTPValidationError);
+
 export type ListProjectSamplesEndpointApiV1ProjectsProjectIdSamplesGetData = {
     path: {
         project_id: number;
     };
+    query?: {
+        /**
+         * 上一页返回的 next_cursor
+         */
+        cursor?: (number | null);
+        data_type?: (number | null);
+        has_dark?: (boolean | null);
+        has_white?: (boolean | null);
+        interleave?: ('bil' | 'bsq' | 'bip' | null);
+        is_annotated?: (boolean | null);
+        last_annotated_by?: (number | null);
+        /**
+         * 每页数量
+         */
+        limit?: number;
+        max_bands?: (number | null);
+        max_file_size?: (number | null);
+        max_lines?: (number | null);
+        max_samples?: (number | null);
+        min_bands?: (number | null);
+        min_file_size?: (number | null);
+        min_lines?: (number | null);
+        min_samples?: (number | null);
+        sample_type?: ('image' | 'hyperspectral' | null);
+        status?: ('valid' | 'ignored' | 'missing' | null);
+        /**
+         * 波长覆盖上限 (nm)
+         */
+        wavelength_max?: (number | null);
+        /**
+         * 波长覆盖下限 (nm)
+         */
+        wavelength_min?: (number | null);
+        /**
+         * 分页时同时返回（估算的）总数
+         */
+        with_total?: boolean;
+    };
 };
 
 export type ListProjectSamplesEndpointApiV1ProjectsProjectIdSamplesGetResponse = (SampleListResponse);
@@ -826,6 +1442,17 @@ export type ReplaceSampleAnnotationsEndpointApiV1SamplesSampleIdAnnotationsPutRe
 
 export type ReplaceSampleAnnotationsEndpointApiV1SamplesSampleIdAnnotationsPutError = (HTTPValidationError);
 
+export type PatchSampleAnnotationsEndpointApiV1SamplesSampleIdAnnotationsPatchData = {
+    body: SampleAnnotationsPatch;
+    path: {
+        sample_id: number;
+    };
+};
+
+export type PatchSampleAnnotationsEndpointApiV1SamplesSampleIdAnnotationsPatchResponse = (AnnotationSampleDetail);
+
+export type PatchSampleAnnotationsEndpointApiV1SamplesSampleIdAnnotationsPatchError = (HTTPValidationError);
+
 export type GetSampleAssetEndpointApiV1SamplesSampleIdAssetsGetData = {
     path: {
         sample_id: number;
@@ -842,6 +1469,121 @@ export type GetSampleAssetEndpointApiV1SamplesSampleIdAssetsGetResponse = (unkno
 
 export type GetSampleAssetEndpointApiV1SamplesSampleIdAssetsGetError = (HTTPValidationError);
 
+export type ExtractSampleEndmembersEndpointApiV1SamplesSampleIdEndmembersPostData = {
+    body: EndmemberExtractionRequest;
+    path: {
+        sample_id: number;
+    };
+};
+
+export type ExtractSampleEndmembersEndpointApiV1SamplesSampleIdEndmembersPostResponse = (EndmemberResult);
+
+export type ExtractSampleEndmembersEndpointApiV1SamplesSampleIdEndmembersPostError = (HTTPValidationError);
+
+export type RenderSampleAbundanceEndpointApiV1SamplesSampleIdEndmembersIndexAbundanceGetData = {
+    path: {
+        index: number;
+        sample_id: number;
+    };
+    query?: {
+        n_endmembers?: number;
+        seed?: number;
+        subsample?: number;
+        wavelength_max?: (number | null);
+        wavelength_min?: (number | null);
+    };
+};
+
+export type RenderSampleAbundanceEndpointApiV1SamplesSampleIdEndmembersIndexAbundanceGetResponse = (unknown);
+
+export type RenderSampleAbundanceEndpointApiV1SamplesSampleIdEndmembersIndexAbundanceGetError = (HTTPValidationError);
+
+export type GetSampleQualityEndpointApiV1SamplesSampleIdQualityGetData = {
+    path: {
+        sample_id: number;
+    };
+};
+
+export type GetSampleQualityEndpointApiV1SamplesSampleIdQualityGetResponse = (SampleQualityReport);
+
+export type GetSampleQualityEndpointApiV1SamplesSampleIdQualityGetError = (HTTPValidationError);
+
+export type GetSampleThumbnailEndpointApiV1SamplesSampleIdThumbnailGetData = {
+    path: {
+        sample_id: number;
+    };
+};
+
+export type GetSampleThumbnailEndpointApiV1SamplesSampleIdThumbnailGetResponse = (unknown);
+
+export type GetSampleThumbnailEndpointApiV1SamplesSampleIdThumbnailGetError = (HTTPValidationError);
+
+export type RenderSampleOverviewEndpointApiV1SamplesSampleIdOverviewGetData = {
+    path: {
+        sample_id: number;
+    };
+    query?: {
+        band?: number;
+        level?: number;
+    };
+};
+
+export type RenderSampleOverviewEndpointApiV1SamplesSampleIdOverviewGetResponse = (unknown);
+
+export type RenderSampleOverviewEndpointApiV1SamplesSampleIdOverviewGetError = (HTTPValidationError);
+
+export type LookupSampleBandsEndpointApiV1SamplesSampleIdBandsLookupGetData = {
+    path: {
+        sample_id: number;
+    };
+    query: {
+        /**
+         * 目标波长 (nm)
+         */
+        wavelength: Array<(number)>;
+    };
+};
+
+export type LookupSampleBandsEndpointApiV1SamplesSampleIdBandsLookupGetResponse = (BandLookupResponse);
+
+export type LookupSampleBandsEndpointApiV1SamplesSampleIdBandsLookupGetError = (HTTPValidationError);
+
+export type SelectSampleBandRangeEndpointApiV1SamplesSampleIdBandsRangeGetData = {
+    path: {
+        sample_id: number;
+    };
+    query?: {
+        wavelength_max?: (number | null);
+        wavelength_min?: (number | null);
+    };
+};
+
+export type SelectSampleBandRangeEndpointApiV1SamplesSampleIdBandsRangeGetResponse = (BandRangeResponse);
+
+export type SelectSampleBandRangeEndpointApiV1SamplesSampleIdBandsRangeGetError = (HTTPValidationError);
+
+export type ResolveSampleModeChannelsEndpointApiV1SamplesSampleIdSpectralModesModeIdChannelsGetData = {
+    path: {
+        mode_id: number;
+        sample_id: number;
+    };
+};
+
+export type ResolveSampleModeChannelsEndpointApiV1SamplesSampleIdSpectralModesModeIdChannelsGetResponse = (ResolvedModeChannels);
+
+export type ResolveSampleModeChannelsEndpointApiV1SamplesSampleIdSpectralModesModeIdChannelsGetError = (HTTPValidationError);
+
+export type ExtractSampleSpectraEndpointApiV1SamplesSampleIdSpectraExtractPostData = {
+    body: SpectrumExtractionRequest;
+    path: {
+        sample_id: number;
+    };
+};
+
+export type ExtractSampleSpectraEndpointApiV1SamplesSampleIdSpectraExtractPostResponse = (SpectrumExtractionResponse);
+
+export type ExtractSampleSpectraEndpointApiV1SamplesSampleIdSpectraExtractPostError = (HTTPValidationError);
+
 export type RootGetResponse = ({
     [key: string]: (string);
 });